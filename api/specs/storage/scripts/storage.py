@@ -31,6 +31,7 @@ from servicelib.long_running_tasks._models import TaskGet, TaskId, TaskStatus
 from settings_library.s3 import S3Settings
 from simcore_service_storage._meta import API_VTAG
 from simcore_service_storage.models import (
+    MAX_FILES_LISTING_PAGE_SIZE,
     DatasetMetaData,
     FileMetaData,
     SearchFilesQueryParams,
@@ -160,8 +161,21 @@ async def get_files_metadata(
             "Automatic directory expansion. This will be replaced by pagination the future"
         ),
     ),
+    limit: int | None = Query(
+        None,
+        ge=1,
+        le=MAX_FILES_LISTING_PAGE_SIZE,
+        description="Page size limit. If passed, the listing is paginated",
+    ),
+    cursor: str | None = Query(
+        None,
+        description="Opaque cursor returned with the previous page (requires limit)",
+    ),
 ):
-    """returns all the file meta data a user has access to (uuid_filter may be used)"""
+    """returns all the file meta data a user has access to (uuid_filter may be used)
+
+    If limit is passed, the response also contains the `next_cursor` of the next page (null on the last page)
+    """
 
 
 @app.get(
@@ -350,7 +364,10 @@ async def delete_folders_of_project(
     operation_id="search_files",
 )
 async def search_files(_query_params: Annotated[SearchFilesQueryParams, Depends()]):
-    """search for files starting with `startswith` and/or matching a sha256_checksum in the file_meta_data table"""
+    """search for files starting with `startswith` and/or matching a sha256_checksum in the file_meta_data table
+
+    The response also contains the `total` number of matching files
+    """
 
 
 # long_running_tasks.py
@@ -1,8 +1,9 @@
 import asyncio
 import contextlib
+import datetime
 import logging
 import urllib.parse
-from collections.abc import AsyncGenerator, Callable, Sequence
+from collections.abc import AsyncGenerator, AsyncIterable, Callable, Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Final, cast
@@ -16,13 +17,17 @@ from models_library.api_schemas_storage import ETag, S3BucketName, UploadedPart
 from models_library.basic_types import SHA256Str
 from pydantic import AnyUrl, ByteSize, parse_obj_as
 from servicelib.logging_utils import log_catch, log_context
-from servicelib.utils import limited_gather
+from servicelib.utils import limited_gather, partition_gen
 from settings_library.s3 import S3Settings
 from types_aiobotocore_s3 import S3Client
 from types_aiobotocore_s3.literals import BucketLocationConstraintType
-from types_aiobotocore_s3.type_defs import ObjectIdentifierTypeDef
+from types_aiobotocore_s3.type_defs import ObjectIdentifierTypeDef, ObjectTypeDef
 
-from ._constants import MULTIPART_UPLOADS_MIN_TOTAL_SIZE, PRESIGNED_LINK_MAX_SIZE
+from ._constants import (
+    MULTIPART_UPLOADS_MIN_PART_SIZE,
+    MULTIPART_UPLOADS_MIN_TOTAL_SIZE,
+    PRESIGNED_LINK_MAX_SIZE,
+)
 from ._error_handler import s3_exception_handler, s3_exception_handler_async_gen
 from ._errors import S3DestinationNotEmptyError, S3KeyNotFoundError
 from ._models import (
@@ -152,7 +157,12 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
         prefix: str,
         *,
         items_per_page: int = _MAX_ITEMS_PER_PAGE,
+        start_after: S3ObjectKey | None = None,
     ) -> AsyncGenerator[list[S3MetaData], None]:
+        """
+        start_after: if passed, only lists the objects whose keys come after it (lexicographic order),
+        i.e. the last listed key can be used as a cursor to resume a listing
+        """
         if items_per_page > _AWS_MAX_ITEMS_PER_PAGE:
             msg = f"items_per_page must be <= {_AWS_MAX_ITEMS_PER_PAGE}"
             raise ValueError(msg)
@@ -162,6 +172,7 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
             PaginationConfig={
                 "PageSize": items_per_page,
             },
+            **({"StartAfter": start_after} if start_after else {}),
         ):
             yield [
                 S3MetaData.from_botocore_list_objects(obj)
@@ -233,6 +244,86 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
                 )
                 _logger.debug("restored %s", f"{bucket}/{object_key}")
 
+    @s3_exception_handler(_logger)
+    async def undelete_objects(
+        self, *, bucket: S3BucketName, prefix: str, object_keys: set[S3ObjectKey]
+    ) -> list[S3MetaData]:
+        """same as `undelete_object` for many objects at once: the versions under
+        `prefix` (which must contain all the `object_keys`) are listed once and the
+        delete markers are removed in batches.
+        **NOT to restore previous versions!
+
+        Returns the metadata of the restored objects
+        """
+        latest_delete_markers: dict[S3ObjectKey, dict[str, Any]] = {}
+        newest_other_delete_markers: dict[S3ObjectKey, datetime.datetime] = {}
+        newest_versions: dict[S3ObjectKey, dict[str, Any]] = {}
+        async for page in self._client.get_paginator("list_object_versions").paginate(
+            Bucket=bucket,
+            Prefix=prefix,
+            PaginationConfig={"PageSize": _AWS_MAX_ITEMS_PER_PAGE},
+        ):
+            for marker in page.get("DeleteMarkers", []):
+                if (key := marker.get("Key")) not in object_keys:
+                    continue
+                if marker.get("IsLatest"):
+                    latest_delete_markers[key] = cast(dict[str, Any], marker)
+                elif (
+                    key not in newest_other_delete_markers
+                    or marker["LastModified"] > newest_other_delete_markers[key]
+                ):
+                    newest_other_delete_markers[key] = marker["LastModified"]
+            for version in page.get("Versions", []):
+                if (key := version.get("Key")) not in object_keys:
+                    continue
+                if (
+                    key not in newest_versions
+                    or version["LastModified"] > newest_versions[key]["LastModified"]
+                ):
+                    newest_versions[key] = cast(dict[str, Any], version)
+
+        # NOTE: removing the latest delete marker only restores the object if
+        # the version before it is not another delete marker
+        restorable_keys = [
+            key
+            for key in latest_delete_markers
+            if key in newest_versions
+            and (
+                key not in newest_other_delete_markers
+                or newest_versions[key]["LastModified"]
+                > newest_other_delete_markers[key]
+            )
+        ]
+        restored_objects: list[S3MetaData] = []
+        for keys in partition_gen(restorable_keys, slice_size=_AWS_MAX_ITEMS_PER_PAGE):
+            if not keys:
+                continue
+            response = await self._client.delete_objects(
+                Bucket=bucket,
+                Delete={
+                    "Objects": [
+                        {
+                            "Key": key,
+                            "VersionId": latest_delete_markers[key]["VersionId"],
+                        }
+                        for key in keys
+                    ],
+                    "Quiet": True,
+                },
+            )
+            failed_keys = {error.get("Key") for error in response.get("Errors", [])}
+            restored_objects.extend(
+                S3MetaData.from_botocore_list_objects(
+                    cast(ObjectTypeDef, newest_versions[key])
+                )
+                for key in keys
+                if key not in failed_keys
+            )
+        _logger.debug(
+            "restored %s objects in %s", len(restored_objects), f"{bucket}/{prefix}"
+        )
+        return restored_objects
+
     @s3_exception_handler(_logger)
     async def create_single_presigned_download_link(
         self,
@@ -384,6 +475,73 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
             upload_options |= {"Callback": bytes_transfered_cb}
         await self._client.upload_file(f"{file}", **upload_options)
 
+    @s3_exception_handler(_logger)
+    async def upload_object_from_stream(
+        self,
+        *,
+        bucket: S3BucketName,
+        object_key: S3ObjectKey,
+        stream: AsyncIterable[bytes],
+        part_size: ByteSize = MULTIPART_UPLOADS_MIN_PART_SIZE,
+    ) -> None:
+        """upload the bytes produced by stream with a memory usage bounded by part_size
+        (e.g. for content generated on the fly). Streams smaller than part_size are uploaded
+        in one request, larger ones as a multipart upload (aborted on failure)
+        """
+        assert part_size >= MULTIPART_UPLOADS_MIN_PART_SIZE  # nosec
+        buffer = bytearray()
+        upload_id: UploadID | None = None
+        uploaded_parts: list[UploadedPart] = []
+
+        async def _upload_part(data: bytes) -> None:
+            assert upload_id  # nosec
+            part_number = len(uploaded_parts) + 1
+            response = await self._client.upload_part(
+                Bucket=bucket,
+                Key=object_key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=data,
+            )
+            uploaded_parts.append(
+                UploadedPart(number=part_number, e_tag=response["ETag"])
+            )
+
+        try:
+            async for chunk in stream:
+                buffer += chunk
+                while len(buffer) >= part_size:
+                    if upload_id is None:
+                        response = await self._client.create_multipart_upload(
+                            Bucket=bucket, Key=object_key
+                        )
+                        upload_id = response["UploadId"]
+                    part = bytes(buffer[:part_size])
+                    del buffer[:part_size]
+                    await _upload_part(part)
+
+            if upload_id is None:
+                await self._client.put_object(
+                    Bucket=bucket, Key=object_key, Body=bytes(buffer)
+                )
+                return
+
+            if buffer:
+                await _upload_part(bytes(buffer))
+            await self.complete_multipart_upload(
+                bucket=bucket,
+                object_key=object_key,
+                upload_id=upload_id,
+                uploaded_parts=uploaded_parts,
+            )
+        except BaseException:
+            if upload_id is not None:
+                with log_catch(_logger, reraise=False):
+                    await self._client.abort_multipart_upload(
+                        Bucket=bucket, Key=object_key, UploadId=upload_id
+                    )
+            raise
+
     @s3_exception_handler(_logger)
     async def copy_object(
         self,
@@ -407,6 +565,77 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
             copy_options |= {"Callback": bytes_transfered_cb}
         await self._client.copy(**copy_options)
 
+    @s3_exception_handler(_logger)
+    async def copy_listed_object(
+        self,
+        *,
+        bucket: S3BucketName,
+        src_object: S3MetaData,
+        dst_object_key: S3ObjectKey,
+        bytes_transfered_cb: Callable[[int], None] | None,
+    ) -> S3MetaData:
+        """server-side copy of an object which was already listed (e.g. with list_objects_paginated),
+        i.e. the source is not requested again. Multipart sized objects are copied in parts (in parallel)
+
+        Returns the metadata of the copy
+        """
+        copy_source = {"Bucket": bucket, "Key": src_object.object_key}
+        if not self.is_multipart(ByteSize(src_object.size)):
+            response = await self._client.copy_object(
+                CopySource=copy_source, Bucket=bucket, Key=dst_object_key
+            )
+            if bytes_transfered_cb:
+                bytes_transfered_cb(src_object.size)
+            return S3MetaData(
+                object_key=dst_object_key,
+                last_modified=response["CopyObjectResult"]["LastModified"],
+                e_tag=response["CopyObjectResult"]["ETag"].strip('"'),
+                sha256_checksum=None,
+                size=src_object.size,
+            )
+
+        num_parts, part_size = compute_num_file_chunks(ByteSize(src_object.size))
+        response = await self._client.create_multipart_upload(
+            Bucket=bucket, Key=dst_object_key
+        )
+        upload_id = response["UploadId"]
+
+        async def _copy_part(part_index: int) -> UploadedPart:
+            first_byte = part_index * part_size
+            last_byte = min(first_byte + part_size, src_object.size) - 1
+            response = await self._client.upload_part_copy(
+                CopySource=copy_source,
+                CopySourceRange=f"bytes={first_byte}-{last_byte}",
+                Bucket=bucket,
+                Key=dst_object_key,
+                UploadId=upload_id,
+                PartNumber=part_index + 1,
+            )
+            if bytes_transfered_cb:
+                bytes_transfered_cb(last_byte - first_byte + 1)
+            return UploadedPart(
+                number=part_index + 1, e_tag=response["CopyPartResult"]["ETag"]
+            )
+
+        try:
+            uploaded_parts: list[UploadedPart] = await limited_gather(
+                *(_copy_part(part_index) for part_index in range(num_parts)),
+                limit=self.transfer_max_concurrency,
+            )
+            await self.complete_multipart_upload(
+                bucket=bucket,
+                object_key=dst_object_key,
+                upload_id=upload_id,
+                uploaded_parts=uploaded_parts,
+            )
+        except BaseException:
+            with log_catch(_logger, reraise=False):
+                await self._client.abort_multipart_upload(
+                    Bucket=bucket, Key=dst_object_key, UploadId=upload_id
+                )
+            raise
+        return await self.get_object_metadata(bucket=bucket, object_key=dst_object_key)
+
     @s3_exception_handler(_logger)
     async def copy_objects_recursively(
         self,
@@ -424,9 +653,9 @@ class SimcoreS3API:  # pylint: disable=too-many-public-methods
             raise S3DestinationNotEmptyError(dst_prefix=dst_prefix)
         await limited_gather(
             *[
-                self.copy_object(
+                self.copy_listed_object(
                     bucket=bucket,
-                    src_object_key=s3_object.object_key,
+                    src_object=s3_object,
                     dst_object_key=s3_object.object_key.replace(src_prefix, dst_prefix),
                     bytes_transfered_cb=bytes_transfered_cb,
                 )
@@ -654,6 +654,60 @@ async def test_undelete_file_with_no_versioning_raises(
         )
 
 
+async def test_undelete_objects(
+    mocked_s3_server_envs: EnvVarsDict,
+    with_s3_bucket: S3BucketName,
+    with_versioning_enabled: None,
+    simcore_s3_api: SimcoreS3API,
+    s3_client: S3Client,
+    faker: Faker,
+):
+    prefix = f"{faker.uuid4()}/"
+    deleted_key, deleted_twice_key, existing_key, missing_key = (
+        f"{prefix}{name}" for name in ("deleted", "deleted_twice", "existing", "missing")
+    )
+    for key in (deleted_key, deleted_twice_key, existing_key):
+        await s3_client.put_object(Bucket=with_s3_bucket, Key=key, Body=b"old")
+        await s3_client.put_object(Bucket=with_s3_bucket, Key=key, Body=b"latest")
+    latest_metadata = await simcore_s3_api.get_object_metadata(
+        bucket=with_s3_bucket, object_key=deleted_key
+    )
+    await simcore_s3_api.delete_object(bucket=with_s3_bucket, object_key=deleted_key)
+    for _ in range(2):
+        await simcore_s3_api.delete_object(
+            bucket=with_s3_bucket, object_key=deleted_twice_key
+        )
+
+    restored_objects = await simcore_s3_api.undelete_objects(
+        bucket=with_s3_bucket,
+        prefix=prefix,
+        object_keys={deleted_key, deleted_twice_key, existing_key, missing_key},
+    )
+    assert len(restored_objects) == 1
+    assert restored_objects[0].object_key == deleted_key
+    assert restored_objects[0].size == latest_metadata.size
+    assert restored_objects[0].e_tag == latest_metadata.e_tag
+
+    # the latest version is back
+    assert (
+        await simcore_s3_api.get_object_metadata(
+            bucket=with_s3_bucket, object_key=deleted_key
+        )
+    ).e_tag == latest_metadata.e_tag
+    assert await simcore_s3_api.object_exists(
+        bucket=with_s3_bucket, object_key=existing_key
+    )
+    for key in (deleted_twice_key, missing_key):
+        assert not await simcore_s3_api.object_exists(
+            bucket=with_s3_bucket, object_key=key
+        )
+
+    # does nothing
+    assert not await simcore_s3_api.undelete_objects(
+        bucket=with_s3_bucket, prefix=prefix, object_keys={deleted_key}
+    )
+
+
 async def test_create_single_presigned_download_link(
     mocked_s3_server_envs: EnvVarsDict,
     with_s3_bucket: S3BucketName,
@@ -1017,6 +1071,70 @@ async def test_upload_file_invalid_raises(
         )
 
 
+@pytest.mark.parametrize(
+    "stream_size",
+    [
+        parametrized_file_size("0"),
+        parametrized_file_size("1Mib"),
+        parametrized_file_size("5Mib"),
+        parametrized_file_size("12Mib"),
+    ],
+    ids=byte_size_ids,
+)
+async def test_upload_object_from_stream(
+    mocked_s3_server_envs: EnvVarsDict,
+    simcore_s3_api: SimcoreS3API,
+    with_s3_bucket: S3BucketName,
+    s3_client: S3Client,
+    stream_size: ByteSize,
+    faker: Faker,
+):
+    data = faker.binary(length=stream_size)
+    chunk_size = 100 * 1024
+
+    async def _stream() -> AsyncIterator[bytes]:
+        for offset in range(0, len(data), chunk_size):
+            yield data[offset : offset + chunk_size]
+
+    object_key = faker.file_name()
+    await simcore_s3_api.upload_object_from_stream(
+        bucket=with_s3_bucket, object_key=object_key, stream=_stream()
+    )
+
+    response = await s3_client.get_object(Bucket=with_s3_bucket, Key=object_key)
+    assert await response["Body"].read() == data
+    assert (
+        await simcore_s3_api.list_ongoing_multipart_uploads(bucket=with_s3_bucket) == []
+    )
+
+
+async def test_upload_object_from_failing_stream_aborts_upload(
+    mocked_s3_server_envs: EnvVarsDict,
+    simcore_s3_api: SimcoreS3API,
+    with_s3_bucket: S3BucketName,
+    faker: Faker,
+):
+    class _StreamError(RuntimeError):
+        ...
+
+    async def _failing_stream() -> AsyncIterator[bytes]:
+        yield faker.binary(length=parse_obj_as(ByteSize, "6Mib"))
+        raise _StreamError
+
+    object_key = faker.file_name()
+    with pytest.raises(_StreamError):
+        await simcore_s3_api.upload_object_from_stream(
+            bucket=with_s3_bucket, object_key=object_key, stream=_failing_stream()
+        )
+    assert (
+        await simcore_s3_api.list_ongoing_multipart_uploads(bucket=with_s3_bucket) == []
+    )
+    assert (
+        await simcore_s3_api.object_exists(bucket=with_s3_bucket, object_key=object_key)
+        is False
+    )
+
+
 @pytest.mark.parametrize(
     "file_size",
     [parametrized_file_size("500Mib")],
@@ -1050,6 +1168,51 @@ async def test_copy_file(
     assert uploaded_file.local_path.stat().st_size == dst_file_metadata.size
 
 
+@pytest.mark.parametrize(
+    "file_size",
+    [parametrized_file_size("1Mib"), parametrized_file_size("150Mib")],
+    ids=byte_size_ids,
+)
+async def test_copy_listed_object(
+    mocked_s3_server_envs: EnvVarsDict,
+    simcore_s3_api: SimcoreS3API,
+    with_s3_bucket: S3BucketName,
+    file_size: ByteSize,
+    upload_file: Callable[[Path], Awaitable[UploadedFile]],
+    create_file_of_size: Callable[[ByteSize], Path],
+    faker: Faker,
+):
+    file = create_file_of_size(file_size)
+    uploaded_file = await upload_file(file)
+    src_object = await simcore_s3_api.get_object_metadata(
+        bucket=with_s3_bucket, object_key=uploaded_file.s3_key
+    )
+    dst_object_key = faker.file_name()
+    transferred_bytes = 0
+
+    def _bytes_transfered_cb(num_bytes: int) -> None:
+        nonlocal transferred_bytes
+        transferred_bytes += num_bytes
+
+    dst_object = await simcore_s3_api.copy_listed_object(
+        bucket=with_s3_bucket,
+        src_object=src_object,
+        dst_object_key=dst_object_key,
+        bytes_transfered_cb=_bytes_transfered_cb,
+    )
+    assert dst_object.object_key == dst_object_key
+    assert dst_object.size == file_size
+    assert transferred_bytes == file_size
+    dst_file_metadata = await simcore_s3_api.get_object_metadata(
+        bucket=with_s3_bucket, object_key=dst_object_key
+    )
+    assert dst_file_metadata.size == dst_object.size
+    assert dst_file_metadata.e_tag == dst_object.e_tag
+    assert (
+        await simcore_s3_api.list_ongoing_multipart_uploads(bucket=with_s3_bucket) == []
+    )
+
+
 async def test_copy_file_invalid_raises(
     mocked_s3_server_envs: EnvVarsDict,
     simcore_s3_api: SimcoreS3API,
@@ -1106,6 +1269,47 @@ async def test_get_directory_metadata(
     assert metadata.size == directory_size
 
 
+@pytest.mark.parametrize(
+    "directory_size, min_file_size, max_file_size",
+    [
+        (
+            parse_obj_as(ByteSize, "1Mib"),
+            parse_obj_as(ByteSize, "1B"),
+            parse_obj_as(ByteSize, "10Kib"),
+        )
+    ],
+    ids=byte_size_ids,
+)
+async def test_list_objects_paginated_start_after(
+    mocked_s3_server_envs: EnvVarsDict,
+    simcore_s3_api: SimcoreS3API,
+    with_s3_bucket: S3BucketName,
+    with_uploaded_folder_on_s3: list[UploadedFile],
+):
+    prefix = Path(with_uploaded_folder_on_s3[0].s3_key).parts[0]
+    all_object_keys = [
+        s3_object.object_key
+        async for s3_objects in simcore_s3_api.list_objects_paginated(
+            with_s3_bucket, prefix
+        )
+        for s3_object in s3_objects
+    ]
+    assert sorted(all_object_keys) == sorted(
+        uploaded_file.s3_key for uploaded_file in with_uploaded_folder_on_s3
+    )
+
+    # the listing can be resumed after any listed key
+    start_after = all_object_keys[len(all_object_keys) // 2]
+    resumed_object_keys = [
+        s3_object.object_key
+        async for s3_objects in simcore_s3_api.list_objects_paginated(
+            with_s3_bucket, prefix, items_per_page=3, start_after=start_after
+        )
+        for s3_object in s3_objects
+    ]
+    assert resumed_object_keys == all_object_keys[len(all_object_keys) // 2 + 1 :]
+
+
 @pytest.mark.parametrize(
     "directory_size, min_file_size, max_file_size",
     [
@@ -278,6 +278,11 @@ class UploadedPart(BaseModel):
 
 class FileUploadCompletionBody(BaseModel):
     parts: list[UploadedPart]
+    sha256_checksum: SHA256Str | None = Field(
+        default=None,
+        description="SHA256 message digest of the uploaded content, "
+        "if it was not known when the upload was started (e.g. a stream)",
+    )
 
     @validator("parts")
     @classmethod
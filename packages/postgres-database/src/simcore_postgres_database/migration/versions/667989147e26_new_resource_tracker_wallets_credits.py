@@ -0,0 +1,127 @@
+"""new resource_tracker_wallets_credits table
+
+Revision ID: 667989147e26
+Revises: 617e0ecaf602
+Create Date: 2024-08-05 09:12:31.482067+00:00
+
+"""
+from typing import Final
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "667989147e26"
+down_revision = "617e0ecaf602"
+branch_labels = None
+depends_on = None
+
+
+# TRIGGERS ------------------------
+_TABLE_NAME: Final[str] = "resource_tracker_credit_transactions"
+_TRIGGER_NAME: Final[str] = "credit_transaction_wallet_credits_update"
+_PROCEDURE_NAME: Final[str] = "update_wallet_credits_on_credit_transaction()"
+
+credit_transaction_wallet_credits_trigger = sa.DDL(
+    f"""
+DROP TRIGGER IF EXISTS {_TRIGGER_NAME} on {_TABLE_NAME};
+CREATE TRIGGER {_TRIGGER_NAME}
+AFTER INSERT OR UPDATE OR DELETE ON {_TABLE_NAME}
+    FOR EACH ROW
+    EXECUTE PROCEDURE {_PROCEDURE_NAME};
+"""
+)
+
+# PROCEDURES ------------------------
+update_wallet_credits_procedure = sa.DDL(
+    f"""
+CREATE OR REPLACE FUNCTION {_PROCEDURE_NAME} RETURNS TRIGGER AS $$
+DECLARE
+    old_credits NUMERIC := 0;
+    new_credits NUMERIC := 0;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.transaction_status IN ('BILLED', 'PENDING') THEN
+        old_credits := OLD.osparc_credits;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.transaction_status IN ('BILLED', 'PENDING') THEN
+        new_credits := NEW.osparc_credits;
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND OLD.product_name = NEW.product_name AND OLD.wallet_id = NEW.wallet_id THEN
+        new_credits := new_credits - old_credits;
+        old_credits := 0;
+        IF new_credits = 0 THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    IF old_credits <> 0 THEN
+        INSERT INTO "resource_tracker_wallets_credits" ("product_name", "wallet_id", "available_osparc_credits")
+        VALUES (OLD.product_name, OLD.wallet_id, -old_credits)
+        ON CONFLICT ("product_name", "wallet_id") DO UPDATE
+        SET "available_osparc_credits" = "resource_tracker_wallets_credits"."available_osparc_credits" + EXCLUDED."available_osparc_credits",
+            "modified" = now();
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO "resource_tracker_wallets_credits" ("product_name", "wallet_id", "available_osparc_credits")
+        VALUES (NEW.product_name, NEW.wallet_id, new_credits)
+        ON CONFLICT ("product_name", "wallet_id") DO UPDATE
+        SET "available_osparc_credits" = "resource_tracker_wallets_credits"."available_osparc_credits" + EXCLUDED."available_osparc_credits",
+            "modified" = now();
+    END IF;
+    RETURN NULL;
+END; $$ LANGUAGE 'plpgsql';
+    """
+)
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table(
+        "resource_tracker_wallets_credits",
+        sa.Column("product_name", sa.String(), nullable=False),
+        sa.Column("wallet_id", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "available_osparc_credits",
+            sa.Numeric(scale=2),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+        sa.Column(
+            "modified",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint(
+            "product_name", "wallet_id", name="resource_tracker_wallets_credits_pkey"
+        ),
+    )
+    # ### end Alembic commands ###
+
+    # custom
+    # NOTE: the running balances are initialized within the same transaction as the trigger creation
+    op.execute(f"LOCK TABLE {_TABLE_NAME} IN SHARE ROW EXCLUSIVE MODE;")
+    op.execute(
+        sa.DDL(
+            f"""
+INSERT INTO resource_tracker_wallets_credits (product_name, wallet_id, available_osparc_credits)
+SELECT product_name, wallet_id, SUM(osparc_credits)
+FROM {_TABLE_NAME}
+WHERE transaction_status IN ('BILLED', 'PENDING')
+GROUP BY product_name, wallet_id;
+            """
+        )
+    )
+    op.execute(update_wallet_credits_procedure)
+    op.execute(credit_transaction_wallet_credits_trigger)
+
+
+def downgrade():
+    # custom
+    op.execute(f"DROP TRIGGER IF EXISTS {_TRIGGER_NAME} on {_TABLE_NAME};")
+    op.execute(f"DROP FUNCTION {_PROCEDURE_NAME};")
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_table("resource_tracker_wallets_credits")
+    # ### end Alembic commands ###
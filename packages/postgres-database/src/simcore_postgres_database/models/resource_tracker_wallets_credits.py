@@ -0,0 +1,111 @@
+""" Wallets credits
+    - Running balance of each wallet, i.e. the sum of the BILLED and PENDING credit transactions
+    - Maintained incrementally by a trigger on resource_tracker_credit_transactions so that reading
+      the available credits of a wallet does not need to aggregate its whole history
+"""
+from typing import Final
+
+import sqlalchemy as sa
+
+from ._common import NUMERIC_KWARGS, column_modified_datetime
+from .base import metadata
+from .resource_tracker_credit_transactions import resource_tracker_credit_transactions
+
+resource_tracker_wallets_credits = sa.Table(
+    "resource_tracker_wallets_credits",
+    metadata,
+    sa.Column(
+        "product_name",
+        sa.String,
+        nullable=False,
+        doc="Product name",
+    ),
+    sa.Column(
+        "wallet_id",
+        sa.BigInteger,
+        nullable=False,
+        doc="Wallet id",
+    ),
+    sa.Column(
+        "available_osparc_credits",
+        sa.Numeric(**NUMERIC_KWARGS),  # type: ignore
+        nullable=False,
+        server_default=sa.text("0"),
+        doc="Sum of the BILLED and PENDING credit transactions of the wallet",
+    ),
+    column_modified_datetime(timezone=True),
+    # ---------------------------
+    sa.PrimaryKeyConstraint(
+        "product_name", "wallet_id", name="resource_tracker_wallets_credits_pkey"
+    ),
+)
+
+
+# ------------------------ TRIGGERS
+_TRIGGER_NAME: Final[str] = "credit_transaction_wallet_credits_update"
+_PROCEDURE_NAME: Final[str] = "update_wallet_credits_on_credit_transaction()"
+
+credit_transaction_wallet_credits_trigger = sa.DDL(
+    f"""
+DROP TRIGGER IF EXISTS {_TRIGGER_NAME} on {resource_tracker_credit_transactions.name};
+CREATE TRIGGER {_TRIGGER_NAME}
+AFTER INSERT OR UPDATE OR DELETE ON {resource_tracker_credit_transactions.name}
+    FOR EACH ROW
+    EXECUTE PROCEDURE {_PROCEDURE_NAME};
+"""
+)
+
+
+# --------------------------- PROCEDURES
+update_wallet_credits_procedure = sa.DDL(
+    f"""
+CREATE OR REPLACE FUNCTION {_PROCEDURE_NAME} RETURNS TRIGGER AS $$
+DECLARE
+    old_credits NUMERIC := 0;
+    new_credits NUMERIC := 0;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.transaction_status IN ('BILLED', 'PENDING') THEN
+        old_credits := OLD.osparc_credits;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.transaction_status IN ('BILLED', 'PENDING') THEN
+        new_credits := NEW.osparc_credits;
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND OLD.product_name = NEW.product_name AND OLD.wallet_id = NEW.wallet_id THEN
+        new_credits := new_credits - old_credits;
+        old_credits := 0;
+        IF new_credits = 0 THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    IF old_credits <> 0 THEN
+        INSERT INTO "{resource_tracker_wallets_credits.name}" ("product_name", "wallet_id", "available_osparc_credits")
+        VALUES (OLD.product_name, OLD.wallet_id, -old_credits)
+        ON CONFLICT ("product_name", "wallet_id") DO UPDATE
+        SET "available_osparc_credits" = "{resource_tracker_wallets_credits.name}"."available_osparc_credits" + EXCLUDED."available_osparc_credits",
+            "modified" = now();
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO "{resource_tracker_wallets_credits.name}" ("product_name", "wallet_id", "available_osparc_credits")
+        VALUES (NEW.product_name, NEW.wallet_id, new_credits)
+        ON CONFLICT ("product_name", "wallet_id") DO UPDATE
+        SET "available_osparc_credits" = "{resource_tracker_wallets_credits.name}"."available_osparc_credits" + EXCLUDED."available_osparc_credits",
+            "modified" = now();
+    END IF;
+    RETURN NULL;
+END; $$ LANGUAGE 'plpgsql';
+    """
+)
+
+# NOTE: the trigger is attached to the credit transactions table, which might be created after this one
+sa.event.listen(
+    resource_tracker_credit_transactions,
+    "after_create",
+    update_wallet_credits_procedure,
+)
+sa.event.listen(
+    resource_tracker_credit_transactions,
+    "after_create",
+    credit_transaction_wallet_credits_trigger,
+)
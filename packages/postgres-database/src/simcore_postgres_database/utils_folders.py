@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from functools import reduce
-from typing import Any, ClassVar, TypeAlias
+from typing import Any, ClassVar, Final, TypeAlias
 
 import sqlalchemy as sa
 from aiopg.sa.connection import SAConnection
@@ -22,6 +22,7 @@ from pydantic import (
 from pydantic.errors import PydanticErrorMixin
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import CTE
 
 from .models.folders import folders, folders_access_rights, folders_to_projects
 from .models.groups import GroupType, groups
@@ -51,6 +52,7 @@ FoldersError
         * GroupIdDoesNotExistError
     * BaseMoveFolderError
         * CannotMoveFolderSharedViaNonPrimaryGroupError
+        * CannotMoveFolderInsideItselfError
     * BaseAddProjectError
         * ProjectAlreadyExistsInFolderError
 """
@@ -112,6 +114,13 @@ class CannotMoveFolderSharedViaNonPrimaryGroupError(BaseMoveFolderError):
     )
 
 
+class CannotMoveFolderInsideItselfError(BaseMoveFolderError):
+    msg_template = (
+        "cannot move folder_id={source_folder_id} inside "
+        "folder_id={destination_folder_id} which is the folder itself or one of its subfolders"
+    )
+
+
 class BaseAddProjectError(FoldersError):
     pass
 
@@ -308,43 +317,42 @@ class _ResolvedAccessRights(BaseModel):
         orm_mode = True
 
 
-async def _get_resolved_access_rights(
-    connection: SAConnection,
-    folder_id: _FolderID,
-    gid: _GroupID,
-    *,
-    permissions: _FolderPermissions | None,
-    enforece_all_permissions: bool,
-) -> _ResolvedAccessRights | None:
+_ACCESS_RIGHTS_COLUMNS: Final[tuple[sa.Column, ...]] = (
+    folders_access_rights.c.folder_id,
+    folders_access_rights.c.gid,
+    folders_access_rights.c.traversal_parent_id,
+    folders_access_rights.c.original_parent_id,
+    folders_access_rights.c.read,
+    folders_access_rights.c.write,
+    folders_access_rights.c.delete,
+)
+
 
+def _get_access_rights_hierarchy(start_folders: ColumnElement) -> CTE:
+    """
+    Access rights of the folders selected by `start_folders` and of all the
+    folders they were created in (walking up via `original_parent_id`).
+    `start_folder_id` is the folder the row was reached from and `level`
+    its distance from it.
+    """
     # Define the anchor CTE
     access_rights_cte = (
         sa.select(
             [
-                folders_access_rights.c.folder_id,
-                folders_access_rights.c.gid,
-                folders_access_rights.c.traversal_parent_id,
-                folders_access_rights.c.original_parent_id,
-                folders_access_rights.c.read,
-                folders_access_rights.c.write,
-                folders_access_rights.c.delete,
+                *_ACCESS_RIGHTS_COLUMNS,
+                folders_access_rights.c.folder_id.label("start_folder_id"),
                 sa.literal_column("0").label("level"),
             ]
         )
-        .where(folders_access_rights.c.folder_id == sa.bindparam("start_folder_id"))
+        .where(start_folders)
         .cte(name="access_rights_cte", recursive=True)
     )
 
     # Define the recursive part of the CTE
     recursive = sa.select(
         [
-            folders_access_rights.c.folder_id,
-            folders_access_rights.c.gid,
-            folders_access_rights.c.traversal_parent_id,
-            folders_access_rights.c.original_parent_id,
-            folders_access_rights.c.read,
-            folders_access_rights.c.write,
-            folders_access_rights.c.delete,
+            *_ACCESS_RIGHTS_COLUMNS,
+            access_rights_cte.c.start_folder_id,
             sa.literal_column("access_rights_cte.level + 1").label("level"),
         ]
     ).select_from(
@@ -355,47 +363,74 @@ async def _get_resolved_access_rights(
     )
 
     # Combine anchor and recursive CTE
-    folder_hierarchy = access_rights_cte.union_all(recursive)
+    return access_rights_cte.union_all(recursive)
 
-    def _get_permissions_where_clause() -> ColumnElement | bool:
-        if not permissions:
-            return True
+
+def _has_permissions(
+    access_rights: _ResolvedAccessRights,
+    permissions: _FolderPermissions | None,
+    *,
+    enforece_all_permissions: bool,
+) -> bool:
+    if not permissions:
+        return True
+    if enforece_all_permissions:
         return (
-            sa.and_(
-                folder_hierarchy.c.read.is_(permissions.read),
-                folder_hierarchy.c.write.is_(permissions.write),
-                folder_hierarchy.c.delete.is_(permissions.delete),
-            )
-            if enforece_all_permissions
-            else _get_and_calsue_with_only_true_entries(permissions, folder_hierarchy)
+            access_rights.read is permissions.read
+            and access_rights.write is permissions.write
+            and access_rights.delete is permissions.delete
         )
+    return all(
+        getattr(access_rights, permission)
+        for permission in _only_true_permissions(permissions)
+    )
+
 
-    # Final query to filter and order results
+async def _list_resolvable_access_rights(
+    connection: SAConnection, folder_id: _FolderID, gid: _GroupID
+) -> list[_ResolvedAccessRights]:
+    """entries which can provide `gid` access to `folder_id`, closest first"""
+    folder_hierarchy = _get_access_rights_hierarchy(
+        folders_access_rights.c.folder_id == sa.bindparam("start_folder_id")
+    )
     query = (
         sa.select(
             [
-                folder_hierarchy.c.folder_id,
-                folder_hierarchy.c.gid,
-                folder_hierarchy.c.traversal_parent_id,
-                folder_hierarchy.c.original_parent_id,
-                folder_hierarchy.c.read,
-                folder_hierarchy.c.write,
-                folder_hierarchy.c.delete,
+                *(folder_hierarchy.c[c.name] for c in _ACCESS_RIGHTS_COLUMNS),
                 folder_hierarchy.c.level,
             ]
         )
-        .where(_get_permissions_where_clause())
         .where(folder_hierarchy.c.original_parent_id.is_(None))
         .where(folder_hierarchy.c.gid == gid)
         .order_by(folder_hierarchy.c.level.asc())
     )
 
     result = await connection.execute(query.params(start_folder_id=folder_id))
-    resolved_access_rights: RowProxy | None = await result.fetchone()
-    return (
-        _ResolvedAccessRights.from_orm(resolved_access_rights)
-        if resolved_access_rights
-        else None
+    rows: list[RowProxy] = await result.fetchall()
+    return [_ResolvedAccessRights.from_orm(row) for row in rows]
+
+
+async def _get_resolved_access_rights(
+    connection: SAConnection,
+    folder_id: _FolderID,
+    gid: _GroupID,
+    *,
+    permissions: _FolderPermissions | None,
+    enforece_all_permissions: bool,
+) -> _ResolvedAccessRights | None:
+    return next(
+        (
+            access_rights
+            for access_rights in await _list_resolvable_access_rights(
+                connection, folder_id, gid
+            )
+            if _has_permissions(
+                access_rights,
+                permissions,
+                enforece_all_permissions=enforece_all_permissions,
+            )
+        ),
+        None,
     )
 
 
@@ -422,33 +457,129 @@ async def _check_folder_and_access(
     if not folder_entry:
         raise FolderNotFoundError(folder_id=folder_id, product_name=product_name)
 
-    # check if folder was shared
-    resolved_access_rights_without_permissions = await _get_resolved_access_rights(
-        connection,
-        folder_id,
-        gid,
-        permissions=None,
-        enforece_all_permissions=False,
+    # NOTE: the hierarchy is resolved once for both checks
+    resolvable_access_rights = await _list_resolvable_access_rights(
+        connection, folder_id, gid
     )
-    if not resolved_access_rights_without_permissions:
+
+    # check if folder was shared
+    if not resolvable_access_rights:
         raise FolderNotSharedWithGidError(folder_id=folder_id, gid=gid)
 
     # check if there are permissions
-    resolved_access_rights = await _get_resolved_access_rights(
-        connection,
-        folder_id,
-        gid,
-        permissions=permissions,
-        enforece_all_permissions=enforece_all_permissions,
+    for access_rights in resolvable_access_rights:
+        if _has_permissions(
+            access_rights,
+            permissions,
+            enforece_all_permissions=enforece_all_permissions,
+        ):
+            return access_rights
+
+    raise InsufficientPermissionsError(
+        folder_id=folder_id,
+        gid=gid,
+        permissions=_only_true_permissions(permissions),
     )
-    if resolved_access_rights is None:
-        raise InsufficientPermissionsError(
-            folder_id=folder_id,
-            gid=gid,
-            permissions=_only_true_permissions(permissions),
+
+
+def _get_subtree(folder_id: _FolderID) -> CTE:
+    """`folder_id` and all the folders listed (recursively) inside it"""
+    subtree_cte = (
+        sa.select([folders.c.id.label("folder_id")])
+        .where(folders.c.id == folder_id)
+        .cte(name="subtree_cte", recursive=True)
+    )
+    children = sa.select([folders_access_rights.c.folder_id]).select_from(
+        folders_access_rights.join(
+            subtree_cte,
+            folders_access_rights.c.traversal_parent_id == subtree_cte.c.folder_id,
+        )
+    )
+    # NOTE: UNION (not UNION ALL) ends the recursion if the folders form a cycle
+    return subtree_cte.union(children)
+
+
+def _get_ancestors(folder_id: _FolderID, gid: _GroupID) -> CTE:
+    """all the folders `folder_id` is listed (recursively) inside, for `gid`"""
+    ancestors_cte = (
+        sa.select([folders_access_rights.c.traversal_parent_id.label("folder_id")])
+        .where(folders_access_rights.c.folder_id == folder_id)
+        .where(folders_access_rights.c.gid == gid)
+        .where(folders_access_rights.c.traversal_parent_id.is_not(None))
+        .cte(name="ancestors_cte", recursive=True)
+    )
+    parents = (
+        sa.select([folders_access_rights.c.traversal_parent_id])
+        .select_from(
+            folders_access_rights.join(
+                ancestors_cte,
+                folders_access_rights.c.folder_id == ancestors_cte.c.folder_id,
+            )
         )
+        .where(folders_access_rights.c.gid == gid)
+        .where(folders_access_rights.c.traversal_parent_id.is_not(None))
+    )
+    return ancestors_cte.union(parents)
 
-    return resolved_access_rights
+
+async def _check_subtree_access(
+    connection: SAConnection,
+    subtree: CTE,
+    gid: _GroupID,
+    *,
+    permissions: _FolderPermissions,
+) -> list[_FolderID]:
+    """
+    Resolves the access rights of all the folders in the subtree at once
+
+    Raises:
+        FolderNotSharedWithGidError
+        InsufficientPermissionsError
+    """
+    folder_hierarchy = _get_access_rights_hierarchy(
+        folders_access_rights.c.folder_id.in_(sa.select([subtree.c.folder_id]))
+    )
+    permissions_clause = _get_and_calsue_with_only_true_entries(
+        permissions, folder_hierarchy
+    )
+    resolvable_access_rights = (
+        sa.select(
+            [
+                folder_hierarchy.c.start_folder_id,
+                sa.func.bool_or(
+                    sa.true() if permissions_clause is True else permissions_clause
+                ).label("has_permissions"),
+            ]
+        )
+        .where(folder_hierarchy.c.original_parent_id.is_(None))
+        .where(folder_hierarchy.c.gid == gid)
+        .group_by(folder_hierarchy.c.start_folder_id)
+        .subquery()
+    )
+    query = sa.select(
+        [
+            subtree.c.folder_id,
+            resolvable_access_rights.c.has_permissions,
+        ]
+    ).select_from(
+        subtree.outerjoin(
+            resolvable_access_rights,
+            subtree.c.folder_id == resolvable_access_rights.c.start_folder_id,
+        )
+    )
+
+    folder_ids: list[_FolderID] = []
+    async for row in connection.execute(query):
+        if row.has_permissions is None:
+            raise FolderNotSharedWithGidError(folder_id=row.folder_id, gid=gid)
+        if not row.has_permissions:
+            raise InsufficientPermissionsError(
+                folder_id=row.folder_id,
+                gid=gid,
+                permissions=_only_true_permissions(permissions),
+            )
+        folder_ids.append(row.folder_id)
+    return folder_ids
 
 
 ###
@@ -650,8 +781,8 @@ async def folder_delete(
         FolderNotSharedWithGidError
         InsufficientPermissionsError
     """
-    childern_folder_ids: list[_FolderID] = []
-
+    # NOTE: the whole subtree is checked and deleted at once, nothing is deleted
+    # if the `gid` is not allowed to delete any of the folders
     async with connection.begin():
         await _check_folder_and_access(
             connection,
@@ -662,24 +793,14 @@ async def folder_delete(
             enforece_all_permissions=False,
         )
 
-        # list all children then delete
-        results = await connection.execute(
-            folders_access_rights.select().where(
-                folders_access_rights.c.traversal_parent_id == folder_id
-            )
+        subtree = _get_subtree(folder_id)
+        subtree_folder_ids = await _check_subtree_access(
+            connection, subtree, gid, permissions=required_permissions
         )
-        rows = await results.fetchall()
-        if rows:
-            for entry in rows:
-                childern_folder_ids.append(entry.folder_id)  # noqa: PERF401
-
-    # first remove all childeren
-    for child_folder_id in childern_folder_ids:
-        await folder_delete(connection, product_name, child_folder_id, gid)
 
-    # as a last step remove the folder per se
-    async with connection.begin():
-        await connection.execute(folders.delete().where(folders.c.id == folder_id))
+        await connection.execute(
+            folders.delete().where(folders.c.id.in_(subtree_folder_ids))
+        )
 
 
 async def folder_move(
@@ -702,6 +823,7 @@ async def folder_move(
         FolderNotSharedWithGidError
         InsufficientPermissionsError
         CannotMoveFolderSharedViaNonPrimaryGroupError:
+        CannotMoveFolderInsideItselfError
     """
     async with connection.begin():
         source_access_entry = await _check_folder_and_access(
@@ -731,6 +853,22 @@ async def folder_move(
                 enforece_all_permissions=False,
             )
 
+            # a folder cannot be moved inside itself or inside one of its subfolders
+            destination_ancestors = _get_ancestors(destination_folder_id, gid)
+            if (
+                source_folder_id == destination_folder_id
+                or await connection.scalar(
+                    sa.select([destination_ancestors.c.folder_id]).where(
+                        destination_ancestors.c.folder_id == source_folder_id
+                    )
+                )
+                is not None
+            ):
+                raise CannotMoveFolderInsideItselfError(
+                    source_folder_id=source_folder_id,
+                    destination_folder_id=destination_folder_id,
+                )
+
         # set new traversa_parent_id on the source_folder_id which is equal to destination_folder_id
         await connection.execute(
             folders_access_rights.update()
@@ -0,0 +1,123 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+from decimal import Decimal
+
+import sqlalchemy as sa
+from aiopg.sa.connection import SAConnection
+from faker import Faker
+from simcore_postgres_database.models.resource_tracker_credit_transactions import (
+    CreditTransactionClassification,
+    CreditTransactionStatus,
+    resource_tracker_credit_transactions,
+)
+from simcore_postgres_database.models.resource_tracker_wallets_credits import (
+    resource_tracker_wallets_credits,
+)
+
+
+async def _get_wallet_credits(
+    connection: SAConnection, product_name: str, wallet_id: int
+) -> Decimal | None:
+    return await connection.scalar(
+        sa.select(resource_tracker_wallets_credits.c.available_osparc_credits).where(
+            (resource_tracker_wallets_credits.c.product_name == product_name)
+            & (resource_tracker_wallets_credits.c.wallet_id == wallet_id)
+        )
+    )
+
+
+async def _sum_credit_transactions(
+    connection: SAConnection, product_name: str, wallet_id: int
+) -> Decimal:
+    total = await connection.scalar(
+        sa.select(
+            sa.func.sum(resource_tracker_credit_transactions.c.osparc_credits)
+        ).where(
+            (resource_tracker_credit_transactions.c.product_name == product_name)
+            & (resource_tracker_credit_transactions.c.wallet_id == wallet_id)
+            & resource_tracker_credit_transactions.c.transaction_status.in_(
+                [CreditTransactionStatus.BILLED, CreditTransactionStatus.PENDING]
+            )
+        )
+    )
+    return total or Decimal(0)
+
+
+async def test_wallet_credits_follow_credit_transactions(
+    connection: SAConnection, faker: Faker
+):
+    product_name = "osparc"
+    wallet_id = faker.pyint(min_value=1)
+
+    async def _add_transaction(
+        osparc_credits: Decimal,
+        status: CreditTransactionStatus,
+        classification: CreditTransactionClassification,
+    ) -> int:
+        transaction_id = await connection.scalar(
+            resource_tracker_credit_transactions.insert()
+            .values(
+                product_name=product_name,
+                wallet_id=wallet_id,
+                wallet_name=faker.word(),
+                user_id=faker.pyint(min_value=1),
+                user_email=faker.email(),
+                osparc_credits=osparc_credits,
+                transaction_status=status,
+                transaction_classification=classification,
+                last_heartbeat_at=sa.func.now(),
+            )
+            .returning(resource_tracker_credit_transactions.c.transaction_id)
+        )
+        assert transaction_id
+        return transaction_id
+
+    async def _assert_wallet_credits(expected: Decimal) -> None:
+        assert await _get_wallet_credits(connection, product_name, wallet_id) == expected
+        assert (
+            await _sum_credit_transactions(connection, product_name, wallet_id)
+            == expected
+        )
+
+    assert await _get_wallet_credits(connection, product_name, wallet_id) is None
+
+    # top-up
+    await _add_transaction(
+        Decimal(100),
+        CreditTransactionStatus.BILLED,
+        CreditTransactionClassification.ADD_WALLET_TOP_UP,
+    )
+    await _assert_wallet_credits(Decimal(100))
+
+    # a running service
+    transaction_id = await _add_transaction(
+        Decimal(0),
+        CreditTransactionStatus.PENDING,
+        CreditTransactionClassification.DEDUCT_SERVICE_RUN,
+    )
+    await _assert_wallet_credits(Decimal(100))
+    for used_credits in (Decimal("-1.5"), Decimal("-3.25"), Decimal("-3.25")):
+        await connection.execute(
+            resource_tracker_credit_transactions.update()
+            .values(osparc_credits=used_credits)
+            .where(resource_tracker_credit_transactions.c.transaction_id == transaction_id)
+        )
+        await _assert_wallet_credits(Decimal(100) + used_credits)
+
+    # the service was not billed
+    await connection.execute(
+        resource_tracker_credit_transactions.update()
+        .values(transaction_status=CreditTransactionStatus.NOT_BILLED)
+        .where(resource_tracker_credit_transactions.c.transaction_id == transaction_id)
+    )
+    await _assert_wallet_credits(Decimal(100))
+
+    # deleting the transactions
+    await connection.execute(
+        resource_tracker_credit_transactions.delete().where(
+            resource_tracker_credit_transactions.c.wallet_id == wallet_id
+        )
+    )
+    await _assert_wallet_credits(Decimal(0))
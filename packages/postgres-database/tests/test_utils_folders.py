@@ -27,6 +27,7 @@ from simcore_postgres_database.utils_folders import (
     NO_ACCESS_PERMISSIONS,
     OWNER_PERMISSIONS,
     VIEWER_PERMISSIONS,
+    CannotMoveFolderInsideItselfError,
     CannotMoveFolderSharedViaNonPrimaryGroupError,
     FolderAccessRole,
     FolderAlreadyExistsError,
@@ -1024,6 +1025,165 @@ async def test_folder_delete_nested_folders(
     await _assert_folder_entires(connection, folder_count=101, access_rights_count=106)
 
 
+async def test_folder_delete_is_atomic(
+    connection: SAConnection,
+    default_product_name: _ProductName,
+    get_unique_gids: Callable[[int], tuple[_GroupID, ...]],
+    make_folders: Callable[[set[MkFolder]], Awaitable[dict[str, _FolderID]]],
+):
+    (gid_owner, gid_editor) = get_unique_gids(2)
+
+    folder_ids = await make_folders(
+        {
+            MkFolder(
+                name="root_folder",
+                gid=gid_owner,
+                shared_with={gid_editor: FolderAccessRole.EDITOR},
+                children={
+                    MkFolder(
+                        name="f1",
+                        gid=gid_owner,
+                        children={MkFolder(name="f2", gid=gid_owner)},
+                    )
+                },
+            ),
+            MkFolder(name="editor_folder", gid=gid_editor),
+        }
+    )
+    await _assert_folder_entires(connection, folder_count=4, access_rights_count=5)
+
+    # the editor moves a folder which is not shared with the owner inside the tree
+    await folder_move(
+        connection,
+        default_product_name,
+        folder_ids["editor_folder"],
+        gid_editor,
+        destination_folder_id=folder_ids["f2"],
+    )
+
+    # nothing is removed since the owner cannot delete the moved folder
+    with pytest.raises(FolderNotSharedWithGidError):
+        await folder_delete(
+            connection, default_product_name, folder_ids["root_folder"], gid_owner
+        )
+    await _assert_folder_entires(connection, folder_count=4, access_rights_count=5)
+
+    # once moved out, the tree can be deleted
+    await folder_move(
+        connection,
+        default_product_name,
+        folder_ids["editor_folder"],
+        gid_editor,
+        destination_folder_id=None,
+    )
+    await folder_delete(
+        connection, default_product_name, folder_ids["root_folder"], gid_owner
+    )
+    await _assert_folder_entires(connection, folder_count=1)
+
+
+async def _create_folders_tree(
+    connection: SAConnection,
+    product_name: _ProductName,
+    gid: _GroupID,
+    *,
+    fanout: NonNegativeInt,
+    depth: NonNegativeInt,
+) -> tuple[_FolderID, list[_FolderID]]:
+    # NOTE: bulk inserts, creating thousands of folders with `folder_create` is too slow
+    root_folder_id = await folder_create(connection, product_name, "root", gid)
+
+    parent_ids: list[_FolderID] = [root_folder_id]
+    for _ in range(depth):
+        result = await connection.execute(
+            folders.insert()
+            .values(
+                [
+                    {
+                        "name": f"f_{parent_id}_{i}",
+                        "created_by": gid,
+                        "product_name": product_name,
+                    }
+                    for parent_id in parent_ids
+                    for i in range(fanout)
+                ]
+            )
+            .returning(folders.c.id, folders.c.name)
+        )
+        rows = await result.fetchall()
+        await connection.execute(
+            folders_access_rights.insert().values(
+                [
+                    {
+                        "folder_id": row.id,
+                        "gid": gid,
+                        "traversal_parent_id": int(row.name.split("_")[1]),
+                        "original_parent_id": int(row.name.split("_")[1]),
+                        **OWNER_PERMISSIONS.to_dict(),
+                    }
+                    for row in rows
+                ]
+            )
+        )
+        parent_ids = [row.id for row in rows]
+
+    return root_folder_id, parent_ids
+
+
+@pytest.mark.parametrize(
+    "fanout, depth",
+    [
+        pytest.param(8, 4, id="wide-tree"),
+        pytest.param(1, 1_000, id="deep-tree"),
+    ],
+)
+async def test_folder_delete_large_trees(
+    connection: SAConnection,
+    default_product_name: _ProductName,
+    get_unique_gids: Callable[[int], tuple[_GroupID, ...]],
+    fanout: NonNegativeInt,
+    depth: NonNegativeInt,
+):
+    (gid_owner, gid_editor) = get_unique_gids(2)
+
+    root_folder_id, leaf_folder_ids = await _create_folders_tree(
+        connection, default_product_name, gid_owner, fanout=fanout, depth=depth
+    )
+    folder_count = 1 + sum(fanout**level for level in range(1, depth + 1))
+    await _assert_folder_entires(connection, folder_count=folder_count)
+
+    # access to the leaves is granted by sharing the root
+    await folder_share_or_update_permissions(
+        connection,
+        default_product_name,
+        root_folder_id,
+        sharing_gid=gid_owner,
+        recipient_gid=gid_editor,
+        recipient_role=FolderAccessRole.EDITOR,
+    )
+    resolved_access_rights = await _get_resolved_access_rights(
+        connection,
+        leaf_folder_ids[-1],
+        gid_editor,
+        permissions=EDITOR_PERMISSIONS,
+        enforece_all_permissions=True,
+    )
+    assert resolved_access_rights
+    assert resolved_access_rights.folder_id == root_folder_id
+    assert resolved_access_rights.level == depth
+
+    with pytest.raises(InsufficientPermissionsError):
+        await folder_delete(
+            connection, default_product_name, root_folder_id, gid_editor
+        )
+    await _assert_folder_entires(
+        connection, folder_count=folder_count, access_rights_count=folder_count + 1
+    )
+
+    await folder_delete(connection, default_product_name, root_folder_id, gid_owner)
+    await _assert_folder_entires(connection, folder_count=0)
+
+
 async def test_folder_move(
     connection: SAConnection,
     default_product_name: _ProductName,
@@ -1329,6 +1489,100 @@ async def test_folder_move(
             )
 
 
+async def test_folder_move_inside_itself(
+    connection: SAConnection,
+    default_product_name: _ProductName,
+    get_unique_gids: Callable[[int], tuple[_GroupID, ...]],
+    make_folders: Callable[[set[MkFolder]], Awaitable[dict[str, _FolderID]]],
+):
+    (gid_owner,) = get_unique_gids(1)
+
+    folder_ids = await make_folders(
+        {
+            MkFolder(
+                name="f1",
+                gid=gid_owner,
+                children={
+                    MkFolder(
+                        name="f2",
+                        gid=gid_owner,
+                        children={MkFolder(name="f3", gid=gid_owner)},
+                    )
+                },
+            ),
+        }
+    )
+
+    for destination in ("f1", "f2", "f3"):
+        with pytest.raises(CannotMoveFolderInsideItselfError):
+            await folder_move(
+                connection,
+                default_product_name,
+                folder_ids["f1"],
+                gid_owner,
+                destination_folder_id=folder_ids[destination],
+            )
+
+    # moving to a parent is allowed
+    await folder_move(
+        connection,
+        default_product_name,
+        folder_ids["f3"],
+        gid_owner,
+        destination_folder_id=folder_ids["f1"],
+    )
+
+
+async def test_folder_move_inside_itself_only_checks_hierarchy_of_gid(
+    connection: SAConnection,
+    default_product_name: _ProductName,
+    get_unique_gids: Callable[[int], tuple[_GroupID, ...]],
+    make_folders: Callable[[set[MkFolder]], Awaitable[dict[str, _FolderID]]],
+):
+    gid_user_a, gid_user_b = get_unique_gids(2)
+
+    folder_ids = await make_folders(
+        {
+            MkFolder(
+                name="f1",
+                gid=gid_user_a,
+                shared_with={gid_user_b: FolderAccessRole.OWNER},
+            ),
+            MkFolder(
+                name="f2",
+                gid=gid_user_a,
+                shared_with={gid_user_b: FolderAccessRole.OWNER},
+            ),
+        }
+    )
+
+    # for USER_B `f1` is inside `f2`, for USER_A both are still in the root
+    await folder_move(
+        connection,
+        default_product_name,
+        folder_ids["f1"],
+        gid_user_b,
+        destination_folder_id=folder_ids["f2"],
+    )
+
+    # USER_A can move `f2` inside `f1`
+    await folder_move(
+        connection,
+        default_product_name,
+        folder_ids["f2"],
+        gid_user_a,
+        destination_folder_id=folder_ids["f1"],
+    )
+    # and USER_B cannot
+    with pytest.raises(CannotMoveFolderInsideItselfError):
+        await folder_move(
+            connection,
+            default_product_name,
+            folder_ids["f2"],
+            gid_user_b,
+            destination_folder_id=folder_ids["f1"],
+        )
+
 async def test_move_only_owners_can_move(
     connection: SAConnection,
     default_product_name: _ProductName,
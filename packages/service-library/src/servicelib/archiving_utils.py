@@ -1,13 +1,20 @@
 import asyncio
 import fnmatch
 import functools
+import heapq
+import io
 import logging
+import multiprocessing
+import queue
+import struct
+import time
 import types
 import zipfile
-from contextlib import AsyncExitStack, contextmanager
+import zlib
+from contextlib import AsyncExitStack, contextmanager, suppress
 from functools import partial
 from pathlib import Path
-from typing import Any, Awaitable, Callable, Final, Iterator
+from typing import Any, Awaitable, Callable, Final, Generator, Iterator, NamedTuple
 
 import tqdm
 from models_library.basic_types import IDStr
@@ -21,10 +28,62 @@ from .progress_bar import ProgressBarData
 _MIN: Final[int] = 60  # secs
 _MAX_UNARCHIVING_WORKER_COUNT: Final[int] = 2
 _CHUNK_SIZE: Final[int] = 1024 * 8
+# NOTE: cost of extracting an entry besides its content, expressed in bytes
+_ENTRY_EXTRACTION_OVERHEAD: Final[int] = 1024 * 64
+_PROGRESS_REPORT_INTERVAL_S: Final[float] = 0.5
+# NOTE: files with these extensions are stored even if compression is requested
+_ALREADY_COMPRESSED_SUFFIXES: Final[frozenset[str]] = frozenset(
+    {
+        ".7z",
+        ".avi",
+        ".bz2",
+        ".docx",
+        ".gif",
+        ".gz",
+        ".h5",
+        ".jpeg",
+        ".jpg",
+        ".mkv",
+        ".mov",
+        ".mp3",
+        ".mp4",
+        ".npz",
+        ".pdf",
+        ".png",
+        ".pptx",
+        ".rar",
+        ".tgz",
+        ".webp",
+        ".xlsx",
+        ".xz",
+        ".zip",
+        ".zst",
+    }
+)
+_STREAM_READ_CHUNK_SIZE: Final[int] = 1024 * 1024
 
 log = logging.getLogger(__name__)
 
 
+_ZIP64_VERSION: Final[int] = 45
+_ZIP64_MARKER: Final[int] = 0xFFFFFFFF
+_ZIP64_EXTRA_ID: Final[int] = 0x0001
+_ZIP64_LOCAL_EXTRA_SIZE: Final[int] = 20
+_ZIP64_CENTRAL_DIR_EXTRA_SIZE: Final[int] = 28
+_ZIP64_LOCAL_HEADER_SIZE: Final[int] = zipfile.sizeFileHeader + _ZIP64_LOCAL_EXTRA_SIZE
+_ZIP64_CENTRAL_DIR_ENTRY_SIZE: Final[int] = (
+    zipfile.sizeCentralDir + _ZIP64_CENTRAL_DIR_EXTRA_SIZE
+)
+_ZIP64_DATA_DESCRIPTOR_SIZE: Final[int] = 24
+_ZIP64_END_RECORDS_SIZE: Final[int] = (
+    zipfile.sizeEndCentDir64 + zipfile.sizeEndCentDir64Locator + zipfile.sizeEndCentDir
+)
+_DATA_DESCRIPTOR_SIGNATURE: Final[int] = 0x08074B50
+_FLAG_DATA_DESCRIPTOR: Final[int] = 0x08
+_FLAG_UTF8_FILENAME: Final[int] = 0x800
+_CREATE_SYSTEM_UNIX: Final[int] = 3
+
+
 class ArchiveError(Exception):
     """
     Error raised while archiving or unarchiving
@@ -68,6 +127,26 @@ def _strip_directory_from_path(input_path: Path, to_strip: Path) -> Path:
     return Path(str(input_path).replace(_to_strip, ""))
 
 
+def _get_name_in_archive(
+    file_to_add: Path, dir_to_compress: Path, *, store_relative_path: bool
+) -> Path:
+    file_name_in_archive = (
+        _strip_directory_from_path(file_to_add, dir_to_compress)
+        if store_relative_path
+        else file_to_add
+    )
+    # because surrogates are not allowed in zip files,
+    # replacing them will ensure errors will not happen.
+    return _strip_undecodable_in_path(file_name_in_archive)
+
+
+def _get_compress_type(file_to_add: Path, *, compress: bool) -> int:
+    # NOTE: deflating already compressed files only costs time
+    if compress and file_to_add.suffix.lower() not in _ALREADY_COMPRESSED_SUFFIXES:
+        return zipfile.ZIP_DEFLATED
+    return zipfile.ZIP_STORED
+
+
 class _FastZipFileReader(zipfile.ZipFile):
     """
     Used to gain a speed boost of several orders of magnitude.
@@ -103,55 +182,94 @@ _TQDM_MULTI_FILES_OPTIONS: Final[dict[str, Any]] = _TQDM_FILE_OPTIONS | {
 }
 
 
-def _zipfile_single_file_extract_worker(
+def _partition_zip_entries(
+    zip_entries: list[zipfile.ZipInfo], num_partitions: int
+) -> list[list[zipfile.ZipInfo]]:
+    """Splits the entries in at most num_partitions of similar extraction cost
+
+    The largest entries are assigned first, each to the partition with the smallest cost
+    """
+    partitions: list[list[zipfile.ZipInfo]] = [[] for _ in range(num_partitions)]
+    partitions_costs: list[tuple[int, int]] = [(0, i) for i in range(num_partitions)]
+    for zip_entry in sorted(zip_entries, key=lambda e: e.file_size, reverse=True):
+        cost, index = heapq.heappop(partitions_costs)
+        partitions[index].append(zip_entry)
+        heapq.heappush(
+            partitions_costs,
+            (cost + zip_entry.file_size + _ENTRY_EXTRACTION_OVERHEAD, index),
+        )
+    return [partition for partition in partitions if partition]
+
+
+def _zipfile_batch_extract_worker(
     zip_file_path: Path,
-    file_in_archive: zipfile.ZipInfo,
+    files_in_archive: list[zipfile.ZipInfo],
     destination_folder: Path,
-    is_dir: bool,
-) -> Path:
-    """Extracts file_in_archive from the archive zip_file_path -> destination_folder/file_in_archive
+    progress_queue: queue.Queue,
+) -> None:
+    """Extracts all files_in_archive from the archive zip_file_path -> destination_folder/file_in_archive
 
+    The archive is opened once for the whole batch.
     Extracts in chunks to avoid memory pressure on zip/unzip
-    returns: a path to extracted file or directory
+    The extracted bytes are reported to progress_queue in aggregated form
     """
+    extracted_bytes = 0
+    reported_at = time.monotonic()
     with _FastZipFileReader(zip_file_path) as zf:
-        # assemble destination and ensure it exits
-        destination_path = destination_folder / file_in_archive.filename
-
-        if is_dir:
-            destination_path.mkdir(parents=True, exist_ok=True)
-            return destination_path
-        desc = f"decompressing {zip_file_path}:{file_in_archive.filename} -> {destination_path}\n"
-        with zf.open(name=file_in_archive) as zip_fp, destination_path.open(
-            "wb"
-        ) as dest_fp, tqdm_logging_redirect(
-            total=file_in_archive.file_size,
-            desc=desc,
-            **(
-                _TQDM_FILE_OPTIONS
-                | dict(miniters=_compute_tqdm_miniters(file_in_archive.file_size))
-            ),
-        ) as pbar:
-            while chunk := zip_fp.read(_CHUNK_SIZE):
-                dest_fp.write(chunk)
-                pbar.update(len(chunk))
-            return destination_path
+        for file_in_archive in files_in_archive:
+            destination_path = destination_folder / file_in_archive.filename
+            with zf.open(name=file_in_archive) as zip_fp, destination_path.open(
+                "wb"
+            ) as dest_fp:
+                while chunk := zip_fp.read(_CHUNK_SIZE):
+                    dest_fp.write(chunk)
+                    extracted_bytes += len(chunk)
+
+            if time.monotonic() - reported_at >= _PROGRESS_REPORT_INTERVAL_S:
+                progress_queue.put(extracted_bytes)
+                extracted_bytes = 0
+                reported_at = time.monotonic()
+
+    if extracted_bytes:
+        progress_queue.put(extracted_bytes)
 
 
 def _ensure_destination_subdirectories_exist(
-    zip_file_handler: zipfile.ZipFile, destination_folder: Path
+    zip_entries: list[zipfile.ZipInfo], destination_folder: Path
 ) -> None:
     # assemble full destination paths
     full_destination_paths = {
-        destination_folder / entry.filename for entry in zip_file_handler.infolist()
+        destination_folder / entry.filename for entry in zip_entries
+    }
+    # extract all possible subdirectories (including the directories in the archive)
+    subdirectories = {x.parent for x in full_destination_paths} | {
+        destination_folder / entry.filename for entry in zip_entries if entry.is_dir()
     }
-    # extract all possible subdirectories
-    subdirectories = {x.parent for x in full_destination_paths}
     # create all subdirectories before extracting
     for subdirectory in subdirectories:
         Path(subdirectory).mkdir(parents=True, exist_ok=True)
 
 
+def _get_extracted_leaf_paths(
+    zip_entries: list[zipfile.ZipInfo], destination_folder: Path
+) -> set[Path]:
+    """files and empty folders of the archive, i.e. the leafs of the extracted tree
+
+    NOTE: computed from the archive entries, the extracted tree is not walked
+    """
+    entries_paths = {Path(entry.filename) for entry in zip_entries}
+    parent_paths = {parent for p in entries_paths for parent in p.parents}
+    return {destination_folder / p for p in entries_paths if p not in parent_paths}
+
+
+def _pop_extracted_bytes(progress_queue: queue.Queue) -> int:
+    extracted_bytes = 0
+    with suppress(queue.Empty):
+        while True:
+            extracted_bytes += progress_queue.get_nowait()
+    return extracted_bytes
+
+
 async def unarchive_dir(
     archive_to_extract: Path,
     destination_folder: Path,
@@ -163,6 +281,8 @@ async def unarchive_dir(
     """Extracts zipped file archive_to_extract to destination_folder,
     preserving all relative files and folders inside the archive
 
+    The files are extracted in batches of similar size, one per worker.
+
     Returns a set with all the paths extracted from archive. It includes
     all tree leafs, which might include files or empty folders
 
@@ -186,13 +306,18 @@ async def unarchive_dir(
         process_pool = zip_stack.enter_context(
             non_blocking_process_pool_executor(max_workers=max_workers)
         )
+        # NOTE: the workers report their progress through this queue
+        progress_queue = zip_stack.enter_context(multiprocessing.Manager()).Queue()
+
+        zip_entries = zip_file_handler.infolist()
+        files_in_archive = [entry for entry in zip_entries if not entry.is_dir()]
 
         # running in process poll is not ideal for concurrency issues
         # to avoid race conditions all subdirectories where files will be extracted need to exist
         # creating them before the extraction is under way avoids the issue
         # the following avoids race conditions while unzippin in parallel
         _ensure_destination_subdirectories_exist(
-            zip_file_handler=zip_file_handler,
+            zip_entries=zip_entries,
             destination_folder=destination_folder,
         )
 
@@ -200,20 +325,17 @@ async def unarchive_dir(
             asyncio.get_event_loop().run_in_executor(
                 process_pool,
                 # ---------
-                _zipfile_single_file_extract_worker,
+                _zipfile_batch_extract_worker,
                 archive_to_extract,
-                zip_entry,
+                batch,
                 destination_folder,
-                zip_entry.is_dir(),
+                progress_queue,
             )
-            for zip_entry in zip_file_handler.infolist()
+            for batch in _partition_zip_entries(files_in_archive, max_workers)
         ]
 
         try:
-            extracted_paths: list[Path] = []
-            total_file_size = sum(
-                zip_entry.file_size for zip_entry in zip_file_handler.infolist()
-            )
+            total_file_size = sum(entry.file_size for entry in files_in_archive)
             async with AsyncExitStack() as progress_stack:
                 sub_prog = await progress_stack.enter_async_context(
                     progress_bar.sub_progress(
@@ -222,20 +344,27 @@ async def unarchive_dir(
                 )
                 tqdm_progress = progress_stack.enter_context(
                     tqdm.tqdm(
-                        desc=f"decompressing {archive_to_extract} -> {destination_folder} [{len(futures)} file{'s' if len(futures) > 1 else ''}"
+                        desc=f"decompressing {archive_to_extract} -> {destination_folder} [{len(files_in_archive)} file{'s' if len(files_in_archive) > 1 else ''}"
                         f"/{_human_readable_size(archive_to_extract.stat().st_size)}]\n",
                         total=total_file_size,
                         **_TQDM_MULTI_FILES_OPTIONS,
                     )
                 )
-                for future in asyncio.as_completed(futures):
-                    extracted_path = await future
-                    extracted_file_size = extracted_path.stat().st_size
-                    if tqdm_progress.update(extracted_file_size) and log_cb:
+                pending_futures: set[asyncio.Future] = set(futures)
+                while pending_futures:
+                    done_futures, pending_futures = await asyncio.wait(
+                        pending_futures, timeout=_PROGRESS_REPORT_INTERVAL_S
+                    )
+                    for future in done_futures:
+                        future.result()  # raises if the worker failed
+
+                    extracted_bytes = _pop_extracted_bytes(progress_queue)
+                    if extracted_bytes == 0:
+                        continue
+                    if tqdm_progress.update(extracted_bytes) and log_cb:
                         with log_catch(log, reraise=False):
                             await log_cb(f"{tqdm_progress}")
-                    await sub_prog.update(extracted_file_size)
-                    extracted_paths.append(extracted_path)
+                    await sub_prog.update(extracted_bytes)
 
         except Exception as err:
             for f in futures:
@@ -256,12 +385,8 @@ async def unarchive_dir(
             )
             raise ArchiveError(msg) from err
 
-    # NOTE: extracted_paths includes all tree leafs, which might include files and empty folders
-    return {
-        p
-        for p in extracted_paths
-        if p.is_file() or (p.is_dir() and not any(p.glob("*")))
-    }
+    # NOTE: includes all tree leafs, which might include files and empty folders
+    return _get_extracted_leaf_paths(zip_entries, destination_folder)
 
 
 @contextmanager
@@ -316,19 +441,15 @@ def _add_to_archive(
     ) as zip_file_handler:
         for file_to_add in _iter_files_to_compress(dir_to_compress, exclude_patterns):
             progress_bar.set_description(f"{desc}/{file_to_add.name}\n")
-            file_name_in_archive = (
-                _strip_directory_from_path(file_to_add, dir_to_compress)
-                if store_relative_path
-                else file_to_add
-            )
-
-            # because surrogates are not allowed in zip files,
-            # replacing them will ensure errors will not happen.
-            escaped_file_name_in_archive = _strip_undecodable_in_path(
-                file_name_in_archive
+            zip_file_handler.write(
+                file_to_add,
+                _get_name_in_archive(
+                    file_to_add,
+                    dir_to_compress,
+                    store_relative_path=store_relative_path,
+                ),
+                compress_type=_get_compress_type(file_to_add, compress=compress),
             )
-
-            zip_file_handler.write(file_to_add, escaped_file_name_in_archive)
             asyncio.run_coroutine_threadsafe(
                 update_progress(file_to_add.stat().st_size), loop
             )
@@ -404,6 +525,237 @@ async def archive_dir(
             raise
 
 
+class _StoredArchiveMember(NamedTuple):
+    path: Path
+    zip_info: zipfile.ZipInfo
+    encoded_name: bytes
+    flag_bits: int
+
+
+class StoredArchiveStream(io.RawIOBase):
+    """
+    Read-only file object which generates, while it is read, the zip archive of
+    a directory. The archive is never written to disk, e.g. it can be uploaded
+    while it is created.
+
+    Files are stored (not compressed), therefore the size of the archive is known
+    before it is generated. All entries use the ZIP64 format and data descriptors.
+
+    NOTE: can only be read sequentially. Seeking is only possible to the current position
+
+    ::raise ArchiveError while reading if the files change while archived
+    """
+
+    def __init__(
+        self,
+        dir_to_compress: Path,
+        *,
+        store_relative_path: bool,
+        exclude_patterns: set[str] | None = None,
+    ) -> None:
+        super().__init__()
+        self.dir_to_compress = dir_to_compress
+        # NOTE: generates the archive lazily, while it is read
+        self._chunks: Generator[bytes, None, None] = self._iter_chunks()
+        self._members: list[_StoredArchiveMember] = [
+            self._create_member(
+                file_to_add,
+                _get_name_in_archive(
+                    file_to_add,
+                    dir_to_compress,
+                    store_relative_path=store_relative_path,
+                ),
+            )
+            for file_to_add in _iter_files_to_compress(
+                dir_to_compress, exclude_patterns
+            )
+        ]
+        self.size: int = sum(
+            _ZIP64_LOCAL_HEADER_SIZE
+            + _ZIP64_DATA_DESCRIPTOR_SIZE
+            + _ZIP64_CENTRAL_DIR_ENTRY_SIZE
+            + 2 * len(member.encoded_name)
+            + member.zip_info.file_size
+            for member in self._members
+        ) + _ZIP64_END_RECORDS_SIZE
+
+        self._buffer: memoryview = memoryview(b"")
+        self._position: int = 0
+
+    @staticmethod
+    def _create_member(
+        file_to_add: Path, name_in_archive: Path
+    ) -> _StoredArchiveMember:
+        zip_info = zipfile.ZipInfo.from_file(
+            file_to_add, name_in_archive, strict_timestamps=False
+        )
+        flag_bits = _FLAG_DATA_DESCRIPTOR
+        try:
+            encoded_name = zip_info.filename.encode("ascii")
+        except UnicodeEncodeError:
+            encoded_name = zip_info.filename.encode("utf-8")
+            flag_bits |= _FLAG_UTF8_FILENAME
+        return _StoredArchiveMember(file_to_add, zip_info, encoded_name, flag_bits)
+
+    def _iter_chunks(self) -> Generator[bytes, None, None]:
+        central_dir_entries: list[bytes] = []
+        offset = 0
+        for member in self._members:
+            zip_info = member.zip_info
+            dos_time = (
+                zip_info.date_time[3] << 11
+                | zip_info.date_time[4] << 5
+                | zip_info.date_time[5] // 2
+            )
+            dos_date = (
+                (zip_info.date_time[0] - 1980) << 9
+                | zip_info.date_time[1] << 5
+                | zip_info.date_time[2]
+            )
+            # NOTE: sizes and CRC are provided by the data descriptor
+            local_header = struct.pack(
+                zipfile.structFileHeader,
+                zipfile.stringFileHeader,
+                _ZIP64_VERSION,
+                0,
+                member.flag_bits,
+                zipfile.ZIP_STORED,
+                dos_time,
+                dos_date,
+                0,
+                _ZIP64_MARKER,
+                _ZIP64_MARKER,
+                len(member.encoded_name),
+                _ZIP64_LOCAL_EXTRA_SIZE,
+            )
+            yield local_header + member.encoded_name + struct.pack(
+                "<HHQQ", _ZIP64_EXTRA_ID, _ZIP64_LOCAL_EXTRA_SIZE - 4, 0, 0
+            )
+
+            crc = 0
+            file_size = 0
+            with member.path.open("rb") as file:
+                while chunk := file.read(_STREAM_READ_CHUNK_SIZE):
+                    crc = zlib.crc32(chunk, crc)
+                    file_size += len(chunk)
+                    yield chunk
+            if file_size != zip_info.file_size:
+                msg = (
+                    f"Failed archiving {member.path}: its size changed from "
+                    f"{zip_info.file_size} to {file_size} while archiving"
+                )
+                raise ArchiveError(msg)
+
+            yield struct.pack(
+                "<LLQQ", _DATA_DESCRIPTOR_SIGNATURE, crc, file_size, file_size
+            )
+
+            central_dir_entries.append(
+                struct.pack(
+                    zipfile.structCentralDir,
+                    zipfile.stringCentralDir,
+                    _ZIP64_VERSION,
+                    _CREATE_SYSTEM_UNIX,
+                    _ZIP64_VERSION,
+                    0,
+                    member.flag_bits,
+                    zipfile.ZIP_STORED,
+                    dos_time,
+                    dos_date,
+                    crc,
+                    _ZIP64_MARKER,
+                    _ZIP64_MARKER,
+                    len(member.encoded_name),
+                    _ZIP64_CENTRAL_DIR_EXTRA_SIZE,
+                    0,
+                    0,
+                    0,
+                    zip_info.external_attr,
+                    _ZIP64_MARKER,
+                )
+                + member.encoded_name
+                + struct.pack(
+                    "<HHQQQ",
+                    _ZIP64_EXTRA_ID,
+                    _ZIP64_CENTRAL_DIR_EXTRA_SIZE - 4,
+                    file_size,
+                    file_size,
+                    offset,
+                )
+            )
+            offset += (
+                _ZIP64_LOCAL_HEADER_SIZE
+                + len(member.encoded_name)
+                + file_size
+                + _ZIP64_DATA_DESCRIPTOR_SIZE
+            )
+
+        central_dir = b"".join(central_dir_entries)
+        num_entries = len(central_dir_entries)
+        yield central_dir
+        yield struct.pack(
+            zipfile.structEndArchive64,
+            zipfile.stringEndArchive64,
+            zipfile.sizeEndCentDir64 - 12,
+            _ZIP64_VERSION,
+            _ZIP64_VERSION,
+            0,
+            0,
+            num_entries,
+            num_entries,
+            len(central_dir),
+            offset,
+        )
+        yield struct.pack(
+            zipfile.structEndArchive64Locator,
+            zipfile.stringEndArchive64Locator,
+            0,
+            offset + len(central_dir),
+            1,
+        )
+        yield struct.pack(
+            zipfile.structEndArchive,
+            zipfile.stringEndArchive,
+            0,
+            0,
+            min(num_entries, 0xFFFF),
+            min(num_entries, 0xFFFF),
+            min(len(central_dir), _ZIP64_MARKER),
+            min(offset, _ZIP64_MARKER),
+            0,
+        )
+
+    def close(self) -> None:
+        # NOTE: also closes the file being archived (if any)
+        self._chunks.close()
+        super().close()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+
+        num_bytes = min(len(buffer), len(self._buffer))
+        buffer[:num_bytes] = self._buffer[:num_bytes]
+        self._buffer = self._buffer[num_bytes:]
+        self._position += num_bytes
+        return num_bytes
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence != io.SEEK_SET or offset != self._position:
+            msg = f"{StoredArchiveStream.__name__} can only be read sequentially"
+            raise io.UnsupportedOperation(msg)
+        return self._position
+
+
 def is_leaf_path(p: Path) -> bool:
     """Tests whether a path corresponds to a file or empty folder, i.e.
     some leaf item in a file-system tree structure
@@ -471,5 +823,6 @@ __all__ = (
     "ArchiveError",
     "is_leaf_path",
     "PrunableFolder",
+    "StoredArchiveStream",
     "unarchive_dir",
 )
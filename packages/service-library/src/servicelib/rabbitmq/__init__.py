@@ -1,5 +1,6 @@
 from models_library.rabbitmq_basic_types import RPCNamespace
 
+from ._buffered_publisher import RabbitMQBufferedPublisher
 from ._client import RabbitMQClient
 from ._client_rpc import RabbitMQRPCClient
 from ._constants import BIND_TO_ALL_TOPICS
@@ -14,6 +15,7 @@ from ._utils import is_rabbitmq_responsive, wait_till_rabbitmq_responsive
 __all__: tuple[str, ...] = (
     "BIND_TO_ALL_TOPICS",
     "is_rabbitmq_responsive",
+    "RabbitMQBufferedPublisher",
     "RabbitMQClient",
     "RabbitMQRPCClient",
     "RemoteMethodNotRegisteredError",
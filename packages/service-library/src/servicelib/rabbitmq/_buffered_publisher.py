@@ -0,0 +1,94 @@
+import asyncio
+import contextlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Final
+
+from ..logging_utils import log_catch
+from ._client import RabbitMQClient
+from ._models import RabbitMessage
+
+_logger = logging.getLogger(__name__)
+
+_DEFAULT_FLUSH_INTERVAL: Final[timedelta] = timedelta(milliseconds=200)
+_DEFAULT_MAX_BUFFERED_MESSAGES: Final[int] = 1000
+
+
+@dataclass
+class RabbitMQBufferedPublisher:
+    """Buffers the messages per exchange and publishes them in batches (see RabbitMQClient.publish_many)
+    every flush_interval, or as soon as max_buffered_messages are pending in an exchange.
+
+    The buffers are bounded: publishing in a full buffer waits until it was flushed (backpressure).
+    NOTE: start() must be called before publishing and close() flushes the pending messages
+
+    Usage:
+        publisher = RabbitMQBufferedPublisher(rabbitmq_client)
+        publisher.start()
+        await publisher.publish(exchange_name, message)
+        ...
+        await publisher.close()
+    """
+
+    client: RabbitMQClient
+    flush_interval: timedelta = _DEFAULT_FLUSH_INTERVAL
+    max_buffered_messages: int = _DEFAULT_MAX_BUFFERED_MESSAGES
+
+    _buffers: defaultdict[str, list[RabbitMessage]] = field(
+        init=False, default_factory=lambda: defaultdict(list)
+    )
+    _flush_locks: defaultdict[str, asyncio.Lock] = field(
+        init=False, default_factory=lambda: defaultdict(asyncio.Lock)
+    )
+    _has_pending: asyncio.Event = field(init=False, default_factory=asyncio.Event)
+    _task: asyncio.Task | None = field(init=False, default=None)
+
+    @property
+    def num_pending_messages(self) -> int:
+        return sum(len(messages) for messages in self._buffers.values())
+
+    async def publish(self, exchange_name: str, message: RabbitMessage) -> None:
+        self._buffers[exchange_name].append(message)
+        if len(self._buffers[exchange_name]) >= self.max_buffered_messages:
+            await self._flush_exchange(exchange_name)
+        else:
+            self._has_pending.set()
+
+    async def _flush_exchange(self, exchange_name: str) -> None:
+        # NOTE: the lock keeps the messages order when flushes of the same exchange overlap
+        async with self._flush_locks[exchange_name]:
+            messages = self._buffers.pop(exchange_name, [])
+            if messages:
+                await self.client.publish_many(exchange_name, messages)
+
+    async def flush(self) -> None:
+        self._has_pending.clear()
+        results = await asyncio.gather(
+            *(self._flush_exchange(exchange_name) for exchange_name in list(self._buffers)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            await asyncio.sleep(self.flush_interval.total_seconds())
+            with log_catch(_logger, reraise=False):
+                await self.flush()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(
+            self._run(), name=f"rabbitmq_buffered_publisher_{self.client.client_name}"
+        )
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
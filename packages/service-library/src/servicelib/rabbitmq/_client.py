@@ -1,8 +1,10 @@
 import asyncio
 import logging
+import weakref
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from functools import partial
-from typing import Final
+from typing import Any, Final
 
 import aio_pika
 from pydantic import NonNegativeInt
@@ -92,10 +94,29 @@ async def _on_message(
                 await _safe_nack(message_handler, max_retries_upon_error, message)
 
 
+_ExchangeKey = tuple[str, aio_pika.ExchangeType]
+
+
+def _get_exchange_type(topic: str | None) -> aio_pika.ExchangeType:
+    return aio_pika.ExchangeType.FANOUT if topic is None else aio_pika.ExchangeType.TOPIC
+
+
 @dataclass
 class RabbitMQClient(RabbitMQClientBase):
+    """
+    - publisher_confirms: if True, publishing returns once the broker confirmed the message
+        (publish_many pipelines the confirmations of the messages)
+    """
+
+    publisher_confirms: bool = True
+
     _connection_pool: aio_pika.pool.Pool | None = field(init=False, default=None)
     _channel_pool: aio_pika.pool.Pool | None = field(init=False, default=None)
+    # NOTE: exchanges are declared once per channel (robust channels re-declare them on reconnection)
+    _declared_exchanges: weakref.WeakKeyDictionary[
+        aio_pika.abc.AbstractChannel,
+        dict[_ExchangeKey, aio_pika.abc.AbstractExchange],
+    ] = field(init=False, default_factory=weakref.WeakKeyDictionary)
 
     def __post_init__(self) -> None:
         # recommendations are 1 connection per process
@@ -134,10 +155,38 @@ class RabbitMQClient(RabbitMQClientBase):
     async def _get_channel(self) -> aio_pika.abc.AbstractChannel:
         assert self._connection_pool  # nosec
         async with self._connection_pool.acquire() as connection:
-            channel: aio_pika.abc.AbstractChannel = await connection.channel()
+            channel: aio_pika.abc.AbstractChannel = await connection.channel(
+                publisher_confirms=self.publisher_confirms
+            )
             channel.close_callbacks.add(self._channel_close_callback)
+            channel.close_callbacks.add(self._forget_declared_exchanges)
             return channel
 
+    def _forget_declared_exchanges(
+        self,
+        sender: Any,
+        exc: BaseException | None,  # pylint: disable=unused-argument  # noqa: ARG002
+    ) -> None:
+        self._declared_exchanges.pop(sender, None)
+
+    async def _get_publishing_exchange(
+        self,
+        channel: aio_pika.abc.AbstractChannel,
+        exchange_name: str,
+        exchange_type: aio_pika.ExchangeType,
+    ) -> aio_pika.abc.AbstractExchange:
+        channel_exchanges = self._declared_exchanges.setdefault(channel, {})
+        exchange_key = (exchange_name, exchange_type)
+        if (exchange := channel_exchanges.get(exchange_key)) is None:
+            exchange = await channel.declare_exchange(
+                exchange_name,
+                exchange_type,
+                durable=True,
+                timeout=_DEFAULT_RABBITMQ_EXECUTION_TIMEOUT_S,
+            )
+            channel_exchanges[exchange_key] = exchange
+        return exchange
+
     async def _get_consumer_tag(self, exchange_name) -> str:
         return f"{get_rabbitmq_client_unique_name(self.client_name)}_{exchange_name}"
 
@@ -314,23 +363,34 @@ class RabbitMQClient(RabbitMQClientBase):
 
         NOTE: changing the type of Exchange will create issues if the name is not changed!
         """
+        await self.publish_many(exchange_name, [message])
+
+    async def publish_many(
+        self, exchange_name: str, messages: Sequence[RabbitMessage]
+    ) -> None:
+        """publish messages in the exchange exchange_name using one channel.
+        With publisher confirms, the messages are all sent before waiting for the
+        confirmations of the broker (the order of the messages is kept).
+
+        NOTE: all the messages shall be of the same kind (i.e. with or without topics)
+        """
+        if not messages:
+            return
         assert self._channel_pool  # nosec
-        topic = message.routing_key()
+        exchange_type = _get_exchange_type(messages[0].routing_key())
 
         async with self._channel_pool.acquire() as channel:
-            exchange = await channel.declare_exchange(
-                exchange_name,
-                (
-                    aio_pika.ExchangeType.FANOUT
-                    if topic is None
-                    else aio_pika.ExchangeType.TOPIC
-                ),
-                durable=True,
-                timeout=_DEFAULT_RABBITMQ_EXECUTION_TIMEOUT_S,
+            exchange = await self._get_publishing_exchange(
+                channel, exchange_name, exchange_type
             )
-            await exchange.publish(
-                aio_pika.Message(message.body()),
-                routing_key=message.routing_key() or "",
+            await asyncio.gather(
+                *(
+                    exchange.publish(
+                        aio_pika.Message(message.body()),
+                        routing_key=message.routing_key() or "",
+                    )
+                    for message in messages
+                )
             )
 
     async def unsubscribe_consumer(self, exchange_name: str):
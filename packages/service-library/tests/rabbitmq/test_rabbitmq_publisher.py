@@ -0,0 +1,214 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+# pylint:disable=protected-access
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from unittest import mock
+
+import aio_pika
+import pytest
+from faker import Faker
+from pytest_mock.plugin import MockerFixture
+from servicelib.rabbitmq import RabbitMQBufferedPublisher, RabbitMQClient
+from settings_library.rabbit import RabbitSettings
+from tenacity.asyncio import AsyncRetrying
+from tenacity.retry import retry_if_exception_type
+from tenacity.stop import stop_after_delay
+from tenacity.wait import wait_fixed
+
+pytest_simcore_core_services_selection = [
+    "rabbit",
+]
+
+
+@dataclass(frozen=True)
+class _Message:
+    message: str
+    topic: str | None = None
+
+    def routing_key(self) -> str | None:
+        return self.topic
+
+    def body(self) -> bytes:
+        return self.message.encode()
+
+
+@pytest.fixture
+async def create_client(
+    rabbit_service: RabbitSettings, faker: Faker
+) -> AsyncIterator[Callable[..., RabbitMQClient]]:
+    created_clients: list[RabbitMQClient] = []
+
+    def _creator(*, publisher_confirms: bool = True) -> RabbitMQClient:
+        client = RabbitMQClient(
+            f"pytest_{faker.pystr()}",
+            rabbit_service,
+            publisher_confirms=publisher_confirms,
+        )
+        created_clients.append(client)
+        return client
+
+    yield _creator
+
+    await asyncio.gather(*(client.close() for client in created_clients))
+
+
+@pytest.fixture
+async def subscribed_exchange(
+    create_client: Callable[..., RabbitMQClient],
+    random_exchange_name: Callable[[], str],
+    mocker: MockerFixture,
+) -> tuple[str, mock.AsyncMock]:
+    consumer = create_client()
+    exchange_name = random_exchange_name()
+    message_handler = mocker.AsyncMock(return_value=True)
+    await consumer.subscribe(exchange_name, message_handler, exclusive_queue=False)
+    return exchange_name, message_handler
+
+
+async def _assert_messages_received(
+    message_handler: mock.AsyncMock, expected_messages: list[_Message]
+) -> None:
+    async for attempt in AsyncRetrying(
+        wait=wait_fixed(0.1),
+        stop=stop_after_delay(30),
+        retry=retry_if_exception_type(AssertionError),
+        reraise=True,
+    ):
+        with attempt:
+            assert message_handler.call_count == len(expected_messages)
+    assert [c.args[0] for c in message_handler.call_args_list] == [
+        m.body() for m in expected_messages
+    ]
+
+
+async def test_publish_declares_exchange_once_per_channel(
+    create_client: Callable[..., RabbitMQClient],
+    subscribed_exchange: tuple[str, mock.AsyncMock],
+    mocker: MockerFixture,
+    faker: Faker,
+):
+    exchange_name, message_handler = subscribed_exchange
+    declare_exchange_spy = mocker.spy(
+        aio_pika.robust_channel.RobustChannel, "declare_exchange"
+    )
+    publisher = create_client()
+    messages = [_Message(faker.text()) for _ in range(10)]
+    for message in messages:
+        await publisher.publish(exchange_name, message)
+
+    await _assert_messages_received(message_handler, messages)
+    assert declare_exchange_spy.call_count == 1
+
+
+@pytest.mark.parametrize("publisher_confirms", [True, False])
+async def test_publish_many(
+    create_client: Callable[..., RabbitMQClient],
+    subscribed_exchange: tuple[str, mock.AsyncMock],
+    publisher_confirms: bool,
+    faker: Faker,
+):
+    exchange_name, message_handler = subscribed_exchange
+    publisher = create_client(publisher_confirms=publisher_confirms)
+    messages = [_Message(f"{n}: {faker.text()}") for n in range(100)]
+    await publisher.publish_many(exchange_name, [])
+    await publisher.publish_many(exchange_name, messages)
+    await _assert_messages_received(message_handler, messages)
+
+
+async def test_buffered_publisher(
+    create_client: Callable[..., RabbitMQClient],
+    subscribed_exchange: tuple[str, mock.AsyncMock],
+    mocker: MockerFixture,
+    faker: Faker,
+):
+    exchange_name, message_handler = subscribed_exchange
+    client = create_client()
+    publish_many_spy = mocker.spy(client, "publish_many")
+    publisher = RabbitMQBufferedPublisher(
+        client, flush_interval=timedelta(seconds=60), max_buffered_messages=10
+    )
+    publisher.start()
+
+    messages = [_Message(f"{n}: {faker.text()}") for n in range(25)]
+    for message in messages:
+        await publisher.publish(exchange_name, message)
+    # the full buffers were published right away
+    assert publish_many_spy.call_count == 2
+    assert publisher.num_pending_messages == 5
+
+    await publisher.close()
+    assert publish_many_spy.call_count == 3
+    assert publisher.num_pending_messages == 0
+    await _assert_messages_received(message_handler, messages)
+
+
+async def test_buffered_publisher_flushes_periodically(
+    create_client: Callable[..., RabbitMQClient],
+    subscribed_exchange: tuple[str, mock.AsyncMock],
+    faker: Faker,
+):
+    exchange_name, message_handler = subscribed_exchange
+    publisher = RabbitMQBufferedPublisher(
+        create_client(), flush_interval=timedelta(milliseconds=100)
+    )
+    publisher.start()
+    messages = [_Message(faker.text()) for _ in range(5)]
+    for message in messages:
+        await publisher.publish(exchange_name, message)
+    await _assert_messages_received(message_handler, messages)
+    await publisher.close()
+
+
+#
+# micro-benchmark: run with `pytest -s -k benchmark` to see the numbers
+#
+
+
+async def _timed(coro: Awaitable[None]) -> float:
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start
+
+
+@pytest.mark.parametrize("publisher_confirms", [True, False])
+@pytest.mark.parametrize("num_messages", [1000])
+async def test_publisher_benchmark(
+    create_client: Callable[..., RabbitMQClient],
+    subscribed_exchange: tuple[str, mock.AsyncMock],
+    publisher_confirms: bool,
+    num_messages: int,
+    faker: Faker,
+):
+    exchange_name, message_handler = subscribed_exchange
+    client = create_client(publisher_confirms=publisher_confirms)
+    messages = [_Message(f"{n}: {faker.text()}") for n in range(num_messages)]
+
+    async def _one_by_one() -> None:
+        for message in messages:
+            await client.publish(exchange_name, message)
+
+    async def _buffered() -> None:
+        publisher = RabbitMQBufferedPublisher(client, max_buffered_messages=100)
+        publisher.start()
+        for message in messages:
+            await publisher.publish(exchange_name, message)
+        await publisher.close()
+
+    results = {
+        "publish": await _timed(_one_by_one()),
+        "publish_many": await _timed(client.publish_many(exchange_name, messages)),
+        "buffered": await _timed(_buffered()),
+    }
+    for name, duration in results.items():
+        print(
+            f"{name:>15}: {num_messages} messages in {duration:.3f}s "
+            f"({num_messages / duration:.0f} msg/s, {publisher_confirms=})"
+        )
+
+    await _assert_messages_received(message_handler, messages * len(results))
@@ -11,6 +11,7 @@ import random
 import secrets
 import string
 import tempfile
+import zipfile
 from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
@@ -21,7 +22,12 @@ from faker import Faker
 from pydantic import ByteSize, parse_obj_as
 from pytest_benchmark.plugin import BenchmarkFixture
 from servicelib import archiving_utils
-from servicelib.archiving_utils import ArchiveError, archive_dir, unarchive_dir
+from servicelib.archiving_utils import (
+    ArchiveError,
+    StoredArchiveStream,
+    archive_dir,
+    unarchive_dir,
+)
 
 
 def _print_tree(path: Path, level=0):
@@ -110,16 +116,16 @@ def __raise_error(*arts, **kwargs) -> None:
 
 
 @pytest.fixture
-def zipfile_single_file_extract_worker_raises_error() -> Iterator[None]:
+def zipfile_batch_extract_worker_raises_error() -> Iterator[None]:
     # NOTE: cannot MagicMock cannot be serialized via pickle used by
     # multiprocessing, also `__raise_error` cannot be defined in the
     # context fo this function or it cannot be pickled
 
     # pylint: disable=protected-access
-    old_func = archiving_utils._zipfile_single_file_extract_worker
-    archiving_utils._zipfile_single_file_extract_worker = __raise_error
+    old_func = archiving_utils._zipfile_batch_extract_worker
+    archiving_utils._zipfile_batch_extract_worker = __raise_error
     yield
-    archiving_utils._zipfile_single_file_extract_worker = old_func
+    archiving_utils._zipfile_batch_extract_worker = old_func
 
 
 # UTILS
@@ -328,6 +334,63 @@ async def test_archive_unarchive_same_structure_dir(
     )
 
 
+@pytest.mark.parametrize("store_relative_path", [True, False])
+async def test_stored_archive_stream_unarchive_same_structure_dir(
+    dir_with_random_content: Path,
+    tmp_path: Path,
+    store_relative_path: bool,
+):
+    archive_file = tmp_path / "archive.zip"
+    destination_folder = tmp_path / "unarchived"
+    destination_folder.mkdir()
+
+    with StoredArchiveStream(
+        dir_with_random_content, store_relative_path=store_relative_path
+    ) as archive_stream, archive_file.open("wb") as archive_fp:
+        while chunk := archive_stream.read(1024):
+            archive_fp.write(chunk)
+        assert archive_stream.tell() == archive_stream.size
+    assert archive_file.stat().st_size == archive_stream.size
+
+    unarchived_paths: set[Path] = await unarchive_dir(
+        archive_to_extract=archive_file, destination_folder=destination_folder
+    )
+
+    assert_unarchived_paths(
+        unarchived_paths,
+        src_dir=dir_with_random_content,
+        dst_dir=destination_folder,
+        is_saved_as_relpath=store_relative_path,
+    )
+
+    await assert_same_directory_content(
+        dir_with_random_content,
+        destination_folder,
+        None if store_relative_path else dir_with_random_content,
+    )
+
+
+async def test_archive_dir_stores_already_compressed_files(
+    tmp_path: Path, faker: Faker
+):
+    dir_to_compress = tmp_path / "to_compress"
+    dir_to_compress.mkdir()
+    (dir_to_compress / "image.png").write_bytes(faker.binary(1024))
+    (dir_to_compress / "text.txt").write_text(faker.text())
+
+    archive_file = tmp_path / "archive.zip"
+    await archive_dir(
+        dir_to_compress=dir_to_compress,
+        destination=archive_file,
+        compress=True,
+        store_relative_path=True,
+    )
+
+    with zipfile.ZipFile(archive_file) as zip_file:
+        assert zip_file.getinfo("image.png").compress_type == zipfile.ZIP_STORED
+        assert zip_file.getinfo("text.txt").compress_type == zipfile.ZIP_DEFLATED
+
+
 @pytest.mark.parametrize(
     "compress,store_relative_path",
     itertools.product([True, False], repeat=2),
@@ -524,7 +587,7 @@ async def test_archive_unarchive_check_exclude(
 
 
 async def test_unarchive_dir_raises_error(
-    zipfile_single_file_extract_worker_raises_error: None,
+    zipfile_batch_extract_worker_raises_error: None,
     dir_with_random_content: Path,
     tmp_path: Path,
 ):
@@ -547,6 +610,27 @@ async def test_unarchive_dir_raises_error(
         await archiving_utils.unarchive_dir(archive_file, temp_dir_two)
 
 
+@pytest.mark.parametrize("num_partitions", [1, 2, 5])
+def test_partition_zip_entries(num_partitions: int):
+    zip_entries = []
+    for n, file_size in enumerate([1000, 10, 10, 10, 10, 1000, 1, 1, 500, 500]):
+        zip_entry = zipfile.ZipInfo(f"file_{n}")
+        zip_entry.file_size = file_size
+        zip_entries.append(zip_entry)
+
+    partitions = archiving_utils._partition_zip_entries(  # noqa: SLF001
+        zip_entries, num_partitions
+    )
+    assert len(partitions) == num_partitions
+    assert sorted(e.filename for p in partitions for e in p) == sorted(
+        e.filename for e in zip_entries
+    )
+    partitions_sizes = [sum(e.file_size for e in p) for p in partitions]
+    assert max(partitions_sizes) - min(partitions_sizes) <= max(
+        e.file_size for e in zip_entries
+    )
+
+
 file_suffix = 0
 
 
@@ -596,3 +680,50 @@ def test_archive_dir_performance(
         )
 
     benchmark(run_async_test)
+
+
+@pytest.mark.skip(reason="manual testing")
+@pytest.mark.parametrize(
+    "compress, file_size, num_files",
+    [
+        (False, parse_obj_as(ByteSize, "1Kib"), 100000),
+        (False, parse_obj_as(ByteSize, "1Gib"), 4),
+    ],
+    ids=["many-small-files", "few-huge-files"],
+)
+def test_unarchive_dir_performance(
+    benchmark: BenchmarkFixture,
+    create_file_of_size: Callable[[ByteSize, str], Path],
+    tmp_path: Path,
+    compress: bool,
+    file_size: ByteSize,
+    num_files: int,
+):
+    files_to_compress = [
+        create_file_of_size(file_size, f"inputs/test_file_{n}")
+        for n in range(num_files)
+    ]
+    archive_file = tmp_path / "archive.zip"
+    asyncio.get_event_loop().run_until_complete(
+        archive_dir(
+            files_to_compress[0].parent,
+            archive_file,
+            compress=compress,
+            store_relative_path=True,
+        )
+    )
+
+    destination_index = 0
+
+    def destination_setup() -> tuple[tuple[Path], dict]:
+        nonlocal destination_index
+        destination_index += 1
+        return (tmp_path / f"unarchived_{destination_index}",), {}
+
+    def run_async_test(destination_folder: Path) -> None:
+        unarchived_paths = asyncio.get_event_loop().run_until_complete(
+            unarchive_dir(archive_file, destination_folder)
+        )
+        assert len(unarchived_paths) == num_files
+
+    benchmark.pedantic(run_async_test, setup=destination_setup, rounds=3)
@@ -1,4 +1,6 @@
 import asyncio
+import hashlib
+import io
 import json
 import logging
 from collections.abc import AsyncGenerator, Coroutine
@@ -52,6 +54,50 @@ class UploadableFileObject:
     sha256_checksum: SHA256Str | None = None
 
 
+class Sha256FileObject(io.RawIOBase):
+    """
+    Wraps a file object and computes the sha256 checksum of its content while
+    it is read (e.g. a stream whose content is only known once read)
+
+    NOTE: the content must be read in order, parts read again (e.g. on retries)
+    are not hashed twice
+    """
+
+    def __init__(self, file_object: IO) -> None:
+        super().__init__()
+        self._file_object = file_object
+        self._sha256 = hashlib.sha256()
+        self._position = 0
+        self._hashed_size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._position = self._file_object.seek(offset, whence)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._file_object.read(size)
+        if self._position <= self._hashed_size < self._position + len(data):
+            self._sha256.update(data[self._hashed_size - self._position :])
+            self._hashed_size = self._position + len(data)
+        self._position += len(data)
+        return data
+
+    def get_sha256_checksum(self, file_size: int) -> SHA256Str | None:
+        """returns None if the whole content was not read"""
+        if self._hashed_size != file_size:
+            return None
+        return SHA256Str(self._sha256.hexdigest())
+
+
 class _ExtendedClientResponseError(ClientResponseError):
     def __init__(
         self,
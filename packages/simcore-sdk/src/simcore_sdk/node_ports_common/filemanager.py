@@ -1,6 +1,6 @@
 import logging
 from asyncio import CancelledError
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 
 import aiofiles
@@ -34,6 +34,7 @@ from . import aws_s3_cli, exceptions, r_clone, storage_client
 from ._filemanager import _abort_upload, _complete_upload, _resolve_location_id
 from .file_io_utils import (
     LogRedirectCB,
+    Sha256FileObject,
     UploadableFileObject,
     download_link_to_file,
     upload_file_to_presigned_links,
@@ -449,6 +450,7 @@ async def _upload_to_s3(
     aws_s3_cli_settings: AwsS3CliSettings | None,
 ) -> tuple[ETag | None, FileUploadSchema]:
     uploaded_parts: list[UploadedPart] = []
+    sha256_checksum: SHA256Str | None = None
     if is_directory:
         assert isinstance(path_to_upload, Path)  # nosec
         assert len(upload_links.urls) > 0  # nosec
@@ -472,20 +474,35 @@ async def _upload_to_s3(
             msg = "Unexpected configuration"
             raise RuntimeError(msg)
     else:
+        file_to_upload = path_to_upload
+        sha256_file_object: Sha256FileObject | None = None
+        if (
+            isinstance(path_to_upload, UploadableFileObject)
+            and path_to_upload.sha256_checksum is None
+        ):
+            # NOTE: the checksum is computed while uploading and passed on completion
+            sha256_file_object = Sha256FileObject(path_to_upload.file_object)
+            file_to_upload = replace(path_to_upload, file_object=sha256_file_object)
         uploaded_parts = await upload_file_to_presigned_links(
             session,
             upload_links,
-            path_to_upload,
+            file_to_upload,
             num_retries=NodePortsSettings.create_from_envs().NODE_PORTS_IO_NUM_RETRY_ATTEMPTS,
             io_log_redirect_cb=io_log_redirect_cb,
             progress_bar=progress_bar,
         )
+        if sha256_file_object:
+            assert isinstance(path_to_upload, UploadableFileObject)  # nosec
+            sha256_checksum = sha256_file_object.get_sha256_checksum(
+                path_to_upload.file_size
+            )
     # complete the upload
     e_tag = await _complete_upload(
         session,
         upload_links.links.complete_upload,
         uploaded_parts,
         is_directory=is_directory,
+        sha256_checksum=sha256_checksum,
     )
     return e_tag, upload_links
 
@@ -19,6 +19,7 @@ from ..node_ports_common.exceptions import (
     InvalidItemTypeError,
     SymlinkToSymlinkIsNotUploadableException,
 )
+from ..node_ports_common.file_io_utils import UploadableFileObject
 from . import port_utils
 from .links import (
     DataItemValue,
@@ -296,7 +297,7 @@ class Port(BaseServiceIOModel):
 
     async def _set(
         self,
-        new_concrete_value: ItemConcreteValue | None,
+        new_concrete_value: ItemConcreteValue | UploadableFileObject | None,
         *,
         set_kwargs: SetKWargs | None = None,
         progress_bar: ProgressBarData,
@@ -312,7 +313,28 @@ class Port(BaseServiceIOModel):
             new_concrete_value,
         )
         new_value: DataItemValue | None = None
-        if new_concrete_value is not None:
+        # NOTE: the file will be saved in S3 as PROJECT_ID/NODE_ID/(set_kwargs.file_base_path)/PORT_KEY/file.ext
+        base_path = Path(self.key)
+        if set_kwargs and set_kwargs.file_base_path:
+            base_path = set_kwargs.file_base_path / self.key
+
+        if isinstance(new_concrete_value, UploadableFileObject):
+            # NOTE: the file is uploaded while it is read (e.g. an archive created on the fly)
+            if not port_utils.is_file_type(self.property_type):
+                raise InvalidItemTypeError(self.property_type, f"{new_concrete_value}")
+
+            new_value = await port_utils.push_file_to_store(
+                file=new_concrete_value,
+                user_id=self._node_ports.user_id,
+                project_id=self._node_ports.project_id,
+                node_id=self._node_ports.node_uuid,
+                r_clone_settings=self._node_ports.r_clone_settings,
+                io_log_redirect_cb=self._node_ports.io_log_redirect_cb,
+                file_base_path=base_path,
+                progress_bar=progress_bar,
+                aws_s3_cli_settings=self._node_ports.aws_s3_cli_settings,
+            )
+        elif new_concrete_value is not None:
             converted_value = self._py_value_converter(new_concrete_value)
             if isinstance(converted_value, Path):
                 if (
@@ -326,11 +348,6 @@ class Port(BaseServiceIOModel):
 
                 _check_if_symlink_is_valid(converted_value)
 
-                # NOTE: the file will be saved in S3 as PROJECT_ID/NODE_ID/(set_kwargs.file_base_path)/PORT_KEY/file.ext
-                base_path = Path(self.key)
-                if set_kwargs and set_kwargs.file_base_path:
-                    base_path = set_kwargs.file_base_path / self.key
-
                 new_value = await port_utils.push_file_to_store(
                     file=converted_value,
                     user_id=self._node_ports.user_id,
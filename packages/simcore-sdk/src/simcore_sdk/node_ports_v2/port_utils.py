@@ -18,7 +18,7 @@ from yarl import URL
 from ..node_ports_common import data_items_utils, filemanager
 from ..node_ports_common.constants import SIMCORE_LOCATION
 from ..node_ports_common.exceptions import NodeportsException
-from ..node_ports_common.file_io_utils import LogRedirectCB
+from ..node_ports_common.file_io_utils import LogRedirectCB, UploadableFileObject
 from ..node_ports_common.filemanager import UploadedFile, UploadedFolder
 from .links import DownloadLink, FileLink, ItemConcreteValue, ItemValue, PortLink
 
@@ -221,7 +221,7 @@ async def pull_file_from_store(
 
 async def push_file_to_store(
     *,
-    file: Path,
+    file: Path | UploadableFileObject,
     user_id: UserID,
     project_id: str,
     node_id: str,
@@ -237,9 +237,12 @@ async def push_file_to_store(
 
     log.debug("file path %s will be uploaded to s3", file)
     s3_object = data_items_utils.create_simcore_file_id(
-        file, project_id, node_id, file_base_path=file_base_path
+        Path(file.file_name) if isinstance(file, UploadableFileObject) else file,
+        project_id,
+        node_id,
+        file_base_path=file_base_path,
     )
-    if not file.is_file():
+    if isinstance(file, Path) and not file.is_file():
         msg = f"Expected path={file} should be a file"
         raise NodeportsException(msg)
 
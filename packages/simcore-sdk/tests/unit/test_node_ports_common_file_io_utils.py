@@ -3,6 +3,9 @@
 # pylint: disable=protected-access
 
 import asyncio
+import hashlib
+import io
+import time
 from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass
 from pathlib import Path
@@ -18,6 +21,7 @@ from models_library.api_schemas_storage import (
     FileUploadSchema,
     UploadedPart,
 )
+from models_library.basic_types import IDStr
 from moto.server import ThreadedMotoServer
 from pydantic import AnyUrl, ByteSize, parse_obj_as
 from pytest_mock import MockerFixture
@@ -25,6 +29,8 @@ from servicelib.aiohttp import status
 from servicelib.progress_bar import ProgressBarData
 from simcore_sdk.node_ports_common.exceptions import AwsS3BadRequestRequestTimeoutError
 from simcore_sdk.node_ports_common.file_io_utils import (
+    Sha256FileObject,
+    UploadableFileObject,
     _check_for_aws_http_errors,
     _ExtendedClientResponseError,
     _process_batch,
@@ -282,3 +288,76 @@ async def test_upload_file_to_presigned_links(
         )
     assert progress_bar._current_steps == pytest.approx(1)
     assert uploaded_parts
+
+
+def test_sha256_file_object(faker: Faker):
+    content = faker.binary(length=1024)
+    file_object = Sha256FileObject(io.BytesIO(content))
+
+    assert file_object.read(100) == content[:100]
+    assert file_object.get_sha256_checksum(len(content)) is None
+    # a part read again (e.g. on a retry) is not hashed twice
+    file_object.seek(50)
+    assert file_object.read(100) == content[50:150]
+    assert file_object.read() == content[150:]
+
+    assert (
+        file_object.get_sha256_checksum(len(content))
+        == hashlib.sha256(content).hexdigest()
+    )
+
+
+@pytest.mark.heavy_load
+@pytest.mark.parametrize(
+    "file_size,chunk_size",
+    [(parse_obj_as(ByteSize, "500Mib"), parse_obj_as(ByteSize, "10Mib"))],
+)
+async def test_upload_file_object_to_presigned_links_performance(
+    client_session: ClientSession,
+    create_upload_links: Callable[[int, ByteSize], Awaitable[FileUploadSchema]],
+    create_file_of_size: Callable[[ByteSize], Path],
+    file_size: ByteSize,
+    chunk_size: ByteSize,
+):
+    """measures the upload of a file object (parts are uploaded one after the other,
+    since a stream can only be read sequentially) against the upload of a file
+    (parts are uploaded concurrently)"""
+    local_file = create_file_of_size(file_size)
+    num_links = file_size // chunk_size
+
+    async def _upload(file_to_upload: Path | UploadableFileObject) -> float:
+        upload_links = await create_upload_links(num_links, chunk_size)
+        async with ProgressBarData(
+            num_steps=1, description=IDStr("uploading")
+        ) as progress_bar:
+            start = time.perf_counter()
+            uploaded_parts = await upload_file_to_presigned_links(
+                session=client_session,
+                file_upload_links=upload_links,
+                file_to_upload=file_to_upload,
+                num_retries=0,
+                io_log_redirect_cb=None,
+                progress_bar=progress_bar,
+            )
+            elapsed = time.perf_counter() - start
+        assert len(uploaded_parts) == num_links
+        return elapsed
+
+    file_upload_time = await _upload(local_file)
+    with local_file.open("rb") as file_object:
+        file_object_upload_time = await _upload(
+            UploadableFileObject(
+                file_object=file_object,
+                file_name=local_file.name,
+                file_size=file_size,
+            )
+        )
+
+    def _throughput(upload_time: float) -> str:
+        return f"{upload_time:.2f}s ({file_size / upload_time / 1024**2:.2f}MiB/s)"
+
+    print(
+        f"upload of {file_size.human_readable()} in {num_links} parts:",
+        f"file {_throughput(file_upload_time)},",
+        f"file object {_throughput(file_object_upload_time)}",
+    )
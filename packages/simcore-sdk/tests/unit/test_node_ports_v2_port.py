@@ -6,6 +6,7 @@
 # pylint:disable=too-many-arguments
 
 
+import io
 import os
 import re
 import shutil
@@ -22,12 +23,17 @@ from aiohttp.client import ClientSession
 from aioresponses import aioresponses as AioResponsesMock
 from faker import Faker
 from models_library.api_schemas_storage import FileMetaDataGet
+from models_library.basic_types import IDStr
 from models_library.projects_nodes_io import LocationID
 from pydantic import parse_obj_as
 from pydantic.error_wrappers import ValidationError
 from pytest_mock.plugin import MockerFixture
 from servicelib.progress_bar import ProgressBarData
-from simcore_sdk.node_ports_common.file_io_utils import LogRedirectCB
+from simcore_sdk.node_ports_common import filemanager
+from simcore_sdk.node_ports_common.file_io_utils import (
+    LogRedirectCB,
+    UploadableFileObject,
+)
 from simcore_sdk.node_ports_common.filemanager import UploadedFile
 from simcore_sdk.node_ports_v2 import exceptions
 from simcore_sdk.node_ports_v2.links import (
@@ -37,7 +43,7 @@ from simcore_sdk.node_ports_v2.links import (
     ItemConcreteValue,
     PortLink,
 )
-from simcore_sdk.node_ports_v2.port import Port
+from simcore_sdk.node_ports_v2.port import Port, SetKWargs
 from simcore_sdk.node_ports_v2.ports_mapping import InputsList, OutputsList
 from utils_port_v2 import create_valid_port_config
 from yarl import URL
@@ -751,3 +757,67 @@ async def test_invalid_file_type_setter(
     # set a folder fails too
     with pytest.raises(exceptions.InvalidItemTypeError):
         await port.set_value(f"{Path(__file__).parent}")
+
+
+@pytest.mark.parametrize(
+    "port_cfg", [create_valid_port_config("data:*/*", key="some_file_object")]
+)
+async def test_set_file_object(
+    common_fixtures: None,
+    user_id: int,
+    project_id: str,
+    node_uuid: str,
+    e_tag: str,
+    port_cfg: dict[str, Any],
+):
+    port = Port(**port_cfg)
+    port._node_ports = AsyncMock(
+        user_id=user_id,
+        project_id=project_id,
+        node_uuid=node_uuid,
+        r_clone_settings=None,
+        io_log_redirect_cb=None,
+        aws_s3_cli_settings=None,
+    )
+    content = b"some content generated while it is read"
+    file_object = UploadableFileObject(
+        file_object=io.BytesIO(content),
+        file_name="some_archive.zip",
+        file_size=len(content),
+    )
+
+    async with ProgressBarData(
+        num_steps=1, description=IDStr("set file object")
+    ) as progress_bar:
+        await port._set(
+            file_object,
+            set_kwargs=SetKWargs(file_base_path=Path("outputs")),
+            progress_bar=progress_bar,
+        )
+
+    expected_s3_object = (
+        f"{project_id}/{node_uuid}/outputs/{port.key}/{file_object.file_name}"
+    )
+    assert port.value == FileLink(
+        store=simcore_store_id(), path=expected_s3_object, eTag=e_tag
+    )
+    assert isinstance(filemanager.upload_path, AsyncMock)
+    filemanager.upload_path.assert_called_once()
+    upload_kwargs = filemanager.upload_path.call_args.kwargs
+    assert upload_kwargs["path_to_upload"] is file_object
+    assert upload_kwargs["s3_object"] == expected_s3_object
+
+
+@pytest.mark.parametrize("port_cfg", [create_valid_port_config("integer", key="int")])
+async def test_set_file_object_to_non_file_port_fails(
+    common_fixtures: None, port_cfg: dict[str, Any]
+):
+    port = Port(**port_cfg)
+    port._node_ports = AsyncMock()
+    with pytest.raises(exceptions.InvalidItemTypeError):
+        await port._set(
+            UploadableFileObject(
+                file_object=io.BytesIO(b""), file_name="some_file", file_size=0
+            ),
+            progress_bar=ProgressBarData(num_steps=1, description=IDStr("set")),
+        )
@@ -96,20 +96,7 @@ async def _get_file(
         ) from err
 
 
-@router.get("", response_model=list[File], responses=_FILE_STATUS_CODES)
-async def list_files(
-    storage_client: Annotated[StorageApi, Depends(get_api_client(StorageApi))],
-    user_id: Annotated[int, Depends(get_current_user_id)],
-):
-    """Lists all files stored in the system
-
-    SEE get_files_page for a paginated version of this function
-    """
-
-    stored_files: list[StorageFileMetaData] = await storage_client.list_files(
-        user_id=user_id
-    )
-
+def _to_file_api_models(stored_files: list[StorageFileMetaData]) -> list[File]:
     # Adapts storage API model to API model
     all_files: list[File] = []
     for stored_file_meta in stored_files:
@@ -132,22 +119,40 @@ async def list_files(
     return all_files
 
 
+@router.get("", response_model=list[File], responses=_FILE_STATUS_CODES)
+async def list_files(
+    storage_client: Annotated[StorageApi, Depends(get_api_client(StorageApi))],
+    user_id: Annotated[int, Depends(get_current_user_id)],
+):
+    """Lists all files stored in the system
+
+    SEE get_files_page for a paginated version of this function
+    """
+
+    stored_files: list[StorageFileMetaData] = await storage_client.list_files(
+        user_id=user_id
+    )
+    return _to_file_api_models(stored_files)
+
+
 @router.get(
     "/page",
     response_model=Page[File],
     include_in_schema=API_SERVER_DEV_FEATURES_ENABLED,
-    status_code=status.HTTP_501_NOT_IMPLEMENTED,
 )
 async def get_files_page(
     storage_client: Annotated[StorageApi, Depends(get_api_client(StorageApi))],
     user_id: Annotated[int, Depends(get_current_user_id)],
     page_params: Annotated[PaginationParams, Depends()],
 ):
-    assert storage_client  # nosec
-    assert user_id  # nosec
-
-    msg = f"get_files_page of user_id={user_id!r} with page_params={page_params!r}. SEE https://github.com/ITISFoundation/osparc-issues/issues/952"
-    raise NotImplementedError(msg)
+    """Lists a page of the files stored in the system"""
+    stored_files, total = await storage_client.search_owned_files_page(
+        user_id=user_id,
+        file_id=None,
+        limit=page_params.limit,
+        offset=page_params.offset,
+    )
+    return create_page(_to_file_api_models(stored_files), total, page_params)
 
 
 def _get_spooled_file_size(file_io: IO) -> int:
@@ -299,7 +304,7 @@ async def search_files_page(
     file_id: UUID | None = None,
 ):
     """Search files"""
-    stored_files: list[StorageFileMetaData] = await storage_client.search_owned_files(
+    stored_files, total = await storage_client.search_owned_files_page(
         user_id=user_id,
         file_id=file_id,
         sha256_checksum=sha256_checksum,
@@ -313,7 +318,7 @@ async def search_files_page(
         )
     return create_page(
         [to_file_api_model(fmd) for fmd in stored_files],
-        len(stored_files),
+        total,
         page_params,
     )
 
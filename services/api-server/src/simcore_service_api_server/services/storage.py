@@ -13,7 +13,7 @@ from models_library.api_schemas_storage import FileMetaDataGet as StorageFileMet
 from models_library.api_schemas_storage import FileUploadSchema, PresignedLink
 from models_library.basic_types import SHA256Str
 from models_library.generics import Envelope
-from pydantic import AnyUrl, PositiveInt
+from pydantic import AnyUrl, NonNegativeInt, PositiveInt
 from starlette.datastructures import URL
 
 from ..core.settings import StorageSettings
@@ -47,6 +47,10 @@ def to_file_api_model(stored_file_meta: StorageFileMetaData) -> File:
     )
 
 
+class _FilesMetaDataPage(Envelope[FileMetaDataArray]):
+    total: NonNegativeInt
+
+
 class StorageApi(BaseServiceClientApi):
     #
     # All files created via the API are stored in simcore-s3 as objects with name pattern "api/{file_id}/{filename.ext}"
@@ -78,16 +82,15 @@ class StorageApi(BaseServiceClientApi):
         )
         return files
 
-    @_exception_mapper({})
-    async def search_owned_files(
+    async def _search_owned_files(
         self,
         *,
         user_id: int,
         file_id: UUID | None,
-        sha256_checksum: SHA256Str | None = None,
-        limit: PositiveInt | None = None,
-        offset: PositiveInt | None = None,
-    ) -> list[StorageFileMetaData]:
+        sha256_checksum: SHA256Str | None,
+        limit: PositiveInt | None,
+        offset: NonNegativeInt | None,
+    ) -> str:
         # NOTE: can NOT use /locations/0/files/metadata with uuid_filter=api/ because
         # logic in storage 'wrongly' assumes that all data is associated to a project and
         # here there is no project, so it would always returns an empty
@@ -97,7 +100,7 @@ class StorageApi(BaseServiceClientApi):
                 {
                     "kind": "owned",
                     "user_id": f"{user_id}",
-                    "startswith": None if file_id is None else f"api/{file_id}",
+                    "startswith": "api/" if file_id is None else f"api/{file_id}",
                     "sha256_checksum": sha256_checksum,
                     "limit": limit,
                     "offset": offset,
@@ -106,14 +109,64 @@ class StorageApi(BaseServiceClientApi):
             ),
         )
         response.raise_for_status()
+        return response.text
 
-        files_metadata = Envelope[FileMetaDataArray].parse_raw(response.text).data
+    @_exception_mapper({})
+    async def search_owned_files(
+        self,
+        *,
+        user_id: int,
+        file_id: UUID | None,
+        sha256_checksum: SHA256Str | None = None,
+        limit: PositiveInt | None = None,
+        offset: NonNegativeInt | None = None,
+    ) -> list[StorageFileMetaData]:
+        """Searches the user's s3 objects named as api/* (or api/{file_id}/*)"""
+        files_metadata = (
+            Envelope[FileMetaDataArray]
+            .parse_raw(
+                await self._search_owned_files(
+                    user_id=user_id,
+                    file_id=file_id,
+                    sha256_checksum=sha256_checksum,
+                    limit=limit,
+                    offset=offset,
+                )
+            )
+            .data
+        )
         files: list[StorageFileMetaData] = (
             [] if files_metadata is None else files_metadata.__root__
         )
         assert len(files) <= limit if limit else True  # nosec
         return files
 
+    @_exception_mapper({})
+    async def search_owned_files_page(
+        self,
+        *,
+        user_id: int,
+        file_id: UUID | None,
+        sha256_checksum: SHA256Str | None = None,
+        limit: PositiveInt,
+        offset: NonNegativeInt,
+    ) -> tuple[list[StorageFileMetaData], NonNegativeInt]:
+        """Same as search_owned_files but also returns the total number of matches"""
+        files_page = _FilesMetaDataPage.parse_raw(
+            await self._search_owned_files(
+                user_id=user_id,
+                file_id=file_id,
+                sha256_checksum=sha256_checksum,
+                limit=limit,
+                offset=offset,
+            )
+        )
+        files: list[StorageFileMetaData] = (
+            [] if files_page.data is None else files_page.data.__root__
+        )
+        assert len(files) <= limit  # nosec
+        return files, files_page.total
+
     @_exception_mapper({})
     async def get_download_link(
         self, *, user_id: int, file_id: UUID, file_name: str
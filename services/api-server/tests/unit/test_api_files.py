@@ -20,6 +20,7 @@ from fastapi.encoders import jsonable_encoder
 from httpx import AsyncClient
 from models_library.api_schemas_storage import (
     ETag,
+    FileMetaDataGet,
     FileUploadCompletionBody,
     UploadedPart,
 )
@@ -115,34 +116,67 @@ async def test_list_files_legacy(
     ]
 
 
-@pytest.mark.xfail(reason="Under dev")
+@pytest.fixture
+def owned_files(faker: Faker) -> list[dict[str, Any]]:
+    """files owned by the user: some created via the api, others in projects"""
+    project_file, _, api_file, *_ = FileMetaDataGet.Config.schema_extra["examples"]
+    files = []
+    for n in range(10):
+        file_id = (
+            f"api/{faker.uuid4()}/file_{n}.txt"
+            if n % 3
+            else f"{faker.uuid4()}/{faker.uuid4()}/file_{n}.txt"
+        )
+        files.append(
+            {
+                **(api_file if n % 3 else project_file),
+                "file_id": file_id,
+                "file_uuid": file_id,
+                "file_name": f"file_{n}.txt",
+            }
+        )
+    return files
+
+
 async def test_list_files_with_pagination(
     client: AsyncClient,
     mocked_storage_service_api_base: MockRouter,
+    auth: httpx.BasicAuth,
+    owned_files: list[dict[str, Any]],
 ):
-    response = await client.get(f"{API_VTAG}/files/page")
+    def _search_files(request: httpx.Request) -> httpx.Response:
+        query = dict(yarl.URL(f"{request.url}").query)
+        found = [
+            f for f in owned_files if f["file_id"].startswith(query["startswith"])
+        ]
+        offset, limit = int(query["offset"]), int(query["limit"])
+        return httpx.Response(
+            status.HTTP_200_OK,
+            json={"data": found[offset : offset + limit], "total": len(found)},
+        )
 
-    assert response.status_code == status.HTTP_200_OK
-    assert response.json() == {
-        "items": [
-            {
-                "id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
-                "filename": "string",
-                "content_type": "string",
-                "checksum": "string",
-            }
-        ],
-        "total": 0,
-        "limit": 1,
-        "offset": 0,
-        "links": {
-            "first": "/api/v1/users?limit=1&offset1",
-            "last": "/api/v1/users?limit=1&offset1",
-            "self": "/api/v1/users?limit=1&offset1",
-            "next": "/api/v1/users?limit=1&offset1",
-            "prev": "/api/v1/users?limit=1&offset1",
-        },
-    }
+    mocked_storage_service_api_base.post(
+        path__regex=r"/simcore-s3/files/metadata:search", name="search_files"
+    ).mock(side_effect=_search_files)
+
+    expected_files_names = [
+        f["file_name"] for f in owned_files if f["file_id"].startswith("api/")
+    ]
+    assert 0 < len(expected_files_names) < len(owned_files)
+
+    listed_files_names = []
+    next_page: str | None = f"{API_VTAG}/files/page?limit=2&offset=0"
+    while next_page:
+        response = await client.get(next_page, auth=auth)
+        assert response.status_code == status.HTTP_200_OK
+        page = parse_obj_as(Page[File], response.json())
+        assert page.total == len(expected_files_names)
+        # only the files created via the api are listed and no page is short
+        assert len(page.items) == min(2, page.total - page.offset)
+        listed_files_names += [file.filename for file in page.items]
+        next_page = page.links.next
+
+    assert listed_files_names == expected_files_names
 
 
 @pytest.mark.xfail(reason="Under dev")
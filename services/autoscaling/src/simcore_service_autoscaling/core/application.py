@@ -15,6 +15,7 @@ from .._meta import (
 from ..api.routes import setup_api_routes
 from ..modules.auto_scaling_task import setup as setup_auto_scaler_background_task
 from ..modules.buffer_machines_pool_task import setup as setup_buffer_machines_pool_task
+from ..modules.dask import setup as setup_dask
 from ..modules.docker import setup as setup_docker
 from ..modules.ec2 import setup as setup_ec2
 from ..modules.instrumentation import setup as setup_instrumentation
@@ -65,6 +66,7 @@ def create_app(settings: ApplicationSettings) -> FastAPI:
     setup_ec2(app)
     setup_ssm(app)
     setup_redis(app)
+    setup_dask(app)
 
     setup_auto_scaler_background_task(app)
     setup_buffer_machines_pool_task(app)
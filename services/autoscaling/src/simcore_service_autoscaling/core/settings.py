@@ -32,6 +32,7 @@ from settings_library.utils_logging import MixinLoggingSettings
 from types_aiobotocore_ec2.literals import InstanceTypeType
 
 from .._meta import API_VERSION, API_VTAG, APP_NAME
+from ..models import TaskPlacementStrategy
 
 AUTOSCALING_ENV_PREFIX: Final[str] = "AUTOSCALING_"
 
@@ -265,6 +266,12 @@ class ApplicationSettings(BaseCustomSettings, MixinLoggingSettings):
 
     AUTOSCALING_PROMETHEUS_INSTRUMENTATION_ENABLED: bool = True
 
+    AUTOSCALING_TASK_PLACEMENT_STRATEGY: TaskPlacementStrategy = Field(
+        default=TaskPlacementStrategy.FIRST_FIT,
+        description="heuristic used to pack pending tasks onto the current instances and onto the new instances to start. "
+        "first-fit keeps the tasks order, the *-decreasing variants place the most demanding tasks first which packs better",
+    )
+
     AUTOSCALING_DRAIN_NODES_WITH_LABELS: bool = Field(
         default=False,
         description="If true, drained nodes"
@@ -1,6 +1,7 @@
 from collections import defaultdict
 from collections.abc import Generator
 from dataclasses import dataclass, field
+from enum import Enum
 from typing import Any, TypeAlias
 
 from aws_library.ec2.models import EC2InstanceData, EC2InstanceType, Resources
@@ -9,6 +10,12 @@ from models_library.generated_models.docker_rest_api import Node
 from types_aiobotocore_ec2.literals import InstanceTypeType
 
 
+class TaskPlacementStrategy(str, Enum):
+    FIRST_FIT = "first-fit"
+    FIRST_FIT_DECREASING = "first-fit-decreasing"
+    BEST_FIT_DECREASING = "best-fit-decreasing"
+
+
 @dataclass(frozen=True, slots=True, kw_only=True)
 class _TaskAssignmentMixin:
     assigned_tasks: list = field(default_factory=list)
@@ -20,6 +27,10 @@ class _TaskAssignmentMixin:
             self, "available_resources", self.available_resources - task_resources
         )
 
+    def assign_tasks(self, tasks: list, *, remaining_resources: Resources) -> None:
+        self.assigned_tasks.extend(tasks)
+        object.__setattr__(self, "available_resources", remaining_resources)
+
     def has_resources_for_task(self, task_resources: Resources) -> bool:
         return bool(self.available_resources >= task_resources)
 
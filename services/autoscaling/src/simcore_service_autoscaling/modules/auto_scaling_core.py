@@ -12,7 +12,6 @@ from aws_library.ec2.models import (
     EC2InstanceData,
     EC2InstanceType,
     EC2Tags,
-    Resources,
 )
 from fastapi import FastAPI
 from models_library.generated_models.docker_rest_api import Node, NodeState
@@ -44,6 +43,13 @@ from ..utils.auto_scaling_core import (
 )
 from ..utils.buffer_machines_pool_core import get_buffer_ec2_tags
 from ..utils.rabbitmq import post_autoscaling_status_message
+from ..utils.task_placement import (
+    ResourceBins,
+    TaskDemand,
+    assign_tasks_to_instances,
+    smallest_demand,
+    sort_demands,
+)
 from .auto_scaling_mode_base import BaseAutoscaling
 from .docker import get_docker_client
 from .ec2 import get_ec2_client
@@ -113,20 +119,27 @@ async def _analyze_current_cluster(
     ]
 
     # analyse attached ec2s
-    active_nodes, pending_nodes, all_drained_nodes = [], [], []
+    active_instances = await auto_scaling_mode.list_active_instances(
+        app, attached_ec2s
+    )
+    nodes_used_resources = await auto_scaling_mode.compute_nodes_used_resources(
+        app, active_instances
+    )
+    active_nodes = [
+        dataclasses.replace(
+            instance,
+            available_resources=instance.ec2_instance.resources - node_used_resources,
+        )
+        for instance, node_used_resources in zip(
+            active_instances, nodes_used_resources, strict=True
+        )
+    ]
+    active_ec2_ids = {i.ec2_instance.id for i in active_instances}
+    pending_nodes, all_drained_nodes = [], []
     for instance in attached_ec2s:
-        if await auto_scaling_mode.is_instance_active(app, instance):
-            node_used_resources = await auto_scaling_mode.compute_node_used_resources(
-                app, instance
-            )
-            active_nodes.append(
-                dataclasses.replace(
-                    instance,
-                    available_resources=instance.ec2_instance.resources
-                    - node_used_resources,
-                )
-            )
-        elif auto_scaling_mode.is_instance_drained(instance):
+        if instance.ec2_instance.id in active_ec2_ids:
+            continue
+        if auto_scaling_mode.is_instance_drained(instance):
             all_drained_nodes.append(instance)
         else:
             pending_nodes.append(instance)
@@ -334,52 +347,19 @@ async def _activate_drained_nodes(
     )
 
 
-def _try_assign_task_to_ec2_instance(
-    task,
-    *,
-    instances: list[AssociatedInstance] | list[NonAssociatedInstance],
-    task_required_ec2_instance: InstanceTypeType | None,
-    task_required_resources: Resources,
-) -> bool:
-    for instance in instances:
-        if task_required_ec2_instance and (
-            task_required_ec2_instance != instance.ec2_instance.type
-        ):
-            continue
-        if instance.has_resources_for_task(task_required_resources):
-            instance.assign_task(task, task_required_resources)
-            _logger.debug(
-                "%s",
-                f"assigned task with {task_required_resources=}, {task_required_ec2_instance=} to "
-                f"{instance.ec2_instance.id=}:{instance.ec2_instance.type}, "
-                f"remaining resources:{instance.available_resources}/{instance.ec2_instance.resources}",
-            )
-            return True
-    return False
-
-
-def _try_assign_task_to_ec2_instance_type(
-    task,
-    *,
-    instances: list[AssignedTasksToInstanceType],
-    task_required_ec2_instance: InstanceTypeType | None,
-    task_required_resources: Resources,
-) -> bool:
-    for instance in instances:
-        if task_required_ec2_instance and (
-            task_required_ec2_instance != instance.instance_type.name
-        ):
-            continue
-        if instance.has_resources_for_task(task_required_resources):
-            instance.assign_task(task, task_required_resources)
-            _logger.debug(
-                "%s",
-                f"assigned task with {task_required_resources=}, {task_required_ec2_instance=} to "
-                f"{instance.instance_type}, "
-                f"remaining resources:{instance.available_resources}/{instance.instance_type.resources}",
-            )
-            return True
-    return False
+async def _resolve_task_demands(
+    app: FastAPI, tasks: list, auto_scaling_mode: BaseAutoscaling
+) -> list[TaskDemand]:
+    return [
+        TaskDemand(
+            task=task,
+            required_resources=auto_scaling_mode.get_task_required_resources(task),
+            required_instance_type=await auto_scaling_mode.get_task_defined_instance(
+                app, task
+            ),
+        )
+        for task in tasks
+    ]
 
 
 async def _assign_tasks_to_current_cluster(
@@ -388,47 +368,19 @@ async def _assign_tasks_to_current_cluster(
     cluster: Cluster,
     auto_scaling_mode: BaseAutoscaling,
 ) -> tuple[list, Cluster]:
-    unassigned_tasks = []
-    for task in tasks:
-        task_required_resources = auto_scaling_mode.get_task_required_resources(task)
-        task_required_ec2_instance = await auto_scaling_mode.get_task_defined_instance(
-            app, task
-        )
-
-        assignment_functions = [
-            lambda task, required_ec2, required_resources: _try_assign_task_to_ec2_instance(
-                task,
-                instances=cluster.active_nodes,
-                task_required_ec2_instance=required_ec2,
-                task_required_resources=required_resources,
-            ),
-            lambda task, required_ec2, required_resources: _try_assign_task_to_ec2_instance(
-                task,
-                instances=cluster.drained_nodes + cluster.reserve_drained_nodes,
-                task_required_ec2_instance=required_ec2,
-                task_required_resources=required_resources,
-            ),
-            lambda task, required_ec2, required_resources: _try_assign_task_to_ec2_instance(
-                task,
-                instances=cluster.pending_nodes,
-                task_required_ec2_instance=required_ec2,
-                task_required_resources=required_resources,
-            ),
-            lambda task, required_ec2, required_resources: _try_assign_task_to_ec2_instance(
-                task,
-                instances=cluster.pending_ec2s,
-                task_required_ec2_instance=required_ec2,
-                task_required_resources=required_resources,
-            ),
-        ]
-
-        if any(
-            assignment(task, task_required_ec2_instance, task_required_resources)
-            for assignment in assignment_functions
-        ):
-            _logger.debug("assigned task to cluster")
-        else:
-            unassigned_tasks.append(task)
+    app_settings = get_application_settings(app)
+    task_demands = await _resolve_task_demands(app, tasks, auto_scaling_mode)
+    unassigned_demands = assign_tasks_to_instances(
+        task_demands,
+        [
+            cluster.active_nodes,
+            cluster.drained_nodes + cluster.reserve_drained_nodes,
+            cluster.pending_nodes,
+            cluster.pending_ec2s,
+        ],
+        app_settings.AUTOSCALING_TASK_PLACEMENT_STRATEGY,
+    )
+    unassigned_tasks = [demand.task for demand in unassigned_demands]
 
     if unassigned_tasks:
         _logger.info(
@@ -439,6 +391,27 @@ async def _assign_tasks_to_current_cluster(
     return unassigned_tasks, cluster
 
 
+def _find_new_instance_type_for_task(
+    demand: TaskDemand,
+    available_ec2_types: list[EC2InstanceType],
+    auto_scaling_mode: BaseAutoscaling,
+) -> EC2InstanceType:
+    # check if exact instance type is needed first
+    if demand.required_instance_type:
+        return find_selected_instance_type_for_task(
+            demand.required_instance_type,
+            available_ec2_types,
+            auto_scaling_mode,
+            demand.task,
+        )
+    # we go for best fitting type
+    return utils_ec2.find_best_fitting_ec2_instance(
+        available_ec2_types,
+        demand.required_resources,
+        score_type=utils_ec2.closest_instance_policy,
+    )
+
+
 async def _find_needed_instances(
     app: FastAPI,
     unassigned_tasks: list,
@@ -446,68 +419,57 @@ async def _find_needed_instances(
     cluster: Cluster,
     auto_scaling_mode: BaseAutoscaling,
 ) -> dict[EC2InstanceType, int]:
+    app_settings = get_application_settings(app)
+    placement_strategy = app_settings.AUTOSCALING_TASK_PLACEMENT_STRATEGY
     # 1. check first the pending task needs
-    needed_new_instance_types_for_tasks: list[AssignedTasksToInstanceType] = []
+    new_instance_types: list[EC2InstanceType] = []
+    new_instance_tasks: list[list] = []
     with log_context(_logger, logging.DEBUG, msg="finding needed instances"):
-        for task in unassigned_tasks:
-            task_required_resources = auto_scaling_mode.get_task_required_resources(
-                task
-            )
-            task_required_ec2_instance = (
-                await auto_scaling_mode.get_task_defined_instance(app, task)
-            )
-
+        task_demands = await _resolve_task_demands(
+            app, unassigned_tasks, auto_scaling_mode
+        )
+        new_instances_bins = ResourceBins(
+            strategy=placement_strategy, smallest_demand=smallest_demand(task_demands)
+        )
+        for demand in sort_demands(task_demands, placement_strategy):
             # first check if we can assign the task to one of the newly tobe created instances
-            if _try_assign_task_to_ec2_instance_type(
-                task,
-                instances=needed_new_instance_types_for_tasks,
-                task_required_ec2_instance=task_required_ec2_instance,
-                task_required_resources=task_required_resources,
-            ):
-                continue
-
-            # so we need to find what we can create now
-            try:
-                # check if exact instance type is needed first
-                if task_required_ec2_instance:
-                    defined_ec2 = find_selected_instance_type_for_task(
-                        task_required_ec2_instance,
-                        available_ec2_types,
-                        auto_scaling_mode,
-                        task,
+            index = new_instances_bins.find(demand)
+            if index is None:
+                # so we need to find what we can create now
+                try:
+                    instance_type = _find_new_instance_type_for_task(
+                        demand, available_ec2_types, auto_scaling_mode
                     )
-                    needed_new_instance_types_for_tasks.append(
-                        AssignedTasksToInstanceType(
-                            instance_type=defined_ec2,
-                            assigned_tasks=[task],
-                            available_resources=defined_ec2.resources
-                            - task_required_resources,
-                        )
+                except Ec2InstanceNotFoundError:
+                    _logger.exception(
+                        "Task %s needs more resources than any EC2 instance "
+                        "can provide with the current configuration. Please check!",
+                        f"{demand.task}",
                     )
-                else:
-                    # we go for best fitting type
-                    best_ec2_instance = utils_ec2.find_best_fitting_ec2_instance(
-                        available_ec2_types,
-                        auto_scaling_mode.get_task_required_resources(task),
-                        score_type=utils_ec2.closest_instance_policy,
-                    )
-                    needed_new_instance_types_for_tasks.append(
-                        AssignedTasksToInstanceType(
-                            instance_type=best_ec2_instance,
-                            assigned_tasks=[task],
-                            available_resources=best_ec2_instance.resources
-                            - task_required_resources,
-                        )
-                    )
-            except Ec2InstanceNotFoundError:
-                _logger.exception(
-                    "Task %s needs more resources than any EC2 instance "
-                    "can provide with the current configuration. Please check!",
-                    f"{task}",
+                    continue
+                except Ec2InstanceInvalidError:
+                    _logger.exception("Unexpected error:")
+                    continue
+                index = new_instances_bins.add(
+                    instance_type=instance_type.name,
+                    available=instance_type.resources,
+                    capacity=instance_type.resources,
                 )
-            except Ec2InstanceInvalidError:
-                _logger.exception("Unexpected error:")
-
+                new_instance_types.append(instance_type)
+                new_instance_tasks.append([])
+            new_instances_bins.place(index, demand)
+            new_instance_tasks[index].append(demand.task)
+
+    needed_new_instance_types_for_tasks = [
+        AssignedTasksToInstanceType(
+            instance_type=instance_type,
+            assigned_tasks=tasks,
+            available_resources=new_instances_bins.free_resources(index),
+        )
+        for index, (instance_type, tasks) in enumerate(
+            zip(new_instance_types, new_instance_tasks, strict=True)
+        )
+    ]
     _logger.info(
         "found following needed instances: %s",
         [
@@ -524,7 +486,6 @@ async def _find_needed_instances(
     )
 
     # 2. check the buffer needs
-    app_settings = get_application_settings(app)
     assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
     if (
         num_missing_nodes := (
@@ -62,9 +62,9 @@ class BaseAutoscaling(ABC):  # pragma: no cover
 
     @staticmethod
     @abstractmethod
-    async def compute_node_used_resources(
-        app: FastAPI, instance: AssociatedInstance
-    ) -> Resources:
+    async def compute_nodes_used_resources(
+        app: FastAPI, instances: list[AssociatedInstance]
+    ) -> list[Resources]:
         ...
 
     @staticmethod
@@ -83,7 +83,9 @@ class BaseAutoscaling(ABC):  # pragma: no cover
 
     @staticmethod
     @abstractmethod
-    async def is_instance_active(app: FastAPI, instance: AssociatedInstance) -> bool:
+    async def list_active_instances(
+        app: FastAPI, instances: list[AssociatedInstance]
+    ) -> list[AssociatedInstance]:
         ...
 
     @staticmethod
@@ -12,7 +12,6 @@ from models_library.docker import (
 from models_library.generated_models.docker_rest_api import Node
 from pydantic import AnyUrl, ByteSize
 from servicelib.logging_utils import LogLevelInt
-from servicelib.utils import logged_gather
 from types_aiobotocore_ec2.literals import InstanceTypeType
 
 from ..core.errors import (
@@ -43,6 +42,33 @@ def _scheduler_auth(app: FastAPI) -> InternalClusterAuthentication:
     return app_settings.AUTOSCALING_DASK.DASK_SCHEDULER_AUTH
 
 
+def _compute_node_used_resources(
+    workers_snapshot: dask.DaskWorkersSnapshot, instance: AssociatedInstance
+) -> Resources:
+    try:
+        resource = workers_snapshot.get_worker_used_resources(instance.ec2_instance)
+        if resource == Resources.create_as_empty():
+            num_results_in_memory = (
+                workers_snapshot.get_worker_still_has_results_in_memory(
+                    instance.ec2_instance
+                )
+            )
+            if num_results_in_memory > 0:
+                _logger.debug(
+                    "found %s for %s",
+                    f"{num_results_in_memory=}",
+                    f"{instance.ec2_instance.id}",
+                )
+                # NOTE: this is a trick to consider the node still useful
+                return Resources(cpus=0, ram=ByteSize(1024 * 1024 * 1024))
+
+        _logger.debug("found %s for %s", f"{resource=}", f"{instance.ec2_instance.id}")
+        return resource
+    except (DaskWorkerNotFoundError, DaskNoWorkersError):
+        _logger.debug("no resource found for %s", f"{instance.ec2_instance.id}")
+        return Resources.create_as_empty()
+
+
 class ComputationalAutoscaling(BaseAutoscaling):
     @staticmethod
     async def get_monitored_nodes(app: FastAPI) -> list[Node]:
@@ -65,15 +91,13 @@ class ComputationalAutoscaling(BaseAutoscaling):
     @staticmethod
     async def list_unrunnable_tasks(app: FastAPI) -> list[DaskTask]:
         try:
-            unrunnable_tasks = await dask.list_unrunnable_tasks(
-                _scheduler_url(app), _scheduler_auth(app)
+            tasks_snapshot = await dask.get_tasks_snapshot(
+                app, _scheduler_url(app), _scheduler_auth(app)
             )
+            unrunnable_tasks = tasks_snapshot.unrunnable_tasks
             # NOTE: any worker "processing" more than 1 task means that the other tasks are queued!
-            processing_tasks_by_worker = await dask.list_processing_tasks_per_worker(
-                _scheduler_url(app), _scheduler_auth(app)
-            )
             queued_tasks = []
-            for tasks in processing_tasks_by_worker.values():
+            for tasks in tasks_snapshot.processing_tasks_per_worker.values():
                 queued_tasks += tasks[1:]
             _logger.debug(
                 "found %s unrunnable tasks and %s potentially queued tasks",
@@ -111,45 +135,26 @@ class ComputationalAutoscaling(BaseAutoscaling):
         return cast(InstanceTypeType | None, utils.get_task_instance_restriction(task))
 
     @staticmethod
-    async def compute_node_used_resources(
-        app: FastAPI, instance: AssociatedInstance
-    ) -> Resources:
-        try:
-            resource = await dask.get_worker_used_resources(
-                _scheduler_url(app), _scheduler_auth(app), instance.ec2_instance
-            )
-            if resource == Resources.create_as_empty():
-                num_results_in_memory = (
-                    await dask.get_worker_still_has_results_in_memory(
-                        _scheduler_url(app), _scheduler_auth(app), instance.ec2_instance
-                    )
-                )
-                if num_results_in_memory > 0:
-                    _logger.debug(
-                        "found %s for %s",
-                        f"{num_results_in_memory=}",
-                        f"{instance.ec2_instance.id}",
-                    )
-                    # NOTE: this is a trick to consider the node still useful
-                    return Resources(cpus=0, ram=ByteSize(1024 * 1024 * 1024))
-
-            _logger.debug(
-                "found %s for %s", f"{resource=}", f"{instance.ec2_instance.id}"
-            )
-            return resource
-        except (DaskWorkerNotFoundError, DaskNoWorkersError):
-            _logger.debug("no resource found for %s", f"{instance.ec2_instance.id}")
-            return Resources.create_as_empty()
+    async def compute_nodes_used_resources(
+        app: FastAPI, instances: list[AssociatedInstance]
+    ) -> list[Resources]:
+        if not instances:
+            return []
+        # NOTE: all the workers are looked up in 1 call to the scheduler
+        workers_snapshot = await dask.get_workers_snapshot(
+            app, _scheduler_url(app), _scheduler_auth(app)
+        )
+        return [
+            _compute_node_used_resources(workers_snapshot, instance)
+            for instance in instances
+        ]
 
     @staticmethod
     async def compute_cluster_used_resources(
         app: FastAPI, instances: list[AssociatedInstance]
     ) -> Resources:
-        list_of_used_resources = await logged_gather(
-            *(
-                ComputationalAutoscaling.compute_node_used_resources(app, i)
-                for i in instances
-            )
+        list_of_used_resources = (
+            await ComputationalAutoscaling.compute_nodes_used_resources(app, instances)
         )
         counter = collections.Counter({k: 0 for k in Resources.__fields__})
         for result in list_of_used_resources:
@@ -162,21 +167,31 @@ class ComputationalAutoscaling(BaseAutoscaling):
     ) -> Resources:
         try:
             return await dask.compute_cluster_total_resources(
-                _scheduler_url(app), _scheduler_auth(app), instances
+                app, _scheduler_url(app), _scheduler_auth(app), instances
             )
         except DaskNoWorkersError:
             return Resources.create_as_empty()
 
     @staticmethod
-    async def is_instance_active(app: FastAPI, instance: AssociatedInstance) -> bool:
-        if not utils_docker.is_node_osparc_ready(instance.node):
-            return False
+    async def list_active_instances(
+        app: FastAPI, instances: list[AssociatedInstance]
+    ) -> list[AssociatedInstance]:
+        ready_instances = [
+            i for i in instances if utils_docker.is_node_osparc_ready(i.node)
+        ]
+        if not ready_instances:
+            return []
 
         # now check if dask-scheduler/dask-worker is available and running
-        return await dask.is_worker_connected(
-            _scheduler_url(app), _scheduler_auth(app), instance.ec2_instance
+        workers_snapshot = await dask.get_workers_snapshot(
+            app, _scheduler_url(app), _scheduler_auth(app)
         )
+        return [
+            i
+            for i in ready_instances
+            if workers_snapshot.is_worker_connected(i.ec2_instance)
+        ]
 
     @staticmethod
     async def try_retire_nodes(app: FastAPI) -> None:
-        await dask.try_retire_nodes(_scheduler_url(app), _scheduler_auth(app))
+        await dask.try_retire_nodes(app, _scheduler_url(app), _scheduler_auth(app))
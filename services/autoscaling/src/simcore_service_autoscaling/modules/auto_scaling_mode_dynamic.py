@@ -67,17 +67,20 @@ class DynamicAutoscaling(BaseAutoscaling):
         )
 
     @staticmethod
-    async def compute_node_used_resources(
-        app: FastAPI, instance: AssociatedInstance
-    ) -> Resources:
+    async def compute_nodes_used_resources(
+        app: FastAPI, instances: list[AssociatedInstance]
+    ) -> list[Resources]:
         docker_client = get_docker_client(app)
         app_settings = get_application_settings(app)
         assert app_settings.AUTOSCALING_NODES_MONITORING  # nosec
-        return await utils_docker.compute_node_used_resources(
-            docker_client,
-            instance.node,
-            service_labels=app_settings.AUTOSCALING_NODES_MONITORING.NODES_MONITORING_SERVICE_LABELS,
-        )
+        return [
+            await utils_docker.compute_node_used_resources(
+                docker_client,
+                instance.node,
+                service_labels=app_settings.AUTOSCALING_NODES_MONITORING.NODES_MONITORING_SERVICE_LABELS,
+            )
+            for instance in instances
+        ]
 
     @staticmethod
     async def compute_cluster_used_resources(
@@ -98,9 +101,11 @@ class DynamicAutoscaling(BaseAutoscaling):
         )
 
     @staticmethod
-    async def is_instance_active(app: FastAPI, instance: AssociatedInstance) -> bool:
+    async def list_active_instances(
+        app: FastAPI, instances: list[AssociatedInstance]
+    ) -> list[AssociatedInstance]:
         assert app  # nosec
-        return utils_docker.is_node_osparc_ready(instance.node)
+        return [i for i in instances if utils_docker.is_node_osparc_ready(i.node)]
 
     @staticmethod
     async def try_retire_nodes(app: FastAPI) -> None:
@@ -1,18 +1,22 @@
+import asyncio
 import collections
 import contextlib
 import logging
 import re
 from collections import defaultdict
 from collections.abc import AsyncIterator, Coroutine
-from typing import Any, Final, TypeAlias
+from dataclasses import dataclass, field
+from typing import Any, Final, TypeAlias, cast
 
 import dask.typing
 import distributed
 import distributed.scheduler
 from aws_library.ec2.models import EC2InstanceData, Resources
 from dask_task_models_library.resource_constraints import DaskTaskResources
+from fastapi import FastAPI
 from models_library.clusters import InternalClusterAuthentication, TLSAuthentication
 from pydantic import AnyUrl, ByteSize, parse_obj_as
+from servicelib.logging_utils import log_catch
 
 from ..core.errors import (
     DaskNoWorkersError,
@@ -40,15 +44,63 @@ async def _wrap_client_async_routine(
 _DASK_SCHEDULER_CONNECT_TIMEOUT_S: Final[int] = 5
 
 
-@contextlib.asynccontextmanager
-async def _scheduler_client(
-    url: AnyUrl, authentication: InternalClusterAuthentication
-) -> AsyncIterator[distributed.Client]:
-    """
-    Raises:
-        DaskSchedulerNotFoundError: if the scheduler was not found/cannot be reached
-    """
-    try:
+@dataclass(slots=True)
+class _SchedulerClients:
+    """the connected clients, one per scheduler url and authentication"""
+
+    clients: dict[str, distributed.Client] = field(default_factory=dict)
+    # NOTE: one lock per client, so that connecting to an unreachable scheduler
+    # does not block the calls to the other schedulers
+    locks: dict[str, asyncio.Lock] = field(default_factory=dict)
+
+    async def close(self) -> None:
+        clients = list(self.clients.values())
+        self.clients.clear()
+        self.locks.clear()
+        for client in clients:
+            await _close_client(client)
+
+
+def setup(app: FastAPI) -> None:
+    async def on_startup() -> None:
+        app.state.dask_scheduler_clients = _SchedulerClients()
+
+    async def on_shutdown() -> None:
+        scheduler_clients: _SchedulerClients | None = app.state.dask_scheduler_clients
+        if scheduler_clients:
+            await scheduler_clients.close()
+
+    app.add_event_handler("startup", on_startup)
+    app.add_event_handler("shutdown", on_shutdown)
+
+
+def _get_scheduler_clients(app: FastAPI) -> _SchedulerClients:
+    return cast(_SchedulerClients, app.state.dask_scheduler_clients)
+
+
+def _client_key(url: AnyUrl, authentication: InternalClusterAuthentication) -> str:
+    return f"{url}:{authentication.json()}"
+
+
+async def _close_client(client: distributed.Client) -> None:
+    with log_catch(_logger, reraise=False):
+        await _wrap_client_async_routine(client.close())
+
+
+async def _get_or_create_client(
+    app: FastAPI, url: AnyUrl, authentication: InternalClusterAuthentication
+) -> distributed.Client:
+    scheduler_clients = _get_scheduler_clients(app)
+    key = _client_key(url, authentication)
+    async with scheduler_clients.locks.setdefault(key, asyncio.Lock()):
+        if client := scheduler_clients.clients.get(key):
+            if client.status == "running":
+                return client
+            # the connection to the scheduler was lost, let's reconnect
+            _logger.info("reconnecting to dask-scheduler %s", url)
+            del scheduler_clients.clients[key]
+            await _close_client(client)
+
         security = distributed.Security()
         if isinstance(authentication, TLSAuthentication):
             security = distributed.Security(
@@ -57,14 +109,45 @@ async def _scheduler_client(
                 tls_client_key=f"{authentication.tls_client_key}",
                 require_encryption=True,
             )
-        async with distributed.Client(
+        client = distributed.Client(
             url,
             asynchronous=True,
             timeout=f"{_DASK_SCHEDULER_CONNECT_TIMEOUT_S}",
             security=security,
-        ) as client:
-            yield client
+        )
+        try:
+            await _wrap_client_async_routine(client)
+        except BaseException:
+            await _close_client(client)
+            raise
+        scheduler_clients.clients[key] = client
+        return client
+
+
+async def _discard_client(
+    app: FastAPI, url: AnyUrl, authentication: InternalClusterAuthentication
+) -> None:
+    scheduler_clients = _get_scheduler_clients(app)
+    key = _client_key(url, authentication)
+    scheduler_clients.locks.pop(key, None)
+    if client := scheduler_clients.clients.pop(key, None):
+        await _close_client(client)
+
+
+@contextlib.asynccontextmanager
+async def _scheduler_client(
+    app: FastAPI, url: AnyUrl, authentication: InternalClusterAuthentication
+) -> AsyncIterator[distributed.Client]:
+    """returns a connected client to the scheduler. The client is kept open and
+    reused by the next calls (one per scheduler), and re-created if the connection is lost
+
+    Raises:
+        DaskSchedulerNotFoundError: if the scheduler was not found/cannot be reached
+    """
+    try:
+        yield await _get_or_create_client(app, url, authentication)
     except OSError as exc:
+        await _discard_client(app, url, authentication)
         raise DaskSchedulerNotFoundError(url=url) from exc
 
 
@@ -75,54 +158,146 @@ DASK_NAME_PATTERN: Final[re.Pattern] = re.compile(
 )
 
 
-def _dask_worker_from_ec2_instance(
-    client: distributed.Client, ec2_instance: EC2InstanceData
-) -> tuple[DaskWorkerUrl, DaskWorkerDetails]:
-    """
-    Raises:
-        Ec2InvalidDnsNameError
-        DaskNoWorkersError
-        DaskWorkerNotFoundError
-    """
-    node_hostname = node_host_name_from_ec2_private_dns(ec2_instance)
-    scheduler_info = client.scheduler_info()
+async def _get_scheduler_info(client: distributed.Client) -> dict[str, Any]:
+    # NOTE: client.scheduler_info() is only refreshed periodically on long-lived clients
     assert client.scheduler  # nosec
-    if "workers" not in scheduler_info or not scheduler_info["workers"]:
-        raise DaskNoWorkersError(url=client.scheduler.address)
-    workers: dict[DaskWorkerUrl, DaskWorkerDetails] = scheduler_info["workers"]
-
-    _logger.debug("looking for %s in %s", f"{ec2_instance=}", f"{workers=}")
-
-    # dict is of type dask_worker_address: worker_details
-    def _find_by_worker_host(
-        dask_worker: tuple[DaskWorkerUrl, DaskWorkerDetails]
-    ) -> bool:
-        _, details = dask_worker
-        if match := re.match(DASK_NAME_PATTERN, details["name"]):
-            return bool(match.group("private_ip") == node_hostname)
+    scheduler_info: dict[str, Any] = await _wrap_client_async_routine(
+        client.scheduler.identity()
+    )
+    return scheduler_info
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DaskWorkersSnapshot:
+    """the workers of a scheduler and their processing tasks, retrieved at once
+    so that all the instances of a cluster are looked up with a single call"""
+
+    scheduler_url: AnyUrl
+    workers: dict[DaskWorkerUrl, DaskWorkerDetails]
+    processing_tasks_per_worker: dict[
+        DaskWorkerUrl, list[tuple[dask.typing.Key, DaskTaskResources]]
+    ]
+
+    def _find_worker(
+        self, ec2_instance: EC2InstanceData
+    ) -> tuple[DaskWorkerUrl, DaskWorkerDetails]:
+        """
+        Raises:
+            Ec2InvalidDnsNameError
+            DaskNoWorkersError
+            DaskWorkerNotFoundError
+        """
+        node_hostname = node_host_name_from_ec2_private_dns(ec2_instance)
+        if not self.workers:
+            raise DaskNoWorkersError(url=self.scheduler_url)
+
+        _logger.debug("looking for %s in %s", f"{ec2_instance=}", f"{self.workers=}")
+
+        # dict is of type dask_worker_address: worker_details
+        def _find_by_worker_host(
+            dask_worker: tuple[DaskWorkerUrl, DaskWorkerDetails]
+        ) -> bool:
+            _, details = dask_worker
+            if match := re.match(DASK_NAME_PATTERN, details["name"]):
+                return bool(match.group("private_ip") == node_hostname)
+            return False
+
+        filtered_workers = dict(filter(_find_by_worker_host, self.workers.items()))
+        if not filtered_workers:
+            raise DaskWorkerNotFoundError(
+                worker_host=ec2_instance.aws_private_dns, url=self.scheduler_url
+            )
+        assert (
+            len(filtered_workers) == 1
+        ), f"returned workers {filtered_workers}, {node_hostname=}"  # nosec
+        return next(iter(filtered_workers.items()))
+
+    def is_worker_connected(self, ec2_instance: EC2InstanceData) -> bool:
+        """
+        Raises:
+            Ec2InvalidDnsNameError
+        """
+        with contextlib.suppress(DaskNoWorkersError, DaskWorkerNotFoundError):
+            self._find_worker(ec2_instance)
+            return True
         return False
 
-    filtered_workers = dict(filter(_find_by_worker_host, workers.items()))
-    if not filtered_workers:
-        raise DaskWorkerNotFoundError(
-            worker_host=ec2_instance.aws_private_dns, url=client.scheduler.address
+    def get_worker_still_has_results_in_memory(
+        self, ec2_instance: EC2InstanceData
+    ) -> int:
+        """
+        Raises:
+            Ec2InvalidDnsNameError
+            DaskWorkerNotFoundError
+            DaskNoWorkersError
+        """
+        _, worker_details = self._find_worker(ec2_instance)
+        worker_metrics: dict[str, Any] = worker_details["metrics"]
+        return 1 if worker_metrics.get("task_counts") else 0
+
+    def get_worker_used_resources(self, ec2_instance: EC2InstanceData) -> Resources:
+        """
+        Raises:
+            Ec2InvalidDnsNameError
+            DaskWorkerNotFoundError
+            DaskNoWorkersError
+        """
+        worker_url, _ = self._find_worker(ec2_instance)
+        total_resources_used: collections.Counter[str] = collections.Counter()
+        for _, task_resources in self.processing_tasks_per_worker.get(worker_url, []):
+            total_resources_used.update(task_resources)
+
+        _logger.debug("found %s for %s", f"{total_resources_used=}", f"{worker_url=}")
+        return Resources(
+            cpus=total_resources_used.get("CPU", 0),
+            ram=parse_obj_as(ByteSize, total_resources_used.get("RAM", 0)),
+        )
+
+
+async def get_workers_snapshot(
+    app: FastAPI,
+    scheduler_url: AnyUrl,
+    authentication: InternalClusterAuthentication,
+) -> DaskWorkersSnapshot:
+    """returns the workers and their processing tasks with 1 call to the scheduler
+
+    Raises:
+        DaskSchedulerNotFoundError
+    """
+
+    def _get_workers_snapshot(
+        dask_scheduler: distributed.Scheduler,
+    ) -> tuple[
+        dict[DaskWorkerUrl, DaskWorkerDetails],
+        dict[DaskWorkerUrl, list[tuple[dask.typing.Key, DaskTaskResources]]],
+    ]:
+        return dask_scheduler.identity()["workers"], {
+            worker_url: [
+                (task_state.key, task_state.resource_restrictions or {})
+                for task_state in worker_state.processing
+            ]
+            for worker_url, worker_state in dask_scheduler.workers.items()
+        }
+
+    async with _scheduler_client(app, scheduler_url, authentication) as client:
+        workers, processing_tasks_per_worker = await _wrap_client_async_routine(
+            client.run_on_scheduler(_get_workers_snapshot)
+        )
+        return DaskWorkersSnapshot(
+            scheduler_url=scheduler_url,
+            workers=workers,
+            processing_tasks_per_worker=processing_tasks_per_worker,
         )
-    assert (
-        len(filtered_workers) == 1
-    ), f"returned workers {filtered_workers}, {node_hostname=}"  # nosec
-    return next(iter(filtered_workers.items()))
 
 
 async def is_worker_connected(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     authentication: InternalClusterAuthentication,
     worker_ec2_instance: EC2InstanceData,
 ) -> bool:
-    with contextlib.suppress(DaskNoWorkersError, DaskWorkerNotFoundError):
-        async with _scheduler_client(scheduler_url, authentication) as client:
-            _dask_worker_from_ec2_instance(client, worker_ec2_instance)
-            return True
-    return False
+    workers_snapshot = await get_workers_snapshot(app, scheduler_url, authentication)
+    return workers_snapshot.is_worker_connected(worker_ec2_instance)
 
 
 def _dask_key_to_dask_task_id(key: dask.typing.Key) -> DaskTaskId:
@@ -133,78 +308,79 @@ def _dask_key_to_dask_task_id(key: dask.typing.Key) -> DaskTaskId:
     return f"{key}"
 
 
-async def list_unrunnable_tasks(
-    scheduler_url: AnyUrl,
-    authentication: InternalClusterAuthentication,
-) -> list[DaskTask]:
-    """
-    Raises:
-        DaskSchedulerNotFoundError
-    """
+def _to_dask_tasks_per_worker(
+    worker_to_tasks: dict[str, list[tuple[dask.typing.Key, DaskTaskResources]]]
+) -> dict[DaskWorkerUrl, list[DaskTask]]:
+    tasks_per_worker = defaultdict(list)
+    for worker, tasks in worker_to_tasks.items():
+        for task_id, required_resources in tasks:
+            tasks_per_worker[worker].append(
+                DaskTask(
+                    task_id=_dask_key_to_dask_task_id(task_id),
+                    required_resources=required_resources,
+                )
+            )
+    return tasks_per_worker
 
-    def _list_tasks(
-        dask_scheduler: distributed.Scheduler,
-    ) -> dict[dask.typing.Key, dict[str, float]]:
-        # NOTE: task.key can be a byte, str, or a tuple
-        return {
-            task.key: task.resource_restrictions or {}
-            for task in dask_scheduler.unrunnable
-        }
 
-    async with _scheduler_client(scheduler_url, authentication) as client:
-        list_of_tasks: dict[
-            dask.typing.Key, DaskTaskResources
-        ] = await _wrap_client_async_routine(client.run_on_scheduler(_list_tasks))
-        _logger.debug("found unrunnable tasks: %s", list_of_tasks)
-        return [
-            DaskTask(
-                task_id=_dask_key_to_dask_task_id(task_id),
-                required_resources=task_resources,
-            )
-            for task_id, task_resources in list_of_tasks.items()
-        ]
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DaskTasksSnapshot:
+    unrunnable_tasks: list[DaskTask]
+    processing_tasks_per_worker: dict[DaskWorkerUrl, list[DaskTask]]
 
 
-async def list_processing_tasks_per_worker(
+async def get_tasks_snapshot(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     authentication: InternalClusterAuthentication,
-) -> dict[DaskWorkerUrl, list[DaskTask]]:
-    """
+) -> DaskTasksSnapshot:
+    """returns both the unrunnable and the processing tasks with a single call to the scheduler
+
     Raises:
         DaskSchedulerNotFoundError
     """
 
-    def _list_processing_tasks(
+    def _get_tasks_snapshot(
         dask_scheduler: distributed.Scheduler,
-    ) -> dict[str, list[tuple[dask.typing.Key, DaskTaskResources]]]:
+    ) -> tuple[
+        dict[dask.typing.Key, DaskTaskResources],
+        dict[str, list[tuple[dask.typing.Key, DaskTaskResources]]],
+    ]:
+        unrunnable_tasks = {
+            task.key: task.resource_restrictions or {}
+            for task in dask_scheduler.unrunnable
+        }
         worker_to_processing_tasks = defaultdict(list)
         for task_key, task_state in dask_scheduler.tasks.items():
             if task_state.processing_on:
                 worker_to_processing_tasks[task_state.processing_on.address].append(
                     (task_key, task_state.resource_restrictions or {})
                 )
-        return worker_to_processing_tasks
+        return unrunnable_tasks, worker_to_processing_tasks
 
-    async with _scheduler_client(scheduler_url, authentication) as client:
-        worker_to_tasks: dict[
-            str, list[tuple[dask.typing.Key, DaskTaskResources]]
-        ] = await _wrap_client_async_routine(
-            client.run_on_scheduler(_list_processing_tasks)
+    async with _scheduler_client(app, scheduler_url, authentication) as client:
+        unrunnable_tasks, worker_to_tasks = await _wrap_client_async_routine(
+            client.run_on_scheduler(_get_tasks_snapshot)
+        )
+        _logger.debug(
+            "found unrunnable tasks: %s, processing tasks: %s",
+            unrunnable_tasks,
+            worker_to_tasks,
         )
-        _logger.debug("found processing tasks: %s", worker_to_tasks)
-        tasks_per_worker = defaultdict(list)
-        for worker, tasks in worker_to_tasks.items():
-            for task_id, required_resources in tasks:
-                tasks_per_worker[worker].append(
-                    DaskTask(
-                        task_id=_dask_key_to_dask_task_id(task_id),
-                        required_resources=required_resources,
-                    )
+        return DaskTasksSnapshot(
+            unrunnable_tasks=[
+                DaskTask(
+                    task_id=_dask_key_to_dask_task_id(task_id),
+                    required_resources=task_resources,
                 )
-        return tasks_per_worker
+                for task_id, task_resources in unrunnable_tasks.items()
+            ],
+            processing_tasks_per_worker=_to_dask_tasks_per_worker(worker_to_tasks),
+        )
 
 
 async def get_worker_still_has_results_in_memory(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     authentication: InternalClusterAuthentication,
     ec2_instance: EC2InstanceData,
@@ -216,14 +392,12 @@ async def get_worker_still_has_results_in_memory(
         DaskWorkerNotFoundError
         DaskNoWorkersError
     """
-    async with _scheduler_client(scheduler_url, authentication) as client:
-        _, worker_details = _dask_worker_from_ec2_instance(client, ec2_instance)
-
-        worker_metrics: dict[str, Any] = worker_details["metrics"]
-        return 1 if worker_metrics.get("task_counts") else 0
+    workers_snapshot = await get_workers_snapshot(app, scheduler_url, authentication)
+    return workers_snapshot.get_worker_still_has_results_in_memory(ec2_instance)
 
 
 async def get_worker_used_resources(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     authentication: InternalClusterAuthentication,
     ec2_instance: EC2InstanceData,
@@ -235,57 +409,23 @@ async def get_worker_used_resources(
         DaskWorkerNotFoundError
         DaskNoWorkersError
     """
-
-    def _list_processing_tasks_on_worker(
-        dask_scheduler: distributed.Scheduler, *, worker_url: str
-    ) -> list[tuple[dask.typing.Key, DaskTaskResources]]:
-        processing_tasks = []
-        for task_key, task_state in dask_scheduler.tasks.items():
-            if task_state.processing_on and (
-                task_state.processing_on.address == worker_url
-            ):
-                processing_tasks.append(
-                    (task_key, task_state.resource_restrictions or {})
-                )
-        return processing_tasks
-
-    async with _scheduler_client(scheduler_url, authentication) as client:
-        worker_url, _ = _dask_worker_from_ec2_instance(client, ec2_instance)
-
-        _logger.debug("looking for processing tasksfor %s", f"{worker_url=}")
-
-        # now get the used resources
-        worker_processing_tasks: list[
-            tuple[dask.typing.Key, DaskTaskResources]
-        ] = await _wrap_client_async_routine(
-            client.run_on_scheduler(
-                _list_processing_tasks_on_worker, worker_url=worker_url
-            ),
-        )
-
-        total_resources_used: collections.Counter[str] = collections.Counter()
-        for _, task_resources in worker_processing_tasks:
-            total_resources_used.update(task_resources)
-
-        _logger.debug("found %s for %s", f"{total_resources_used=}", f"{worker_url=}")
-        return Resources(
-            cpus=total_resources_used.get("CPU", 0),
-            ram=parse_obj_as(ByteSize, total_resources_used.get("RAM", 0)),
-        )
+    workers_snapshot = await get_workers_snapshot(app, scheduler_url, authentication)
+    return workers_snapshot.get_worker_used_resources(ec2_instance)
 
 
 async def compute_cluster_total_resources(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     authentication: InternalClusterAuthentication,
     instances: list[AssociatedInstance],
 ) -> Resources:
     if not instances:
         return Resources.create_as_empty()
-    async with _scheduler_client(scheduler_url, authentication) as client:
+    async with _scheduler_client(app, scheduler_url, authentication) as client:
         instance_hosts = (
             node_ip_from_ec2_private_dns(i.ec2_instance) for i in instances
         )
-        scheduler_info = client.scheduler_info()
+        scheduler_info = await _get_scheduler_info(client)
         if "workers" not in scheduler_info or not scheduler_info["workers"]:
             raise DaskNoWorkersError(url=scheduler_url)
         workers: dict[str, Any] = scheduler_info["workers"]
@@ -297,9 +437,9 @@ async def compute_cluster_total_resources(
 
 
 async def try_retire_nodes(
-    scheduler_url: AnyUrl, authentication: InternalClusterAuthentication
+    app: FastAPI, scheduler_url: AnyUrl, authentication: InternalClusterAuthentication
 ) -> None:
-    async with _scheduler_client(scheduler_url, authentication) as client:
+    async with _scheduler_client(app, scheduler_url, authentication) as client:
         await _wrap_client_async_routine(
             client.retire_workers(close_workers=False, remove=False)
         )
@@ -0,0 +1,194 @@
+"""Placement of pending tasks onto instances (existing machines or machines to be started).
+
+The free resources of the instances are kept in flat arrays (one per resource type) and
+instances that cannot fit any of the pending tasks anymore are dropped from the candidates,
+so that placing N tasks does not rescan every instance of the cluster for every task.
+"""
+
+import array
+import collections
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from aws_library.ec2.models import Resources
+from pydantic import ByteSize
+from types_aiobotocore_ec2.literals import InstanceTypeType
+
+from ..models import AssociatedInstance, NonAssociatedInstance, TaskPlacementStrategy
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TaskDemand:
+    task: Any
+    required_resources: Resources
+    required_instance_type: InstanceTypeType | None
+
+
+def sort_demands(
+    demands: Iterable[TaskDemand], strategy: TaskPlacementStrategy
+) -> list[TaskDemand]:
+    if strategy is TaskPlacementStrategy.FIRST_FIT:
+        return list(demands)
+    # NOTE: sorted is stable, equally demanding tasks keep their order
+    return sorted(
+        demands,
+        key=lambda d: (d.required_resources.cpus, d.required_resources.ram),
+        reverse=True,
+    )
+
+
+def smallest_demand(demands: Iterable[TaskDemand]) -> Resources:
+    """returns the component-wise minimum of the demands"""
+    min_cpus = min_ram = None
+    for demand in demands:
+        cpus, ram = demand.required_resources.cpus, demand.required_resources.ram
+        min_cpus = cpus if min_cpus is None else min(min_cpus, cpus)
+        min_ram = ram if min_ram is None else min(min_ram, ram)
+    return Resources.construct(cpus=min_cpus or 0, ram=ByteSize(min_ram or 0))
+
+
+class ResourceBins:
+    """Free resources of a set of bins (instances or instance types).
+
+    Bins are kept in insertion order which is also their order of preference: a bin with
+    a lower tier is always preferred, e.g. active nodes are added (tier 0) before drained
+    nodes (tier 1), so that drained nodes only get tasks the active nodes cannot take.
+    A bin that cannot fit the smallest demand anymore is closed and never scanned again.
+    """
+
+    def __init__(
+        self,
+        *,
+        strategy: TaskPlacementStrategy,
+        smallest_demand: Resources | None = None,
+    ) -> None:
+        self._strategy = strategy
+        self._smallest_demand = smallest_demand or Resources.create_as_empty()
+        self._free_cpus = array.array("d")
+        self._free_ram = array.array("q")
+        self._capacity_cpus = array.array("d")
+        self._capacity_ram = array.array("q")
+        self._tiers = array.array("L")
+        self._open_bins: list[int] = []
+        self._open_bins_per_type: dict[str, list[int]] = collections.defaultdict(list)
+        self._instance_types: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._instance_types)
+
+    def add(
+        self,
+        *,
+        instance_type: str,
+        available: Resources,
+        capacity: Resources,
+        tier: int = 0,
+    ) -> int:
+        if self._tiers and tier < self._tiers[-1]:
+            msg = f"bins must be added by increasing tiers, got {tier=} after {self._tiers[-1]}"
+            raise ValueError(msg)
+        index = len(self._instance_types)
+        self._free_cpus.append(available.cpus)
+        self._free_ram.append(int(available.ram))
+        self._capacity_cpus.append(capacity.cpus)
+        self._capacity_ram.append(int(capacity.ram))
+        self._tiers.append(tier)
+        self._instance_types.append(instance_type)
+        if self._fits(index, self._smallest_demand.cpus, self._smallest_demand.ram):
+            self._open_bins.append(index)
+            self._open_bins_per_type[instance_type].append(index)
+        return index
+
+    def free_resources(self, index: int) -> Resources:
+        return Resources.construct(
+            cpus=max(self._free_cpus[index], 0), ram=ByteSize(self._free_ram[index])
+        )
+
+    def _fits(self, index: int, cpus: float, ram: int) -> bool:
+        return self._free_cpus[index] >= cpus and self._free_ram[index] >= ram
+
+    def _slack(self, index: int, cpus: float, ram: int) -> float:
+        # normalized left-over resources if the demand is placed in the bin
+        slack = 0.0
+        if self._capacity_cpus[index]:
+            slack += (self._free_cpus[index] - cpus) / self._capacity_cpus[index]
+        if self._capacity_ram[index]:
+            slack += (self._free_ram[index] - ram) / self._capacity_ram[index]
+        return slack
+
+    def find(self, demand: TaskDemand) -> int | None:
+        """returns the index of the bin where to place the demand, or None if it fits nowhere"""
+        candidates = (
+            self._open_bins_per_type.get(demand.required_instance_type, [])
+            if demand.required_instance_type
+            else self._open_bins
+        )
+        cpus = demand.required_resources.cpus
+        ram = int(demand.required_resources.ram)
+
+        if self._strategy is not TaskPlacementStrategy.BEST_FIT_DECREASING:
+            return next((i for i in candidates if self._fits(i, cpus, ram)), None)
+
+        best_index = None
+        best_slack = 0.0
+        for index in candidates:
+            if best_index is not None and self._tiers[index] > self._tiers[best_index]:
+                # a bin from a preferred tier was found already
+                break
+            if not self._fits(index, cpus, ram):
+                continue
+            slack = self._slack(index, cpus, ram)
+            if best_index is None or slack < best_slack:
+                best_index, best_slack = index, slack
+        return best_index
+
+    def place(self, index: int, demand: TaskDemand) -> None:
+        self._free_cpus[index] -= demand.required_resources.cpus
+        self._free_ram[index] -= int(demand.required_resources.ram)
+        if not self._fits(
+            index, self._smallest_demand.cpus, int(self._smallest_demand.ram)
+        ):
+            self._open_bins.remove(index)
+            self._open_bins_per_type[self._instance_types[index]].remove(index)
+
+
+def assign_tasks_to_instances(
+    demands: Sequence[TaskDemand],
+    instances_by_tier: Sequence[
+        Sequence[AssociatedInstance] | Sequence[NonAssociatedInstance]
+    ],
+    strategy: TaskPlacementStrategy,
+) -> list[TaskDemand]:
+    """assigns the demands to the instances, instances of the first tiers are filled up first.
+
+    Returns:
+        the demands that could not be placed on any instance
+    """
+    bins = ResourceBins(strategy=strategy, smallest_demand=smallest_demand(demands))
+    instances: list[AssociatedInstance | NonAssociatedInstance] = []
+    for tier, tier_instances in enumerate(instances_by_tier):
+        for instance in tier_instances:
+            bins.add(
+                instance_type=instance.ec2_instance.type,
+                available=instance.available_resources,
+                capacity=instance.ec2_instance.resources,
+                tier=tier,
+            )
+            instances.append(instance)
+
+    placed_tasks: dict[int, list] = collections.defaultdict(list)
+    unplaced_demands = []
+    for demand in sort_demands(demands, strategy):
+        index = bins.find(demand)
+        if index is None:
+            unplaced_demands.append(demand)
+            continue
+        bins.place(index, demand)
+        placed_tasks[index].append(demand.task)
+
+    for index, tasks in placed_tasks.items():
+        instances[index].assign_tasks(
+            tasks, remaining_resources=bins.free_resources(index)
+        )
+    return unplaced_demands
@@ -247,7 +247,7 @@ def create_dask_task_resources() -> Callable[..., DaskTaskResources]:
 @pytest.fixture
 def mock_dask_get_worker_has_results_in_memory(mocker: MockerFixture) -> mock.Mock:
     return mocker.patch(
-        "simcore_service_autoscaling.modules.dask.get_worker_still_has_results_in_memory",
+        "simcore_service_autoscaling.modules.dask.DaskWorkersSnapshot.get_worker_still_has_results_in_memory",
         return_value=0,
         autospec=True,
     )
@@ -256,7 +256,7 @@ def mock_dask_get_worker_has_results_in_memory(mocker: MockerFixture) -> mock.Mo
 @pytest.fixture
 def mock_dask_get_worker_used_resources(mocker: MockerFixture) -> mock.Mock:
     return mocker.patch(
-        "simcore_service_autoscaling.modules.dask.get_worker_used_resources",
+        "simcore_service_autoscaling.modules.dask.DaskWorkersSnapshot.get_worker_used_resources",
         return_value=Resources.create_as_empty(),
         autospec=True,
     )
@@ -265,7 +265,7 @@ def mock_dask_get_worker_used_resources(mocker: MockerFixture) -> mock.Mock:
 @pytest.fixture
 def mock_dask_is_worker_connected(mocker: MockerFixture) -> mock.Mock:
     return mocker.patch(
-        "simcore_service_autoscaling.modules.dask.is_worker_connected",
+        "simcore_service_autoscaling.modules.dask.DaskWorkersSnapshot.is_worker_connected",
         return_value=True,
         autospec=True,
     )
@@ -4,14 +4,16 @@
 
 
 import asyncio
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable
 from typing import Any, Final
 
 import distributed
 import pytest
 from arrow import utcnow
+from asgi_lifespan import LifespanManager
 from aws_library.ec2.models import Resources
 from faker import Faker
+from fastapi import FastAPI
 from models_library.clusters import (
     InternalClusterAuthentication,
     NoAuthentication,
@@ -31,12 +33,15 @@ from simcore_service_autoscaling.models import (
     EC2InstanceData,
 )
 from simcore_service_autoscaling.modules.dask import (
+    _DASK_SCHEDULER_CONNECT_TIMEOUT_S,
     DaskTask,
+    DaskTasksSnapshot,
     _scheduler_client,
+    get_tasks_snapshot,
     get_worker_still_has_results_in_memory,
     get_worker_used_resources,
-    list_processing_tasks_per_worker,
-    list_unrunnable_tasks,
+    get_workers_snapshot,
+    setup,
 )
 from tenacity import retry, stop_after_delay, wait_fixed
 
@@ -46,14 +51,23 @@ _authentication_types = [
 ]
 
 
+@pytest.fixture
+async def app() -> AsyncIterator[FastAPI]:
+    app = FastAPI()
+    setup(app)
+    async with LifespanManager(app):
+        yield app
+
+
 @pytest.mark.parametrize(
     "authentication", _authentication_types, ids=lambda p: f"authentication-{p.type}"
 )
 async def test__scheduler_client_with_wrong_url(
-    faker: Faker, authentication: InternalClusterAuthentication
+    app: FastAPI, faker: Faker, authentication: InternalClusterAuthentication
 ):
     with pytest.raises(DaskSchedulerNotFoundError):
         async with _scheduler_client(
+            app,
             parse_obj_as(AnyUrl, f"tcp://{faker.ipv4()}:{faker.port_number()}"),
             authentication,
         ):
@@ -86,44 +100,126 @@ def dask_workers_config() -> dict[str, Any]:
 
 
 async def test__scheduler_client(
-    scheduler_url: AnyUrl, scheduler_authentication: InternalClusterAuthentication
+    app: FastAPI,
+    scheduler_url: AnyUrl,
+    scheduler_authentication: InternalClusterAuthentication,
+):
+    async with _scheduler_client(app, scheduler_url, scheduler_authentication):
+        ...
+
+
+async def test__scheduler_client_is_reused_and_reconnects(
+    app: FastAPI,
+    scheduler_url: AnyUrl,
+    scheduler_authentication: InternalClusterAuthentication,
 ):
-    async with _scheduler_client(scheduler_url, scheduler_authentication):
+    async with _scheduler_client(
+        app, scheduler_url, scheduler_authentication
+    ) as client:
         ...
+    async with _scheduler_client(
+        app, scheduler_url, scheduler_authentication
+    ) as client2:
+        assert client2 is client
+
+    # a closed client is replaced
+    await client.close()
+    async with _scheduler_client(
+        app, scheduler_url, scheduler_authentication
+    ) as client3:
+        assert client3 is not client
+        assert client3.status == "running"
+
+
+
+@pytest.fixture
+async def unresponsive_scheduler_url() -> AsyncIterator[AnyUrl]:
+    # NOTE: accepts the connection but never answers, the client waits until its timeout
+    async def _never_answer(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await reader.read()
+        writer.close()
+
+    server = await asyncio.start_server(_never_answer, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    async with server:
+        yield parse_obj_as(AnyUrl, f"tcp://{host}:{port}")
+
+
+async def test__scheduler_client_unresponsive_scheduler_does_not_block_others(
+    app: FastAPI,
+    scheduler_url: AnyUrl,
+    scheduler_authentication: InternalClusterAuthentication,
+    unresponsive_scheduler_url: AnyUrl,
+):
+    async def _connect_to_unresponsive_scheduler() -> None:
+        with pytest.raises(DaskSchedulerNotFoundError):
+            async with _scheduler_client(
+                app, unresponsive_scheduler_url, scheduler_authentication
+            ):
+                ...
+
+    connecting_task = asyncio.create_task(_connect_to_unresponsive_scheduler())
+    await asyncio.sleep(0.5)
+    assert not connecting_task.done()
+
+    async def _connect_to_scheduler() -> None:
+        async with _scheduler_client(app, scheduler_url, scheduler_authentication):
+            ...
 
+    await asyncio.wait_for(
+        _connect_to_scheduler(), timeout=_DASK_SCHEDULER_CONNECT_TIMEOUT_S / 2
+    )
+    assert not connecting_task.done()
+    await connecting_task
 
-async def test_list_unrunnable_tasks_with_no_workers(
+async def test_get_tasks_snapshot_with_no_workers(
+    app: FastAPI,
     dask_local_cluster_without_workers: distributed.SpecCluster,
 ):
     scheduler_url = parse_obj_as(
         AnyUrl, dask_local_cluster_without_workers.scheduler_address
     )
-    assert await list_unrunnable_tasks(scheduler_url, NoAuthentication()) == []
+    assert await get_tasks_snapshot(
+        app, scheduler_url, NoAuthentication()
+    ) == DaskTasksSnapshot(unrunnable_tasks=[], processing_tasks_per_worker={})
 
 
-async def test_list_unrunnable_tasks(
+async def test_get_tasks_snapshot_unrunnable_tasks(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     scheduler_authentication: InternalClusterAuthentication,
     create_dask_task: Callable[[DaskTaskResources], distributed.Future],
 ):
     # we have nothing running now
-    assert await list_unrunnable_tasks(scheduler_url, scheduler_authentication) == []
+    tasks_snapshot = await get_tasks_snapshot(
+        app, scheduler_url, scheduler_authentication
+    )
+    assert tasks_snapshot.unrunnable_tasks == []
     # start a task that cannot run
     dask_task_impossible_resources = {"XRAM": 213}
     future = create_dask_task(dask_task_impossible_resources)
     assert future
-    assert await list_unrunnable_tasks(scheduler_url, scheduler_authentication) == [
+    tasks_snapshot = await get_tasks_snapshot(
+        app, scheduler_url, scheduler_authentication
+    )
+    assert tasks_snapshot.unrunnable_tasks == [
         DaskTask(task_id=future.key, required_resources=dask_task_impossible_resources)
     ]
     # remove that future, will remove the task
     del future
-    assert await list_unrunnable_tasks(scheduler_url, scheduler_authentication) == []
+    tasks_snapshot = await get_tasks_snapshot(
+        app, scheduler_url, scheduler_authentication
+    )
+    assert tasks_snapshot.unrunnable_tasks == []
 
 
 _REMOTE_FCT_SLEEP_TIME_S: Final[int] = 3
 
 
-async def test_list_processing_tasks(
+async def test_get_tasks_snapshot_processing_tasks(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     scheduler_authentication: InternalClusterAuthentication,
     dask_spec_cluster_client: distributed.Client,
@@ -135,18 +231,19 @@ async def test_list_processing_tasks(
         return x + y
 
     # there is nothing now
-    assert (
-        await list_processing_tasks_per_worker(scheduler_url, scheduler_authentication)
-        == {}
+    tasks_snapshot = await get_tasks_snapshot(
+        app, scheduler_url, scheduler_authentication
     )
+    assert tasks_snapshot.processing_tasks_per_worker == {}
 
     # this function will be queued and executed as there are no specific resources needed
     future_queued_task = dask_spec_cluster_client.submit(_add_fct, 2, 5)
     assert future_queued_task
 
-    assert await list_processing_tasks_per_worker(
-        scheduler_url, scheduler_authentication
-    ) == {
+    tasks_snapshot = await get_tasks_snapshot(
+        app, scheduler_url, scheduler_authentication
+    )
+    assert tasks_snapshot.processing_tasks_per_worker == {
         next(iter(dask_spec_cluster_client.scheduler_info()["workers"])): [
             DaskTask(task_id=DaskTaskId(future_queued_task.key), required_resources={})
         ]
@@ -156,10 +253,54 @@ async def test_list_processing_tasks(
     assert result == 7
 
     # nothing processing anymore
-    assert (
-        await list_processing_tasks_per_worker(scheduler_url, scheduler_authentication)
-        == {}
+    tasks_snapshot = await get_tasks_snapshot(
+        app, scheduler_url, scheduler_authentication
+    )
+    assert tasks_snapshot.processing_tasks_per_worker == {}
+
+
+async def test_get_tasks_snapshot(
+    app: FastAPI,
+    scheduler_url: AnyUrl,
+    scheduler_authentication: InternalClusterAuthentication,
+    dask_spec_cluster_client: distributed.Client,
+    create_dask_task: Callable[[DaskTaskResources], distributed.Future],
+):
+    def _add_fct(x: int, y: int) -> int:
+        import time
+
+        time.sleep(_REMOTE_FCT_SLEEP_TIME_S)
+        return x + y
+
+    assert await get_tasks_snapshot(
+        app, scheduler_url, scheduler_authentication
+    ) == DaskTasksSnapshot(unrunnable_tasks=[], processing_tasks_per_worker={})
+
+    dask_task_impossible_resources = {"XRAM": 213}
+    future_unrunnable_task = create_dask_task(dask_task_impossible_resources)
+    future_processing_task = dask_spec_cluster_client.submit(_add_fct, 2, 5)
+    assert future_processing_task
+
+    assert await get_tasks_snapshot(
+        app, scheduler_url, scheduler_authentication
+    ) == DaskTasksSnapshot(
+        unrunnable_tasks=[
+            DaskTask(
+                task_id=future_unrunnable_task.key,
+                required_resources=dask_task_impossible_resources,
+            )
+        ],
+        processing_tasks_per_worker={
+            next(iter(dask_spec_cluster_client.scheduler_info()["workers"])): [
+                DaskTask(
+                    task_id=DaskTaskId(future_processing_task.key),
+                    required_resources={},
+                )
+            ]
+        },
     )
+    result = await future_processing_task.result(timeout=_REMOTE_FCT_SLEEP_TIME_S + 4)  # type: ignore
+    assert result == 7
 
 
 _DASK_SCHEDULER_REACTION_TIME_S: Final[int] = 4
@@ -183,12 +324,14 @@ def fake_ec2_instance_data_with_invalid_ec2_name(
 
 
 async def test_get_worker_still_has_results_in_memory_with_invalid_ec2_name_raises(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     scheduler_authentication: InternalClusterAuthentication,
     fake_ec2_instance_data_with_invalid_ec2_name: EC2InstanceData,
 ):
     with pytest.raises(Ec2InvalidDnsNameError):
         await get_worker_still_has_results_in_memory(
+            app,
             scheduler_url,
             scheduler_authentication,
             fake_ec2_instance_data_with_invalid_ec2_name,
@@ -196,6 +339,7 @@ async def test_get_worker_still_has_results_in_memory_with_invalid_ec2_name_rais
 
 
 async def test_get_worker_still_has_results_in_memory_with_no_workers_raises(
+    app: FastAPI,
     dask_local_cluster_without_workers: distributed.SpecCluster,
     fake_localhost_ec2_instance_data: EC2InstanceData,
 ):
@@ -204,11 +348,12 @@ async def test_get_worker_still_has_results_in_memory_with_no_workers_raises(
     )
     with pytest.raises(DaskNoWorkersError):
         await get_worker_still_has_results_in_memory(
-            scheduler_url, NoAuthentication(), fake_localhost_ec2_instance_data
+            app, scheduler_url, NoAuthentication(), fake_localhost_ec2_instance_data
         )
 
 
 async def test_get_worker_still_has_results_in_memory_with_invalid_worker_host_raises(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     scheduler_authentication: InternalClusterAuthentication,
     fake_ec2_instance_data: Callable[..., EC2InstanceData],
@@ -216,12 +361,13 @@ async def test_get_worker_still_has_results_in_memory_with_invalid_worker_host_r
     ec2_instance_data = fake_ec2_instance_data()
     with pytest.raises(DaskWorkerNotFoundError):
         await get_worker_still_has_results_in_memory(
-            scheduler_url, scheduler_authentication, ec2_instance_data
+            app, scheduler_url, scheduler_authentication, ec2_instance_data
         )
 
 
 @pytest.mark.parametrize("fct_shall_err", [True, False], ids=str)
 async def test_get_worker_still_has_results_in_memory(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     scheduler_authentication: InternalClusterAuthentication,
     dask_spec_cluster_client: distributed.Client,
@@ -231,7 +377,10 @@ async def test_get_worker_still_has_results_in_memory(
     # nothing ran, so it's 0
     assert (
         await get_worker_still_has_results_in_memory(
-            scheduler_url, scheduler_authentication, fake_localhost_ec2_instance_data
+            app,
+            scheduler_url,
+            scheduler_authentication,
+            fake_localhost_ec2_instance_data,
         )
         == 0
     )
@@ -249,7 +398,10 @@ async def test_get_worker_still_has_results_in_memory(
     await _wait_for_task_done(future_queued_task)
     assert (
         await get_worker_still_has_results_in_memory(
-            scheduler_url, scheduler_authentication, fake_localhost_ec2_instance_data
+            app,
+            scheduler_url,
+            scheduler_authentication,
+            fake_localhost_ec2_instance_data,
         )
         == 1
     )
@@ -267,7 +419,10 @@ async def test_get_worker_still_has_results_in_memory(
     await _wait_for_dask_scheduler_to_change_state()
     assert (
         await get_worker_still_has_results_in_memory(
-            scheduler_url, scheduler_authentication, fake_localhost_ec2_instance_data
+            app,
+            scheduler_url,
+            scheduler_authentication,
+            fake_localhost_ec2_instance_data,
         )
         == 1
     )
@@ -277,19 +432,52 @@ async def test_get_worker_still_has_results_in_memory(
     await _wait_for_dask_scheduler_to_change_state()
     assert (
         await get_worker_still_has_results_in_memory(
-            scheduler_url, scheduler_authentication, fake_localhost_ec2_instance_data
+            app,
+            scheduler_url,
+            scheduler_authentication,
+            fake_localhost_ec2_instance_data,
         )
         == 0
     )
 
 
+
+async def test_get_workers_snapshot(
+    app: FastAPI,
+    scheduler_url: AnyUrl,
+    scheduler_authentication: InternalClusterAuthentication,
+    fake_localhost_ec2_instance_data: EC2InstanceData,
+    fake_ec2_instance_data: Callable[..., EC2InstanceData],
+):
+    workers_snapshot = await get_workers_snapshot(
+        app, scheduler_url, scheduler_authentication
+    )
+    assert len(workers_snapshot.workers) == 1
+    assert workers_snapshot.is_worker_connected(fake_localhost_ec2_instance_data)
+    assert not workers_snapshot.is_worker_connected(fake_ec2_instance_data())
+    # the same snapshot answers for all the instances
+    assert (
+        workers_snapshot.get_worker_used_resources(fake_localhost_ec2_instance_data)
+        == Resources.create_as_empty()
+    )
+    assert (
+        workers_snapshot.get_worker_still_has_results_in_memory(
+            fake_localhost_ec2_instance_data
+        )
+        == 0
+    )
+    with pytest.raises(DaskWorkerNotFoundError):
+        workers_snapshot.get_worker_used_resources(fake_ec2_instance_data())
+
 async def test_worker_used_resources_with_invalid_ec2_name_raises(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     scheduler_authentication: InternalClusterAuthentication,
     fake_ec2_instance_data_with_invalid_ec2_name: EC2InstanceData,
 ):
     with pytest.raises(Ec2InvalidDnsNameError):
         await get_worker_used_resources(
+            app,
             scheduler_url,
             scheduler_authentication,
             fake_ec2_instance_data_with_invalid_ec2_name,
@@ -297,6 +485,7 @@ async def test_worker_used_resources_with_invalid_ec2_name_raises(
 
 
 async def test_worker_used_resources_with_no_workers_raises(
+    app: FastAPI,
     dask_local_cluster_without_workers: distributed.SpecCluster,
     fake_localhost_ec2_instance_data: EC2InstanceData,
 ):
@@ -305,11 +494,12 @@ async def test_worker_used_resources_with_no_workers_raises(
     )
     with pytest.raises(DaskNoWorkersError):
         await get_worker_used_resources(
-            scheduler_url, NoAuthentication(), fake_localhost_ec2_instance_data
+            app, scheduler_url, NoAuthentication(), fake_localhost_ec2_instance_data
         )
 
 
 async def test_worker_used_resources_with_invalid_worker_host_raises(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     scheduler_authentication: InternalClusterAuthentication,
     fake_ec2_instance_data: Callable[..., EC2InstanceData],
@@ -317,11 +507,12 @@ async def test_worker_used_resources_with_invalid_worker_host_raises(
     ec2_instance_data = fake_ec2_instance_data()
     with pytest.raises(DaskWorkerNotFoundError):
         await get_worker_used_resources(
-            scheduler_url, scheduler_authentication, ec2_instance_data
+            app, scheduler_url, scheduler_authentication, ec2_instance_data
         )
 
 
 async def test_worker_used_resources(
+    app: FastAPI,
     scheduler_url: AnyUrl,
     scheduler_authentication: InternalClusterAuthentication,
     dask_spec_cluster_client: distributed.Client,
@@ -330,7 +521,10 @@ async def test_worker_used_resources(
     # initial state
     assert (
         await get_worker_used_resources(
-            scheduler_url, scheduler_authentication, fake_localhost_ec2_instance_data
+            app,
+            scheduler_url,
+            scheduler_authentication,
+            fake_localhost_ec2_instance_data,
         )
         == Resources.create_as_empty()
     )
@@ -349,7 +543,7 @@ async def test_worker_used_resources(
     assert future_queued_task
     await _wait_for_dask_scheduler_to_change_state()
     assert await get_worker_used_resources(
-        scheduler_url, scheduler_authentication, fake_localhost_ec2_instance_data
+        app, scheduler_url, scheduler_authentication, fake_localhost_ec2_instance_data
     ) == Resources(cpus=num_cpus, ram=ByteSize(0))
 
     result = await future_queued_task.result(timeout=_DASK_SCHEDULER_REACTION_TIME_S)  # type: ignore
@@ -358,7 +552,10 @@ async def test_worker_used_resources(
     # back to no use
     assert (
         await get_worker_used_resources(
-            scheduler_url, scheduler_authentication, fake_localhost_ec2_instance_data
+            app,
+            scheduler_url,
+            scheduler_authentication,
+            fake_localhost_ec2_instance_data,
         )
         == Resources.create_as_empty()
     )
@@ -0,0 +1,239 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+import logging
+import math
+import random
+import time
+from collections.abc import Callable
+
+import pytest
+from aws_library.ec2.models import EC2InstanceData, EC2InstanceType, Resources
+from pydantic import ByteSize
+from simcore_service_autoscaling.models import (
+    AssignedTasksToInstanceType,
+    NonAssociatedInstance,
+    TaskPlacementStrategy,
+)
+from simcore_service_autoscaling.utils.task_placement import (
+    ResourceBins,
+    TaskDemand,
+    assign_tasks_to_instances,
+    sort_demands,
+)
+
+_logger = logging.getLogger(__name__)
+
+_GiB = 1024**3
+
+
+def _demand(
+    cpus: float, ram_gib: int, instance_type: str | None = None
+) -> TaskDemand:
+    return TaskDemand(
+        task=f"task_{cpus=}_{ram_gib=}_{random.random()}",  # noqa: S311
+        required_resources=Resources(cpus=cpus, ram=ByteSize(ram_gib * _GiB)),
+        required_instance_type=instance_type,  # type: ignore[arg-type]
+    )
+
+
+@pytest.fixture
+def create_instance(
+    fake_ec2_instance_data: Callable[..., EC2InstanceData]
+) -> Callable[..., NonAssociatedInstance]:
+    def _creator(
+        cpus: float, ram_gib: int, instance_type: str = "t2.xlarge"
+    ) -> NonAssociatedInstance:
+        return NonAssociatedInstance(
+            ec2_instance=fake_ec2_instance_data(
+                type=instance_type,
+                resources=Resources(cpus=cpus, ram=ByteSize(ram_gib * _GiB)),
+            )
+        )
+
+    return _creator
+
+
+@pytest.mark.parametrize("strategy", list(TaskPlacementStrategy))
+def test_assign_tasks_to_instances_fills_first_tiers_first(
+    create_instance: Callable[..., NonAssociatedInstance],
+    strategy: TaskPlacementStrategy,
+):
+    active = create_instance(4, 16)
+    drained = create_instance(4, 16)
+    demands = [_demand(2, 4), _demand(2, 4), _demand(1, 1)]
+
+    unplaced = assign_tasks_to_instances(demands, [[active], [drained]], strategy)
+
+    assert not unplaced
+    assert len(active.assigned_tasks) == 2
+    assert len(drained.assigned_tasks) == 1
+    assert drained.has_assigned_tasks()
+    total_cpus = active.available_resources.cpus + drained.available_resources.cpus
+    assert total_cpus == 8 - 5
+
+
+@pytest.mark.parametrize("strategy", list(TaskPlacementStrategy))
+def test_assign_tasks_to_instances_respects_required_instance_type(
+    create_instance: Callable[..., NonAssociatedInstance],
+    strategy: TaskPlacementStrategy,
+):
+    instance = create_instance(16, 64, instance_type="r5n.4xlarge")
+    demands = [
+        _demand(1, 1, instance_type="g4dn.xlarge"),
+        _demand(1, 1, instance_type="r5n.4xlarge"),
+        _demand(32, 1),
+    ]
+    unplaced = assign_tasks_to_instances(demands, [[instance]], strategy)
+    assert {d.task for d in unplaced} == {demands[0].task, demands[2].task}
+    assert instance.assigned_tasks == [demands[1].task]
+    assert instance.available_resources == Resources(
+        cpus=15, ram=ByteSize(63 * _GiB)
+    )
+
+
+def test_first_fit_keeps_tasks_order():
+    demands = [_demand(1, 1), _demand(4, 1), _demand(2, 8)]
+    assert sort_demands(demands, TaskPlacementStrategy.FIRST_FIT) == demands
+    assert sort_demands(demands, TaskPlacementStrategy.FIRST_FIT_DECREASING) == [
+        demands[1],
+        demands[2],
+        demands[0],
+    ]
+
+
+def test_best_fit_picks_tightest_bin_of_preferred_tier():
+    bins = ResourceBins(strategy=TaskPlacementStrategy.BEST_FIT_DECREASING)
+    capacity = Resources(cpus=8, ram=ByteSize(32 * _GiB))
+    loose = bins.add(instance_type="t2.2xlarge", available=capacity, capacity=capacity)
+    tight = bins.add(
+        instance_type="t2.2xlarge",
+        available=Resources(cpus=2, ram=ByteSize(4 * _GiB)),
+        capacity=capacity,
+    )
+    tighter_but_other_tier = bins.add(
+        instance_type="t2.2xlarge",
+        available=Resources(cpus=1, ram=ByteSize(1 * _GiB)),
+        capacity=capacity,
+        tier=1,
+    )
+    demand = _demand(1, 1)
+    assert bins.find(demand) == tight
+    bins.place(tight, demand)
+    assert bins.free_resources(tight) == Resources(cpus=1, ram=ByteSize(3 * _GiB))
+    # the tier 1 bin is only used when nothing fits in tier 0
+    assert bins.find(_demand(8, 30)) == loose
+    bins.place(loose, _demand(8, 30))
+    assert bins.find(_demand(1, 1)) == tight
+    bins.place(tight, _demand(1, 1))
+    assert bins.find(_demand(1, 1)) == tighter_but_other_tier
+    assert bins.find(_demand(1, 4)) is None
+
+
+def test_bins_are_closed_when_smallest_demand_does_not_fit():
+    bins = ResourceBins(
+        strategy=TaskPlacementStrategy.FIRST_FIT,
+        smallest_demand=Resources(cpus=1, ram=ByteSize(1 * _GiB)),
+    )
+    capacity = Resources(cpus=2, ram=ByteSize(2 * _GiB))
+    index = bins.add(instance_type="t2.small", available=capacity, capacity=capacity)
+    bins.place(index, _demand(1.5, 1))
+    assert bins.find(_demand(0.5, 1)) is None
+
+    with pytest.raises(ValueError, match="increasing tiers"):
+        bins.add(instance_type="t2.small", available=capacity, capacity=capacity, tier=-1)
+
+
+#
+# benchmark harness: compares the placement engine with the former greedy first-fit
+#
+
+
+def _greedy_first_fit(
+    demands: list[TaskDemand], instance_types: list[EC2InstanceType]
+) -> list[AssignedTasksToInstanceType]:
+    # NOTE: this is how the autoscaling used to place the tasks onto the instances to start
+    needed: list[AssignedTasksToInstanceType] = []
+    for demand in demands:
+        for instance in needed:
+            if instance.has_resources_for_task(demand.required_resources):
+                instance.assign_task(demand.task, demand.required_resources)
+                break
+        else:
+            needed.append(
+                AssignedTasksToInstanceType(
+                    instance_type=instance_types[0],
+                    assigned_tasks=[demand.task],
+                    available_resources=instance_types[0].resources
+                    - demand.required_resources,
+                )
+            )
+    return needed
+
+
+def _engine(
+    demands: list[TaskDemand],
+    instance_types: list[EC2InstanceType],
+    strategy: TaskPlacementStrategy,
+) -> int:
+    bins = ResourceBins(strategy=strategy)
+    for demand in sort_demands(demands, strategy):
+        index = bins.find(demand)
+        if index is None:
+            index = bins.add(
+                instance_type=instance_types[0].name,
+                available=instance_types[0].resources,
+                capacity=instance_types[0].resources,
+            )
+        bins.place(index, demand)
+    return len(bins)
+
+
+def _synthetic_demands(num_tasks: int, seed: int) -> list[TaskDemand]:
+    rng = random.Random(seed)  # noqa: S311
+    return [
+        _demand(rng.choice([0.5, 1, 2, 3, 6]), rng.choice([1, 2, 4, 8, 16, 24]))
+        for _ in range(num_tasks)
+    ]
+
+
+@pytest.mark.parametrize("num_tasks", [10, 500, 2000])
+def test_placement_benchmark_against_greedy(num_tasks: int):
+    instance_types = [
+        EC2InstanceType(
+            name="r5n.2xlarge",
+            resources=Resources(cpus=8, ram=ByteSize(64 * _GiB)),
+        )
+    ]
+    demands = _synthetic_demands(num_tasks, seed=num_tasks)
+    lower_bound = math.ceil(
+        max(
+            sum(d.required_resources.cpus for d in demands)
+            / instance_types[0].resources.cpus,
+            sum(d.required_resources.ram for d in demands)
+            / instance_types[0].resources.ram,
+        )
+    )
+
+    start = time.perf_counter()
+    greedy_num_instances = len(_greedy_first_fit(demands, instance_types))
+    greedy_duration = time.perf_counter() - start
+
+    for strategy in TaskPlacementStrategy:
+        start = time.perf_counter()
+        num_instances = _engine(demands, instance_types, strategy)
+        duration = time.perf_counter() - start
+        _logger.info(
+            "%s: %s tasks placed on %s instances in %.3fs (greedy: %s instances in %.3fs)",
+            strategy,
+            num_tasks,
+            num_instances,
+            duration,
+            greedy_num_instances,
+            greedy_duration,
+        )
+        assert num_instances >= lower_bound
+        if strategy is TaskPlacementStrategy.FIRST_FIT:
+            # same heuristic, same outcome
+            assert num_instances == greedy_num_instances
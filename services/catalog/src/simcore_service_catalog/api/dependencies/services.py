@@ -17,6 +17,7 @@ from ...db.repositories.groups import GroupsRepository
 from ...db.repositories.services import ServicesRepository
 from ...services import manifest
 from ...services.director import DirectorApi
+from ...services.services_index import ServicesIndex
 from .database import get_repository
 from .director import get_director_api
 
@@ -37,6 +38,11 @@ def get_default_service_specifications(
     return app_settings.CATALOG_SERVICES_DEFAULT_SPECIFICATIONS
 
 
+def get_services_index(app: Annotated[FastAPI, Depends(get_app)]) -> ServicesIndex:
+    services_index: ServicesIndex = app.state.services_index
+    return services_index
+
+
 @dataclass(frozen=True)
 class AccessInfo:
     uid: int
@@ -3,31 +3,30 @@
 import asyncio
 import logging
 import urllib.parse
-from typing import Annotated, Any, TypeAlias, cast
+from functools import partial
+from typing import Annotated, Any, TypeAlias
 
-from aiocache import cached  # type: ignore[import-untyped]
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 from models_library.api_schemas_catalog.services import ServiceGet, ServiceUpdate
+from models_library.groups import GroupTypeInModel
 from models_library.services import ServiceKey, ServiceType, ServiceVersion
 from models_library.services_metadata_published import ServiceMetaDataPublished
+from models_library.users import GroupID
 from pydantic import ValidationError
 from pydantic.types import PositiveInt
 from servicelib.fastapi.requests_decorators import cancel_on_disconnect
 from starlette.requests import Request
 
-from ..._constants import (
-    DIRECTOR_CACHING_TTL,
-    LIST_SERVICES_CACHING_TTL,
-    RESPONSE_MODEL_POLICY,
-)
+from ..._constants import RESPONSE_MODEL_POLICY
 from ...db.repositories.groups import GroupsRepository
 from ...db.repositories.services import ServicesRepository
 from ...models.services_db import ServiceAccessRightsAtDB, ServiceMetaDataAtDB
 from ...services.director import DirectorApi
 from ...services.function_services import is_function_service
+from ...services.services_index import ServicesIndex
 from ..dependencies.database import get_repository
 from ..dependencies.director import get_director_api
-from ..dependencies.services import get_service_from_manifest
+from ..dependencies.services import get_service_from_manifest, get_services_index
 
 _logger = logging.getLogger(__name__)
 
@@ -41,7 +40,7 @@ def _compose_service_details(
     service_owner: str | None,
 ) -> ServiceGet | None:
     # compose service from registry and DB
-    service = service_in_registry
+    service = {**service_in_registry}
     service.update(
         service_in_db.dict(exclude_unset=True, exclude={"owner"}),
         access_rights={rights.gid: rights for rights in service_access_rights_in_db},
@@ -61,10 +60,6 @@ def _compose_service_details(
     return None
 
 
-def _build_cache_key(fct, *_, **kwargs):
-    return f"{fct.__name__}_{kwargs['user_id']}_{kwargs['x_simcore_products_name']}_{kwargs['details']}"
-
-
 #
 # Routes
 #
@@ -74,13 +69,9 @@ router = APIRouter()
 
 # NOTE: this call is pretty expensive and can be called several times
 # (when e2e runs or by the webserver when listing projects) therefore
-# a cache is setup here
+# the detailed listings are kept in the services index (SEE services/services_index.py)
 @router.get("", response_model=list[ServiceGet], **RESPONSE_MODEL_POLICY)
 @cancel_on_disconnect
-@cached(
-    ttl=LIST_SERVICES_CACHING_TTL,
-    key_builder=_build_cache_key,
-)
 async def list_services(
     request: Request,  # pylint:disable=unused-argument
     *,
@@ -92,6 +83,7 @@ async def list_services(
     services_repo: Annotated[
         ServicesRepository, Depends(get_repository(ServicesRepository))
     ],
+    services_index: Annotated[ServicesIndex, Depends(get_services_index)],
     x_simcore_products_name: Annotated[str, Header(...)],
     details: bool = True,
 ):
@@ -105,18 +97,25 @@ async def list_services(
         )
 
     # now get the executable or writable services
-    services_in_db = {
-        (s.key, s.version): s
-        for s in await services_repo.list_services(
-            gids=[group.gid for group in user_groups],
-            execute_access=True,
-            write_access=True,
-            combine_access_with_and=False,
-            product_name=x_simcore_products_name,
-        )
-    }
+    async def _list_services_in_db(
+        gids: list[GroupID],
+    ) -> dict[tuple[str, str], ServiceMetaDataAtDB]:
+        return {
+            (s.key, s.version): s
+            for s in await services_repo.list_services(
+                gids=gids,
+                execute_access=True,
+                write_access=True,
+                combine_access_with_and=False,
+                product_name=x_simcore_products_name,
+            )
+        }
+
     # Non-detailed views from the services_repo database
     if not details:
+        services_in_db = await _list_services_in_db(
+            [group.gid for group in user_groups]
+        )
         # only return a stripped down version
         # NOTE: here validation is not necessary since key,version were already validated
         # in terms of time, this takes the most
@@ -136,51 +135,80 @@ async def list_services(
             for key, version in services_in_db
         ]
 
-    # caching this steps brings down the time to generate it at the expense of being sometimes a bit out of date
-    @cached(ttl=DIRECTOR_CACHING_TTL)
-    async def cached_registry_services() -> dict[str, Any]:
-        return cast(dict[str, Any], await director_client.get("/services"))
-
-    (
-        services_in_registry,
-        services_access_rights,
-        services_owner_emails,
-    ) = await asyncio.gather(
-        cached_registry_services(),
-        services_repo.list_services_access_rights(
-            key_versions=services_in_db,
-            product_name=x_simcore_products_name,
-        ),
-        groups_repository.list_user_emails_from_gids(
-            {s.owner for s in services_in_db.values() if s.owner}
-        ),
+    async def _compose_services_details(
+        gids: list[GroupID], exclude: ServicesSelection
+    ) -> list[ServiceGet]:
+        services_in_db = {
+            key_version: service_in_db
+            for key_version, service_in_db in (
+                await _list_services_in_db(gids)
+            ).items()
+            if key_version not in exclude
+        }
+        if not services_in_db:
+            return []
+        (
+            services_in_registry,
+            services_access_rights,
+            services_owner_emails,
+        ) = await asyncio.gather(
+            services_index.get_registry_services(director_client),
+            services_repo.list_services_access_rights(
+                key_versions=services_in_db,
+                product_name=x_simcore_products_name,
+            ),
+            groups_repository.list_user_emails_from_gids(
+                {s.owner for s in services_in_db.values() if s.owner}
+            ),
+        )
+
+        # NOTE: for the details of the services:
+        # 1. we get all the services from the index (registry of the director-v0 and function services)
+        # 2. we filter the services using the visible ones from the db
+        # 3. then we compose the final service using as a base the registry service, overriding with the same
+        #    service from the database, adding also the access rights and the owner as email address instead of gid
+        # NOTE: This step takes the bulk of the time to generate the list
+        services_details = await asyncio.gather(
+            *[
+                asyncio.get_event_loop().run_in_executor(
+                    None,
+                    _compose_service_details,
+                    services_in_registry[key_version],
+                    service_in_db,
+                    services_access_rights[key_version],
+                    services_owner_emails.get(service_in_db.owner or 0),
+                )
+                for key_version, service_in_db in services_in_db.items()
+                if key_version in services_in_registry
+            ]
+        )
+        return [s for s in services_details if s is not None]
+
+    # NOTE: the listing of the shared groups (i.e. all but the primary group) only depends
+    # on the product and those groups, i.e. it is shared with all users in the same groups.
+    # The services accessible through the user's primary group are composed on top of it.
+    shared_gids = [
+        group.gid
+        for group in user_groups
+        if group.group_type != GroupTypeInModel.PRIMARY
+    ]
+    primary_gids = [
+        group.gid
+        for group in user_groups
+        if group.group_type == GroupTypeInModel.PRIMARY
+    ]
+    shared_listing = await services_index.get_or_compose_listing(
+        x_simcore_products_name,
+        set(shared_gids),
+        partial(_compose_services_details, shared_gids, set()),
     )
+    if not primary_gids:
+        return shared_listing
 
-    # NOTE: for the details of the services:
-    # 1. we get all the services from the director-v0 (TODO: move the registry to the catalog)
-    # 2. we filter the services using the visible ones from the db
-    # 3. then we compose the final service using as a base the registry service, overriding with the same
-    #    service from the database, adding also the access rights and the owner as email address instead of gid
-    # NOTE: This step takes the bulk of the time to generate the list
-    services_details = await asyncio.gather(
-        *[
-            asyncio.get_event_loop().run_in_executor(
-                None,
-                _compose_service_details,
-                s,
-                services_in_db[s["key"], s["version"]],
-                services_access_rights[s["key"], s["version"]],
-                services_owner_emails.get(
-                    services_in_db[s["key"], s["version"]].owner or 0
-                ),
-            )
-            for s in (
-                request.app.state.frontend_services_catalog + services_in_registry
-            )
-            if (s.get("key"), s.get("version")) in services_in_db
-        ]
+    return shared_listing + await _compose_services_details(
+        primary_gids,
+        {(service.key, service.version) for service in shared_listing},
     )
-    return [s for s in services_details if s is not None]
 
 
 @router.get(
@@ -279,6 +307,7 @@ async def update_service(
     services_repo: Annotated[
         ServicesRepository, Depends(get_repository(ServicesRepository))
     ],
+    services_index: Annotated[ServicesIndex, Depends(get_services_index)],
     x_simcore_products_name: Annotated[str | None, Header()] = None,
 ):
     if is_function_service(service_key):
@@ -366,6 +395,8 @@ async def update_service(
         ]
         await services_repo.delete_service_access_rights(deleted_access_rights)
 
+    services_index.invalidate()
+
     # now return the service
     assert x_simcore_products_name  # nosec
     return await get_service(
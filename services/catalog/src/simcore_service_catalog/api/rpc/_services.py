@@ -24,6 +24,7 @@ from servicelib.rabbitmq.rpc_interfaces.catalog.errors import (
 from ...db.repositories.services import ServicesRepository
 from ...services import services_api
 from ..dependencies.director import get_director_api
+from ..dependencies.services import get_services_index
 
 _logger = logging.getLogger(__name__)
 
@@ -139,6 +140,7 @@ async def update_service(
         service_version=service_version,
         update=update,
     )
+    get_services_index(app).invalidate()
 
     assert service.key == service_key  # nosec
     assert service.version == service_version  # nosec
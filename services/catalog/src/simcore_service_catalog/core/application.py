@@ -17,6 +17,7 @@ from ..api.rpc.routes import setup_rpc_api_routes
 from ..exceptions.handlers import setup_exception_handlers
 from ..services.function_services import setup_function_services
 from ..services.rabbitmq import setup_rabbitmq
+from ..services.services_index import setup_services_index
 from .events import create_on_shutdown, create_on_startup
 from .settings import ApplicationSettings
 
@@ -51,6 +52,7 @@ def create_app(settings: ApplicationSettings | None = None) -> FastAPI:
     # PLUGIN SETUP
     setup_function_services(app)
     setup_rabbitmq(app)
+    setup_services_index(app)
 
     if app.state.settings.CATALOG_PROMETHEUS_INSTRUMENTATION_ENABLED:
         setup_prometheus_instrumentation(app)
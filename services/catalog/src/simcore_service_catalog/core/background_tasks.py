@@ -6,6 +6,8 @@
     3.a. basic access rights are set as following:
         1. writable access allow the user to change meta data as well as access rights
         2. executable access allow the user to see/execute the service
+4. refreshes the services index with the registry services (i.e. listings are invalidated
+   only if the registry or the services in the DB changed)
 
 """
 
@@ -20,6 +22,7 @@ from models_library.services import ServiceMetaDataPublished
 from models_library.services_types import ServiceKey, ServiceVersion
 from packaging.version import Version
 from simcore_service_catalog.api.dependencies.director import get_director_api
+from simcore_service_catalog.api.dependencies.services import get_services_index
 from simcore_service_catalog.services import manifest
 from sqlalchemy.ext.asyncio import AsyncEngine
 
@@ -97,6 +100,8 @@ async def _ensure_registry_and_database_are_synced(app: FastAPI) -> None:
     """
     director_api = get_director_api(app)
     services_in_manifest_map = await manifest.get_services_map(director_api)
+    services_index = get_services_index(app)
+    services_index.update_registry_services(services_in_manifest_map)
 
     services_in_db: set[
         tuple[ServiceKey, ServiceVersion]
@@ -114,11 +119,12 @@ async def _ensure_registry_and_database_are_synced(app: FastAPI) -> None:
         await _create_services_in_database(
             app, missing_services_in_db, services_in_manifest_map
         )
+        services_index.invalidate()
 
 
 async def _ensure_published_templates_accessible(
     db_engine: AsyncEngine, default_product_name: str
-) -> None:
+) -> bool:
     # Rationale: if a project template was published, its services must be available to everyone.
     # a published template has a column Published that is set to True
     projects_repo = ProjectsRepository(db_engine)
@@ -155,6 +161,7 @@ async def _ensure_published_templates_accessible(
             missing_services_access_rights,
         )
         await services_repo.upsert_service_access_rights(missing_services_access_rights)
+    return bool(missing_services_access_rights)
 
 
 async def _run_sync_services(app: FastAPI):
@@ -166,7 +173,8 @@ async def _run_sync_services(app: FastAPI):
 
     # check that the published services are available to everyone
     # (templates are published to GUESTs, so their services must be also accessible)
-    await _ensure_published_templates_accessible(engine, default_product)
+    if await _ensure_published_templates_accessible(engine, default_product):
+        get_services_index(app).invalidate()
 
 
 async def _sync_services_task(app: FastAPI) -> None:
@@ -0,0 +1,189 @@
+""" Catalog-wide index of the services listed with details
+
+- the registry services (i.e. the published part) are fetched once from the director and
+  are then refreshed by the registry sync task (SEE core/background_tasks.py)
+- the composed listings (registry + db) are kept per (product, shared groups), i.e. all the
+  user's groups but the primary one, so that users in the same groups share the same listing
+- expired listings and the locks of the listings being composed are dropped so that the index
+  does not grow with the number of group combinations ever requested
+- listings are invalidated whenever the registry or the services in the database change
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Final, TypeAlias
+
+from fastapi import FastAPI
+from models_library.api_schemas_catalog.services import ServiceGet
+from models_library.products import ProductName
+from models_library.services_types import ServiceKey, ServiceVersion
+from models_library.users import GroupID
+from prometheus_client import REGISTRY, Counter
+
+from .._constants import LIST_SERVICES_CACHING_TTL
+from .._meta import PROJECT_NAME
+from .director import DirectorApi
+from .manifest import ServiceMetaDataPublishedDict, get_services_map
+
+_logger = logging.getLogger(__name__)
+
+_METRICS_NAMESPACE: Final[str] = PROJECT_NAME.replace("-", "_")
+
+ListingKey: TypeAlias = tuple[ProductName, frozenset[GroupID]]
+RegistryServicesDict: TypeAlias = dict[
+    tuple[ServiceKey, ServiceVersion], dict[str, Any]
+]
+
+
+@dataclass
+class ServicesIndexStatistics:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class ServicesIndex:
+    listing_ttl: float = LIST_SERVICES_CACHING_TTL
+    statistics: ServicesIndexStatistics = field(
+        default_factory=ServicesIndexStatistics
+    )
+    requests_counter: Counter | None = None
+
+    _registry_services: RegistryServicesDict | None = field(default=None, init=False)
+    _registry_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+    _listings: dict[ListingKey, tuple[float, list[ServiceGet]]] = field(
+        default_factory=dict, init=False
+    )
+    _listings_locks: dict[ListingKey, asyncio.Lock] = field(
+        default_factory=dict, init=False
+    )
+    _generation: int = field(default=0, init=False)
+
+    #
+    # registry services
+    #
+
+    def update_registry_services(self, services: ServiceMetaDataPublishedDict) -> bool:
+        """Replaces the registry services and returns True if anything changed
+
+        NOTE: listings are only dropped when the registry changed
+        """
+        new_registry_services = {
+            key_version: service.dict(by_alias=True, exclude_unset=True)
+            for key_version, service in services.items()
+        }
+        if new_registry_services == self._registry_services:
+            return False
+
+        if self._registry_services is not None:
+            _logger.debug(
+                "Registry changed: %d added, %d removed",
+                len(new_registry_services.keys() - self._registry_services.keys()),
+                len(self._registry_services.keys() - new_registry_services.keys()),
+            )
+        self._registry_services = new_registry_services
+        self.invalidate()
+        return True
+
+    async def get_registry_services(
+        self, director_api: DirectorApi
+    ) -> RegistryServicesDict:
+        """Returns the registry services (function services included)
+
+        They are fetched from the director only if the index was not yet filled by the sync task
+        """
+        if self._registry_services is None:
+            async with self._registry_lock:
+                if self._registry_services is None:
+                    self.update_registry_services(await get_services_map(director_api))
+        assert self._registry_services is not None  # nosec
+        return self._registry_services
+
+    #
+    # listings
+    #
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._listings.clear()
+        self.statistics.invalidations += 1
+
+    def _count(self, *, hit: bool) -> None:
+        if hit:
+            self.statistics.hits += 1
+        else:
+            self.statistics.misses += 1
+        if self.requests_counter:
+            self.requests_counter.labels(result="hit" if hit else "miss").inc()
+
+    def _get_listing(self, key: ListingKey) -> list[ServiceGet] | None:
+        if entry := self._listings.get(key):
+            created_at, listing = entry
+            if monotonic() - created_at < self.listing_ttl:
+                return listing
+            del self._listings[key]
+        return None
+
+    def _drop_expired_listings(self) -> None:
+        now = monotonic()
+        for key in [
+            key
+            for key, (created_at, _) in self._listings.items()
+            if now - created_at >= self.listing_ttl
+        ]:
+            del self._listings[key]
+
+    async def get_or_compose_listing(
+        self,
+        product_name: ProductName,
+        gids: set[GroupID],
+        compose: Callable[[], Awaitable[list[ServiceGet]]],
+    ) -> list[ServiceGet]:
+        key: ListingKey = (product_name, frozenset(gids))
+        if (listing := self._get_listing(key)) is not None:
+            self._count(hit=True)
+            return listing
+
+        # NOTE: concurrent requests for the same listing wait for the one composing it
+        lock = self._listings_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                if (listing := self._get_listing(key)) is not None:
+                    self._count(hit=True)
+                    return listing
+
+                self._count(hit=False)
+                generation = self._generation
+                listing = await compose()
+                if generation == self._generation:
+                    # NOTE: listings composed while the index was invalidated are not kept
+                    self._drop_expired_listings()
+                    self._listings[key] = (monotonic(), listing)
+                return listing
+        finally:
+            # NOTE: the requests already waiting keep their reference to the lock,
+            # the lock is only needed while the listing is being composed
+            if self._listings_locks.get(key) is lock:
+                del self._listings_locks[key]
+
+
+def setup_services_index(app: FastAPI) -> None:
+    app.state.services_index = ServicesIndex()
+
+    def _on_startup() -> None:
+        if app.state.settings.CATALOG_PROMETHEUS_INSTRUMENTATION_ENABLED:
+            # NOTE: the instrumentation unregisters all collectors on shutdown
+            app.state.services_index.requests_counter = Counter(
+                "services_index_requests",
+                "Listings of services served from the index (hit) or composed (miss)",
+                labelnames=("result",),
+                namespace=_METRICS_NAMESPACE,
+                registry=REGISTRY,
+            )
+
+    app.add_event_handler("startup", _on_startup)
+
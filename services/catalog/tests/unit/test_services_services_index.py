@@ -0,0 +1,149 @@
+# pylint: disable=protected-access
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from models_library.api_schemas_catalog.services import ServiceGet
+from pytest_simcore.helpers.monkeypatch_envs import setenvs_from_dict
+from pytest_simcore.helpers.typing_env import EnvVarsDict
+from respx.router import MockRouter
+from simcore_service_catalog.api.dependencies.director import get_director_api
+from simcore_service_catalog.api.dependencies.services import get_services_index
+from simcore_service_catalog.services import manifest
+from simcore_service_catalog.services.services_index import ServicesIndex
+
+
+@pytest.fixture
+def app_environment(
+    monkeypatch: pytest.MonkeyPatch, app_environment: EnvVarsDict
+) -> EnvVarsDict:
+    return setenvs_from_dict(
+        monkeypatch,
+        {
+            **app_environment,
+            "CATALOG_POSTGRES": "null",  # disable postgres
+            "SC_BOOT_MODE": "local-development",
+        },
+    )
+
+
+def _create_listing() -> list[ServiceGet]:
+    return [ServiceGet.parse_obj(ServiceGet.Config.schema_extra["examples"][0])]
+
+
+async def test_services_index_registry_services(
+    background_tasks_setup_disabled: None,
+    rabbitmq_and_rpc_setup_disabled: None,
+    mocked_director_service_api: MockRouter,
+    app: FastAPI,
+):
+    director_api = get_director_api(app)
+    services_index = get_services_index(app)
+    assert isinstance(services_index, ServicesIndex)
+
+    # fetched once from the director
+    registry_services = await services_index.get_registry_services(director_api)
+    assert mocked_director_service_api["list_services"].call_count == 1
+    assert (
+        await services_index.get_registry_services(director_api) is registry_services
+    )
+    assert mocked_director_service_api["list_services"].call_count == 1
+
+    services_map = await manifest.get_services_map(director_api)
+    assert registry_services.keys() == services_map.keys()
+
+    # the sync task only invalidates the listings if the registry changed
+    invalidations = services_index.statistics.invalidations
+    assert services_index.update_registry_services(services_map) is False
+    assert services_index.statistics.invalidations == invalidations
+
+    services_map.popitem()
+    assert services_index.update_registry_services(services_map) is True
+    assert services_index.statistics.invalidations == invalidations + 1
+    assert (
+        await services_index.get_registry_services(director_api)
+    ).keys() == services_map.keys()
+
+
+async def test_services_index_listings():
+    services_index = ServicesIndex()
+    num_composed = 0
+
+    async def _compose() -> list[ServiceGet]:
+        nonlocal num_composed
+        num_composed += 1
+        await asyncio.sleep(0.1)
+        return _create_listing()
+
+    # concurrent requests with the same groups compose only once
+    listings = await asyncio.gather(
+        *(
+            services_index.get_or_compose_listing("osparc", {1, 2, 3}, _compose)
+            for _ in range(10)
+        )
+    )
+    assert num_composed == 1
+    assert all(listing is listings[0] for listing in listings)
+    assert services_index.statistics.misses == 1
+    assert services_index.statistics.hits == 9
+    # the locks are only kept while composing
+    assert not services_index._listings_locks
+
+    # same groups in another order
+    await services_index.get_or_compose_listing("osparc", {3, 2, 1}, _compose)
+    assert num_composed == 1
+
+    # other product or other groups
+    await services_index.get_or_compose_listing("s4l", {1, 2, 3}, _compose)
+    await services_index.get_or_compose_listing("osparc", {1, 2}, _compose)
+    assert num_composed == 3
+
+    # invalidated
+    services_index.invalidate()
+    await services_index.get_or_compose_listing("osparc", {1, 2, 3}, _compose)
+    assert num_composed == 4
+
+
+async def test_services_index_does_not_keep_listings_invalidated_while_composing():
+    services_index = ServicesIndex()
+
+    async def _compose() -> list[ServiceGet]:
+        services_index.invalidate()
+        return _create_listing()
+
+    await services_index.get_or_compose_listing("osparc", {1}, _compose)
+    await services_index.get_or_compose_listing("osparc", {1}, _compose)
+    assert services_index.statistics.misses == 2
+    assert services_index.statistics.hits == 0
+
+
+async def test_services_index_listings_expire():
+    services_index = ServicesIndex(listing_ttl=0)
+
+    async def _compose() -> list[ServiceGet]:
+        return _create_listing()
+
+    await services_index.get_or_compose_listing("osparc", {1}, _compose)
+    await services_index.get_or_compose_listing("osparc", {1}, _compose)
+    assert services_index.statistics.misses == 2
+
+    # expired listings are dropped when storing new ones
+    await services_index.get_or_compose_listing("osparc", {2}, _compose)
+    assert list(services_index._listings) == [("osparc", frozenset({2}))]
+
+
+async def test_services_index_drops_lock_if_composing_fails():
+    services_index = ServicesIndex()
+
+    async def _compose() -> list[ServiceGet]:
+        msg = "failed composing"
+        raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError):
+        await services_index.get_or_compose_listing("osparc", {1}, _compose)
+    assert not services_index._listings
+    assert not services_index._listings_locks
@@ -15,6 +15,7 @@ from models_library.services import ServiceMetaDataPublished
 from models_library.users import UserID
 from pydantic import parse_obj_as
 from respx.router import MockRouter
+from simcore_service_catalog.api.dependencies.services import get_services_index
 from starlette import status
 from starlette.testclient import TestClient
 from yarl import URL
@@ -82,6 +83,84 @@ async def test_list_services_with_details(
     data = response.json()
     assert len(data) == round(NUM_SERVICES / 2)
 
+    # the registry services are fetched only once and the listing is served from the index
+    assert mocked_director_service_api_base["list_services"].call_count == 1
+    services_index = get_services_index(client.app)
+    assert services_index.statistics.misses == 1
+
+
+async def test_list_services_with_details_shares_listing_of_shared_groups(
+    background_tasks_setup_disabled: None,
+    rabbitmq_and_rpc_setup_disabled: None,
+    mocked_director_service_api_base: MockRouter,
+    user_id: UserID,
+    user_groups_ids: list[int],
+    target_product: ProductName,
+    create_fake_service_data: Callable,
+    services_db_tables_injector: Callable,
+    client: TestClient,
+):
+    everyone_gid, *_ = user_groups_ids
+    shared_services = [
+        create_fake_service_data(
+            "simcore/services/dynamic/jupyterlab",
+            f"1.0.{s}",
+            team_access=None,
+            everyone_access="x",
+            product=target_product,
+        )
+        for s in range(3)
+    ]
+    owned_services = [
+        create_fake_service_data(
+            "simcore/services/dynamic/jupyterlab",
+            f"2.0.{s}",
+            team_access=None,
+            everyone_access=None,
+            product=target_product,
+        )
+        for s in range(2)
+    ]
+    await services_db_tables_injector(shared_services + owned_services)
+
+    fake_registry_service_data = ServiceMetaDataPublished.Config.schema_extra[
+        "examples"
+    ][0]
+    mocked_director_service_api_base.get("/services", name="list_services").respond(
+        200,
+        json={
+            "data": [
+                {
+                    **fake_registry_service_data,
+                    "key": s[0]["key"],
+                    "version": s[0]["version"],
+                }
+                for s in shared_services + owned_services
+            ]
+        },
+    )
+
+    url = URL("/v0/services").with_query({"user_id": user_id, "details": "true"})
+    for _ in range(2):
+        response = client.get(
+            f"{url}", headers={"x-simcore-products-name": target_product}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        got = parse_obj_as(list[ServiceGet], response.json())
+        assert {service.version for service in got} == {
+            s[0]["version"] for s in shared_services + owned_services
+        }
+
+    # the listing is kept for the shared groups only, the services of the
+    # user's primary group are added on top of it
+    services_index = get_services_index(client.app)
+    assert services_index.statistics.misses == 1
+    assert services_index.statistics.hits == 1
+    assert list(services_index._listings) == [
+        (target_product, frozenset({everyone_gid}))
+    ]
+    assert not services_index._listings_locks
+
 
 async def test_list_services_without_details(
     background_tasks_setup_disabled: None,
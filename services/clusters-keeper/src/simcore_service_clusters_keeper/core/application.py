@@ -15,6 +15,7 @@ from .._meta import (
 )
 from ..api.routes import setup_api_routes
 from ..modules.clusters_management_task import setup as setup_clusters_management
+from ..modules.dask import setup as setup_dask
 from ..modules.ec2 import setup as setup_ec2
 from ..modules.rabbitmq import setup as setup_rabbitmq
 from ..modules.redis import setup as setup_redis
@@ -49,6 +50,7 @@ def create_app(settings: ApplicationSettings) -> FastAPI:
     setup_rpc_routes(app)
     setup_ec2(app)
     setup_redis(app)
+    setup_dask(app)
     setup_clusters_management(app)
 
     # ERROR HANDLERS
@@ -20,7 +20,7 @@ from ..modules.clusters import (
 )
 from ..utils.dask import get_scheduler_auth, get_scheduler_url
 from ..utils.ec2 import HEARTBEAT_TAG_KEY
-from .dask import is_scheduler_busy, ping_scheduler
+from .dask import close_unused_scheduler_clients, is_scheduler_busy, ping_scheduler
 
 _logger = logging.getLogger(__name__)
 
@@ -105,11 +105,17 @@ async def _find_terminateable_instances(
 
 async def check_clusters(app: FastAPI) -> None:
     primary_instances = await get_all_clusters(app)
+    # NOTE: scheduler clients are kept open between checks, the ones of gone clusters are closed
+    await close_unused_scheduler_clients(
+        app, (get_scheduler_url(instance) for instance in primary_instances)
+    )
 
     connected_intances = {
         instance
         for instance in primary_instances
-        if await ping_scheduler(get_scheduler_url(instance), get_scheduler_auth(app))
+        if await ping_scheduler(
+            app, get_scheduler_url(instance), get_scheduler_auth(app)
+        )
     }
 
     for instance in connected_intances:
@@ -117,7 +123,7 @@ async def check_clusters(app: FastAPI) -> None:
             # NOTE: some connected instance could in theory break between these 2 calls, therefore this is silenced and will
             # be handled in the next call to check_clusters
             if await is_scheduler_busy(
-                get_scheduler_url(instance), get_scheduler_auth(app)
+                app, get_scheduler_url(instance), get_scheduler_auth(app)
             ):
                 _logger.info(
                     "%s is running tasks",
@@ -1,10 +1,14 @@
+import asyncio
 import logging
-from collections.abc import Coroutine
-from typing import Any, Final
+from collections.abc import Coroutine, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Final, cast
 
 import distributed
+from fastapi import FastAPI
 from models_library.clusters import InternalClusterAuthentication, TLSAuthentication
 from pydantic import AnyUrl
+from servicelib.logging_utils import log_catch
 
 _logger = logging.getLogger(__name__)
 
@@ -20,11 +24,74 @@ async def _wrap_client_async_routine(
 
 _CONNECTION_TIMEOUT: Final[str] = "5"
 
+_ClientKey = tuple[str, str]
 
-async def ping_scheduler(
+
+@dataclass(slots=True)
+class _SchedulerClients:
+    """the connected clients, one per scheduler url and authentication"""
+
+    clients: dict[_ClientKey, distributed.Client] = field(default_factory=dict)
+    # NOTE: one lock per client, so that connecting to an unreachable scheduler
+    # does not block the calls to the other schedulers
+    locks: dict[_ClientKey, asyncio.Lock] = field(default_factory=dict)
+
+    async def close_unused(self, used_urls: Iterable[AnyUrl]) -> None:
+        kept_urls = {f"{url}" for url in used_urls}
+        for key in [key for key in self.locks if key[0] not in kept_urls]:
+            del self.locks[key]
+        unused_keys = [key for key in self.clients if key[0] not in kept_urls]
+        unused_clients = [self.clients.pop(key) for key in unused_keys]
+        for client in unused_clients:
+            await _close_client(client)
+
+
+def setup(app: FastAPI) -> None:
+    async def on_startup() -> None:
+        app.state.dask_scheduler_clients = _SchedulerClients()
+
+    async def on_shutdown() -> None:
+        scheduler_clients: _SchedulerClients | None = app.state.dask_scheduler_clients
+        if scheduler_clients:
+            await scheduler_clients.close_unused([])
+
+    app.add_event_handler("startup", on_startup)
+    app.add_event_handler("shutdown", on_shutdown)
+
+
+def _get_scheduler_clients(app: FastAPI) -> _SchedulerClients:
+    return cast(_SchedulerClients, app.state.dask_scheduler_clients)
+
+
+def _client_key(
     url: AnyUrl, authentication: InternalClusterAuthentication
-) -> bool:
-    try:
+) -> _ClientKey:
+    return (f"{url}", authentication.json())
+
+
+async def _close_client(client: distributed.Client) -> None:
+    with log_catch(_logger, reraise=False):
+        await _wrap_client_async_routine(client.close())
+
+
+async def _get_or_create_client(
+    app: FastAPI, url: AnyUrl, authentication: InternalClusterAuthentication
+) -> distributed.Client:
+    """returns a connected client, clients are kept open and reused (one per scheduler)
+    and re-created if the connection to the scheduler was lost
+
+    Raises:
+        OSError: if the scheduler cannot be reached
+    """
+    scheduler_clients = _get_scheduler_clients(app)
+    key = _client_key(url, authentication)
+    async with scheduler_clients.locks.setdefault(key, asyncio.Lock()):
+        if client := scheduler_clients.clients.get(key):
+            if client.status == "running":
+                return client
+            del scheduler_clients.clients[key]
+            await _close_client(client)
+
         security = distributed.Security()
         if isinstance(authentication, TLSAuthentication):
             security = distributed.Security(
@@ -33,12 +100,46 @@ async def ping_scheduler(
                 tls_client_key=f"{authentication.tls_client_key}",
                 require_encryption=True,
             )
-        async with distributed.Client(
+        client = distributed.Client(
             url, asynchronous=True, timeout=_CONNECTION_TIMEOUT, security=security
-        ):
-            ...
+        )
+        try:
+            await _wrap_client_async_routine(client)
+        except BaseException:
+            await _close_client(client)
+            raise
+        scheduler_clients.clients[key] = client
+        return client
+
+
+async def _discard_client(
+    app: FastAPI, url: AnyUrl, authentication: InternalClusterAuthentication
+) -> None:
+    scheduler_clients = _get_scheduler_clients(app)
+    key = _client_key(url, authentication)
+    scheduler_clients.locks.pop(key, None)
+    if client := scheduler_clients.clients.pop(key, None):
+        await _close_client(client)
+
+
+async def close_unused_scheduler_clients(
+    app: FastAPI, used_urls: Iterable[AnyUrl]
+) -> None:
+    """closes the clients of the schedulers that are not in used_urls (e.g. terminated clusters)"""
+    await _get_scheduler_clients(app).close_unused(used_urls)
+
+
+async def ping_scheduler(
+    app: FastAPI, url: AnyUrl, authentication: InternalClusterAuthentication
+) -> bool:
+    try:
+        client = await _get_or_create_client(app, url, authentication)
+        # NOTE: the client might be reused, so the scheduler is really contacted here
+        assert client.scheduler  # nosec
+        await _wrap_client_async_routine(client.scheduler.identity())
         return True
     except OSError:
+        await _discard_client(app, url, authentication)
         _logger.info(
             "osparc-dask-scheduler %s ping timed-out, the machine is likely still starting/hanged or broken...",
             url,
@@ -48,31 +149,36 @@ async def ping_scheduler(
 
 
 async def is_scheduler_busy(
-    url: AnyUrl, authentication: InternalClusterAuthentication
+    app: FastAPI, url: AnyUrl, authentication: InternalClusterAuthentication
 ) -> bool:
-    security = distributed.Security()
-    if isinstance(authentication, TLSAuthentication):
-        security = distributed.Security(
-            tls_ca_file=f"{authentication.tls_ca_file}",
-            tls_client_cert=f"{authentication.tls_client_cert}",
-            tls_client_key=f"{authentication.tls_client_key}",
-            require_encryption=True,
-        )
-    async with distributed.Client(
-        url, asynchronous=True, timeout=_CONNECTION_TIMEOUT, security=security
-    ) as client:
-        datasets_on_scheduler = await _wrap_client_async_routine(client.list_datasets())
-        _logger.info("cluster currently has %s datasets", len(datasets_on_scheduler))
-        num_processing_tasks = 0
-        if worker_to_processing_tasks := await _wrap_client_async_routine(
-            client.processing()
-        ):
-            _logger.info(
-                "cluster current workers: %s", worker_to_processing_tasks.keys()
-            )
-            num_processing_tasks = sum(
-                len(tasks) for tasks in worker_to_processing_tasks.values()
+    def _get_scheduler_usage(
+        dask_scheduler: distributed.Scheduler,
+    ) -> tuple[int, dict[str, int]]:
+        publish_extension = dask_scheduler.extensions.get("publish")
+        num_datasets = len(publish_extension.datasets) if publish_extension else 0
+        return num_datasets, {
+            address: len(worker_state.processing)
+            for address, worker_state in dask_scheduler.workers.items()
+        }
+
+    try:
+        client = await _get_or_create_client(app, url, authentication)
+        # NOTE: datasets and processing tasks are retrieved with 1 call to the scheduler
+        num_datasets_on_scheduler, worker_to_num_processing_tasks = (
+            await _wrap_client_async_routine(
+                client.run_on_scheduler(_get_scheduler_usage)
             )
-            _logger.info("cluster currently processes %s tasks", num_processing_tasks)
+        )
+    except OSError:
+        await _discard_client(app, url, authentication)
+        raise
+    _logger.info("cluster currently has %s datasets", num_datasets_on_scheduler)
+    num_processing_tasks = 0
+    if worker_to_num_processing_tasks:
+        _logger.info(
+            "cluster current workers: %s", worker_to_num_processing_tasks.keys()
+        )
+        num_processing_tasks = sum(worker_to_num_processing_tasks.values())
+        _logger.info("cluster currently processes %s tasks", num_processing_tasks)
 
-        return bool(datasets_on_scheduler or num_processing_tasks)
+    return bool(num_datasets_on_scheduler or num_processing_tasks)
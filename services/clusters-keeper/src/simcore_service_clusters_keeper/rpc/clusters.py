@@ -48,7 +48,7 @@ async def get_or_create_cluster(
 
         dask_scheduler_ready = bool(
             ec2_instance.state == "running"
-            and await ping_scheduler(get_scheduler_url(ec2_instance), cluster_auth)
+            and await ping_scheduler(app, get_scheduler_url(ec2_instance), cluster_auth)
         )
         if dask_scheduler_ready:
             await clusters.cluster_heartbeat(app, user_id=user_id, wallet_id=wallet_id)
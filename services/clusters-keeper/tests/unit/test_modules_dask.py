@@ -1,12 +1,16 @@
 # pylint: disable=redefined-outer-name
 # pylint: disable=unused-argument
 # pylint: disable=unused-variable
+import asyncio
 import time
+from collections.abc import AsyncIterator
 
 import distributed
 import pytest
+from asgi_lifespan import LifespanManager
 from distributed import SpecCluster
 from faker import Faker
+from fastapi import FastAPI
 from models_library.clusters import (
     InternalClusterAuthentication,
     NoAuthentication,
@@ -14,8 +18,12 @@ from models_library.clusters import (
 )
 from pydantic import AnyUrl, parse_obj_as
 from simcore_service_clusters_keeper.modules.dask import (
+    _CONNECTION_TIMEOUT,
+    _get_or_create_client,
+    close_unused_scheduler_clients,
     is_scheduler_busy,
     ping_scheduler,
+    setup,
 )
 from tenacity import retry
 from tenacity.retry import retry_if_exception_type
@@ -28,14 +36,23 @@ _authentication_types = [
 ]
 
 
+@pytest.fixture
+async def app() -> AsyncIterator[FastAPI]:
+    app = FastAPI()
+    setup(app)
+    async with LifespanManager(app):
+        yield app
+
+
 @pytest.mark.parametrize(
     "authentication", _authentication_types, ids=lambda p: f"authentication-{p.type}"
 )
 async def test_ping_scheduler_non_existing_scheduler(
-    faker: Faker, authentication: InternalClusterAuthentication
+    app: FastAPI, faker: Faker, authentication: InternalClusterAuthentication
 ):
     assert (
         await ping_scheduler(
+            app,
             parse_obj_as(AnyUrl, f"tcp://{faker.ipv4()}:{faker.port_number()}"),
             authentication,
         )
@@ -43,9 +60,10 @@ async def test_ping_scheduler_non_existing_scheduler(
     )
 
 
-async def test_ping_scheduler(dask_spec_local_cluster: SpecCluster):
+async def test_ping_scheduler(app: FastAPI, dask_spec_local_cluster: SpecCluster):
     assert (
         await ping_scheduler(
+            app,
             parse_obj_as(AnyUrl, dask_spec_local_cluster.scheduler_address),
             NoAuthentication(),
         )
@@ -53,24 +71,88 @@ async def test_ping_scheduler(dask_spec_local_cluster: SpecCluster):
     )
 
 
+async def test_scheduler_client_is_reused(
+    app: FastAPI, dask_spec_local_cluster: SpecCluster
+):
+    scheduler_address = parse_obj_as(AnyUrl, dask_spec_local_cluster.scheduler_address)
+    assert await ping_scheduler(app, scheduler_address, NoAuthentication()) is True
+    client = await _get_or_create_client(app, scheduler_address, NoAuthentication())
+    assert await ping_scheduler(app, scheduler_address, NoAuthentication()) is True
+    assert await is_scheduler_busy(app, scheduler_address, NoAuthentication()) is False
+    assert (
+        await _get_or_create_client(app, scheduler_address, NoAuthentication())
+        is client
+    )
+
+    # once the cluster is gone, the client gets closed
+    await close_unused_scheduler_clients(app, [])
+    assert client.status == "closed"
+    assert (
+        await _get_or_create_client(app, scheduler_address, NoAuthentication())
+        is not client
+    )
+
+
+
+@pytest.fixture
+async def unresponsive_scheduler_url() -> AsyncIterator[AnyUrl]:
+    # NOTE: accepts the connection but never answers, the client waits until its timeout
+    async def _never_answer(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await reader.read()
+        writer.close()
+
+    server = await asyncio.start_server(_never_answer, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    async with server:
+        yield parse_obj_as(AnyUrl, f"tcp://{host}:{port}")
+
+
+async def test_unresponsive_scheduler_does_not_block_others(
+    app: FastAPI,
+    dask_spec_local_cluster: SpecCluster,
+    unresponsive_scheduler_url: AnyUrl,
+):
+    pinging_task = asyncio.create_task(
+        ping_scheduler(app, unresponsive_scheduler_url, NoAuthentication())
+    )
+    await asyncio.sleep(0.5)
+    assert not pinging_task.done()
+
+    assert (
+        await asyncio.wait_for(
+            ping_scheduler(
+                app,
+                parse_obj_as(AnyUrl, dask_spec_local_cluster.scheduler_address),
+                NoAuthentication(),
+            ),
+            timeout=float(_CONNECTION_TIMEOUT) / 2,
+        )
+        is True
+    )
+    assert not pinging_task.done()
+    assert await pinging_task is False
+
 @retry(
     wait=wait_fixed(1),
     stop=stop_after_delay(30),
     retry=retry_if_exception_type(AssertionError),
 )
-async def _assert_scheduler_is_busy(url: AnyUrl, *, busy: bool) -> None:
+async def _assert_scheduler_is_busy(app: FastAPI, url: AnyUrl, *, busy: bool) -> None:
     print(f"--> waiting for osparc-dask-scheduler to become {busy=}")
-    assert await is_scheduler_busy(url, NoAuthentication()) is busy
+    assert await is_scheduler_busy(app, url, NoAuthentication()) is busy
     print(f"scheduler is now {busy=}")
 
 
 async def test_is_scheduler_busy(
+    app: FastAPI,
     dask_spec_local_cluster: distributed.SpecCluster,
     dask_spec_cluster_client: distributed.Client,
 ):
     # nothing runs right now
     scheduler_address = parse_obj_as(AnyUrl, dask_spec_local_cluster.scheduler_address)
-    assert await is_scheduler_busy(scheduler_address, NoAuthentication()) is False
+    assert await is_scheduler_busy(app, scheduler_address, NoAuthentication()) is False
     _SLEEP_TIME = 5
 
     def _some_long_running_fct(sleep_time: int) -> str:
@@ -80,6 +162,7 @@ async def test_is_scheduler_busy(
     future = dask_spec_cluster_client.submit(_some_long_running_fct, _SLEEP_TIME)
 
     await _assert_scheduler_is_busy(
+        app,
         url=scheduler_address,
         busy=True,
     )
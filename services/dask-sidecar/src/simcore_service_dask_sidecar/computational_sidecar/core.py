@@ -3,6 +3,7 @@ import json
 import logging
 import os
 import socket
+import time
 from collections.abc import Coroutine
 from dataclasses import dataclass
 from pathlib import Path
@@ -19,10 +20,11 @@ from dask_task_models_library.container_tasks.protocol import ContainerTaskParam
 from models_library.basic_types import IDStr
 from models_library.progress_bar import ProgressReport
 from packaging import version
-from pydantic import ValidationError
+from pydantic import ByteSize, ValidationError
 from pydantic.networks import AnyUrl
 from servicelib.logging_utils import LogLevelInt, LogMessageStr
 from servicelib.progress_bar import ProgressBarData
+from servicelib.utils import logged_gather
 from settings_library.s3 import S3Settings
 from yarl import URL
 
@@ -59,13 +61,15 @@ class ComputationalSidecar:
         self,
         task_volumes: TaskSharedVolumes,
         integration_version: version.Version,
+        progress_bar: ProgressBarData,
+        max_concurrent_downloads: int,
     ) -> None:
         input_data_file = (
             task_volumes.inputs_folder
             / f"{'inputs' if integration_version > LEGACY_INTEGRATION_VERSION else 'input'}.json"
         )
         local_input_data_file = {}
-        download_tasks = []
+        file_inputs: list[tuple[FileUrl, Path]] = []
 
         for input_key, input_params in self.task_parameters.input_data.items():
             if isinstance(input_params, FileUrl):
@@ -80,25 +84,43 @@ class ComputationalSidecar:
                     # NOTE: only 'task_volumes.inputs_folder' part of 'destination_path' is guaranteed,
                     # if extra subfolders via file-mapping,
                     # then we make them first
-                    destination_path.parent.mkdir(parents=True)
+                    destination_path.parent.mkdir(parents=True, exist_ok=True)
 
-                download_tasks.append(
+                file_inputs.append((input_params, destination_path))
+            else:
+                local_input_data_file[input_key] = input_params
+
+        # NOTE: the downloads run concurrently (bounded), archives are uncompressed
+        # as soon as they are downloaded while the other downloads continue
+        download_limiter = asyncio.Semaphore(max_concurrent_downloads)
+        start_time = time.monotonic()
+        async with progress_bar.sub_progress(
+            steps=len(file_inputs), description=IDStr("downloading inputs")
+        ) as downloading_progress_bar:
+            downloaded_bytes: list[int] = await logged_gather(
+                *(
                     pull_file_from_remote(
                         input_params.url,
                         input_params.file_mime_type,
                         destination_path,
                         self._publish_sidecar_log,
                         self.s3_settings,
+                        progress_bar=downloading_progress_bar,
+                        download_limiter=download_limiter,
                     )
-                )
-            else:
-                local_input_data_file[input_key] = input_params
-        # NOTE: temporary solution until new version is created
-        for task in download_tasks:
-            await task
+                    for input_params, destination_path in file_inputs
+                ),
+                log=_logger,
+            )
+        elapsed_time = time.monotonic() - start_time
         input_data_file.write_text(json.dumps(local_input_data_file))
 
-        await self._publish_sidecar_log("All the input data were downloaded.")
+        total_downloaded = ByteSize(sum(downloaded_bytes))
+        await self._publish_sidecar_log(
+            "All the input data were downloaded."
+            f" [{total_downloaded.human_readable()} in {elapsed_time:.1f}s,"
+            f" {total_downloaded.to('MB') / max(elapsed_time, 1e-3):.2f} MBytes/s (avg)]"
+        )
 
     async def _retrieve_output_data(
         self,
@@ -210,10 +232,13 @@ class ComputationalSidecar:
                 envs=self.task_parameters.envs,
                 labels=self.task_parameters.labels,
             )
+            # NOTE:  (1 step weighting 5%), completed by the inputs download sub progress
             await self._write_input_data(
-                task_volumes, image_labels.get_integration_version()
+                task_volumes,
+                image_labels.get_integration_version(),
+                progress_bar,
+                settings.SIDECAR_INPUTS_MAX_CONCURRENT_DOWNLOADS,
             )
-            await progress_bar.update()  # NOTE:  (1 step weighting 5%)
             # PROCESSING (1 step weighted 90%)
             async with managed_container(
                 docker_client,
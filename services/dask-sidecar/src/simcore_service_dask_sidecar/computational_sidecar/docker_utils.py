@@ -10,6 +10,7 @@ from typing import Any, Final, cast
 
 import aiofiles
 import aiofiles.tempfile
+import aiofiles.threadpool.text
 import arrow
 from aiodocker import Docker, DockerError
 from aiodocker.containers import DockerContainer
@@ -154,21 +155,36 @@ def _guess_progress_value(progress_match: re.Match[str]) -> float:
 
 
 _OSPARC_LOG_NUM_PARTS: Final[int] = 2
+# NOTE: fast path for the RFC3339 timestamps (as produced by docker), anything else goes through arrow
+_RFC3339_TIMESTAMP_PREFIX_RE: Final[re.Pattern[str]] = re.compile(
+    r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})? "
+)
+
+
+def _strip_timestamp(log: str) -> str:
+    if match := _RFC3339_TIMESTAMP_PREFIX_RE.match(log):
+        return log[match.end() :]
+    if not log[:1].isdigit():
+        # cannot be a timestamp, no need to ask arrow
+        return log
+    splitted_log = log.split(" ", maxsplit=1)
+    with contextlib.suppress(arrow.ParserError, ValueError):
+        if len(splitted_log) == _OSPARC_LOG_NUM_PARTS and arrow.get(splitted_log[0]):
+            return splitted_log[1]
+    return log
 
 
 async def _try_parse_progress(
-    line: str, *, progress_regexp: re.Pattern[str]
+    line: str, *, progress_regexp: re.Pattern[str], has_timestamp: bool = True
 ) -> float | None:
+    """if has_timestamp is False the line is known to have no timestamp prefix
+    and no attempt to remove it is made"""
     with log_catch(logger, reraise=False):
         # pattern might be like "timestamp log"
         log = line.strip("\n")
-        splitted_log = log.split(" ", maxsplit=1)
-        with contextlib.suppress(arrow.ParserError, ValueError):
-            if len(splitted_log) == _OSPARC_LOG_NUM_PARTS and arrow.get(
-                splitted_log[0]
-            ):
-                log = splitted_log[1]
-        if match := re.search(progress_regexp, log):
+        if has_timestamp:
+            log = _strip_timestamp(log)
+        if match := progress_regexp.search(log):
             return _guess_progress_value(match)
 
     return None
@@ -180,9 +196,10 @@ async def _parse_and_publish_logs(
     task_publishers: TaskPublisher,
     progress_regexp: re.Pattern[str],
     progress_bar: ProgressBarData,
+    has_timestamp: bool = True,
 ) -> None:
     progress_value = await _try_parse_progress(
-        log_line, progress_regexp=progress_regexp
+        log_line, progress_regexp=progress_regexp, has_timestamp=has_timestamp
     )
     if progress_value is not None:
         await progress_bar.set_(round(progress_value * 100.0))
@@ -192,6 +209,69 @@ async def _parse_and_publish_logs(
     )
 
 
+_LEGACY_LOG_FILE_MIN_POLL_INTERVAL_S: Final[float] = 0.1
+_LEGACY_LOG_FILE_MAX_POLL_INTERVAL_S: Final[float] = 2.0
+_LEGACY_LOG_FILE_MAX_LINES_PER_BATCH: Final[int] = 500
+
+
+async def _wait_for_container_exit(container: DockerContainer) -> None:
+    """waits until the container stops (1 long lasting request to the docker engine)"""
+    while True:
+        try:
+            await container.wait()
+            return
+        except asyncio.TimeoutError:
+            # NOTE: the docker client session has a default timeout
+            if not (await container.show())["State"]["Running"]:
+                return
+
+
+async def _read_available_lines(
+    file_pointer: aiofiles.threadpool.text.AsyncTextIOWrapper,
+) -> list[str]:
+    lines: list[str] = []
+    while len(lines) < _LEGACY_LOG_FILE_MAX_LINES_PER_BATCH and (
+        line := await file_pointer.readline()
+    ):
+        lines.append(line)
+    return lines
+
+
+async def _parse_and_publish_log_lines(
+    log_lines: list[str],
+    *,
+    task_publishers: TaskPublisher,
+    progress_regexp: re.Pattern[str],
+    progress_bar: ProgressBarData,
+) -> None:
+    """parses the progress of every line, but publishes consecutive lines
+    of the same log level as one single log message"""
+    last_progress_value = None
+    batch: list[str] = []
+    batch_log_level = None
+    for log_line in log_lines:
+        progress_value = await _try_parse_progress(
+            log_line, progress_regexp=progress_regexp
+        )
+        if progress_value is not None:
+            last_progress_value = progress_value
+        log_level = guess_message_log_level(log_line)
+        if batch and log_level != batch_log_level:
+            task_publishers.publish_logs(
+                message="".join(batch).rstrip("\n"), log_level=batch_log_level
+            )
+            batch = []
+        batch.append(log_line)
+        batch_log_level = log_level
+    if batch:
+        assert batch_log_level is not None  # nosec
+        task_publishers.publish_logs(
+            message="".join(batch).rstrip("\n"), log_level=batch_log_level
+        )
+    if last_progress_value is not None:
+        await progress_bar.set_(round(last_progress_value * 100.0))
+
+
 async def _parse_container_log_file(  # noqa: PLR0913 # pylint: disable=too-many-arguments
     *,
     container: DockerContainer,
@@ -207,44 +287,54 @@ async def _parse_container_log_file(  # noqa: PLR0913 # pylint: disable=too-many
     progress_bar: ProgressBarData,
 ) -> None:
     log_file = task_volumes.logs_folder / LEGACY_SERVICE_LOG_FILE_NAME
+
+    async def _process_lines(lines: list[str]) -> None:
+        for line in lines:
+            logger.info(
+                "[%s]: %s",
+                f"{service_key}:{service_version} - {container.id}{container_name}",
+                line,
+            )
+        await _parse_and_publish_log_lines(
+            lines,
+            task_publishers=task_publishers,
+            progress_regexp=progress_regexp,
+            progress_bar=progress_bar,
+        )
+
     with log_context(
         logger,
         logging.DEBUG,
         "started monitoring of pre-1.0 service - using log file in /logs folder",
     ):
-        async with aiofiles.open(log_file, mode="rt") as file_pointer:
-            while (await container.show())["State"]["Running"]:
-                if line := await file_pointer.readline():
-                    logger.info(
-                        "[%s]: %s",
-                        f"{service_key}:{service_version} - {container.id}{container_name}",
-                        line,
-                    )
-                    await _parse_and_publish_logs(
-                        line,
-                        task_publishers=task_publishers,
-                        progress_regexp=progress_regexp,
-                        progress_bar=progress_bar,
+        container_exit_task = asyncio.create_task(
+            _wait_for_container_exit(container),
+            name=f"wait_for_container_{container.id}_exit",
+        )
+        try:
+            async with aiofiles.open(log_file, mode="rt") as file_pointer:
+                poll_interval = _LEGACY_LOG_FILE_MIN_POLL_INTERVAL_S
+                while not container_exit_task.done():
+                    if lines := await _read_available_lines(file_pointer):
+                        await _process_lines(lines)
+                        poll_interval = _LEGACY_LOG_FILE_MIN_POLL_INTERVAL_S
+                        continue
+                    # nothing new in the file, wait with backoff or until the container stops
+                    await asyncio.wait({container_exit_task}, timeout=poll_interval)
+                    poll_interval = min(
+                        2 * poll_interval, _LEGACY_LOG_FILE_MAX_POLL_INTERVAL_S
                     )
 
-            # finish reading the logs if possible
-            async for line in file_pointer:
-                logger.info(
-                    "[%s]: %s",
-                    f"{service_key}:{service_version} - {container.id}{container_name}",
-                    line,
-                )
-                await _parse_and_publish_logs(
-                    line,
-                    task_publishers=task_publishers,
-                    progress_regexp=progress_regexp,
-                    progress_bar=progress_bar,
-                )
+                # finish reading the logs if possible
+                while lines := await _read_available_lines(file_pointer):
+                    await _process_lines(lines)
+        finally:
+            container_exit_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, DockerError):
+                await container_exit_task
 
-            # copy the log file to the log_file_url
-            await push_file_to_remote(
-                log_file, log_file_url, log_publishing_cb, s3_settings
-            )
+        # copy the log file to the log_file_url
+        await push_file_to_remote(log_file, log_file_url, log_publishing_cb, s3_settings)
 
 
 async def _parse_container_docker_logs(
@@ -289,6 +379,7 @@ async def _parse_container_docker_logs(
                         task_publishers=task_publishers,
                         progress_regexp=progress_regexp,
                         progress_bar=progress_bar,
+                        has_timestamp=False,
                     )
 
             # copy the log file to the log_file_url
@@ -1,5 +1,6 @@
 import asyncio
 import contextlib
+import itertools
 import logging
 from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
@@ -60,33 +61,72 @@ def get_current_task_resources() -> dict[str, float]:
 
 @dataclass(slots=True, kw_only=True)
 class TaskPublisher:
+    """publishes the task progress and logs to the dask pub/sub system
+
+    If buffering_interval_s > 0, the publisher runs in buffered mode: the logs are
+    published in batches (every buffering_interval_s or every buffer_max_log_lines lines)
+    and only the latest progress value of a window is published.
+    NOTE: in buffered mode, flush() must be called once the task is completed
+    """
+
     task_owner: TaskOwner
+    buffering_interval_s: float = 0
+    buffer_max_log_lines: int = 100
     progress: distributed.Pub = field(init=False)
     _last_published_progress_value: float = -1
     logs: distributed.Pub = field(init=False)
+    _pending_progress_value: float | None = None
+    _pending_logs: list[tuple[LogMessageStr, LogLevelInt]] = field(
+        default_factory=list
+    )
+    _flush_handle: asyncio.TimerHandle | None = None
 
     def __post_init__(self) -> None:
         self.progress = distributed.Pub(TaskProgressEvent.topic_name())
         self.logs = distributed.Pub(TaskLogEvent.topic_name())
 
+    @property
+    def is_buffered(self) -> bool:
+        return self.buffering_interval_s > 0
+
     def publish_progress(self, report: ProgressReport) -> None:
         rounded_value = round(report.percent_value, ndigits=2)
         if rounded_value > self._last_published_progress_value:
-            with log_catch(logger=_logger, reraise=False):
-                publish_event(
-                    self.progress,
-                    TaskProgressEvent.from_dask_worker(
-                        progress=rounded_value, task_owner=self.task_owner
-                    ),
-                )
-                self._last_published_progress_value = rounded_value
-            _logger.debug("PROGRESS: %s", rounded_value)
+            if self.is_buffered and rounded_value < 1:
+                self._pending_progress_value = rounded_value
+                self._schedule_flush()
+                return
+            self._publish_progress_value(rounded_value)
+
+    def _publish_progress_value(self, value: float) -> None:
+        with log_catch(logger=_logger, reraise=False):
+            publish_event(
+                self.progress,
+                TaskProgressEvent.from_dask_worker(
+                    progress=value, task_owner=self.task_owner
+                ),
+            )
+            self._last_published_progress_value = value
+            self._pending_progress_value = None
+        _logger.debug("PROGRESS: %s", value)
 
     def publish_logs(
         self,
         *,
         message: LogMessageStr,
         log_level: LogLevelInt,
+    ) -> None:
+        if self.is_buffered:
+            self._pending_logs.append((message, log_level))
+            if len(self._pending_logs) >= self.buffer_max_log_lines:
+                self._flush_logs()
+            else:
+                self._schedule_flush()
+            return
+        self._publish_log_message(message, log_level)
+
+    def _publish_log_message(
+        self, message: LogMessageStr, log_level: LogLevelInt
     ) -> None:
         with log_catch(logger=_logger, reraise=False):
             publish_event(
@@ -97,6 +137,30 @@ class TaskPublisher:
             )
         _logger.log(log_level, message)
 
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_event_loop().call_later(
+                self.buffering_interval_s, self.flush
+            )
+
+    def _flush_logs(self) -> None:
+        # NOTE: consecutive messages with the same log level are sent as one event
+        pending_logs, self._pending_logs = self._pending_logs, []
+        for log_level, messages in itertools.groupby(
+            pending_logs, key=lambda log: log[1]
+        ):
+            self._publish_log_message(
+                "\n".join(message for message, _ in messages), log_level
+            )
+
+    def flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending_progress_value is not None:
+            self._publish_progress_value(self._pending_progress_value)
+        self._flush_logs()
+
 
 _TASK_ABORTION_INTERVAL_CHECK_S: int = 2
 
@@ -1,10 +1,14 @@
 import asyncio
+import contextlib
 import functools
 import logging
 import mimetypes
+import os
 import time
 import zipfile
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from http import HTTPStatus
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Final, TypedDict, cast
@@ -12,9 +16,12 @@ from typing import Any, Final, TypedDict, cast
 import aiofiles
 import aiofiles.tempfile
 import fsspec  # type: ignore[import-untyped]
+import fsspec.asyn  # type: ignore[import-untyped]
 from pydantic import ByteSize, FileUrl, parse_obj_as
 from pydantic.networks import AnyUrl
 from servicelib.logging_utils import LogLevelInt, LogMessageStr
+from servicelib.progress_bar import ProgressBarData
+from servicelib.utils import logged_gather
 from settings_library.s3 import S3Settings
 from yarl import URL
 
@@ -27,28 +34,75 @@ S3_FILE_SYSTEM_SCHEMES: Final = ["s3", "s3a"]
 LogPublishingCB = Callable[[LogMessageStr, LogLevelInt], Awaitable[None]]
 
 
+CHUNK_SIZE = 4 * 1024 * 1024
+_MAX_CHUNK_SIZE: Final[int] = 64 * 1024 * 1024
+# NOTE: chunks are grown as long as reading them takes less than this
+_TARGET_CHUNK_TRANSFER_TIME_S: Final[float] = 0.5
+_MAX_NUMBER_OF_PARTS: Final[int] = 10000
+_MAX_CONCURRENT_PARTS: Final[int] = 8
+_MULTIPART_UPLOAD_CHUNK_SIZE: Final[int] = 64 * 1024 * 1024
+_PROGRESS_LOG_MIN_INTERVAL_S: Final[float] = 5.0
+
+
+@dataclass(kw_only=True)
+class _TransferProgress:
+    """keeps track of a file transfer and publishes its progress at most
+    every _PROGRESS_LOG_MIN_INTERVAL_S (and once when complete)"""
+
+    log_publishing_cb: LogPublishingCB
+    text_prefix: str
+    file_size: int | None
+    progress_bar: ProgressBarData | None = None
+    transferred: int = 0
+    _reported_steps: float = 0.0
+    _start_time: float = field(default_factory=time.monotonic)
+    _last_log_time: float = 0.0
+
+    async def update(self, num_bytes: int) -> None:
+        self.transferred += num_bytes
+        if self.progress_bar and self.file_size and num_bytes:
+            steps = num_bytes / self.file_size
+            self._reported_steps += steps
+            await self.progress_bar.update(steps)
+        now = time.monotonic()
+        if (now - self._last_log_time) >= _PROGRESS_LOG_MIN_INTERVAL_S or (
+            self.file_size and self.transferred >= self.file_size
+        ):
+            self._last_log_time = now
+            await self.log_publishing_cb(self._message(now), logging.DEBUG)
+
+    async def set_(self, transferred: int) -> None:
+        await self.update(transferred - self.transferred)
+
+    async def finish(self) -> None:
+        if self.progress_bar and self._reported_steps < 1:
+            await self.progress_bar.update(1 - self._reported_steps)
+            self._reported_steps = 1
+
+    def _message(self, now: float) -> str:
+        elapsed_time = max(now - self._start_time, 1e-3)
+        return (
+            f"{self.text_prefix}"
+            f" {100.0 * float(self.transferred)/float(self.file_size or 1):.1f}%"
+            f" ({ByteSize(self.transferred).human_readable() if self.transferred else 0} / {ByteSize(self.file_size).human_readable() if self.file_size else 'NaN'})"
+            f" [{ByteSize(self.transferred).to('MB')/elapsed_time:.2f} MBytes/s (avg)]"
+        )
+
+
 def _file_progress_cb(
     size,
     value,
-    log_publishing_cb: LogPublishingCB,
-    text_prefix: str,
+    transfer_progress: _TransferProgress,
     main_loop: asyncio.AbstractEventLoop,
     **kwargs,
 ):
+    # NOTE: fsspec callbacks report the absolute value
     asyncio.run_coroutine_threadsafe(
-        log_publishing_cb(
-            f"{text_prefix}"
-            f" {100.0 * float(value or 0)/float(size or 1):.1f}%"
-            f" ({ByteSize(value).human_readable() if value else 0} / {ByteSize(size).human_readable() if size else 'NaN'})",
-            logging.DEBUG,
-        ),
+        transfer_progress.set_(value or 0),
         main_loop,
     )
 
 
-CHUNK_SIZE = 4 * 1024 * 1024
-
-
 class ClientKWArgsDict(TypedDict, total=False):
     endpoint_url: str
     region_name: str
@@ -78,12 +132,20 @@ def _s3fs_settings_from_s3_settings(s3_settings: S3Settings) -> S3FsSettingsDict
     return s3fs_settings
 
 
-def _file_chunk_streamer(src: BytesIO, dst: BytesIO):
-    data = src.read(CHUNK_SIZE)
+def _file_chunk_streamer(src: BytesIO, dst: BytesIO, chunk_size: int):
+    data = src.read(chunk_size)
     segment_len = dst.write(data)
     return (data, segment_len)
 
 
+def _compute_part_size(file_size: int) -> int:
+    # bigger files get bigger parts, so that the number of requests stays bounded
+    return min(
+        max(CHUNK_SIZE, -(-file_size // _MAX_NUMBER_OF_PARTS)),
+        _MAX_CHUNK_SIZE,
+    )
+
+
 async def _copy_file(
     src_url: AnyUrl,
     dst_url: AnyUrl,
@@ -92,29 +154,172 @@ async def _copy_file(
     text_prefix: str,
     src_storage_cfg: dict[str, Any] | None = None,
     dst_storage_cfg: dict[str, Any] | None = None,
-):
+    progress_bar: ProgressBarData | None = None,
+) -> int:
+    """streams src_url to dst_url and returns the number of bytes written
+
+    The chunk size adapts to the transfer speed (between CHUNK_SIZE and _MAX_CHUNK_SIZE).
+    If passed, progress_bar is updated by 1 step once the file is copied
+    """
     src_storage_kwargs = src_storage_cfg or {}
     dst_storage_kwargs = dst_storage_cfg or {}
     with fsspec.open(src_url, mode="rb", **src_storage_kwargs) as src_fp, fsspec.open(
         dst_url, "wb", **dst_storage_kwargs
     ) as dst_fp:
-        file_size = getattr(src_fp, "size", None)
+        transfer_progress = _TransferProgress(
+            log_publishing_cb=log_publishing_cb,
+            text_prefix=text_prefix,
+            file_size=getattr(src_fp, "size", None),
+            progress_bar=progress_bar,
+        )
+        chunk_size = CHUNK_SIZE
         data_read = True
-        total_data_written = 0
-        t = time.process_time()
         while data_read:
+            chunk_start = time.monotonic()
             (data_read, data_written,) = await asyncio.get_event_loop().run_in_executor(
-                None, _file_chunk_streamer, src_fp, dst_fp
+                None, _file_chunk_streamer, src_fp, dst_fp, chunk_size
             )
-            elapsed_time = time.process_time() - t
-            total_data_written += data_written or 0
-            await log_publishing_cb(
-                f"{text_prefix}"
-                f" {100.0 * float(total_data_written or 0)/float(file_size or 1):.1f}%"
-                f" ({ByteSize(total_data_written).human_readable() if total_data_written else 0} / {ByteSize(file_size).human_readable() if file_size else 'NaN'})"
-                f" [{ByteSize(total_data_written).to('MB')/elapsed_time:.2f} MBytes/s (avg)]",
-                logging.DEBUG,
+            if (time.monotonic() - chunk_start) < _TARGET_CHUNK_TRANSFER_TIME_S:
+                chunk_size = min(2 * chunk_size, _MAX_CHUNK_SIZE)
+            await transfer_progress.update(data_written or 0)
+        await transfer_progress.finish()
+    return transfer_progress.transferred
+
+
+class _RangeRequestsNotSupportedError(RuntimeError):
+    ...
+
+
+async def _check_range_requests_support(
+    fs: fsspec.asyn.AsyncFileSystem, src_url: str
+) -> None:
+    """checks that the http server behind src_url answers range requests
+
+    NOTE: a server ignoring the Range header returns the whole file, therefore
+    only the status of the response is checked and its body is never read
+
+    Raises:
+        _RangeRequestsNotSupportedError
+    """
+    request_kwargs = fs.kwargs.copy()
+    headers = request_kwargs.pop("headers", {}).copy()
+    headers["Range"] = "bytes=0-0"
+    session = await fs.set_session()
+    async with session.get(
+        fs.encode_url(src_url), headers=headers, **request_kwargs
+    ) as response:
+        if response.status != HTTPStatus.PARTIAL_CONTENT:
+            raise _RangeRequestsNotSupportedError
+
+
+async def _download_file_in_parts(
+    fs: fsspec.asyn.AsyncFileSystem,
+    src_path: str,
+    file_size: int,
+    dst_path: Path,
+    transfer_progress: _TransferProgress,
+) -> None:
+    """downloads src_path using concurrent ranged GET requests written in place in dst_path
+
+    Raises:
+        _RangeRequestsNotSupportedError: if a part does not have the requested size
+    """
+    part_size = _compute_part_size(file_size)
+    limiter = asyncio.Semaphore(_MAX_CONCURRENT_PARTS)
+    loop = asyncio.get_event_loop()
+
+    with dst_path.open("wb") as dst_fp:
+        dst_fp.truncate(file_size)
+        dst_fd = dst_fp.fileno()
+
+        async def _download_part(start: int) -> None:
+            end = min(start + part_size, file_size)
+            async with limiter:
+                data = await fs._cat_file(  # pylint: disable=protected-access  # noqa: SLF001
+                    src_path, start=start, end=end
+                )
+                if len(data) != (end - start):
+                    raise _RangeRequestsNotSupportedError
+                await loop.run_in_executor(None, os.pwrite, dst_fd, data, start)
+            await transfer_progress.update(len(data))
+
+        await logged_gather(
+            *(_download_part(start) for start in range(0, file_size, part_size)),
+            log=logger,
+        )
+
+
+@contextlib.asynccontextmanager
+async def _async_filesystem(
+    scheme: str, storage_kwargs: S3FsSettingsDict | dict[str, Any]
+) -> AsyncIterator[fsspec.asyn.AsyncFileSystem]:
+    # NOTE: not taken from the fsspec instances cache since its session is closed on exit
+    fs = fsspec.filesystem(
+        scheme, asynchronous=True, skip_instance_cache=True, **storage_kwargs
+    )
+    session = await fs.set_session()
+    try:
+        yield fs
+    finally:
+        await session.close()
+
+
+async def _download_file(
+    src_url: AnyUrl,
+    dst_path: Path,
+    *,
+    storage_kwargs: S3FsSettingsDict | dict[str, Any],
+    log_publishing_cb: LogPublishingCB,
+    text_prefix: str,
+    progress_bar: ProgressBarData | None,
+) -> int:
+    if src_url.scheme not in HTTP_FILE_SYSTEM_SCHEMES + S3_FILE_SYSTEM_SCHEMES:
+        return await _copy_file(
+            src_url,
+            parse_obj_as(FileUrl, dst_path.as_uri()),
+            src_storage_cfg=cast(dict[str, Any], storage_kwargs),
+            log_publishing_cb=log_publishing_cb,
+            text_prefix=text_prefix,
+            progress_bar=progress_bar,
+        )
+
+    src_path = (
+        f"{src_url}"
+        if src_url.scheme in HTTP_FILE_SYSTEM_SCHEMES
+        else f"{src_url}".removeprefix(f"{src_url.scheme}://")
+    )
+    async with _async_filesystem(src_url.scheme, storage_kwargs) as fs:
+        file_info = await fs._info(src_path)  # pylint: disable=protected-access  # noqa: SLF001
+        file_size = file_info.get("size")
+        if file_size and file_size > _compute_part_size(file_size):
+            transfer_progress = _TransferProgress(
+                log_publishing_cb=log_publishing_cb,
+                text_prefix=text_prefix,
+                file_size=file_size,
+                progress_bar=progress_bar,
             )
+            try:
+                if src_url.scheme in HTTP_FILE_SYSTEM_SCHEMES:
+                    await _check_range_requests_support(fs, src_path)
+                await _download_file_in_parts(
+                    fs, src_path, file_size, dst_path, transfer_progress
+                )
+                await transfer_progress.finish()
+                return transfer_progress.transferred
+            except _RangeRequestsNotSupportedError:
+                logger.warning(
+                    "%s does not support range requests, falling back to streaming",
+                    src_url,
+                )
+
+    return await _copy_file(
+        src_url,
+        parse_obj_as(FileUrl, dst_path.as_uri()),
+        src_storage_cfg=cast(dict[str, Any], storage_kwargs),
+        log_publishing_cb=log_publishing_cb,
+        text_prefix=text_prefix,
+        progress_bar=progress_bar,
+    )
 
 
 _ZIP_MIME_TYPE: Final[str] = "application/zip"
@@ -126,7 +331,16 @@ async def pull_file_from_remote(
     dst_path: Path,
     log_publishing_cb: LogPublishingCB,
     s3_settings: S3Settings | None,
-) -> None:
+    *,
+    progress_bar: ProgressBarData | None = None,
+    download_limiter: asyncio.Semaphore | None = None,
+) -> int:
+    """downloads src_url into dst_path and returns the number of downloaded bytes.
+    Zip archives are uncompressed in place (unless target_mime_type is also zip).
+
+    download_limiter only restricts the download part, so that an archive can be
+    uncompressed while other downloads sharing the same limiter continue.
+    """
     assert src_url.path  # nosec
     await log_publishing_cb(
         f"Downloading '{src_url}' into local file '{dst_path}'...",
@@ -143,13 +357,15 @@ async def pull_file_from_remote(
     storage_kwargs: S3FsSettingsDict | dict[str, Any] = {}
     if s3_settings and src_url.scheme in S3_FILE_SYSTEM_SCHEMES:
         storage_kwargs = _s3fs_settings_from_s3_settings(s3_settings)
-    await _copy_file(
-        src_url,
-        parse_obj_as(FileUrl, dst_path.as_uri()),
-        src_storage_cfg=cast(dict[str, Any], storage_kwargs),
-        log_publishing_cb=log_publishing_cb,
-        text_prefix=f"Downloading '{src_url.path.strip('/')}':",
-    )
+    async with download_limiter or contextlib.nullcontext():
+        downloaded_bytes = await _download_file(
+            src_url,
+            dst_path,
+            storage_kwargs=storage_kwargs,
+            log_publishing_cb=log_publishing_cb,
+            text_prefix=f"Downloading '{src_url.path.strip('/')}':",
+            progress_bar=progress_bar,
+        )
 
     await log_publishing_cb(
         f"Download of '{src_url}' into local file '{dst_path}' complete.",
@@ -168,6 +384,7 @@ async def pull_file_from_remote(
             f"Uncompressing '{dst_path.name}' complete.", logging.INFO
         )
         dst_path.unlink()
+    return downloaded_bytes
 
 
 async def _push_file_to_http_link(
@@ -192,8 +409,11 @@ async def _push_file_to_http_link(
             hooks={
                 "progress": functools.partial(
                     _file_progress_cb,
-                    log_publishing_cb=log_publishing_cb,
-                    text_prefix=f"Uploading '{dst_url.path.strip('/')}':",
+                    transfer_progress=_TransferProgress(
+                        log_publishing_cb=log_publishing_cb,
+                        text_prefix=f"Uploading '{dst_url.path.strip('/')}':",
+                        file_size=file_to_upload.stat().st_size,
+                    ),
                     main_loop=asyncio.get_event_loop(),
                 )
             }
@@ -201,6 +421,39 @@ async def _push_file_to_http_link(
     )
 
 
+async def _push_file_to_s3(
+    file_to_upload: Path,
+    dst_url: AnyUrl,
+    log_publishing_cb: LogPublishingCB,
+    s3_settings: S3Settings,
+) -> None:
+    # NOTE: s3fs uploads big files with concurrent multipart uploads
+    fs = fsspec.filesystem(
+        dst_url.scheme,
+        asynchronous=True,
+        **_s3fs_settings_from_s3_settings(s3_settings),
+    )
+    await fs._put_file(  # pylint: disable=protected-access  # noqa: SLF001
+        file_to_upload,
+        f"{dst_url}".removeprefix(f"{dst_url.scheme}://"),
+        callback=fsspec.Callback(
+            hooks={
+                "progress": functools.partial(
+                    _file_progress_cb,
+                    transfer_progress=_TransferProgress(
+                        log_publishing_cb=log_publishing_cb,
+                        text_prefix=f"Uploading '{dst_url.path.strip('/')}':",
+                        file_size=file_to_upload.stat().st_size,
+                    ),
+                    main_loop=asyncio.get_event_loop(),
+                )
+            }
+        ),
+        chunksize=_MULTIPART_UPLOAD_CHUNK_SIZE,
+        max_concurrency=_MAX_CONCURRENT_PARTS,
+    )
+
+
 async def _push_file_to_remote(
     file_to_upload: Path,
     dst_url: AnyUrl,
@@ -210,14 +463,13 @@ async def _push_file_to_remote(
     logger.debug("Uploading %s to %s...", file_to_upload, dst_url)
     assert dst_url.path  # nosec
 
-    storage_kwargs: S3FsSettingsDict | dict[str, Any] = {}
-    if s3_settings:
-        storage_kwargs = _s3fs_settings_from_s3_settings(s3_settings)
+    if s3_settings and dst_url.scheme in S3_FILE_SYSTEM_SCHEMES:
+        await _push_file_to_s3(file_to_upload, dst_url, log_publishing_cb, s3_settings)
+        return
 
     await _copy_file(
         parse_obj_as(FileUrl, file_to_upload.as_uri()),
         dst_url,
-        dst_storage_cfg=cast(dict[str, Any], storage_kwargs),
         log_publishing_cb=log_publishing_cb,
         text_prefix=f"Uploading '{dst_url.path.strip('/')}':",
     )
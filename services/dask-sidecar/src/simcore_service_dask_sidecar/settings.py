@@ -2,7 +2,7 @@ from pathlib import Path
 from typing import Any
 
 from models_library.basic_types import LogLevel
-from pydantic import Field, validator
+from pydantic import Field, NonNegativeFloat, PositiveInt, validator
 from settings_library.base import BaseCustomSettings
 from settings_library.utils_logging import MixinLoggingSettings
 
@@ -24,6 +24,22 @@ class Settings(BaseCustomSettings, MixinLoggingSettings):
 
     SIDECAR_INTERVAL_TO_CHECK_TASK_ABORTED_S: int | None = 5
 
+    SIDECAR_INPUTS_MAX_CONCURRENT_DOWNLOADS: PositiveInt = Field(
+        default=4,
+        description="maximal number of input files downloaded concurrently when staging a task,"
+        " archives are uncompressed while the other downloads continue",
+    )
+
+    SIDECAR_TASK_EVENTS_BUFFERING_INTERVAL_S: NonNegativeFloat = Field(
+        default=0,
+        description="if >0, the task logs are published in batches at this interval "
+        "and only the latest progress value of each interval is published (0 disables buffering)",
+    )
+    SIDECAR_TASK_EVENTS_BUFFER_MAX_LOG_LINES: PositiveInt = Field(
+        default=100,
+        description="when buffering, the logs are published as soon as that many lines are pending",
+    )
+
     # dask config ----
 
     DASK_START_AS_SCHEDULER: bool | None = Field(
@@ -88,7 +88,12 @@ async def _run_computational_sidecar_async(
     log_file_url: LogFileUploadURL,
     s3_settings: S3Settings | None,
 ) -> TaskOutputData:
-    task_publishers = TaskPublisher(task_owner=task_parameters.task_owner)
+    settings = Settings.create_from_envs()
+    task_publishers = TaskPublisher(
+        task_owner=task_parameters.task_owner,
+        buffering_interval_s=settings.SIDECAR_TASK_EVENTS_BUFFERING_INTERVAL_S,
+        buffer_max_log_lines=settings.SIDECAR_TASK_EVENTS_BUFFER_MAX_LOG_LINES,
+    )
 
     _logger.info(
         "run_computational_sidecar %s",
@@ -96,21 +101,25 @@ async def _run_computational_sidecar_async(
     )
     current_task = asyncio.current_task()
     assert current_task  # nosec
-    async with monitor_task_abortion(
-        task_name=current_task.get_name(), task_publishers=task_publishers
-    ):
-        task_max_resources = get_current_task_resources()
-        async with ComputationalSidecar(
-            task_parameters=task_parameters,
-            docker_auth=docker_auth,
-            log_file_url=log_file_url,
-            s3_settings=s3_settings,
-            task_max_resources=task_max_resources,
-            task_publishers=task_publishers,
-        ) as sidecar:
-            output_data = await sidecar.run(command=task_parameters.command)
-        _logger.info("completed run of sidecar with result %s", f"{output_data=}")
-        return output_data
+    try:
+        async with monitor_task_abortion(
+            task_name=current_task.get_name(), task_publishers=task_publishers
+        ):
+            task_max_resources = get_current_task_resources()
+            async with ComputationalSidecar(
+                task_parameters=task_parameters,
+                docker_auth=docker_auth,
+                log_file_url=log_file_url,
+                s3_settings=s3_settings,
+                task_max_resources=task_max_resources,
+                task_publishers=task_publishers,
+            ) as sidecar:
+                output_data = await sidecar.run(command=task_parameters.command)
+            _logger.info("completed run of sidecar with result %s", f"{output_data=}")
+            return output_data
+    finally:
+        # NOTE: ensures buffered events are sent before the task returns
+        task_publishers.flush()
 
 
 def run_computational_sidecar(
@@ -17,6 +17,8 @@ from dask_task_models_library.container_tasks.errors import TaskCancelledError
 from dask_task_models_library.container_tasks.events import TaskLogEvent
 from dask_task_models_library.container_tasks.io import TaskCancelEventName
 from dask_task_models_library.container_tasks.protocol import TaskOwner
+from models_library.progress_bar import ProgressReport
+from pytest_mock.plugin import MockerFixture
 from simcore_service_dask_sidecar.dask_utils import (
     _DEFAULT_MAX_RESOURCES,
     TaskPublisher,
@@ -250,3 +252,53 @@ def test_task_resources(
     current_resources = _DEFAULT_MAX_RESOURCES
     current_resources.update(resources)
     assert received_resources == current_resources
+
+
+@pytest.fixture
+def mocked_publish_event(mocker: MockerFixture) -> Any:
+    mocker.patch("simcore_service_dask_sidecar.dask_utils.distributed.Pub")
+    for event_cls in ("TaskLogEvent", "TaskProgressEvent"):
+        mocker.patch(
+            f"simcore_service_dask_sidecar.dask_utils.{event_cls}.from_dask_worker",
+            side_effect=lambda **kwargs: kwargs,
+        )
+    return mocker.patch("simcore_service_dask_sidecar.dask_utils.publish_event")
+
+
+async def test_task_publisher_buffered_mode(
+    mocked_publish_event: Any, task_owner: TaskOwner
+):
+    buffering_interval_s = 0.2
+    task_publishers = TaskPublisher(
+        task_owner=task_owner,
+        buffering_interval_s=buffering_interval_s,
+        buffer_max_log_lines=5,
+    )
+    assert task_publishers.is_buffered
+    for value in range(1, 10):
+        task_publishers.publish_progress(ProgressReport(actual_value=value, total=10))
+    task_publishers.publish_logs(message="line 1", log_level=logging.INFO)
+    task_publishers.publish_logs(message="line 2", log_level=logging.INFO)
+    task_publishers.publish_logs(message="error", log_level=logging.ERROR)
+    mocked_publish_event.assert_not_called()
+
+    await asyncio.sleep(2 * buffering_interval_s)
+    published_events = [c.args[1] for c in mocked_publish_event.call_args_list]
+    # only the latest progress, and the logs grouped by log level
+    assert published_events == [
+        {"progress": 0.9, "task_owner": task_owner},
+        {"log": "line 1\nline 2", "log_level": logging.INFO, "task_owner": task_owner},
+        {"log": "error", "log_level": logging.ERROR, "task_owner": task_owner},
+    ]
+    mocked_publish_event.reset_mock()
+
+    # reaching the maximum number of lines flushes the logs
+    for n in range(5):
+        task_publishers.publish_logs(message=f"{n}", log_level=logging.INFO)
+    mocked_publish_event.assert_called_once()
+    mocked_publish_event.reset_mock()
+
+    # the final progress is never delayed
+    task_publishers.publish_progress(ProgressReport(actual_value=10, total=10))
+    mocked_publish_event.assert_called_once()
+    task_publishers.flush()
@@ -4,8 +4,10 @@
 # pylint: disable=no-member
 
 import asyncio
+import logging
 import re
 from typing import Any
+from unittest import mock
 from unittest.mock import call
 
 import aiodocker
@@ -21,6 +23,7 @@ from dask_task_models_library.container_tasks.protocol import (
 from models_library.services_resources import BootMode
 from pytest_mock.plugin import MockerFixture
 from simcore_service_dask_sidecar.computational_sidecar.docker_utils import (
+    _parse_and_publish_log_lines,
     _try_parse_progress,
     create_container_config,
     managed_container,
@@ -178,6 +181,43 @@ async def test__try_parse_progress(
     assert received_progress == expected_progress_value
 
 
+async def test__parse_and_publish_log_lines_batches_logs_per_log_level(
+    mocker: MockerFixture,
+):
+    mocked_task_publishers = mocker.MagicMock()
+    mocked_progress_bar = mocker.AsyncMock()
+    log_lines = [
+        "starting the computation\n",
+        "[PROGRESS] 0.1\n",
+        "[PROGRESS] 0.5\n",
+        "ERROR: something went wrong\n",
+        "ERROR: and again\n",
+        "continuing anyway\n",
+    ]
+    await _parse_and_publish_log_lines(
+        log_lines,
+        task_publishers=mocked_task_publishers,
+        progress_regexp=PROGRESS_REGEXP,
+        progress_bar=mocked_progress_bar,
+    )
+    mocked_task_publishers.publish_logs.assert_has_calls(
+        [
+            mock.call(
+                message="starting the computation\n[PROGRESS] 0.1\n[PROGRESS] 0.5",
+                log_level=logging.INFO,
+            ),
+            mock.call(
+                message="ERROR: something went wrong\nERROR: and again",
+                log_level=logging.ERROR,
+            ),
+            mock.call(message="continuing anyway", log_level=logging.INFO),
+        ]
+    )
+    assert mocked_task_publishers.publish_logs.call_count == 3
+    # only the latest progress is set
+    mocked_progress_bar.set_.assert_called_once_with(50)
+
+
 @pytest.mark.parametrize(
     "exception_type",
     [
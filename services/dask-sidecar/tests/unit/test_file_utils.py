@@ -3,10 +3,14 @@
 # pylint: disable=unused-variable
 
 import asyncio
+import functools
 import mimetypes
+import random
+import threading
 import zipfile
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, Iterator
 from dataclasses import dataclass
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Any, cast
 from unittest import mock
@@ -17,8 +21,12 @@ from faker import Faker
 from pydantic import AnyUrl, parse_obj_as
 from pytest_localftpserver.servers import ProcessFTPServer
 from pytest_mock.plugin import MockerFixture
+from servicelib.progress_bar import ProgressBarData
 from settings_library.s3 import S3Settings
+from simcore_service_dask_sidecar import file_utils
 from simcore_service_dask_sidecar.file_utils import (
+    _MULTIPART_UPLOAD_CHUNK_SIZE,
+    CHUNK_SIZE,
     _s3fs_settings_from_s3_settings,
     pull_file_from_remote,
     push_file_to_remote,
@@ -71,6 +79,12 @@ def s3_remote_file_url(s3_settings: S3Settings, faker: Faker) -> AnyUrl:
     return parse_obj_as(AnyUrl, f"s3://{s3_settings.S3_BUCKET_NAME}{faker.file_path()}")
 
 
+@dataclass(frozen=True)
+class _HttpServer:
+    served_dir: Path
+    url: str
+
+
 @dataclass(frozen=True)
 class StorageParameters:
     s3_settings: S3Settings | None
@@ -234,6 +248,170 @@ async def test_pull_file_from_remote(
     mocked_log_publishing_cb.assert_called()
 
 
+async def test_pull_files_from_remote_concurrently_with_progress(
+    s3_settings: S3Settings,
+    tmp_path: Path,
+    faker: Faker,
+    mocked_log_publishing_cb: mock.AsyncMock,
+):
+    storage_kwargs = _s3fs_settings_from_s3_settings(s3_settings)
+    num_files = 10
+    files_content = {
+        parse_obj_as(
+            AnyUrl, f"s3://{s3_settings.S3_BUCKET_NAME}/{faker.uuid4()}.txt"
+        ): faker.text()
+        for _ in range(num_files)
+    }
+    for remote_file_url, text_in_file in files_content.items():
+        with cast(
+            fsspec.core.OpenFile,
+            fsspec.open(remote_file_url, mode="wt", **storage_kwargs),
+        ) as fp:
+            fp.write(text_in_file)
+
+    download_limiter = asyncio.Semaphore(3)
+    async with ProgressBarData(
+        num_steps=num_files, description=faker.pystr()
+    ) as progress_bar:
+        downloaded_bytes = await asyncio.gather(
+            *(
+                pull_file_from_remote(
+                    src_url=remote_file_url,
+                    target_mime_type=None,
+                    dst_path=tmp_path / f"{index}.txt",
+                    log_publishing_cb=mocked_log_publishing_cb,
+                    s3_settings=s3_settings,
+                    progress_bar=progress_bar,
+                    download_limiter=download_limiter,
+                )
+                for index, remote_file_url in enumerate(files_content)
+            )
+        )
+        assert progress_bar._current_steps == pytest.approx(  # noqa: SLF001
+            num_files
+        )
+    for index, (text_in_file, num_bytes) in enumerate(
+        zip(files_content.values(), downloaded_bytes, strict=True)
+    ):
+        dst_path = tmp_path / f"{index}.txt"
+        assert dst_path.read_text() == text_in_file
+        assert num_bytes == dst_path.stat().st_size
+
+
+@pytest.mark.parametrize(
+    "file_size",
+    [3 * CHUNK_SIZE + 1234, 2 * _MULTIPART_UPLOAD_CHUNK_SIZE + 1234],
+    ids=["download in parts", "upload and download in parts"],
+)
+@pytest.mark.parametrize("use_presigned_link", [False, True])
+async def test_push_and_pull_big_file_in_parts(
+    s3_settings: S3Settings,
+    s3_remote_file_url: AnyUrl,
+    aiobotocore_s3_client,
+    tmp_path: Path,
+    mocked_log_publishing_cb: mock.AsyncMock,
+    mocker: MockerFixture,
+    use_presigned_link: bool,
+    file_size: int,
+):
+    src_path = tmp_path / "big_file.bin"
+    file_content = random.randbytes(file_size)  # noqa: S311
+    src_path.write_bytes(file_content)
+    await push_file_to_remote(
+        src_path, s3_remote_file_url, mocked_log_publishing_cb, s3_settings
+    )
+    assert s3_remote_file_url.path
+    response = await aiobotocore_s3_client.head_object(
+        Bucket=s3_settings.S3_BUCKET_NAME,
+        Key=s3_remote_file_url.path.removeprefix("/"),
+    )
+    # NOTE: the ETag of a multipart upload is suffixed by the number of parts
+    is_multipart_upload = file_size > _MULTIPART_UPLOAD_CHUNK_SIZE
+    assert ("-" in response["ETag"]) is is_multipart_upload
+
+    remote_file_url = s3_remote_file_url
+    if use_presigned_link:
+        assert s3_remote_file_url.path
+        remote_file_url = parse_obj_as(
+            AnyUrl,
+            await aiobotocore_s3_client.generate_presigned_url(
+                "get_object",
+                Params={
+                    "Bucket": s3_settings.S3_BUCKET_NAME,
+                    "Key": s3_remote_file_url.path.removeprefix("/"),
+                },
+                ExpiresIn=30,
+            ),
+        )
+    mocked_log_publishing_cb.reset_mock()
+    spied_download_file_in_parts = mocker.spy(file_utils, "_download_file_in_parts")
+    spied_copy_file = mocker.spy(file_utils, "_copy_file")
+    dst_path = tmp_path / "downloaded_big_file.bin"
+    downloaded_bytes = await pull_file_from_remote(
+        src_url=remote_file_url,
+        target_mime_type=None,
+        dst_path=dst_path,
+        log_publishing_cb=mocked_log_publishing_cb,
+        s3_settings=None if use_presigned_link else s3_settings,
+    )
+    spied_download_file_in_parts.assert_called_once()
+    spied_copy_file.assert_not_called()
+    assert downloaded_bytes == len(file_content)
+    assert dst_path.read_bytes() == file_content
+    # progress is rate limited: start/end messages + at most first and last progress
+    assert mocked_log_publishing_cb.call_count <= 4
+
+
+@pytest.fixture
+def http_server_ignoring_range_requests(tmp_path: Path) -> Iterator[_HttpServer]:
+    # NOTE: the python simple http server always returns the whole file
+    served_dir = tmp_path / "served"
+    served_dir.mkdir()
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        functools.partial(SimpleHTTPRequestHandler, directory=f"{served_dir}"),
+    )
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    yield _HttpServer(
+        served_dir=served_dir, url=f"http://127.0.0.1:{server.server_port}"
+    )
+    server.shutdown()
+    server.server_close()
+    server_thread.join()
+
+
+async def test_pull_big_file_from_remote_not_supporting_range_requests(
+    http_server_ignoring_range_requests: _HttpServer,
+    tmp_path: Path,
+    mocked_log_publishing_cb: mock.AsyncMock,
+    mocker: MockerFixture,
+):
+    file_content = random.randbytes(3 * CHUNK_SIZE + 1234)  # noqa: S311
+    (http_server_ignoring_range_requests.served_dir / "big_file.bin").write_bytes(
+        file_content
+    )
+
+    spied_download_file_in_parts = mocker.spy(file_utils, "_download_file_in_parts")
+    dst_path = tmp_path / "downloaded_big_file.bin"
+    async with ProgressBarData(num_steps=1) as progress_bar:
+        downloaded_bytes = await pull_file_from_remote(
+            src_url=parse_obj_as(
+                AnyUrl, f"{http_server_ignoring_range_requests.url}/big_file.bin"
+            ),
+            target_mime_type=None,
+            dst_path=dst_path,
+            log_publishing_cb=mocked_log_publishing_cb,
+            s3_settings=None,
+            progress_bar=progress_bar,
+        )
+        assert progress_bar._current_steps == pytest.approx(1)  # noqa: SLF001
+    # no part was requested before falling back to streaming
+    spied_download_file_in_parts.assert_not_called()
+    assert downloaded_bytes == len(file_content)
+    assert dst_path.read_bytes() == file_content
+
+
 async def test_pull_file_from_remote_s3_presigned_link(
     s3_settings: S3Settings,
     s3_remote_file_url: AnyUrl,
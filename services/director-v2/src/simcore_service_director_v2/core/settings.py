@@ -93,6 +93,18 @@ class ComputationalBackendSettings(BaseCustomSettings):
         FileLinkType.PRESIGNED,
         description=f"Default file link type to use with computational backend on-demand clusters '{list(FileLinkType)}'",
     )
+    COMPUTATIONAL_BACKEND_EVENT_DRIVEN_SCHEDULING_ENABLED: bool = Field(
+        default=False,
+        description="if enabled, the computational scheduler only re-evaluates pipelines "
+        "for which a task event was received (task completion, new run, stop request) "
+        "instead of reloading every scheduled pipeline from the database on each pass",
+    )
+    COMPUTATIONAL_BACKEND_SCHEDULING_RECONCILIATION_INTERVAL: datetime.timedelta = Field(
+        default=datetime.timedelta(seconds=30),
+        description="with event driven scheduling, every scheduled pipeline is anyway fully "
+        "reconciled with the database and the computational backend at this interval"
+        " (default to seconds, or see https://pydantic-docs.helpmanual.io/usage/types/#datetime-types for string formating)",
+    )
 
     @cached_property
     def default_cluster(self) -> Cluster:
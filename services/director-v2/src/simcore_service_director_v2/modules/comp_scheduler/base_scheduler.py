@@ -75,6 +75,12 @@ _logger = logging.getLogger(__name__)
 _Previous = CompTaskAtDB
 _Current = CompTaskAtDB
 _MAX_WAITING_FOR_CLUSTER_TIMEOUT_IN_MIN: Final[int] = 10
+# NOTE: no event is received from the computational backend when tasks leave these states,
+# pipelines containing such tasks are therefore re-evaluated on every pass
+_POLLED_STATES: Final[set[RunningState]] = {
+    RunningState.WAITING_FOR_CLUSTER,
+    RunningState.UNKNOWN,
+}
 
 
 @dataclass(frozen=True, slots=True)
@@ -132,6 +138,19 @@ class ScheduledPipelineParams:
     run_metadata: RunMetadataDict
     mark_for_cancellation: bool = False
     use_on_demand_clusters: bool
+    # NOTE: in-memory scheduling state, only used with event driven scheduling
+    is_dirty: bool = field(default=True, compare=False)
+    last_scheduled: datetime.datetime | None = field(default=None, compare=False)
+    dag: nx.DiGraph | None = field(default=None, compare=False, repr=False)
+
+    def needs_scheduling(
+        self, *, now: datetime.datetime, reconciliation_interval: datetime.timedelta
+    ) -> bool:
+        return (
+            self.is_dirty
+            or self.last_scheduled is None
+            or (now - self.last_scheduled) >= reconciliation_interval
+        )
 
 
 @dataclass
@@ -211,14 +230,22 @@ class BaseCompScheduler(ABC):
             selected_iteration = iteration
 
         # mark the scheduled pipeline for stopping
-        self.scheduled_pipelines[
+        pipeline_params = self.scheduled_pipelines[
             (user_id, project_id, selected_iteration)
-        ].mark_for_cancellation = True
+        ]
+        pipeline_params.mark_for_cancellation = True
+        pipeline_params.is_dirty = True
         # ensure the scheduler starts right away
         self._wake_up_scheduler_now()
 
     async def schedule_all_pipelines(self) -> None:
         self.wake_up_event.clear()
+        pipelines_to_schedule = self._list_pipelines_to_schedule()
+        _logger.debug(
+            "scheduling %s out of %s pipelines",
+            len(pipelines_to_schedule),
+            len(self.scheduled_pipelines),
+        )
         # if one of the task throws, the other are NOT cancelled which is what we want
         await logged_gather(
             *(
@@ -232,12 +259,56 @@ class BaseCompScheduler(ABC):
                     user_id,
                     project_id,
                     iteration,
-                ), pipeline_params in self.scheduled_pipelines.items()
+                ), pipeline_params in pipelines_to_schedule.items()
             ),
             log=_logger,
             max_concurrency=40,
         )
 
+    def _list_pipelines_to_schedule(
+        self,
+    ) -> dict[tuple[UserID, ProjectID, Iteration], ScheduledPipelineParams]:
+        if not self.settings.COMPUTATIONAL_BACKEND_EVENT_DRIVEN_SCHEDULING_ENABLED:
+            return dict(self.scheduled_pipelines)
+
+        utc_now = arrow.utcnow().datetime
+        pipelines_to_schedule = {}
+        for key, pipeline_params in self.scheduled_pipelines.items():
+            if not pipeline_params.needs_scheduling(
+                now=utc_now,
+                reconciliation_interval=self.settings.COMPUTATIONAL_BACKEND_SCHEDULING_RECONCILIATION_INTERVAL,
+            ):
+                continue
+            if not pipeline_params.is_dirty:
+                # full reconciliation: the pipeline might have changed in the DB
+                pipeline_params.dag = None
+            # NOTE: any event received from now on will trigger a new evaluation
+            pipeline_params.is_dirty = False
+            pipeline_params.last_scheduled = utc_now
+            pipelines_to_schedule[key] = pipeline_params
+        return pipelines_to_schedule
+
+    def _mark_pipeline_dirty(self, user_id: UserID, project_id: ProjectID) -> None:
+        """marks all the scheduled runs of the project for re-evaluation and wakes up the scheduler
+
+        NOTE: this might be called from a secondary thread (e.g. dask future callbacks)
+        """
+        for (u_id, p_id, _), pipeline_params in self.scheduled_pipelines.copy().items():
+            if u_id == user_id and p_id == project_id:
+                pipeline_params.is_dirty = True
+        self._wake_up_scheduler_now()
+
+    async def _get_scheduled_pipeline_dag(
+        self, project_id: ProjectID, pipeline_params: ScheduledPipelineParams
+    ) -> nx.DiGraph:
+        if not self.settings.COMPUTATIONAL_BACKEND_EVENT_DRIVEN_SCHEDULING_ENABLED:
+            return await self._get_pipeline_dag(project_id)
+        if pipeline_params.dag is None:
+            pipeline_params.dag = await self._get_pipeline_dag(project_id)
+        # NOTE: the scheduling modifies the dag, so a copy is returned
+        dag: nx.DiGraph = pipeline_params.dag.copy()
+        return dag
+
     async def _get_pipeline_dag(self, project_id: ProjectID) -> nx.DiGraph:
         comp_pipeline_repo = CompPipelinesRepository.instance(self.db_engine)
         pipeline_at_db: CompPipelineAtDB = await comp_pipeline_repo.get_pipeline(
@@ -615,7 +686,7 @@ class BaseCompScheduler(ABC):
         )
         dag: nx.DiGraph = nx.DiGraph()
         try:
-            dag = await self._get_pipeline_dag(project_id)
+            dag = await self._get_scheduled_pipeline_dag(project_id, pipeline_params)
             # 1. Update our list of tasks with data from backend (state, results)
             await self._update_states_from_comp_backend(
                 user_id, project_id, iteration, dag, pipeline_params=pipeline_params
@@ -642,6 +713,8 @@ class BaseCompScheduler(ABC):
             comp_tasks = await self._timeout_if_waiting_for_cluster_too_long(
                 user_id, project_id, comp_tasks
             )
+            if any(t.state in _POLLED_STATES for t in comp_tasks.values()):
+                pipeline_params.is_dirty = True
             # 5. send a heartbeat
             await self._send_running_tasks_heartbeat(
                 user_id, project_id, iteration, dag
@@ -699,6 +772,7 @@ class BaseCompScheduler(ABC):
             self.scheduled_pipelines.pop((user_id, project_id, iteration), None)
         except ComputationalBackendNotConnectedError:
             _logger.exception("Computational backend is not connected!")
+            pipeline_params.is_dirty = True
 
     async def _schedule_tasks_to_stop(
         self,
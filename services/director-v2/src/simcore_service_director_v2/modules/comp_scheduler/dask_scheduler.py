@@ -1,5 +1,6 @@
 import asyncio
 import contextlib
+import functools
 import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
@@ -66,12 +67,11 @@ _DASK_CLIENT_TASK_STATE_TO_RUNNING_STATE_MAP: dict[
 }
 
 
-@asynccontextmanager
-async def _cluster_dask_client(
+async def _get_pipeline_cluster(
     user_id: UserID,
     pipeline_params: ScheduledPipelineParams,
     scheduler: "DaskScheduler",
-) -> AsyncIterator[DaskClient]:
+) -> BaseCluster:
     cluster: BaseCluster = scheduler.settings.default_cluster
     if pipeline_params.use_on_demand_clusters:
         cluster = await get_or_create_on_demand_cluster(
@@ -82,6 +82,16 @@ async def _cluster_dask_client(
     if pipeline_params.cluster_id != DEFAULT_CLUSTER_ID:
         clusters_repo = ClustersRepository.instance(scheduler.db_engine)
         cluster = await clusters_repo.get_cluster(user_id, pipeline_params.cluster_id)
+    return cluster
+
+
+@asynccontextmanager
+async def _cluster_dask_client(
+    user_id: UserID,
+    pipeline_params: ScheduledPipelineParams,
+    scheduler: "DaskScheduler",
+) -> AsyncIterator[DaskClient]:
+    cluster = await _get_pipeline_cluster(user_id, pipeline_params, scheduler)
     async with scheduler.dask_clients_pool.acquire(cluster) as client:
         yield client
 
@@ -116,6 +126,11 @@ class DaskScheduler(BaseCompScheduler):
                 RunningState.PENDING,
             )
             # each task is started independently
+            on_task_done_callback = (
+                functools.partial(self._mark_pipeline_dirty, user_id, project_id)
+                if self.settings.COMPUTATIONAL_BACKEND_EVENT_DRIVEN_SCHEDULING_ENABLED
+                else self._wake_up_scheduler_now
+            )
             results: list[list[PublishedComputationTask]] = await asyncio.gather(
                 *(
                     client.send_computation_tasks(
@@ -124,7 +139,7 @@ class DaskScheduler(BaseCompScheduler):
                         cluster_id=pipeline_params.cluster_id,
                         tasks={node_id: task.image},
                         hardware_info=task.hardware_info,
-                        callback=self._wake_up_scheduler_now,
+                        callback=on_task_done_callback,
                         metadata=pipeline_params.run_metadata,
                     )
                     for node_id, task in scheduled_tasks.items()
@@ -149,11 +164,12 @@ class DaskScheduler(BaseCompScheduler):
         pipeline_params: ScheduledPipelineParams,
     ) -> list[RunningState]:
         try:
-            async with _cluster_dask_client(user_id, pipeline_params, self) as client:
-                tasks_statuses = await client.get_tasks_status(
-                    [f"{t.job_id}" for t in tasks]
-                )
-                # process dask states
+            cluster = await _get_pipeline_cluster(user_id, pipeline_params, self)
+            # NOTE: the pool batches the requests of all the pipelines running on the same cluster
+            tasks_statuses = await self.dask_clients_pool.get_tasks_status(
+                cluster, [f"{t.job_id}" for t in tasks]
+            )
+            # process dask states
             running_states: list[RunningState] = []
             for dask_task_state, task in zip(tasks_statuses, tasks, strict=True):
                 if dask_task_state is DaskClientTaskState.PENDING_OR_STARTED:
@@ -339,6 +355,9 @@ class DaskScheduler(BaseCompScheduler):
                     iteration=run.iteration,
                     run_metadata=run.metadata,
                 )
+                if self.settings.COMPUTATIONAL_BACKEND_EVENT_DRIVEN_SCHEDULING_ENABLED:
+                    # the task started, the pipeline shall be re-evaluated
+                    self._mark_pipeline_dirty(user_id, project_id)
             else:
                 await comp_tasks_repo.update_project_task_progress(
                     project_id, node_id, task_progress_event.progress
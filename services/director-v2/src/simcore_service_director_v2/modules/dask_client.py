@@ -11,12 +11,11 @@ loads(dumps(my_object))
 import asyncio
 import json
 import logging
-import traceback
 from collections.abc import Callable
 from copy import deepcopy
 from dataclasses import dataclass, field
 from http.client import HTTPException
-from typing import Any, cast
+from typing import Any, TypeAlias, cast
 
 import dask.typing
 import distributed
@@ -104,6 +103,11 @@ _DASK_DEFAULT_TIMEOUT_S = 1
 
 _UserCallbackInSepThread = Callable[[], None]
 
+# (state, exception type name, exception text, traceback text)
+_SchedulerTaskStatus: TypeAlias = tuple[
+    DaskSchedulerTaskState | None, str | None, str | None, str | None
+]
+
 
 @dataclass(frozen=True, kw_only=True, slots=True)
 class PublishedComputationTask:
@@ -435,43 +439,61 @@ class DaskClient:
         dask_utils.check_communication_with_scheduler_is_open(self.backend.client)
         dask_utils.check_scheduler_status(self.backend.client)
 
-        # try to get the task from the scheduler
-        def _get_pipeline_statuses(
-            dask_scheduler: distributed.Scheduler,
-        ) -> dict[dask.typing.Key, DaskSchedulerTaskState | None]:
-            statuses: dict[
-                dask.typing.Key, DaskSchedulerTaskState | None
-            ] = dask_scheduler.get_task_status(keys=job_ids)
+        def _get_tasks_statuses_on_scheduler(
+            dask_scheduler: distributed.Scheduler, *, job_ids: list[str]
+        ) -> dict[dask.typing.Key, _SchedulerTaskStatus]:
+            # NOTE: this runs on the dask-scheduler, it is therefore defined locally to be
+            # pickled by value. The exceptions are not unpickled there, the worker already
+            # stored their representation (e.g. "TaskCancelledError(...)")
+            statuses: dict[dask.typing.Key, _SchedulerTaskStatus] = {}
+            for job_id in job_ids:
+                task_state = dask_scheduler.tasks.get(job_id)
+                if task_state is None:
+                    statuses[job_id] = (None, None, None, None)
+                    continue
+                exception_type = exception_text = traceback_text = None
+                if task_state.state == "erred":
+                    erred_task = task_state.exception_blame or task_state
+                    exception_text = erred_task.exception_text or None
+                    traceback_text = erred_task.traceback_text or None
+                    if exception_text:
+                        exception_type = exception_text.split("(", maxsplit=1)[0]
+                        exception_type = exception_type.strip()
+                statuses[job_id] = (
+                    task_state.state,
+                    exception_type,
+                    exception_text,
+                    traceback_text,
+                )
             return statuses
 
+        # NOTE: states and errors are resolved in one go on the scheduler, this
+        # way there is only 1 round trip whatever the number of (erred) tasks
         task_statuses: dict[
-            dask.typing.Key, DaskSchedulerTaskState | None
-        ] = await self.backend.client.run_on_scheduler(_get_pipeline_statuses)
+            dask.typing.Key, _SchedulerTaskStatus
+        ] = await self.backend.client.run_on_scheduler(
+            _get_tasks_statuses_on_scheduler, job_ids=job_ids
+        )
         assert isinstance(task_statuses, dict)  # nosec
 
         _logger.debug("found dask task statuses: %s", f"{task_statuses=}")
 
         running_states: list[DaskClientTaskState] = []
         for job_id in job_ids:
-            dask_status = cast(
-                DaskSchedulerTaskState | None, task_statuses.get(job_id, "lost")
+            dask_status, exception_type, exception_text, traceback_text = cast(
+                _SchedulerTaskStatus,
+                task_statuses.get(job_id, ("lost", None, None, None)),
             )
             if dask_status == "erred":
                 # find out if this was a cancellation
-                exception = await distributed.Future(job_id).exception(
-                    timeout=_DASK_DEFAULT_TIMEOUT_S
-                )
-                assert isinstance(exception, Exception)  # nosec
-
-                if isinstance(exception, TaskCancelledError):
+                if exception_type == TaskCancelledError.__name__:
                     running_states.append(DaskClientTaskState.ABORTED)
                 else:
-                    assert exception  # nosec
                     _logger.warning(
                         "Task  %s completed in error:\n%s\nTrace:\n%s",
                         job_id,
-                        exception,
-                        "".join(traceback.format_exception(exception)),
+                        exception_text,
+                        traceback_text,
                     )
                     running_states.append(DaskClientTaskState.ERRED)
             elif dask_status is None:
@@ -3,7 +3,7 @@ import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import TypeAlias
+from typing import Final, TypeAlias
 
 from fastapi import FastAPI
 from models_library.clusters import BaseCluster, ClusterTypeInModel
@@ -16,6 +16,7 @@ from ..core.errors import (
     DaskClientAcquisisitonError,
 )
 from ..core.settings import ComputationalBackendSettings
+from ..models.dask_subsystem import DaskClientTaskState
 from ..utils.dask_client_utils import TaskHandlers
 from .dask_client import DaskClient
 
@@ -23,6 +24,16 @@ logger = logging.getLogger(__name__)
 
 
 _ClusterUrl: TypeAlias = AnyUrl
+_TASKS_STATUS_BATCHING_WINDOW_S: Final[float] = 0.1
+
+
+@dataclass
+class _TasksStatusBatch:
+    # NOTE: dict is used as an ordered set
+    job_ids: dict[str, None] = field(default_factory=dict)
+    statuses: asyncio.Future[dict[str, DaskClientTaskState]] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
 
 
 @dataclass
@@ -32,6 +43,10 @@ class DaskClientsPool:
     _client_acquisition_lock: asyncio.Lock = field(init=False)
     _cluster_to_client_map: dict[_ClusterUrl, DaskClient] = field(default_factory=dict)
     _task_handlers: TaskHandlers | None = None
+    _tasks_status_batches: dict[_ClusterUrl, _TasksStatusBatch] = field(
+        default_factory=dict
+    )
+    _tasks_status_flush_tasks: set[asyncio.Task] = field(default_factory=set)
 
     def __post_init__(self):
         # NOTE: to ensure the correct loop is used
@@ -55,6 +70,9 @@ class DaskClientsPool:
         return dask_clients_pool
 
     async def delete(self) -> None:
+        for task in self._tasks_status_flush_tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks_status_flush_tasks, return_exceptions=True)
         await asyncio.gather(
             *[client.delete() for client in self._cluster_to_client_map.values()],
             return_exceptions=True,
@@ -122,6 +140,50 @@ class DaskClientsPool:
                 await dask_client.delete()
             raise
 
+    async def get_tasks_status(
+        self, cluster: BaseCluster, job_ids: list[str]
+    ) -> list[DaskClientTaskState]:
+        """returns the states of job_ids in the given cluster
+
+        Concurrent calls targeting the same cluster (e.g. one per scheduled pipeline)
+        are batched together so that only one request is sent to the dask-scheduler
+        per batching window, the results are then dispatched back to each caller.
+        """
+        if not job_ids:
+            return []
+        batch = self._tasks_status_batches.get(cluster.endpoint)
+        if batch is None:
+            batch = self._tasks_status_batches[cluster.endpoint] = _TasksStatusBatch()
+            flush_task = asyncio.create_task(
+                self._flush_tasks_status_batch(cluster, batch),
+                name=f"dask_tasks_status_batch_{cluster.endpoint}",
+            )
+            self._tasks_status_flush_tasks.add(flush_task)
+            flush_task.add_done_callback(self._tasks_status_flush_tasks.discard)
+        batch.job_ids.update(dict.fromkeys(job_ids))
+
+        # NOTE: shielded so that a cancelled caller does not cancel the whole batch
+        statuses = await asyncio.shield(batch.statuses)
+        return [statuses[job_id] for job_id in job_ids]
+
+    async def _flush_tasks_status_batch(
+        self, cluster: BaseCluster, batch: _TasksStatusBatch
+    ) -> None:
+        # let the other callers join the batch
+        await asyncio.sleep(_TASKS_STATUS_BATCHING_WINDOW_S)
+        self._tasks_status_batches.pop(cluster.endpoint, None)  # type: ignore[arg-type] # https://github.com/python/mypy/issues/10152
+        try:
+            job_ids = list(batch.job_ids)
+            async with self.acquire(cluster) as client:
+                statuses = await client.get_tasks_status(job_ids)
+            batch.statuses.set_result(dict(zip(job_ids, statuses, strict=True)))
+        except asyncio.CancelledError:
+            batch.statuses.cancel()
+            raise
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # NOTE: every caller receives the error
+            batch.statuses.set_exception(exc)
+
 
 def setup(app: FastAPI, settings: ComputationalBackendSettings) -> None:
     async def on_startup() -> None:
@@ -0,0 +1,64 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+
+import datetime
+
+import arrow
+import pytest
+from models_library.clusters import DEFAULT_CLUSTER_ID
+from simcore_service_director_v2.modules.comp_scheduler.base_scheduler import (
+    ScheduledPipelineParams,
+)
+
+_RECONCILIATION_INTERVAL = datetime.timedelta(seconds=30)
+
+
+@pytest.fixture
+def pipeline_params() -> ScheduledPipelineParams:
+    return ScheduledPipelineParams(
+        cluster_id=DEFAULT_CLUSTER_ID,
+        run_metadata={},
+        use_on_demand_clusters=False,
+    )
+
+
+def test_new_pipeline_needs_scheduling(pipeline_params: ScheduledPipelineParams):
+    assert pipeline_params.is_dirty is True
+    assert pipeline_params.last_scheduled is None
+    assert pipeline_params.needs_scheduling(
+        now=arrow.utcnow().datetime, reconciliation_interval=_RECONCILIATION_INTERVAL
+    )
+
+
+def test_clean_pipeline_needs_scheduling_only_after_reconciliation_interval(
+    pipeline_params: ScheduledPipelineParams,
+):
+    now = arrow.utcnow().datetime
+    pipeline_params.is_dirty = False
+    pipeline_params.last_scheduled = now
+    assert not pipeline_params.needs_scheduling(
+        now=now + _RECONCILIATION_INTERVAL / 2,
+        reconciliation_interval=_RECONCILIATION_INTERVAL,
+    )
+    assert pipeline_params.needs_scheduling(
+        now=now + _RECONCILIATION_INTERVAL,
+        reconciliation_interval=_RECONCILIATION_INTERVAL,
+    )
+
+    # an event makes it dirty again
+    pipeline_params.is_dirty = True
+    assert pipeline_params.needs_scheduling(
+        now=now, reconciliation_interval=_RECONCILIATION_INTERVAL
+    )
+
+
+def test_scheduling_state_is_not_compared(pipeline_params: ScheduledPipelineParams):
+    other = ScheduledPipelineParams(
+        cluster_id=DEFAULT_CLUSTER_ID,
+        run_metadata={},
+        use_on_demand_clusters=False,
+        is_dirty=False,
+        last_scheduled=arrow.utcnow().datetime,
+    )
+    assert other == pipeline_params
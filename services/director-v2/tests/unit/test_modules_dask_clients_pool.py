@@ -3,6 +3,7 @@
 # pylint:disable=redefined-outer-name
 
 
+import asyncio
 from random import choice
 from typing import Any, AsyncIterator, Callable, get_args
 from unittest import mock
@@ -32,6 +33,7 @@ from simcore_service_director_v2.core.errors import (
     DaskClientAcquisisitonError,
 )
 from simcore_service_director_v2.core.settings import AppSettings
+from simcore_service_director_v2.models.dask_subsystem import DaskClientTaskState
 from simcore_service_director_v2.modules.dask_clients_pool import DaskClientsPool
 from starlette.testclient import TestClient
 
@@ -228,6 +230,55 @@ async def test_acquiring_wrong_cluster_raises_exception(
             ...
 
 
+async def test_get_tasks_status_batches_concurrent_calls_per_cluster(
+    minimal_dask_config: None,
+    mocker: MockerFixture,
+    client: TestClient,
+    fake_clusters: Callable[[int], list[Cluster]],
+    faker: Faker,
+):
+    mocked_dask_client = mocker.patch(
+        "simcore_service_director_v2.modules.dask_clients_pool.DaskClient",
+        autospec=True,
+    )
+    mocked_dask_client.create.return_value = mocked_dask_client
+    mocked_dask_client.get_tasks_status.side_effect = lambda job_ids: [
+        DaskClientTaskState.PENDING for _ in job_ids
+    ]
+    clients_pool = DaskClientsPool.instance(client.app)
+
+    cluster = fake_clusters(1)[0]
+    num_pipelines = 50
+    job_ids_per_pipeline = [
+        [faker.pystr() for _ in range(3)] for _ in range(num_pipelines)
+    ]
+    results = await asyncio.gather(
+        *(
+            clients_pool.get_tasks_status(cluster, job_ids)
+            for job_ids in job_ids_per_pipeline
+        )
+    )
+    # all the pipelines got their own statuses back
+    for job_ids, statuses in zip(job_ids_per_pipeline, results, strict=True):
+        assert statuses == [DaskClientTaskState.PENDING] * len(job_ids)
+    # but only 1 request was sent to the scheduler
+    mocked_dask_client.get_tasks_status.assert_called_once_with(
+        [job_id for job_ids in job_ids_per_pipeline for job_id in job_ids]
+    )
+
+    # errors are dispatched to every caller
+    mocked_dask_client.get_tasks_status.side_effect = RuntimeError
+    results = await asyncio.gather(
+        *(
+            clients_pool.get_tasks_status(cluster, job_ids)
+            for job_ids in job_ids_per_pipeline
+        ),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    await clients_pool.delete()
+
+
 def test_default_cluster_correctly_initialized(
     minimal_dask_config: None, default_scheduler: None, client: TestClient
 ):
@@ -1036,6 +1036,67 @@ async def test_task_progress_triggers(
         )
 
 
+@pytest.fixture
+def with_event_driven_scheduling(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("COMPUTATIONAL_BACKEND_EVENT_DRIVEN_SCHEDULING_ENABLED", "1")
+
+
+async def test_task_progress_marks_pipeline_dirty(
+    with_event_driven_scheduling: None,
+    with_disabled_scheduler_task: None,
+    mocked_dask_client: mock.MagicMock,
+    scheduler: BaseCompScheduler,
+    aiopg_engine: aiopg.sa.engine.Engine,
+    published_project: PublishedProject,
+    mocked_parse_output_data_fct: None,
+    mocked_clean_task_output_and_log_files_if_invalid: None,
+):
+    assert scheduler.settings.COMPUTATIONAL_BACKEND_EVENT_DRIVEN_SCHEDULING_ENABLED
+    _mock_send_computation_tasks(published_project.tasks, mocked_dask_client)
+    expected_published_tasks = await _assert_start_pipeline(
+        aiopg_engine, published_project, scheduler
+    )
+    expected_pending_tasks = await _assert_schedule_pipeline_PENDING(
+        aiopg_engine,
+        published_project,
+        expected_published_tasks,
+        mocked_dask_client,
+        scheduler,
+    )
+    assert len(scheduler.scheduled_pipelines) == 1
+    pipeline_params = next(iter(scheduler.scheduled_pipelines.values()))
+    # nothing happened since the last scheduling
+    pipeline_params.is_dirty = False
+    scheduler.wake_up_event.clear()
+
+    started_task = expected_pending_tasks[0]
+    assert started_task.job_id
+    assert published_project.project.prj_owner
+    await _trigger_progress_event(
+        scheduler,
+        job_id=started_task.job_id,
+        user_id=published_project.project.prj_owner,
+        project_id=published_project.project.uuid,
+        node_id=started_task.node_id,
+    )
+    # the task started, the pipeline is re-evaluated right away
+    assert pipeline_params.is_dirty is True
+    assert scheduler.wake_up_event.is_set()
+
+    # further progress of the running task does not wake up the scheduler
+    pipeline_params.is_dirty = False
+    scheduler.wake_up_event.clear()
+    await _trigger_progress_event(
+        scheduler,
+        job_id=started_task.job_id,
+        user_id=published_project.project.prj_owner,
+        project_id=published_project.project.uuid,
+        node_id=started_task.node_id,
+    )
+    assert pipeline_params.is_dirty is False
+    assert not scheduler.wake_up_event.is_set()
+
+
 @pytest.mark.parametrize(
     "backend_error",
     [
@@ -57,6 +57,10 @@ DIRECTOR_REGISTRY_CACHING: bool = strtobool(
 DIRECTOR_REGISTRY_CACHING_TTL: int = int(
     os.environ.get("DIRECTOR_REGISTRY_CACHING_TTL", 15 * 60)
 )
+# maximum number of concurrent calls to the registry when listing services or refreshing the cache
+DIRECTOR_REGISTRY_CLIENT_MAX_CONCURRENT_CALLS: int = _from_env_with_default(
+    "DIRECTOR_REGISTRY_CLIENT_MAX_CONCURRENT_CALLS", int, 20
+)
 
 DIRECTOR_SERVICES_CUSTOM_CONSTRAINTS: str = os.environ.get(
     "DIRECTOR_SERVICES_CUSTOM_CONSTRAINTS", ""
@@ -113,6 +117,7 @@ TRAEFIK_SIMCORE_ZONE: str = os.environ.get(
     "TRAEFIK_SIMCORE_ZONE", "internal_simcore_stack"
 )
 APP_REGISTRY_CACHE_DATA_KEY: str = __name__ + "_registry_cache_data"
+APP_REGISTRY_LABELS_CACHE_DATA_KEY: str = __name__ + "_registry_labels_cache_data"
 
 REGISTRY_AUTH: bool = strtobool(os.environ.get("REGISTRY_AUTH", "False"))
 REGISTRY_USER: str = os.environ.get("REGISTRY_USER", "")
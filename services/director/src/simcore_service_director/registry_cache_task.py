@@ -1,49 +1,121 @@
+""" Background task refreshing the registry cache
+
+The cache holds the responses of the registry (SEE cache_request_decorator.py):
+- every cached entry (catalog pages, tags lists and manifests) is revalidated every
+  DIRECTOR_REGISTRY_CACHING_TTL with a conditional request (If-None-Match). A tag is
+  mutable, but the ETag of a manifest is its digest: an unchanged manifest only costs
+  a 304 response, a re-pushed tag returns the new manifest.
+- the entries of removed tags (or repositories) are evicted
+- the image labels are cached by manifest digest (i.e. immutable content) and are
+  evicted once no cached manifest refers to them anymore
+- on registry errors, the stale entries are kept and served until the next refresh
+"""
+
 import asyncio
 import logging
-from typing import AsyncIterator
+from typing import AsyncIterator, Dict, Optional, Tuple
 
 from aiohttp import web
-from servicelib.utils import logged_gather
 from simcore_service_director import config, exceptions, registry_proxy
-from simcore_service_director.config import APP_REGISTRY_CACHE_DATA_KEY
+from simcore_service_director.config import (
+    APP_REGISTRY_CACHE_DATA_KEY,
+    APP_REGISTRY_LABELS_CACHE_DATA_KEY,
+)
 
 _logger = logging.getLogger(__name__)
 
 TASK_NAME: str = __name__ + "_registry_caching_task"
 
 
+def _split_cache_key(cache_key: str) -> Tuple[str, str]:
+    path, method = cache_key.rsplit(":", 1)
+    return path, method
+
+
+def _get_etag(cached_headers: Optional[Dict]) -> Optional[str]:
+    cached_headers = cached_headers or {}
+    etag = cached_headers.get("ETag")
+    if not etag and registry_proxy.DOCKER_CONTENT_DIGEST_HEADER in cached_headers:
+        # the ETag of a manifest is its digest
+        etag = f'"{cached_headers[registry_proxy.DOCKER_CONTENT_DIGEST_HEADER]}"'
+    return etag
+
+
+async def _revalidate_entry(
+    app: web.Application, cache_key: str, cached: Tuple[Dict, Dict]
+) -> Tuple[Dict, Dict]:
+    path, method = _split_cache_key(cache_key)
+    _, cached_headers = cached
+    etag = _get_etag(cached_headers)
+    session_kwargs = {"headers": {"If-None-Match": etag}} if etag else {}
+
+    resp_data, resp_headers = await registry_proxy.registry_request(
+        app, path, method, no_cache=True, **session_kwargs
+    )
+    if resp_data is None:
+        # not modified
+        return cached
+    return (resp_data, resp_headers)
+
+
+async def _revalidate_cached_entries(app: web.Application) -> None:
+    cache_data = app[APP_REGISTRY_CACHE_DATA_KEY]
+    entries = list(cache_data.items())
+
+    results = await registry_proxy.gather_with_max_concurrency(
+        *[_revalidate_entry(app, key, cached) for key, cached in entries],
+        return_exceptions=True,
+    )
+    for (key, _), result in zip(entries, results):
+        if isinstance(result, exceptions.ServiceNotAvailableError):
+            # e.g. the tag or the repository was removed
+            cache_data.pop(key, None)
+        elif isinstance(result, Exception):
+            _logger.warning(
+                "%s: could not revalidate %s, keeping stale entry: %s",
+                TASK_NAME,
+                key,
+                result,
+            )
+        else:
+            cache_data[key] = result
+
+
+def _evict_unreferenced_labels(app: web.Application) -> None:
+    referenced_digests = {
+        (headers or {}).get(registry_proxy.DOCKER_CONTENT_DIGEST_HEADER)
+        for _, headers in app[APP_REGISTRY_CACHE_DATA_KEY].values()
+    }
+    labels_cache = app[APP_REGISTRY_LABELS_CACHE_DATA_KEY]
+    for digest in set(labels_cache) - referenced_digests:
+        labels_cache.pop(digest, None)
+
+
+async def refresh_registry_cache(app: web.Application) -> None:
+    """Costs a conditional request per cached entry + the manifests of the new tags"""
+    await _revalidate_cached_entries(app)
+    _evict_unreferenced_labels(app)
+    # fills the cache with the manifests of the new tags
+    await registry_proxy.list_services(app, registry_proxy.ServiceType.ALL)
+
+
 async def registry_caching_task(app: web.Application) -> None:
     try:
 
         _logger.info("%s: initializing cache...", TASK_NAME)
         app[APP_REGISTRY_CACHE_DATA_KEY].clear()
-        await registry_proxy.list_services(app, registry_proxy.ServiceType.ALL)
-        _logger.info("%s: initialisation completed", TASK_NAME)
+        app[APP_REGISTRY_LABELS_CACHE_DATA_KEY].clear()
         while True:
             _logger.info("%s: waking up, refreshing cache...", TASK_NAME)
             try:
-                keys = []
-                refresh_tasks = []
-                for key in app[APP_REGISTRY_CACHE_DATA_KEY]:
-                    path, method = key.split(":")
-                    _logger.debug("refresh %s:%s", method, path)
-                    refresh_tasks.append(
-                        registry_proxy.registry_request(
-                            app, path, method, no_cache=True
-                        )
-                    )
-                keys = list(app[APP_REGISTRY_CACHE_DATA_KEY].keys())
-                results = await logged_gather(*refresh_tasks)
-
-                for key, result in zip(keys, results):
-                    app[APP_REGISTRY_CACHE_DATA_KEY][key] = result
+                await refresh_registry_cache(app)
 
             except exceptions.DirectorException:
                 # if the registry is temporarily not available this might happen
                 _logger.exception(
-                    "%s: exception while refreshing cache, clean cache...", TASK_NAME
+                    "%s: exception while refreshing cache, keeping stale entries...",
+                    TASK_NAME,
                 )
-                app[APP_REGISTRY_CACHE_DATA_KEY].clear()
 
             _logger.info(
                 "cache refreshed %s: sleeping for %ss...",
@@ -58,10 +130,12 @@ async def registry_caching_task(app: web.Application) -> None:
     finally:
         _logger.info("%s: finished task...clearing cache...", TASK_NAME)
         app[APP_REGISTRY_CACHE_DATA_KEY].clear()
+        app[APP_REGISTRY_LABELS_CACHE_DATA_KEY].clear()
 
 
 async def setup_registry_caching_task(app: web.Application) -> AsyncIterator[None]:
     app[APP_REGISTRY_CACHE_DATA_KEY] = {}
+    app[APP_REGISTRY_LABELS_CACHE_DATA_KEY] = {}
     app[TASK_NAME] = asyncio.get_event_loop().create_task(registry_caching_task(app))
 
     yield
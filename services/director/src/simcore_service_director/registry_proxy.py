@@ -6,7 +6,7 @@ import logging
 import re
 from http import HTTPStatus
 from pprint import pformat
-from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
 
 from aiohttp import BasicAuth, ClientSession, client_exceptions, web
 from aiohttp.client import ClientTimeout
@@ -69,6 +69,10 @@ async def _basic_auth_registry_request(
                     url, method, response.headers, session, **session_kwargs
                 )
 
+            elif response.status == HTTPStatus.NOT_MODIFIED:
+                # conditional request (If-None-Match): the cached data is still valid
+                resp_data, resp_headers = None, response.headers
+
             elif response.status == HTTPStatus.NOT_FOUND:
                 logger.exception("Path to registry not found: %s", url)
                 raise exceptions.ServiceNotAvailableError(str(path))
@@ -130,10 +134,15 @@ async def _auth_registry_request(
                     )
                 )
             bearer_code = (await token_resp.json())["token"]
-            headers = {"Authorization": "Bearer {}".format(bearer_code)}
+            headers = {
+                **kwargs.pop("headers", {}),
+                "Authorization": "Bearer {}".format(bearer_code),
+            }
             async with getattr(session, method.lower())(
                 url, headers=headers, **kwargs
             ) as resp_wtoken:
+                if resp_wtoken.status == HTTPStatus.NOT_MODIFIED:
+                    return (None, resp_wtoken.headers)
                 if resp_wtoken.status == HTTPStatus.NOT_FOUND:
                     logger.exception("path to registry not found: %s", url)
                     raise exceptions.ServiceNotAvailableError(str(url))
@@ -151,6 +160,8 @@ async def _auth_registry_request(
         async with getattr(session, method.lower())(
             url, auth=auth, **kwargs
         ) as resp_wbasic:
+            if resp_wbasic.status == HTTPStatus.NOT_MODIFIED:
+                return (None, resp_wbasic.headers)
             if resp_wbasic.status == HTTPStatus.NOT_FOUND:
                 logger.exception("path to registry not found: %s", url)
                 raise exceptions.ServiceNotAvailableError(str(url))
@@ -175,6 +186,10 @@ async def registry_request(
     no_cache: bool = False,
     **session_kwargs,
 ) -> Tuple[Dict, Dict]:
+    """
+    NOTE: conditional requests (i.e. passing an If-None-Match header) return (None, headers)
+    if the resource was not modified
+    """
     logger.debug(
         "Request to registry: path=%s, method=%s. no_cache=%s", path, method, no_cache
     )
@@ -183,6 +198,21 @@ async def registry_request(
     )
 
 
+async def gather_with_max_concurrency(
+    *coros: Awaitable, return_exceptions: bool = False
+) -> List[Any]:
+    """asyncio.gather limiting the number of concurrent calls to the registry"""
+    semaphore = asyncio.Semaphore(config.DIRECTOR_REGISTRY_CLIENT_MAX_CONCURRENT_CALLS)
+
+    async def _limited(coro: Awaitable) -> Any:
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(
+        *[_limited(coro) for coro in coros], return_exceptions=return_exceptions
+    )
+
+
 async def is_registry_responsive(app: web.Application) -> bool:
     path = "/v2/"
     try:
@@ -243,7 +273,7 @@ async def list_image_tags(app: web.Application, image_key: str) -> List[str]:
     logger.debug("Found %s image tags in %s", len(image_tags), image_key)
     return image_tags
 
-_DOCKER_CONTENT_DIGEST_HEADER = "Docker-Content-Digest"
+DOCKER_CONTENT_DIGEST_HEADER = "Docker-Content-Digest"
 
 async def get_image_digest(app: web.Application, image: str, tag: str) -> Optional[str]:
     """ Returns image manifest digest number or None if fails to obtain it
@@ -256,7 +286,7 @@ async def get_image_digest(app: web.Application, image: str, tag: str) -> Option
     _, headers = await registry_request(app, path)
 
     headers = headers or {}
-    return headers.get(_DOCKER_CONTENT_DIGEST_HEADER, None)
+    return headers.get(DOCKER_CONTENT_DIGEST_HEADER, None)
 
 
 async def get_image_labels(app: web.Application, image: str, tag: str) -> Tuple[Dict, Optional[str]]:
@@ -265,14 +295,28 @@ async def get_image_labels(app: web.Application, image: str, tag: str) -> Tuple[
     logger.debug("getting image labels of %s:%s", image, tag)
     path = f"/v2/{image}/manifests/{tag}"
     request_result, headers = await registry_request(app, path)
-    v1_compatibility_key = json.loads(request_result["history"][0]["v1Compatibility"])
-    container_config = v1_compatibility_key.get(
-        "container_config", v1_compatibility_key["config"]
-    )
-    labels = container_config["Labels"]
 
     headers = headers or {}
-    manifest_digest =  headers.get(_DOCKER_CONTENT_DIGEST_HEADER, None)
+    manifest_digest =  headers.get(DOCKER_CONTENT_DIGEST_HEADER, None)
+
+    # NOTE: a tag can be moved to another image, labels are cached by manifest digest
+    labels_cache: Optional[Dict[str, Dict]] = (
+        app[config.APP_REGISTRY_LABELS_CACHE_DATA_KEY]
+        if config.DIRECTOR_REGISTRY_CACHING
+        else None
+    )
+    if labels_cache is not None and manifest_digest in labels_cache:
+        labels = labels_cache[manifest_digest]
+    else:
+        v1_compatibility_key = json.loads(
+            request_result["history"][0]["v1Compatibility"]
+        )
+        container_config = v1_compatibility_key.get(
+            "container_config", v1_compatibility_key["config"]
+        )
+        labels = container_config["Labels"]
+        if labels_cache is not None and manifest_digest:
+            labels_cache[manifest_digest] = labels
 
     logger.debug("retrieved labels of image %s:%s", image, tag)
 
@@ -315,7 +359,7 @@ async def get_repo_details(app: web.Application, image_key: str) -> List[Dict]:
     repo_details = []
     image_tags = await list_image_tags(app, image_key)
     tasks = [get_image_details(app, image_key, tag) for tag in image_tags]
-    results = await asyncio.gather(*tasks)
+    results = await gather_with_max_concurrency(*tasks)
     for image_details in results:
         if image_details:
             repo_details.append(image_details)
@@ -334,15 +378,29 @@ async def list_services(app: web.Application, service_type: ServiceType) -> List
     repos = [x for x in repos if str(x).startswith(tuple(prefixes))]
     logger.debug("retrieved list of repos : %s", repos)
 
+    # NOTE: the tags of all repos are listed first and then all the images are
+    # detailed, so that the number of concurrent calls to the registry stays bounded
+    repos_tags = await gather_with_max_concurrency(
+        *[list_image_tags(app, repo) for repo in repos], return_exceptions=True
+    )
+    images = []
+    for repo, image_tags in zip(repos, repos_tags):
+        if isinstance(image_tags, Exception):
+            logger.error("Exception occured while listing services %s", image_tags)
+            continue
+        images.extend((repo, tag) for tag in image_tags)
+
     # only list as service if it actually contains the necessary labels
-    tasks = [get_repo_details(app, repo) for repo in repos]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    results = await gather_with_max_concurrency(
+        *[get_image_details(app, repo, tag) for repo, tag in images],
+        return_exceptions=True,
+    )
     services = []
-    for repo_details in results:
-        if repo_details and isinstance(repo_details, list):
-            services.extend(repo_details)
-        elif isinstance(repo_details, Exception):
-            logger.error("Exception occured while listing services %s", repo_details)
+    for image_details in results:
+        if image_details and isinstance(image_details, dict):
+            services.append(image_details)
+        elif isinstance(image_details, Exception):
+            logger.error("Exception occured while listing services %s", image_details)
     return services
 
 
@@ -65,3 +65,60 @@ async def test_registry_caching_task(client, push_services):
         app, registry_proxy.ServiceType.ALL
     )
     assert len(list_of_services) == len(pushed_services)
+
+
+async def test_registry_cache_refresh_revalidates_with_conditional_requests(
+    aiohttp_mock_app,
+    push_services,
+    configure_registry_access,
+    configure_schemas_location,
+    monkeypatch,
+    mocker,
+):
+    monkeypatch.setattr(config, "DIRECTOR_REGISTRY_CACHING", True)
+    pushed_services = await push_services(
+        number_of_computational_services=1, number_of_interactive_services=1
+    )
+    list_of_services = await registry_proxy.list_services(
+        aiohttp_mock_app, registry_proxy.ServiceType.ALL
+    )
+    assert len(list_of_services) == len(pushed_services)
+    cached_digests = set(
+        aiohttp_mock_app[config.APP_REGISTRY_LABELS_CACHE_DATA_KEY].keys()
+    )
+    assert cached_digests == {service["image_digest"] for service in list_of_services}
+
+    spy_registry_request = mocker.spy(registry_proxy, "_basic_auth_registry_request")
+
+    def _requested_manifests(*, conditional: bool):
+        return [
+            call[0][1]
+            for call in spy_registry_request.call_args_list
+            if "/manifests/" in call[0][1]
+            and ("If-None-Match" in call[1].get("headers", {})) == conditional
+        ]
+
+    # tags are mutable: the manifests are revalidated against their digest
+    await registry_cache_task.refresh_registry_cache(aiohttp_mock_app)
+    assert len(_requested_manifests(conditional=True)) == 2
+    assert not _requested_manifests(conditional=False)
+    assert (
+        set(aiohttp_mock_app[config.APP_REGISTRY_LABELS_CACHE_DATA_KEY].keys())
+        == cached_digests
+    )
+
+    # only the manifests of the new tags are requested in full
+    pushed_services = await push_services(
+        number_of_computational_services=1,
+        number_of_interactive_services=1,
+        version="2.0.",
+    )
+    spy_registry_request.reset_mock()
+    await registry_cache_task.refresh_registry_cache(aiohttp_mock_app)
+    assert len(_requested_manifests(conditional=True)) == 2
+    assert len(_requested_manifests(conditional=False)) == 2
+
+    list_of_services = await registry_proxy.list_services(
+        aiohttp_mock_app, registry_proxy.ServiceType.ALL
+    )
+    assert len(list_of_services) == len(pushed_services)
@@ -1,29 +1,36 @@
+import asyncio
+import functools
 import json
 import logging
 import os
 import shutil
 import sys
 import time
-from collections import deque
 from contextlib import AsyncExitStack
 from enum import Enum
 from pathlib import Path
-from typing import Coroutine, Optional, cast
+from typing import Optional, cast
 
 import aiofiles.os
 import magic
-from aiofiles.tempfile import TemporaryDirectory as AioTemporaryDirectory
 from models_library.projects import ProjectIDStr
 from models_library.projects_nodes_io import NodeIDStr
 from pydantic import ByteSize
-from servicelib.archiving_utils import PrunableFolder, archive_dir, unarchive_dir
+from servicelib.archiving_utils import (
+    PrunableFolder,
+    StoredArchiveStream,
+    unarchive_dir,
+)
 from servicelib.async_utils import run_sequentially_in_context
 from servicelib.file_utils import remove_directory
 from servicelib.logging_utils import log_context
 from servicelib.progress_bar import ProgressBarData
 from servicelib.utils import logged_gather
 from simcore_sdk import node_ports_v2
-from simcore_sdk.node_ports_common.file_io_utils import LogRedirectCB
+from simcore_sdk.node_ports_common.file_io_utils import (
+    LogRedirectCB,
+    UploadableFileObject,
+)
 from simcore_sdk.node_ports_v2 import Nodeports, Port
 from simcore_sdk.node_ports_v2.links import ItemConcreteValue
 from simcore_sdk.node_ports_v2.port import SetKWargs
@@ -45,9 +52,11 @@ logger = logging.getLogger(__name__)
 # OUTPUTS section
 
 
-def _get_size_of_value(value: ItemConcreteValue | None) -> int:
+def _get_size_of_value(value: ItemConcreteValue | UploadableFileObject | None) -> int:
     if value is None:
         return 0
+    if isinstance(value, UploadableFileObject):
+        return value.file_size
     if isinstance(value, Path):
         # if symlink we need to fetch the pointer to the file
         # relative symlink need to know which their parent is
@@ -89,8 +98,9 @@ async def upload_outputs(
     )
 
     # let's gather the tasks
-    ports_values: dict[str, tuple[ItemConcreteValue | None, SetKWargs | None]] = {}
-    archiving_tasks: deque[Coroutine[None, None, None]] = deque()
+    ports_values: dict[
+        str, tuple[ItemConcreteValue | UploadableFileObject | None, SetKWargs | None]
+    ] = {}
     ports_to_set = [
         port_value
         for port_value in (await PORTS.outputs).values()
@@ -133,25 +143,23 @@ async def upload_outputs(
                     continue
 
                 # generic case let's create an archive
-                # only the filtered out files will be zipped
-                tmp_folder = Path(
-                    await stack.enter_async_context(AioTemporaryDirectory())  # type: ignore[arg-type]
-                )
-                tmp_file = tmp_folder / f"{src_folder.stem}.zip"
-
-                # when having multiple directories it is important to
-                # run the compression in parallel to guarantee better performance
-                archiving_tasks.append(
-                    archive_dir(
-                        dir_to_compress=src_folder,
-                        destination=tmp_file,
-                        compress=False,
-                        store_relative_path=True,
-                        progress_bar=sub_progress,
+                # NOTE: the archive is generated while it is uploaded, i.e. archiving
+                # and uploading overlap and no temporary archive file is written
+                archive_stream = stack.enter_context(
+                    await asyncio.get_event_loop().run_in_executor(
+                        None,
+                        functools.partial(
+                            StoredArchiveStream, src_folder, store_relative_path=True
+                        ),
                     )
                 )
+                await sub_progress.update()
                 ports_values[port.key] = (
-                    tmp_file,
+                    UploadableFileObject(
+                        file_object=archive_stream,
+                        file_name=f"{src_folder.stem}.zip",
+                        file_size=archive_stream.size,
+                    ),
                     SetKWargs(
                         file_base_path=(
                             src_folder.parent.relative_to(outputs_path.parent)
@@ -169,9 +177,6 @@ async def upload_outputs(
                 else:
                     logger.debug("No file %s to fetch port values from", data_file)
 
-        if archiving_tasks:
-            await logged_gather(*archiving_tasks)
-
         await PORTS.set_multiple(ports_values, progress_bar=sub_progress)
 
         elapsed_time = time.perf_counter() - start_time
@@ -1,18 +1,26 @@
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import NamedTuple
 
 import aioprocessing
 from aioprocessing.queues import AioQueue
 from fastapi import FastAPI
+from pydantic import NonNegativeInt
 
 from ..mounted_fs import MountedVolumes
 
 
+class PortKeyEvent(NamedTuple):
+    port_key: str
+    # size of the `port_key` directory when the event was generated
+    dir_size: NonNegativeInt
+
+
 @dataclass
 class OutputsContext:
     outputs_path: Path
 
-    # _PortKeysEventHandler (generates) -> EventFilter (receives)
+    # _PortKeysEventHandler (generates PortKeyEvent) -> EventFilter (receives)
     port_key_events_queue: AioQueue = field(default_factory=aioprocessing.AioQueue)
 
     # OutputsContext (generates) -> _EventHandlerProcess(receives)
@@ -1,7 +1,23 @@
+import logging
 import os
+import time
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Final
 
-from pydantic import ByteSize, parse_obj_as
+from pydantic import ByteSize, NonNegativeFloat, parse_obj_as
+
+_logger = logging.getLogger(__name__)
+
+_DEFAULT_VERIFICATION_INTERVAL_S: Final[NonNegativeFloat] = 60
+
+
+def _iter_file_sizes(path: str) -> Iterator[tuple[str, int]]:
+    for entry in os.scandir(path):
+        if entry.is_file():
+            yield entry.path, entry.stat().st_size
+        elif entry.is_dir():
+            yield from _iter_file_sizes(entry.path)
 
 
 def get_directory_total_size(path: Path) -> ByteSize:
@@ -12,10 +28,124 @@ def get_directory_total_size(path: Path) -> ByteSize:
     if not path.exists():
         return parse_obj_as(ByteSize, 0)
 
-    total = 0
-    for entry in os.scandir(path):
-        if entry.is_file():
-            total += entry.stat().st_size
-        elif entry.is_dir():
-            total += get_directory_total_size(Path(entry.path))
-    return parse_obj_as(ByteSize, total)
+    return parse_obj_as(
+        ByteSize, sum(size for _, size in _iter_file_sizes(f"{path}"))
+    )
+
+
+class DirectorySizeIndex:
+    """
+    Keeps the total size of a directory up to date from the changes
+    signaled by the file system events, instead of walking the whole
+    directory every time its size is required.
+
+    The directory is walked (verified) when its size is first required and
+    then at most once every `verification_interval_s` to correct any drift
+    (e.g. events which were missed).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        verification_interval_s: NonNegativeFloat = _DEFAULT_VERIFICATION_INTERVAL_S,
+    ) -> None:
+        self.path = path
+        self.verification_interval_s = verification_interval_s
+
+        self._prefix: str = f"{path}{os.sep}"
+        self._file_sizes: dict[str, int] = {}
+        self._total_size: int = 0
+        self._verified_at: float | None = None
+
+    @property
+    def total_size(self) -> ByteSize:
+        if (
+            self._verified_at is None
+            or time.monotonic() - self._verified_at > self.verification_interval_s
+        ):
+            self.verify()
+        return parse_obj_as(ByteSize, self._total_size)
+
+    def contains(self, path: str) -> bool:
+        return path.startswith(self._prefix)
+
+    def invalidate(self) -> None:
+        """the directory will be walked again when its size is next required"""
+        self._verified_at = None
+
+    def verify(self) -> None:
+        file_sizes = (
+            dict(_iter_file_sizes(f"{self.path}")) if self.path.exists() else {}
+        )
+        total_size = sum(file_sizes.values())
+        if self._verified_at is not None and total_size != self._total_size:
+            _logger.debug(
+                "Corrected size of '%s' from %s to %s",
+                self.path,
+                self._total_size,
+                total_size,
+            )
+        self._file_sizes = file_sizes
+        self._total_size = total_size
+        self._verified_at = time.monotonic()
+
+    def _set_file_size(self, path: str, size: int) -> None:
+        self._total_size += size - self._file_sizes.get(path, 0)
+        self._file_sizes[path] = size
+
+    def _pop_file_size(self, path: str) -> int | None:
+        size = self._file_sizes.pop(path, None)
+        if size is not None:
+            self._total_size -= size
+        return size
+
+    def _pop_file_sizes_in(self, path: str, *, is_directory: bool) -> dict[str, int]:
+        """removes `path` and, if it is a directory, all the files it contains"""
+        removed: dict[str, int] = {}
+        if (size := self._pop_file_size(path)) is not None:
+            removed[path] = size
+        if not is_directory:
+            return removed
+        dir_prefix = f"{path}{os.sep}"
+        for file_path in [p for p in self._file_sizes if p.startswith(dir_prefix)]:
+            removed[file_path] = self._file_sizes[file_path]
+            self._pop_file_size(file_path)
+        return removed
+
+    def update(self, path: str) -> None:
+        """a file was created or modified or a directory was created"""
+        if self._verified_at is None or not self.contains(path):
+            # NOTE: will be part of the next verification
+            return
+
+        try:
+            if os.path.isdir(path):
+                for file_path, size in _iter_file_sizes(path):
+                    self._set_file_size(file_path, size)
+            else:
+                self._set_file_size(path, os.stat(path).st_size)
+        except FileNotFoundError:
+            # NOTE: was already removed, the deletion event will follow
+            self._pop_file_size(path)
+
+    def remove(self, path: str, *, is_directory: bool) -> None:
+        """a file or directory was deleted"""
+        if self._verified_at is None:
+            return
+        self._pop_file_sizes_in(path, is_directory=is_directory)
+
+    def move(self, src_path: str, dest_path: str, *, is_directory: bool) -> None:
+        """a file or directory was moved from, to or inside the directory"""
+        if self._verified_at is None:
+            return
+        if not self.contains(dest_path):
+            self._pop_file_sizes_in(src_path, is_directory=is_directory)
+            return
+        if not self.contains(src_path):
+            self.update(dest_path)
+            return
+
+        moved = self._pop_file_sizes_in(src_path, is_directory=is_directory)
+        for file_path, size in moved.items():
+            self._set_file_size(f"{dest_path}{file_path[len(src_path):]}", size)
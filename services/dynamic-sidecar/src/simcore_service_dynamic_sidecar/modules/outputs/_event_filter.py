@@ -22,7 +22,8 @@ from watchdog.observers.api import DEFAULT_OBSERVER_TIMEOUT
 from ._directory_utils import get_directory_total_size
 from ._manager import OutputsManager
 
-PortEvent = Optional[str]
+# port_key and size of its directory (when known)
+PortEvent = Optional[tuple[str, NonNegativeInt | None]]
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +65,7 @@ class DefaultDelayPolicy(BaseDelayPolicy):
 class TrackedEvent:
     last_detection: NonNegativeFloat
     wait_interval: NonNegativeFloat | None = None
+    dir_size: NonNegativeInt | None = None
 
 
 class EventFilter:
@@ -93,14 +95,16 @@ class EventFilter:
             if port_event is None:
                 break
 
-            port_key = port_event
+            port_key, dir_size = port_event
 
             if port_key not in self._port_key_tracked_event:
                 self._port_key_tracked_event[port_key] = TrackedEvent(
-                    last_detection=time.time()
+                    last_detection=time.time(), dir_size=dir_size
                 )
             else:
-                self._port_key_tracked_event[port_key].last_detection = time.time()
+                tracked_event = self._port_key_tracked_event[port_key]
+                tracked_event.last_detection = time.time()
+                tracked_event.dir_size = dir_size
 
     def _worker_blocking_event_emitter(self) -> None:  # NOSONAR
         repeat_interval = self.delay_policy.get_min_interval() * 0.49
@@ -121,7 +125,9 @@ class EventFilter:
                     continue
 
                 # Set the wait_interval for future events.
-                # NOTE: Computing the size of a directory is a relatively difficult task,
+                # NOTE: the size of the directory is normally provided with
+                # the event (tracked by the file system event handler).
+                # Otherwise it is computed, which is a relatively difficult task,
                 # example: on SSD with 1 million files ~ 2 seconds
                 # Size of directory will only be computed if:
                 # - event was just added
@@ -130,13 +136,15 @@ class EventFilter:
                     tracked_event.wait_interval is None
                     or elapsed_since_detection > tracked_event.wait_interval
                 ):
-                    port_key_dir_path = (
-                        self.outputs_manager.outputs_context.outputs_path / port_key
+                    dir_size = tracked_event.dir_size
+                    if dir_size is None:
+                        dir_size = get_directory_total_size(
+                            self.outputs_manager.outputs_context.outputs_path
+                            / port_key
+                        )
+                    tracked_event.wait_interval = self.delay_policy.get_wait_interval(
+                        dir_size
                     )
-                    total_wait_for = self.delay_policy.get_wait_interval(
-                        get_directory_total_size(port_key_dir_path)
-                    )
-                    tracked_event.wait_interval = total_wait_for
 
                 # could require to wait more since wait_interval was just updated
                 elapsed_since_detection = current_time - tracked_event.last_detection
@@ -167,8 +175,10 @@ class EventFilter:
             logger.debug("Request upload for port_key %s", port_key)
             await self.outputs_manager.port_key_content_changed(port_key)
 
-    async def enqueue(self, port_key: str) -> None:
-        await self._incoming_events_queue.put(port_key)
+    async def enqueue(
+        self, port_key: str, *, dir_size: NonNegativeInt | None = None
+    ) -> None:
+        await self._incoming_events_queue.put((port_key, dir_size))
 
     async def start(self) -> None:
         with log_context(logger, logging.INFO, f"{EventFilter.__name__} start"):
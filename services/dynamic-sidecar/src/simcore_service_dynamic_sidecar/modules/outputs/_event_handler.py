@@ -16,14 +16,27 @@ from aioprocessing.process import AioProcess
 from aioprocessing.queues import AioQueue
 from pydantic import PositiveFloat
 from servicelib.logging_utils import log_context
-from watchdog.events import FileSystemEvent
-
-from ._context import OutputsContext
+from watchdog.events import (
+    EVENT_TYPE_CLOSED,
+    EVENT_TYPE_CREATED,
+    EVENT_TYPE_DELETED,
+    EVENT_TYPE_MODIFIED,
+    FileSystemEvent,
+    FileSystemMovedEvent,
+)
+
+from ._context import OutputsContext, PortKeyEvent
+from ._directory_utils import DirectorySizeIndex
 from ._manager import OutputsManager
 from ._watchdog_extensions import ExtendedInotifyObserver, SafeFileSystemEventHandler
 
 _HEART_BEAT_MARK: Final = 1
 
+_FILE_CONTENT_CHANGED_EVENT_TYPES: Final[set[str]] = {
+    EVENT_TYPE_MODIFIED,
+    EVENT_TYPE_CLOSED,
+}
+
 _logger = logging.getLogger(__name__)
 
 
@@ -36,18 +49,51 @@ class _PortKeysEventHandler(SafeFileSystemEventHandler):
         self._is_event_propagation_enabled: bool = False
         self.outputs_path: Path = outputs_path
         self.port_key_events_queue: AioQueue = port_key_events_queue
-        self._outputs_port_keys: set[str] = set()
+        self._port_key_dir_sizes: dict[str, DirectorySizeIndex] = {}
 
     def handle_set_outputs_port_keys(self, *, outputs_port_keys: set[str]) -> None:
-        self._outputs_port_keys = outputs_port_keys
+        self._port_key_dir_sizes = {
+            port_key: self._port_key_dir_sizes.get(port_key)
+            or DirectorySizeIndex(self.outputs_path / port_key)
+            for port_key in outputs_port_keys
+        }
 
     def handle_toggle_event_propagation(self, *, is_enabled: bool) -> None:
+        if is_enabled and not self._is_event_propagation_enabled:
+            # NOTE: changes are not tracked while propagation is disabled
+            for dir_size_index in self._port_key_dir_sizes.values():
+                dir_size_index.invalidate()
         self._is_event_propagation_enabled = is_enabled
 
+    def _update_dir_sizes(self, event: FileSystemEvent) -> None:
+        src_path = f"{event.src_path}"
+        for dir_size_index in self._port_key_dir_sizes.values():
+            if isinstance(event, FileSystemMovedEvent):
+                dest_path = f"{event.dest_path}"
+                if dir_size_index.contains(src_path) or dir_size_index.contains(
+                    dest_path
+                ):
+                    dir_size_index.move(
+                        src_path, dest_path, is_directory=event.is_directory
+                    )
+            elif not dir_size_index.contains(src_path):
+                continue
+            elif event.event_type == EVENT_TYPE_DELETED:
+                dir_size_index.remove(src_path, is_directory=event.is_directory)
+            elif event.event_type == EVENT_TYPE_CREATED or (
+                not event.is_directory
+                and event.event_type in _FILE_CONTENT_CHANGED_EVENT_TYPES
+            ):
+                # NOTE: modifications of directories are ignored, since
+                # they are generated by changes of the files they contain
+                dir_size_index.update(src_path)
+
     def event_handler(self, event: FileSystemEvent) -> None:
         if not self._is_event_propagation_enabled:
             return
 
+        self._update_dir_sizes(event)
+
         # NOTE: ignoring all events which are not relative to modifying
         # the contents of the `port_key` folders from the outputs directory
 
@@ -62,10 +108,15 @@ class _PortKeysEventHandler(SafeFileSystemEventHandler):
         # only accept events generated inside `port_key` subfolder
         port_key_candidate = f"{relative_path_parents[0]}"
 
-        if port_key_candidate in self._outputs_port_keys:
+        dir_size_index = self._port_key_dir_sizes.get(port_key_candidate)
+        if dir_size_index is not None:
             # messages in this queue (part of the process),
             # will be consumed by the asyncio thread
-            self.port_key_events_queue.put(port_key_candidate)
+            self.port_key_events_queue.put(
+                PortKeyEvent(
+                    port_key=port_key_candidate, dir_size=dir_size_index.total_size
+                )
+            )
 
 
 class _EventHandlerProcess:
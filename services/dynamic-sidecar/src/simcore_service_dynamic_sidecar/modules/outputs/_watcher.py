@@ -7,7 +7,7 @@ from fastapi import FastAPI
 from servicelib.logging_utils import log_context
 from watchdog.observers.api import DEFAULT_OBSERVER_TIMEOUT
 
-from ._context import OutputsContext
+from ._context import OutputsContext, PortKeyEvent
 from ._event_filter import EventFilter
 from ._event_handler import EventHandlerObserver
 from ._manager import OutputsManager
@@ -32,13 +32,13 @@ class OutputsWatcher:
 
     async def _worker_events(self) -> None:
         while True:
-            event: str | None = (
+            event: PortKeyEvent | None = (
                 await self.outputs_context.port_key_events_queue.coro_get()
             )
             if event is None:
                 break
 
-            await self._event_filter.enqueue(event)
+            await self._event_filter.enqueue(event.port_key, dir_size=event.dir_size)
 
     async def enable_event_propagation(self) -> None:
         await self.outputs_context.toggle_event_propagation(is_enabled=True)
@@ -39,7 +39,10 @@ from simcore_service_dynamic_sidecar.core.settings import ApplicationSettings
 from simcore_service_dynamic_sidecar.core.utils import async_command
 from simcore_service_dynamic_sidecar.core.validation import parse_compose_spec
 from simcore_service_dynamic_sidecar.models.shared_store import SharedStore
-from simcore_service_dynamic_sidecar.modules.outputs._context import OutputsContext
+from simcore_service_dynamic_sidecar.modules.outputs._context import (
+    OutputsContext,
+    PortKeyEvent,
+)
 from simcore_service_dynamic_sidecar.modules.outputs._manager import OutputsManager
 from simcore_service_dynamic_sidecar.modules.outputs._watcher import OutputsWatcher
 from tenacity.asyncio import AsyncRetrying
@@ -517,10 +520,10 @@ async def test_outputs_watcher_disabling(
         async for attempt in AsyncRetrying(**_TENACITY_RETRY_PARAMS):
             with attempt:
                 # check events were triggered after generation
-                events_in_dir: list[str] = [
+                events_in_dir: list[PortKeyEvent] = [
                     c.args[0]
                     for c in mocked_port_key_events_queue_coro_get.call_args_list
-                    if c.args[0] == random_subdir
+                    if c.args[0] is not None and c.args[0].port_key == random_subdir
                 ]
 
                 if is_propagation_enabled:
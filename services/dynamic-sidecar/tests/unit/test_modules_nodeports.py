@@ -0,0 +1,105 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+
+import io
+import zipfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from faker import Faker
+from models_library.basic_types import IDStr
+from models_library.projects import ProjectID
+from models_library.projects_nodes_io import NodeID
+from pytest_mock import MockerFixture
+from servicelib.progress_bar import ProgressBarData
+from simcore_sdk.node_ports_common.file_io_utils import UploadableFileObject
+from simcore_sdk.node_ports_v2.port import SetKWargs
+from simcore_service_dynamic_sidecar.modules.nodeports import upload_outputs
+
+
+@pytest.fixture
+def mock_settings(
+    mocker: MockerFixture, faker: Faker, project_id: ProjectID, node_id: NodeID
+) -> None:
+    mocker.patch(
+        "simcore_service_dynamic_sidecar.modules.nodeports.get_settings",
+        return_value=MagicMock(
+            DY_SIDECAR_USER_ID=faker.pyint(min_value=1),
+            DY_SIDECAR_PROJECT_ID=project_id,
+            DY_SIDECAR_NODE_ID=node_id,
+        ),
+    )
+
+
+@pytest.fixture
+def port_key() -> str:
+    return "output_1"
+
+
+@pytest.fixture
+def mock_node_ports(mocker: MockerFixture, port_key: str) -> AsyncMock:
+    port = MagicMock(key=port_key, property_type="data:*/*")
+
+    async def _outputs() -> dict[str, MagicMock]:
+        return {port_key: port}
+
+    node_ports = MagicMock()
+    type(node_ports).outputs = property(lambda _: _outputs())
+    node_ports.set_multiple = AsyncMock()
+    mocker.patch(
+        "simcore_service_dynamic_sidecar.modules.nodeports.node_ports_v2.ports",
+        return_value=node_ports,
+    )
+    return node_ports.set_multiple
+
+
+@pytest.fixture
+def outputs_path(tmp_path: Path, port_key: str, faker: Faker) -> Path:
+    outputs_path = tmp_path / "outputs"
+    for file_name in ("file_a.txt", "subfolder/file_b.txt", "subfolder/file_c.txt"):
+        file_path = outputs_path / port_key / file_name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(faker.text())
+    return outputs_path
+
+
+async def test_upload_outputs_streams_folder_archive(
+    mock_settings: None,
+    mock_node_ports: AsyncMock,
+    outputs_path: Path,
+    port_key: str,
+):
+    uploaded_archives: dict[str, bytes] = {}
+
+    async def _set_multiple(
+        port_values: dict[str, tuple[Any, SetKWargs | None]], **kwargs
+    ) -> None:
+        # NOTE: the archive stream is only readable while the outputs are set
+        for key, (value, set_kwargs) in port_values.items():
+            assert isinstance(value, UploadableFileObject)
+            assert value.file_name == f"{port_key}.zip"
+            assert set_kwargs == SetKWargs(file_base_path=Path("outputs"))
+            uploaded_archives[key] = value.file_object.read()
+            assert len(uploaded_archives[key]) == value.file_size
+
+    mock_node_ports.side_effect = _set_multiple
+
+    async with ProgressBarData(
+        num_steps=1, description=IDStr("uploading outputs")
+    ) as progress_bar:
+        await upload_outputs(
+            outputs_path, [port_key], io_log_redirect_cb=None, progress_bar=progress_bar
+        )
+    mock_node_ports.assert_awaited_once()
+
+    with zipfile.ZipFile(io.BytesIO(uploaded_archives[port_key])) as archive:
+        assert archive.testzip() is None
+        assert {
+            name: archive.read(name).decode() for name in archive.namelist()
+        } == {
+            f"{path.relative_to(outputs_path / port_key)}": path.read_text()
+            for path in (outputs_path / port_key).rglob("*")
+            if path.is_file()
+        }
@@ -1,5 +1,6 @@
 # pylint:disable=redefined-outer-name
 
+import shutil
 import time
 from pathlib import Path
 from random import randbytes
@@ -8,6 +9,7 @@ from uuid import uuid4
 import pytest
 from pydantic import NonNegativeInt, PositiveInt
 from simcore_service_dynamic_sidecar.modules.outputs._directory_utils import (
+    DirectorySizeIndex,
     get_directory_total_size,
 )
 
@@ -57,3 +59,51 @@ def test_get_directory_total_size(dir_with_files: tuple[Path, PositiveInt]):
     print(f"runtime {runtime:04}")
 
     assert expected_size == dir_size
+
+
+def test_directory_size_index(tmp_path: Path):
+    dir_size_index = DirectorySizeIndex(tmp_path, verification_interval_s=3600)
+    assert dir_size_index.total_size == 0
+
+    # created
+    file_path = tmp_path / "file"
+    file_path.write_bytes(randbytes(10))
+    dir_size_index.update(f"{file_path}")
+    assert dir_size_index.total_size == 10
+
+    # modified
+    file_path.write_bytes(randbytes(20))
+    dir_size_index.update(f"{file_path}")
+    dir_size_index.update(f"{file_path}")
+    assert dir_size_index.total_size == 20
+
+    # directory created
+    _create_files(tmp_path / "dir" / "subdir", 10)
+    dir_size_index.update(f"{tmp_path / 'dir'}")
+    assert dir_size_index.total_size == 30
+
+    # moved inside the directory
+    (tmp_path / "dir").rename(tmp_path / "moved_dir")
+    dir_size_index.move(
+        f"{tmp_path / 'dir'}", f"{tmp_path / 'moved_dir'}", is_directory=True
+    )
+    assert dir_size_index.total_size == 30
+    assert dir_size_index.total_size == get_directory_total_size(tmp_path)
+
+    # moved away
+    other_dir = tmp_path.parent / f"other_{uuid4()}"
+    other_dir.mkdir()
+    file_path.rename(other_dir / "file")
+    dir_size_index.move(f"{file_path}", f"{other_dir / 'file'}", is_directory=False)
+    assert dir_size_index.total_size == 10
+
+    # deleted
+    shutil.rmtree(tmp_path / "moved_dir")
+    dir_size_index.remove(f"{tmp_path / 'moved_dir'}", is_directory=True)
+    assert dir_size_index.total_size == 0
+
+    # changes without events are corrected by the verification
+    file_path.write_bytes(randbytes(5))
+    assert dir_size_index.total_size == 0
+    dir_size_index.invalidate()
+    assert dir_size_index.total_size == 5
@@ -220,6 +220,20 @@ async def test_minimum_amount_of_get_directory_total_size_calls_with_continuous_
     assert mocked_port_key_content_changed.call_count == 1
 
 
+async def test_provided_directory_size_is_not_computed(
+    mock_get_directory_total_size: AsyncMock,
+    event_filter: EventFilter,
+    port_key_1: str,
+    mocked_port_key_content_changed: AsyncMock,
+):
+    await event_filter.enqueue(port_key_1, dir_size=0)
+    await _wait_for_event_to_trigger(event_filter)
+    async for attempt in AsyncRetrying(**_TENACITY_RETRY_PARAMS):
+        with attempt:
+            assert mocked_port_key_content_changed.call_count == 1
+    assert mock_get_directory_total_size.call_count == 0
+
+
 def test_default_delay_policy():
     wait_policy = DefaultDelayPolicy()
 
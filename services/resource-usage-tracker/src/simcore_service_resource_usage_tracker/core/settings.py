@@ -108,5 +108,9 @@ class ApplicationSettings(MinimalApplicationSettings):
         default=6,
         description="Heartbeat couter limit when RUT considers service as unhealthy.",
     )
+    RESOURCE_USAGE_TRACKER_HEARTBEATS_BATCH_INTERVAL: datetime.timedelta = Field(
+        default=datetime.timedelta(seconds=2),
+        description="Heartbeats received within this interval are processed together in one batch (the wallets credits are published once per batch). (default to seconds, or see https://pydantic-docs.helpmanual.io/usage/types/#datetime-types for string formating)",
+    )
     RESOURCE_USAGE_TRACKER_PROMETHEUS_INSTRUMENTATION_ENABLED: bool = True
     RESOURCE_USAGE_TRACKER_S3: S3Settings | None = Field(auto_default_from_env=True)
@@ -1,13 +1,13 @@
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
 from decimal import Decimal
-from typing import cast
+from typing import Any, Final, cast
 
 import sqlalchemy as sa
 from models_library.api_schemas_resource_usage_tracker.credit_transactions import (
     WalletTotalCredits,
 )
-from models_library.api_schemas_storage import S3BucketName
 from models_library.products import ProductName
 from models_library.resource_tracker import (
     CreditTransactionId,
@@ -48,7 +48,11 @@ from simcore_postgres_database.models.resource_tracker_pricing_units import (
 from simcore_postgres_database.models.resource_tracker_service_runs import (
     resource_tracker_service_runs,
 )
+from simcore_postgres_database.models.resource_tracker_wallets_credits import (
+    resource_tracker_wallets_credits,
+)
 from sqlalchemy.dialects.postgresql import ARRAY, INTEGER
+from sqlalchemy.sql.expression import Values
 
 from ....models.resource_tracker_credit_transactions import (
     CreditTransactionCreate,
@@ -75,6 +79,33 @@ from ._base import BaseRepository
 _logger = logging.getLogger(__name__)
 
 
+_EXPORT_BATCH_SIZE: Final[PositiveInt] = 1000
+
+SERVICE_RUNS_EXPORT_COLUMNS: Final[tuple[sa.Column, ...]] = (
+    resource_tracker_service_runs.c.product_name,
+    resource_tracker_service_runs.c.service_run_id,
+    resource_tracker_service_runs.c.wallet_name,
+    resource_tracker_service_runs.c.user_email,
+    resource_tracker_service_runs.c.project_name,
+    resource_tracker_service_runs.c.node_name,
+    resource_tracker_service_runs.c.service_key,
+    resource_tracker_service_runs.c.service_version,
+    resource_tracker_service_runs.c.service_type,
+    resource_tracker_service_runs.c.started_at,
+    resource_tracker_service_runs.c.stopped_at,
+    resource_tracker_credit_transactions.c.osparc_credits,
+    resource_tracker_credit_transactions.c.transaction_status,
+)
+
+
+def _values_as_text(name: str, columns: list[str], rows: list[tuple]) -> Values:
+    # NOTE: the types of the parameters of a VALUES list are not inferred by postgres,
+    # they are passed as text and cast where they are used
+    return sa.values(*(sa.column(c, sa.String) for c in columns), name=name).data(
+        [tuple(f"{value}" for value in row) for row in rows]
+    )
+
+
 class ResourceTrackerRepository(
     BaseRepository
 ):  # pylint: disable=too-many-public-methods
@@ -161,6 +192,49 @@ class ResourceTrackerRepository(
             return None
         return ServiceRunDB.from_orm(row)
 
+    async def batch_update_service_runs_last_heartbeat(
+        self, data: list[ServiceRunLastHeartbeatUpdate]
+    ) -> list[ServiceRunDB]:
+        """updates the last heartbeat of many running services with one statement
+        (UPDATE ... FROM (VALUES ...)). Returns only the updated service runs
+        """
+        if not data:
+            return []
+        heartbeats = _values_as_text(
+            "heartbeats",
+            ["service_run_id", "last_heartbeat_at"],
+            [(d.service_run_id, d.last_heartbeat_at.isoformat()) for d in data],
+        )
+        last_heartbeat_at = sa.cast(
+            heartbeats.c.last_heartbeat_at, sa.DateTime(timezone=True)
+        )
+        async with self.db_engine.begin() as conn:
+            update_stmt = (
+                resource_tracker_service_runs.update()
+                .values(
+                    modified=sa.func.now(),
+                    last_heartbeat_at=last_heartbeat_at,
+                    missed_heartbeat_counter=0,
+                )
+                .where(
+                    (
+                        resource_tracker_service_runs.c.service_run_id
+                        == heartbeats.c.service_run_id
+                    )
+                    & (
+                        resource_tracker_service_runs.c.service_run_status
+                        == ServiceRunStatus.RUNNING
+                    )
+                    & (
+                        resource_tracker_service_runs.c.last_heartbeat_at
+                        <= last_heartbeat_at
+                    )
+                )
+                .returning(*resource_tracker_service_runs.columns)
+            )
+            result = await conn.execute(update_stmt)
+        return [ServiceRunDB.from_orm(row) for row in result.fetchall()]
+
     async def update_service_run_stopped_at(
         self, data: ServiceRunStoppedAtUpdate
     ) -> ServiceRunDB | None:
@@ -204,6 +278,16 @@ class ResourceTrackerRepository(
             return None
         return ServiceRunDB.from_orm(row)
 
+    async def list_service_runs_by_ids(
+        self, service_run_ids: list[ServiceRunId]
+    ) -> list[ServiceRunDB]:
+        async with self.db_engine.begin() as conn:
+            stmt = sa.select(resource_tracker_service_runs).where(
+                resource_tracker_service_runs.c.service_run_id.in_(service_run_ids)
+            )
+            result = await conn.execute(stmt)
+        return [ServiceRunDB.from_orm(row) for row in result.fetchall()]
+
     async def list_service_runs_by_product_and_user_and_wallet(
         self,
         product_name: ProductName,
@@ -309,97 +393,61 @@ class ResourceTrackerRepository(
 
         return [ServiceRunWithCreditsDB.from_orm(row) for row in result.fetchall()]
 
-    async def export_service_runs_table_to_s3(
+    async def stream_service_runs_for_export(
         self,
         product_name: ProductName,
-        s3_bucket_name: S3BucketName,
-        s3_key: str,
-        s3_region: str,
         *,
         user_id: UserID | None,
         wallet_id: WalletID | None,
         started_from: datetime | None = None,
         started_until: datetime | None = None,
         order_by: OrderBy | None = None,
-    ):
-        async with self.db_engine.begin() as conn:
-            query = (
-                sa.select(
-                    resource_tracker_service_runs.c.product_name,
-                    resource_tracker_service_runs.c.service_run_id,
-                    resource_tracker_service_runs.c.wallet_name,
-                    resource_tracker_service_runs.c.user_email,
-                    resource_tracker_service_runs.c.project_name,
-                    resource_tracker_service_runs.c.node_name,
-                    resource_tracker_service_runs.c.service_key,
-                    resource_tracker_service_runs.c.service_version,
-                    resource_tracker_service_runs.c.service_type,
-                    resource_tracker_service_runs.c.started_at,
-                    resource_tracker_service_runs.c.stopped_at,
-                    resource_tracker_credit_transactions.c.osparc_credits,
-                    resource_tracker_credit_transactions.c.transaction_status,
+        batch_size: PositiveInt = _EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """streams the rows to export (see SERVICE_RUNS_EXPORT_COLUMNS) in batches of batch_size
+        using a server-side cursor, i.e. the table is never loaded in memory
+        """
+        query = (
+            sa.select(*SERVICE_RUNS_EXPORT_COLUMNS)
+            .select_from(
+                resource_tracker_service_runs.join(
+                    resource_tracker_credit_transactions,
+                    resource_tracker_service_runs.c.service_run_id
+                    == resource_tracker_credit_transactions.c.service_run_id,
+                    isouter=True,
                 )
-                .select_from(
-                    resource_tracker_service_runs.join(
-                        resource_tracker_credit_transactions,
-                        resource_tracker_service_runs.c.service_run_id
-                        == resource_tracker_credit_transactions.c.service_run_id,
-                        isouter=True,
-                    )
-                )
-                .where(resource_tracker_service_runs.c.product_name == product_name)
             )
+            .where(resource_tracker_service_runs.c.product_name == product_name)
+        )
 
-            if user_id:
-                query = query.where(resource_tracker_service_runs.c.user_id == user_id)
-            if wallet_id:
-                query = query.where(
-                    resource_tracker_service_runs.c.wallet_id == wallet_id
-                )
-            if started_from:
-                query = query.where(
-                    sa.func.DATE(resource_tracker_service_runs.c.started_at)
-                    >= started_from.date()
-                )
-            if started_until:
-                query = query.where(
-                    sa.func.DATE(resource_tracker_service_runs.c.started_at)
-                    <= started_until.date()
-                )
+        if user_id:
+            query = query.where(resource_tracker_service_runs.c.user_id == user_id)
+        if wallet_id:
+            query = query.where(resource_tracker_service_runs.c.wallet_id == wallet_id)
+        if started_from:
+            query = query.where(
+                sa.func.DATE(resource_tracker_service_runs.c.started_at)
+                >= started_from.date()
+            )
+        if started_until:
+            query = query.where(
+                sa.func.DATE(resource_tracker_service_runs.c.started_at)
+                <= started_until.date()
+            )
 
-            if order_by:
-                if order_by.direction == OrderDirection.ASC:
-                    query = query.order_by(sa.asc(order_by.field))
-                else:
-                    query = query.order_by(sa.desc(order_by.field))
+        if order_by:
+            if order_by.direction == OrderDirection.ASC:
+                query = query.order_by(sa.asc(order_by.field))
             else:
-                # Default ordering
-                query = query.order_by(
-                    resource_tracker_service_runs.c.started_at.desc()
-                )
-
-            compiled_query = (
-                str(query.compile(compile_kwargs={"literal_binds": True}))
-                .replace("\n", "")
-                .replace("'", "''")
-            )
+                query = query.order_by(sa.desc(order_by.field))
+        else:
+            # Default ordering
+            query = query.order_by(resource_tracker_service_runs.c.started_at.desc())
 
-            result = await conn.execute(
-                sa.DDL(
-                    f"""
-                SELECT * from aws_s3.query_export_to_s3('{compiled_query}',
-                aws_commons.create_s3_uri('{s3_bucket_name}', '{s3_key}', '{s3_region}'), 'format csv, HEADER true');
-                """  # noqa: S608
-                )
-            )
-            row = result.first()
-            assert row
-            _logger.info(
-                "Rows uploaded %s, Files uploaded %s, Bytes uploaded %s",
-                row[0],
-                row[1],
-                row[2],
-            )
+        async with self.db_engine.begin() as conn:
+            result = await conn.stream(query.execution_options(yield_per=batch_size))
+            async for rows in result.mappings().partitions(batch_size):
+                yield [dict(row) for row in rows]
 
     async def total_service_runs_by_product_and_user_and_wallet(
         self,
@@ -592,6 +640,82 @@ class ResourceTrackerRepository(
             return None
         return cast(CreditTransactionId | None, row[0])
 
+    async def batch_update_credit_transactions_credits(
+        self, data: list[CreditTransactionCreditsUpdate]
+    ) -> list[ServiceRunId]:
+        """updates the credits of many pending transactions with one statement
+        (UPDATE ... FROM (VALUES ...)). Returns the service runs of the updated transactions
+        """
+        if not data:
+            return []
+        credits_updates = _values_as_text(
+            "credits_updates",
+            ["service_run_id", "osparc_credits", "last_heartbeat_at"],
+            [
+                (d.service_run_id, d.osparc_credits, d.last_heartbeat_at.isoformat())
+                for d in data
+            ],
+        )
+        last_heartbeat_at = sa.cast(
+            credits_updates.c.last_heartbeat_at, sa.DateTime(timezone=True)
+        )
+        async with self.db_engine.begin() as conn:
+            # NOTE: the running balances of the wallets are updated by a trigger. Locking them
+            # in a fixed order avoids deadlocks with concurrent batches touching the same wallets
+            lock_wallets_stmt = (
+                sa.select(resource_tracker_wallets_credits.c.wallet_id)
+                .where(
+                    sa.tuple_(
+                        resource_tracker_wallets_credits.c.product_name,
+                        resource_tracker_wallets_credits.c.wallet_id,
+                    ).in_(
+                        sa.select(
+                            resource_tracker_credit_transactions.c.product_name,
+                            resource_tracker_credit_transactions.c.wallet_id,
+                        ).where(
+                            resource_tracker_credit_transactions.c.service_run_id.in_(
+                                [d.service_run_id for d in data]
+                            )
+                        )
+                    )
+                )
+                .order_by(
+                    resource_tracker_wallets_credits.c.product_name,
+                    resource_tracker_wallets_credits.c.wallet_id,
+                )
+                .with_for_update()
+            )
+            await conn.execute(lock_wallets_stmt)
+
+            update_stmt = (
+                resource_tracker_credit_transactions.update()
+                .values(
+                    modified=sa.func.now(),
+                    osparc_credits=sa.cast(
+                        credits_updates.c.osparc_credits,
+                        resource_tracker_credit_transactions.c.osparc_credits.type,
+                    ),
+                    last_heartbeat_at=last_heartbeat_at,
+                )
+                .where(
+                    (
+                        resource_tracker_credit_transactions.c.service_run_id
+                        == credits_updates.c.service_run_id
+                    )
+                    & (
+                        resource_tracker_credit_transactions.c.transaction_status
+                        == CreditTransactionStatus.PENDING
+                    )
+                    & (
+                        resource_tracker_credit_transactions.c.last_heartbeat_at
+                        <= last_heartbeat_at
+                    )
+                )
+                .returning(resource_tracker_credit_transactions.c.service_run_id)
+            )
+            result = await conn.execute(update_stmt)
+        return [row[0] for row in result.fetchall()]
+
     async def update_credit_transaction_credits_and_status(
         self, data: CreditTransactionCreditsAndStatusUpdate
     ) -> CreditTransactionId | None:
@@ -624,28 +748,38 @@ class ResourceTrackerRepository(
     async def sum_credit_transactions_by_product_and_wallet(
         self, product_name: ProductName, wallet_id: WalletID
     ) -> WalletTotalCredits:
+        """NOTE: reads the running balance of the wallet (see resource_tracker_wallets_credits)"""
+        wallets_credits = await self.list_wallets_credits([(product_name, wallet_id)])
+        return wallets_credits.get(
+            (product_name, wallet_id),
+            WalletTotalCredits(wallet_id=wallet_id, available_osparc_credits=Decimal(0)),
+        )
+
+    async def list_wallets_credits(
+        self, wallets: list[tuple[ProductName, WalletID]]
+    ) -> dict[tuple[ProductName, WalletID], WalletTotalCredits]:
+        """returns the available credits of the wallets (wallets without transactions are not returned)"""
+        if not wallets:
+            return {}
         async with self.db_engine.begin() as conn:
-            sum_stmt = sa.select(
-                sa.func.sum(resource_tracker_credit_transactions.c.osparc_credits)
+            stmt = sa.select(
+                resource_tracker_wallets_credits.c.product_name,
+                resource_tracker_wallets_credits.c.wallet_id,
+                resource_tracker_wallets_credits.c.available_osparc_credits,
             ).where(
-                (resource_tracker_credit_transactions.c.product_name == product_name)
-                & (resource_tracker_credit_transactions.c.wallet_id == wallet_id)
-                & (
-                    resource_tracker_credit_transactions.c.transaction_status.in_(
-                        [
-                            CreditTransactionStatus.BILLED,
-                            CreditTransactionStatus.PENDING,
-                        ]
-                    )
-                )
+                sa.tuple_(
+                    resource_tracker_wallets_credits.c.product_name,
+                    resource_tracker_wallets_credits.c.wallet_id,
+                ).in_(wallets)
             )
-            result = await conn.execute(sum_stmt)
-        row = result.first()
-        if row is None or row[0] is None:
-            return WalletTotalCredits(
-                wallet_id=wallet_id, available_osparc_credits=Decimal(0)
+            result = await conn.execute(stmt)
+        return {
+            (row.product_name, row.wallet_id): WalletTotalCredits(
+                wallet_id=row.wallet_id,
+                available_osparc_credits=row.available_osparc_credits,
             )
-        return WalletTotalCredits(wallet_id=wallet_id, available_osparc_credits=row[0])
+            for row in result.fetchall()
+        }
 
     #################################
     # Pricing plans
@@ -14,7 +14,7 @@ from .core.settings import ApplicationSettings
 from .modules.rabbitmq import get_rabbitmq_client
 from .modules.redis import get_redis_client
 from .resource_tracker_background_task import periodic_check_of_running_services_task
-from .resource_tracker_process_messages import process_message
+from .resource_tracker_process_messages import HeartbeatsBatcher, process_message
 
 _logger = logging.getLogger(__name__)
 
@@ -43,12 +43,18 @@ def on_app_startup(app: FastAPI) -> Callable[[], Awaitable[None]]:
             app_settings: ApplicationSettings = app.state.settings
             app.state.resource_tracker_rabbitmq_consumer = None
             app.state.resource_tracker_background_task = None
+            app.state.resource_tracker_heartbeats_batcher = None
             settings: RabbitSettings | None = (
                 app_settings.RESOURCE_USAGE_TRACKER_RABBITMQ
             )
             if not settings:
                 _logger.warning("RabbitMQ client is de-activated in the settings")
                 return
+            app.state.resource_tracker_heartbeats_batcher = HeartbeatsBatcher(
+                app,
+                interval=app_settings.RESOURCE_USAGE_TRACKER_HEARTBEATS_BATCH_INTERVAL,
+            )
+            app.state.resource_tracker_heartbeats_batcher.start()
             app.state.resource_tracker_rabbitmq_consumer = await _subscribe_to_rabbitmq(
                 app
             )
@@ -74,6 +80,8 @@ def on_app_shutdown(
         assert _app  # nosec
         if _app.state.resource_tracker_background_task:
             await stop_periodic_task(_app.state.resource_tracker_background_task)
+        if _app.state.resource_tracker_heartbeats_batcher:
+            await _app.state.resource_tracker_heartbeats_batcher.stop()
 
     return _stop
 
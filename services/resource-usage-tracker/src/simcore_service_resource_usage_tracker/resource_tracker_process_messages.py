@@ -1,5 +1,8 @@
+import asyncio
+import contextlib
 import logging
 from collections.abc import Awaitable, Callable
+from datetime import timedelta
 from decimal import Decimal
 
 from fastapi import FastAPI
@@ -17,10 +20,12 @@ from models_library.resource_tracker import (
     CreditClassification,
     CreditTransactionStatus,
     ResourceTrackerServiceType,
+    ServiceRunId,
     ServiceRunStatus,
 )
 from models_library.services import ServiceType
 from pydantic import parse_raw_as
+from servicelib.logging_utils import log_catch
 
 from .models.resource_tracker_credit_transactions import (
     CreditTransactionCreate,
@@ -36,6 +41,7 @@ from .modules.db.repositories.resource_tracker import ResourceTrackerRepository
 from .modules.rabbitmq import RabbitMQClient, get_rabbitmq_client
 from .resource_tracker_utils import (
     compute_service_run_credit_costs,
+    list_wallets_credits_and_publish_to_rabbitmq,
     make_negative,
     publish_to_rabbitmq_wallet_credits_limit_reached,
     sum_credit_transactions_and_publish_to_rabbitmq,
@@ -53,6 +59,14 @@ async def process_message(app: FastAPI, data: bytes) -> bool:
         rabbit_message.message_type,
         rabbit_message.service_run_id,
     )
+    if heartbeats_batcher := app.state.resource_tracker_heartbeats_batcher:
+        if isinstance(rabbit_message, RabbitResourceTrackingHeartbeatMessage):
+            heartbeats_batcher.push(rabbit_message)
+            return True
+        if isinstance(rabbit_message, RabbitResourceTrackingStoppedMessage):
+            # NOTE: the stop event computes the final credits, a pending heartbeat is obsolete
+            heartbeats_batcher.discard(rabbit_message.service_run_id)
+
     resource_tracker_repo: ResourceTrackerRepository = ResourceTrackerRepository(
         db_engine=app.state.engine
     )
@@ -153,75 +167,186 @@ async def _process_start_event(
         )
 
 
-async def _process_heartbeat_event(
+async def _log_not_updated_heartbeats(
     resource_tracker_repo: ResourceTrackerRepository,
-    msg: RabbitResourceTrackingHeartbeatMessage,
+    service_run_ids: set[ServiceRunId],
+) -> None:
+    service_runs_db = {
+        service_run.service_run_id: service_run
+        for service_run in await resource_tracker_repo.list_service_runs_by_ids(
+            list(service_run_ids)
+        )
+    }
+    for service_run_id in service_run_ids:
+        service_run_db = service_runs_db.get(service_run_id)
+        if not service_run_db:
+            _logger.error(
+                "Recieved process heartbeat event for service_run_id: %s, but we do not have the started record in the DB, INVESTIGATE!",
+                service_run_id,
+            )
+        elif service_run_db.service_run_status in {
+            ServiceRunStatus.SUCCESS,
+            ServiceRunStatus.ERROR,
+        }:
+            _logger.error(
+                "Recieved process heartbeat event for service_run_id: %s, but it was already closed, INVESTIGATE!",
+                service_run_id,
+            )
+        else:
+            _logger.info("Nothing to update: %s", f"{service_run_id=}")
+
+
+async def _process_heartbeat_events(
+    resource_tracker_repo: ResourceTrackerRepository,
+    msgs: list[RabbitResourceTrackingHeartbeatMessage],
     rabbitmq_client: RabbitMQClient,
-):
-    service_run_db = await resource_tracker_repo.get_service_run_by_id(
-        service_run_id=msg.service_run_id
+) -> None:
+    # only the latest heartbeat of a service run is relevant
+    latest_heartbeats: dict[ServiceRunId, RabbitResourceTrackingHeartbeatMessage] = {}
+    for msg in msgs:
+        latest = latest_heartbeats.get(msg.service_run_id)
+        if latest is None or latest.created_at < msg.created_at:
+            latest_heartbeats[msg.service_run_id] = msg
+
+    # Update `service run` records (if billable `credit transactions`) in the DB
+    running_services = await resource_tracker_repo.batch_update_service_runs_last_heartbeat(
+        [
+            ServiceRunLastHeartbeatUpdate(
+                service_run_id=msg.service_run_id, last_heartbeat_at=msg.created_at
+            )
+            for msg in latest_heartbeats.values()
+        ]
     )
-    if not service_run_db:
-        _logger.error(
-            "Recieved process heartbeat event for service_run_id: %s, but we do not have the started record in the DB, INVESTIGATE!",
-            msg.service_run_id,
-        )
-        return
-    if service_run_db.service_run_status in {
-        ServiceRunStatus.SUCCESS,
-        ServiceRunStatus.ERROR,
+    if not_updated := latest_heartbeats.keys() - {
+        running_service.service_run_id for running_service in running_services
     }:
-        _logger.error(
-            "Recieved process heartbeat event for service_run_id: %s, but it was already closed, INVESTIGATE!",
-            msg.service_run_id,
-        )
-        return
+        await _log_not_updated_heartbeats(resource_tracker_repo, not_updated)
 
-    # Update `service run` record (if billable `credit transaction`) in the DB
-    update_service_run_last_heartbeat = ServiceRunLastHeartbeatUpdate(
-        service_run_id=msg.service_run_id, last_heartbeat_at=msg.created_at
-    )
-    running_service = await resource_tracker_repo.update_service_run_last_heartbeat(
-        update_service_run_last_heartbeat
-    )
-    if running_service is None:
-        _logger.info("Nothing to update: %s", msg)
+    billable_services = [
+        running_service
+        for running_service in running_services
+        if running_service.wallet_id and running_service.pricing_unit_cost is not None
+    ]
+    if not billable_services:
         return
 
-    if running_service.wallet_id and running_service.pricing_unit_cost is not None:
-        # Compute currently used credits
+    # Compute currently used credits and update them in the transaction table
+    update_credit_transactions = []
+    for running_service in billable_services:
+        assert running_service.pricing_unit_cost is not None  # nosec
+        last_heartbeat_at = latest_heartbeats[running_service.service_run_id].created_at
         computed_credits = await compute_service_run_credit_costs(
             running_service.started_at,
-            msg.created_at,
+            last_heartbeat_at,
             running_service.pricing_unit_cost,
         )
-        # Update credits in the transaction table
-        update_credit_transaction = CreditTransactionCreditsUpdate(
-            service_run_id=msg.service_run_id,
-            osparc_credits=make_negative(computed_credits),
-            last_heartbeat_at=msg.created_at,
-        )
-        await resource_tracker_repo.update_credit_transaction_credits(
-            update_credit_transaction
-        )
-        # Publish wallet total credits to RabbitMQ
-        wallet_total_credits = await sum_credit_transactions_and_publish_to_rabbitmq(
-            resource_tracker_repo,
-            rabbitmq_client,
-            running_service.product_name,
-            running_service.wallet_id,
+        update_credit_transactions.append(
+            CreditTransactionCreditsUpdate(
+                service_run_id=running_service.service_run_id,
+                osparc_credits=make_negative(computed_credits),
+                last_heartbeat_at=last_heartbeat_at,
+            )
         )
+    await resource_tracker_repo.batch_update_credit_transactions_credits(
+        update_credit_transactions
+    )
+
+    # Publish wallets total credits to RabbitMQ (once per wallet)
+    wallets_total_credits = await list_wallets_credits_and_publish_to_rabbitmq(
+        resource_tracker_repo,
+        rabbitmq_client,
+        list(
+            {
+                (running_service.product_name, running_service.wallet_id)
+                for running_service in billable_services
+                if running_service.wallet_id
+            }
+        ),
+    )
+    for (product_name, wallet_id), wallet_total_credits in wallets_total_credits.items():
         if wallet_total_credits.available_osparc_credits < CreditsLimit.OUT_OF_CREDITS:
             await publish_to_rabbitmq_wallet_credits_limit_reached(
                 resource_tracker_repo,
                 rabbitmq_client,
-                product_name=running_service.product_name,
-                wallet_id=running_service.wallet_id,
+                product_name=product_name,
+                wallet_id=wallet_id,
                 credits_=wallet_total_credits.available_osparc_credits,
                 credits_limit=CreditsLimit.OUT_OF_CREDITS,
             )
 
 
+async def _process_heartbeat_event(
+    resource_tracker_repo: ResourceTrackerRepository,
+    msg: RabbitResourceTrackingHeartbeatMessage,
+    rabbitmq_client: RabbitMQClient,
+):
+    await _process_heartbeat_events(resource_tracker_repo, [msg], rabbitmq_client)
+
+
+class HeartbeatsBatcher:
+    """Collects the heartbeats and processes them in batches every interval
+
+    Every running service sends heartbeats, processing them one by one costs several
+    DB round-trips and a wallet credits message per heartbeat.
+    NOTE: the heartbeats are acknowledged once collected. A heartbeat lost on a crash is
+    superseded by the next one of the same service run.
+    """
+
+    def __init__(self, app: FastAPI, *, interval: timedelta) -> None:
+        self._app = app
+        self._interval_s = interval.total_seconds()
+        self._pending: dict[ServiceRunId, RabbitResourceTrackingHeartbeatMessage] = {}
+        self._has_pending = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def push(self, msg: RabbitResourceTrackingHeartbeatMessage) -> None:
+        latest = self._pending.get(msg.service_run_id)
+        if latest is None or latest.created_at < msg.created_at:
+            self._pending[msg.service_run_id] = msg
+        self._has_pending.set()
+
+    def discard(self, service_run_id: ServiceRunId) -> None:
+        self._pending.pop(service_run_id, None)
+
+    async def flush(self) -> None:
+        self._has_pending.clear()
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            await _process_heartbeat_events(
+                ResourceTrackerRepository(db_engine=self._app.state.engine),
+                list(pending.values()),
+                get_rabbitmq_client(self._app),
+            )
+        except Exception:
+            # NOTE: the heartbeats are retried with the next batch (unless newer ones came in)
+            for msg in pending.values():
+                self.push(msg)
+            raise
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            await asyncio.sleep(self._interval_s)
+            with log_catch(_logger, reraise=False):
+                await self.flush()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(
+            self._run(), name=f"{__name__}.heartbeats_batcher"
+        )
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        with log_catch(_logger, reraise=False):
+            await self.flush()
+
+
 async def _process_stop_event(
     resource_tracker_repo: ResourceTrackerRepository,
     msg: RabbitResourceTrackingStoppedMessage,
@@ -51,6 +51,31 @@ async def sum_credit_transactions_and_publish_to_rabbitmq(
     return wallet_total_credits
 
 
+async def list_wallets_credits_and_publish_to_rabbitmq(
+    resource_tracker_repo: ResourceTrackerRepository,
+    rabbitmq_client: RabbitMQClient,
+    wallets: list[tuple[ProductName, WalletID]],
+) -> dict[tuple[ProductName, WalletID], WalletTotalCredits]:
+    wallets_total_credits = await resource_tracker_repo.list_wallets_credits(wallets)
+    now = datetime.now(tz=timezone.utc)
+    await rabbitmq_client.publish_many(
+        WalletCreditsMessage.get_channel_name(),
+        [
+            WalletCreditsMessage.construct(
+                wallet_id=wallet_id,
+                created_at=now,
+                credits=wallet_total_credits.available_osparc_credits,
+                product_name=product_name,
+            )
+            for (
+                product_name,
+                wallet_id,
+            ), wallet_total_credits in wallets_total_credits.items()
+        ],
+    )
+    return wallets_total_credits
+
+
 _BATCH_SIZE = 20
 
 
@@ -18,7 +18,15 @@ from servicelib.rabbitmq.rpc_interfaces.resource_usage_tracker.errors import (
 )
 
 from ..models.resource_tracker_service_runs import ServiceRunWithCreditsDB
-from ..modules.db.repositories.resource_tracker import ResourceTrackerRepository
+from ..modules.db.repositories.resource_tracker import (
+    SERVICE_RUNS_EXPORT_COLUMNS,
+    ResourceTrackerRepository,
+)
+from .resource_tracker_service_runs_export import (
+    ServiceRunsExportFormat,
+    encode_service_runs,
+    get_file_extension,
+)
 
 _PRESIGNED_LINK_EXPIRATION_SEC = 7200
 
@@ -139,7 +147,6 @@ async def list_service_runs(
 async def export_service_runs(
     s3_client: SimcoreS3API,
     bucket_name: str,
-    s3_region: str,
     user_id: UserID,
     product_name: ProductName,
     resource_tracker_repo: ResourceTrackerRepository,
@@ -147,6 +154,7 @@ async def export_service_runs(
     access_all_wallet_usage: bool = False,
     order_by: OrderBy | None = None,
     filters: ServiceResourceUsagesFilters | None = None,
+    export_format: ServiceRunsExportFormat = ServiceRunsExportFormat.CSV,
 ) -> AnyUrl:
     started_from = filters.started_at.from_ if filters else None
     started_until = filters.started_at.until if filters else None
@@ -154,20 +162,25 @@ async def export_service_runs(
     # Create S3 key name
     s3_bucket_name = S3BucketName(bucket_name)
     # NOTE: su stands for "service usage"
-    file_name = f"su_{shortuuid.uuid()}.csv"
+    file_name = f"su_{shortuuid.uuid()}.{get_file_extension(export_format)}"
     s3_object_key = f"resource-usage-tracker-service-runs/{datetime.now(tz=timezone.utc).date()}/{file_name}"
 
-    # Export CSV to S3
-    await resource_tracker_repo.export_service_runs_table_to_s3(
-        product_name=product_name,
-        s3_bucket_name=s3_bucket_name,
-        s3_key=s3_object_key,
-        s3_region=s3_region,
-        user_id=user_id if access_all_wallet_usage is False else None,
-        wallet_id=wallet_id,
-        started_from=started_from,
-        started_until=started_until,
-        order_by=order_by,
+    # Stream the rows from the DB, encode and upload them to S3 part by part
+    await s3_client.upload_object_from_stream(
+        bucket=s3_bucket_name,
+        object_key=s3_object_key,
+        stream=encode_service_runs(
+            export_format,
+            SERVICE_RUNS_EXPORT_COLUMNS,
+            resource_tracker_repo.stream_service_runs_for_export(
+                product_name=product_name,
+                user_id=user_id if access_all_wallet_usage is False else None,
+                wallet_id=wallet_id,
+                started_from=started_from,
+                started_until=started_until,
+                order_by=order_by,
+            ),
+        ),
     )
 
     # Create presigned S3 link
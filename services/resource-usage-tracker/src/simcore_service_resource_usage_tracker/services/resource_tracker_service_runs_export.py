@@ -0,0 +1,158 @@
+""" Incremental encoding of the exported service runs
+
+    The rows are encoded batch by batch while they are streamed from the database,
+    so that an export can be uploaded to S3 with a bounded memory usage.
+"""
+
+import csv
+import enum
+import io
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any, Final
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sqlalchemy as sa
+
+
+class ServiceRunsExportFormat(str, enum.Enum):
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+_FILE_EXTENSIONS: Final[dict[ServiceRunsExportFormat, str]] = {
+    ServiceRunsExportFormat.CSV: "csv",
+    ServiceRunsExportFormat.PARQUET: "parquet",
+}
+
+
+def get_file_extension(export_format: ServiceRunsExportFormat) -> str:
+    return _FILE_EXTENSIONS[export_format]
+
+
+def _to_postgres_timestamp(value: datetime) -> str:
+    """same text as postgres (ISO DateStyle), e.g. '2024-01-02 03:04:05.6+00'"""
+    text = value.strftime("%Y-%m-%d %H:%M:%S")
+    if value.microsecond:
+        text += f".{value.microsecond:06d}".rstrip("0")
+    if (utc_offset := value.utcoffset()) is not None:
+        offset_minutes = int(utc_offset.total_seconds()) // 60
+        sign = "-" if offset_minutes < 0 else "+"
+        hours, minutes = divmod(abs(offset_minutes), 60)
+        text += f"{sign}{hours:02d}" + (f":{minutes:02d}" if minutes else "")
+    return text
+
+
+def _to_csv_value(value: Any) -> Any:
+    # NOTE: values are written as the former postgres COPY ... CSV export did
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return _to_postgres_timestamp(value)
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return value
+
+
+async def _encode_csv(
+    columns: Sequence[sa.Column], batches: AsyncIterable[list[dict[str, Any]]]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def _drain() -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow(column.name for column in columns)
+    yield _drain()
+    async for rows in batches:
+        writer.writerows(
+            [_to_csv_value(row[column.name]) for column in columns] for row in rows
+        )
+        yield _drain()
+
+
+class _DrainableBuffer(io.RawIOBase):
+    """write-only file object whose content can be taken out while it is written"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _to_parquet_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _to_arrow_type(column_type: sa.types.TypeEngine) -> pa.DataType:
+    if isinstance(column_type, sa.DateTime):
+        return pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    if isinstance(column_type, sa.Numeric) and not isinstance(column_type, sa.Float):
+        return pa.decimal128(38, column_type.scale or 0)
+    if isinstance(column_type, sa.Integer):
+        return pa.int64()
+    if isinstance(column_type, sa.Boolean):
+        return pa.bool_()
+    return pa.string()
+
+
+async def _encode_parquet(
+    columns: Sequence[sa.Column], batches: AsyncIterable[list[dict[str, Any]]]
+) -> AsyncIterator[bytes]:
+    # NOTE: the schema is given by the columns types (a batch might only contain NULLs)
+    schema = pa.schema(
+        [(column.name, _to_arrow_type(column.type)) for column in columns]
+    )
+    sink = _DrainableBuffer()
+    writer = pq.ParquetWriter(sink, schema)
+    async for rows in batches:
+        table = pa.Table.from_pydict(
+            {
+                column.name: [_to_parquet_value(row[column.name]) for row in rows]
+                for column in columns
+            },
+            schema=schema,
+        )
+        # NOTE: every batch is written as a row group (columnar encoding per batch)
+        writer.write_table(table)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+async def encode_service_runs(
+    export_format: ServiceRunsExportFormat,
+    columns: Sequence[sa.Column],
+    batches: AsyncIterable[list[dict[str, Any]]],
+) -> AsyncIterator[bytes]:
+    encoder = (
+        _encode_csv if export_format is ServiceRunsExportFormat.CSV else _encode_parquet
+    )
+    async for data in encoder(columns, batches):
+        if data:
+            yield data
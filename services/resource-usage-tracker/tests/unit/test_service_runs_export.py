@@ -0,0 +1,112 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+
+import csv
+import io
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+import pyarrow.parquet as pq
+import pytest
+import sqlalchemy as sa
+from models_library.resource_tracker import CreditTransactionStatus
+from simcore_service_resource_usage_tracker.services.resource_tracker_service_runs_export import (
+    ServiceRunsExportFormat,
+    _to_postgres_timestamp,
+    encode_service_runs,
+)
+
+_COLUMNS = [
+    sa.Column("service_run_id", sa.String),
+    sa.Column("started_at", sa.DateTime(timezone=True)),
+    sa.Column("stopped_at", sa.DateTime(timezone=True)),
+    sa.Column("osparc_credits", sa.Numeric(scale=2)),
+    sa.Column("status", sa.Enum(CreditTransactionStatus)),
+]
+_COLUMNS_NAMES = [column.name for column in _COLUMNS]
+
+
+def _create_rows(num_rows: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "service_run_id": f"run_{n}",
+            "started_at": datetime(2024, 1, 1, n % 24, tzinfo=timezone.utc),
+            "stopped_at": None,
+            "osparc_credits": Decimal("-1.25") * n,
+            "status": CreditTransactionStatus.PENDING,
+        }
+        for n in range(num_rows)
+    ]
+
+
+async def _batches(
+    rows: list[dict[str, Any]], batch_size: int
+) -> AsyncIterator[list[dict[str, Any]]]:
+    for offset in range(0, len(rows), batch_size):
+        yield rows[offset : offset + batch_size]
+
+
+async def _encode(export_format: ServiceRunsExportFormat, rows, batch_size) -> bytes:
+    return b"".join(
+        [
+            chunk
+            async for chunk in encode_service_runs(
+                export_format, _COLUMNS, _batches(rows, batch_size)
+            )
+        ]
+    )
+
+
+@pytest.mark.parametrize("num_rows", [0, 1, 250])
+async def test_encode_service_runs_to_csv(num_rows: int):
+    rows = _create_rows(num_rows)
+    encoded = await _encode(ServiceRunsExportFormat.CSV, rows, batch_size=100)
+
+    header, *csv_rows = list(csv.reader(io.StringIO(encoded.decode())))
+    assert header == _COLUMNS_NAMES
+    assert len(csv_rows) == num_rows
+    if rows:
+        assert csv_rows[-1] == [
+            f"run_{num_rows - 1}",
+            f"2024-01-01 {(num_rows - 1) % 24:02d}:00:00+00",
+            "",
+            f"{rows[-1]['osparc_credits']}",
+            "PENDING",
+        ]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc), "2024-01-02 03:04:05+00"),
+        (
+            datetime(2024, 1, 2, 3, 4, 5, 600000, tzinfo=timezone.utc),
+            "2024-01-02 03:04:05.6+00",
+        ),
+        (
+            datetime(
+                2024, 1, 2, 3, 4, 5, tzinfo=timezone(-timedelta(hours=5, minutes=30))
+            ),
+            "2024-01-02 03:04:05-05:30",
+        ),
+        (datetime(2024, 1, 2, 3, 4, 5, 123), "2024-01-02 03:04:05.000123"),
+    ],
+)
+def test_csv_timestamps_as_postgres_text(value: datetime, expected: str):
+    assert _to_postgres_timestamp(value) == expected
+
+
+@pytest.mark.parametrize("num_rows", [0, 250])
+async def test_encode_service_runs_to_parquet(num_rows: int):
+    rows = _create_rows(num_rows)
+    encoded = await _encode(ServiceRunsExportFormat.PARQUET, rows, batch_size=100)
+
+    parquet_file = pq.ParquetFile(io.BytesIO(encoded))
+    assert parquet_file.schema_arrow.names == _COLUMNS_NAMES
+    assert parquet_file.metadata.num_rows == num_rows
+    if rows:
+        # one row group per batch
+        assert parquet_file.num_row_groups == 3
+        assert parquet_file.read().to_pylist()[1]["status"] == "PENDING"
@@ -1,4 +1,11 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+
+import csv
+import io
 import os
+from collections.abc import Callable, Iterator
+from typing import Any
 from unittest.mock import Mock
 
 import pytest
@@ -10,6 +17,12 @@ from pytest_simcore.helpers.typing_env import EnvVarsDict
 from servicelib.rabbitmq import RabbitMQRPCClient
 from servicelib.rabbitmq.rpc_interfaces.resource_usage_tracker import service_runs
 from settings_library.s3 import S3Settings
+from simcore_postgres_database.models.resource_tracker_service_runs import (
+    resource_tracker_service_runs,
+)
+from simcore_service_resource_usage_tracker.modules.db.repositories.resource_tracker import (
+    SERVICE_RUNS_EXPORT_COLUMNS,
+)
 from types_aiobotocore_s3 import S3Client
 
 pytest_simcore_core_services_selection = [
@@ -21,16 +34,24 @@ pytest_simcore_ops_services_selection = [
 ]
 
 _USER_ID = 1
+_TOTAL_GENERATED_RESOURCE_TRACKER_SERVICE_RUNS_ROWS = 2500
 
 
-@pytest.fixture
-async def mocked_export(mocker: MockerFixture):
-    mock_export = mocker.patch(
-        "simcore_service_resource_usage_tracker.services.resource_tracker_service_runs.ResourceTrackerRepository.export_service_runs_table_to_s3",
-        autospec=True,
-    )
-
-    return mock_export
+@pytest.fixture()
+def resource_tracker_service_runs_db(
+    postgres_db: sa.engine.Engine,
+    random_resource_tracker_service_run: Callable[..., dict[str, Any]],
+) -> Iterator[None]:
+    with postgres_db.connect() as con:
+        con.execute(
+            resource_tracker_service_runs.insert(),
+            [
+                random_resource_tracker_service_run(user_id=_USER_ID)
+                for _ in range(_TOTAL_GENERATED_RESOURCE_TRACKER_SERVICE_RUNS_ROWS)
+            ],
+        )
+        yield
+        con.execute(resource_tracker_service_runs.delete())
 
 
 @pytest.fixture
@@ -69,8 +90,10 @@ async def test_rpc_list_service_runs_which_was_billed(
     mocked_redis_server: None,
     postgres_db: sa.engine.Engine,
     rpc_client: RabbitMQRPCClient,
-    mocked_export: Mock,
+    resource_tracker_service_runs_db: None,
     mocked_presigned_link: Mock,
+    mocked_s3_server_settings: S3Settings,
+    s3_client: S3Client,
 ):
     download_url = await service_runs.export_service_runs(
         rpc_client,
@@ -78,5 +101,15 @@ async def test_rpc_list_service_runs_which_was_billed(
         product_name="osparc",
     )
     assert isinstance(download_url, AnyUrl)
-    assert mocked_export.called
     assert mocked_presigned_link.called
+
+    # the export was streamed to S3
+    exported_object_key = mocked_presigned_link.call_args.kwargs["object_key"]
+    assert exported_object_key.endswith(".csv")
+    response = await s3_client.get_object(
+        Bucket=mocked_s3_server_settings.S3_BUCKET_NAME, Key=exported_object_key
+    )
+    exported_csv = (await response["Body"].read()).decode()
+    header, *rows = list(csv.reader(io.StringIO(exported_csv)))
+    assert header == [column.name for column in SERVICE_RUNS_EXPORT_COLUMNS]
+    assert len(rows) == _TOTAL_GENERATED_RESOURCE_TRACKER_SERVICE_RUNS_ROWS
@@ -11,6 +11,7 @@ from models_library.rabbitmq_messages import (
     RabbitResourceTrackingStoppedMessage,
     SimcorePlatformStatus,
     WalletCreditsLimitReachedMessage,
+    WalletCreditsMessage,
 )
 from models_library.resource_tracker import UnitExtraInfo
 from pytest_mock.plugin import MockerFixture
@@ -35,6 +36,7 @@ from simcore_service_resource_usage_tracker.modules.db.repositories.resource_tra
 )
 from simcore_service_resource_usage_tracker.resource_tracker_process_messages import (
     _process_heartbeat_event,
+    _process_heartbeat_events,
     _process_start_event,
     _process_stop_event,
 )
@@ -239,3 +241,79 @@ async def test_process_event_functions(
     ):
         with attempt:
             mocked_message_parser.assert_called_once()
+
+
+async def test_process_heartbeat_events_in_batch(
+    create_rabbitmq_client: Callable[[str], RabbitMQClient],
+    random_rabbit_message_start,
+    mocked_redis_server: None,
+    postgres_db: sa.engine.Engine,
+    resource_tracker_service_run_db,
+    resource_tracker_pricing_tables_db,
+    initialized_app,
+    mocked_message_parser,
+):
+    engine = initialized_app.state.engine
+    publisher = create_rabbitmq_client("publisher")
+    consumer = create_rabbitmq_client("consumer")
+    await consumer.subscribe(
+        WalletCreditsMessage.get_channel_name(),
+        mocked_message_parser,
+        topics=["#"],
+    )
+    resource_tracker_repo: ResourceTrackerRepository = ResourceTrackerRepository(
+        db_engine=engine
+    )
+
+    start_msgs = [
+        random_rabbit_message_start(
+            wallet_id=1,
+            wallet_name="test",
+            pricing_plan_id=1,
+            pricing_unit_id=1,
+            pricing_unit_cost_id=1,
+        )
+        for _ in range(5)
+    ]
+    for msg in start_msgs:
+        await _process_start_event(resource_tracker_repo, msg, publisher)
+    mocked_message_parser.reset_mock()
+
+    await asyncio.sleep(1)
+    heartbeat_msgs = [
+        RabbitResourceTrackingHeartbeatMessage(
+            service_run_id=msg.service_run_id, created_at=datetime.now(tz=timezone.utc)
+        )
+        for msg in start_msgs
+        for _ in range(2)
+    ]
+    await _process_heartbeat_events(resource_tracker_repo, heartbeat_msgs, publisher)
+
+    for msg in start_msgs:
+        output = await assert_credit_transactions_db_row(postgres_db, msg.service_run_id)
+        assert output.osparc_credits < 0.0
+        assert output.transaction_status == "PENDING"
+
+    # the running balance of the wallet is up to date
+    wallet_total_credits = (
+        await resource_tracker_repo.sum_credit_transactions_by_product_and_wallet(
+            "osparc", 1
+        )
+    )
+    with postgres_db.connect() as con:
+        expected_total = con.execute(
+            sa.select(
+                sa.func.sum(resource_tracker_credit_transactions.c.osparc_credits)
+            ).where(resource_tracker_credit_transactions.c.wallet_id == 1)
+        ).scalar()
+    assert wallet_total_credits.available_osparc_credits == expected_total
+
+    # the wallet credits are published once for the whole batch
+    async for attempt in AsyncRetrying(
+        wait=wait_fixed(0.1),
+        stop=stop_after_delay(5),
+        retry=retry_if_exception_type(AssertionError),
+        reraise=True,
+    ):
+        with attempt:
+            mocked_message_parser.assert_called_once()
@@ -33,6 +33,8 @@ MAX_LINK_CHUNK_BYTE_SIZE: Final[dict[LinkType, ByteSize]] = {
 }
 
 MAX_CONCURRENT_S3_TASKS: Final[int] = 4
+# NOTE: server-side copies of single objects (large ones are in addition copied in parallel parts)
+MAX_CONCURRENT_S3_COPY_TASKS: Final[int] = 20
 
 
 # REST API ----------------------------
@@ -1,5 +1,6 @@
 import datetime
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Sequence
+from typing import Final
 
 import sqlalchemy as sa
 from aiopg.sa.connection import SAConnection
@@ -8,6 +9,7 @@ from models_library.projects import ProjectID
 from models_library.projects_nodes_io import NodeID, SimcoreS3FileID
 from models_library.users import UserID
 from models_library.utils.fastapi_encoders import jsonable_encoder
+from servicelib.utils import partition_gen
 from simcore_postgres_database.storage_models import file_meta_data
 from sqlalchemy import and_, literal_column
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -15,6 +17,9 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 from .exceptions import FileMetaDataNotFoundError
 from .models import FileMetaData, FileMetaDataAtDB, UserOrProjectFilter
 
+# NOTE: keeps the number of parameters of a statement far below postgres' limit
+_UPSERT_MANY_SLICE_SIZE: Final[int] = 500
+
 
 async def exists(conn: SAConnection, file_id: SimcoreS3FileID) -> bool:
     return bool(
@@ -43,6 +48,28 @@ async def upsert(
     return FileMetaDataAtDB.from_orm(row)
 
 
+async def upsert_many(
+    conn: SAConnection, fmds: Sequence[FileMetaData | FileMetaDataAtDB]
+) -> None:
+    """same as upsert for many entries at once (i.e. a few statements instead of one per entry)"""
+    for fmds_slice in partition_gen(fmds, slice_size=_UPSERT_MANY_SLICE_SIZE):
+        values = [
+            jsonable_encoder(
+                FileMetaDataAtDB.from_orm(fmd) if isinstance(fmd, FileMetaData) else fmd
+            )
+            for fmd in fmds_slice
+        ]
+        if not values:
+            continue
+        insert_statement = pg_insert(file_meta_data).values(values)
+        await conn.execute(
+            insert_statement.on_conflict_do_update(
+                index_elements=[file_meta_data.c.file_id],
+                set_={key: insert_statement.excluded[key] for key in values[0]},
+            )
+        )
+
+
 async def insert(conn: SAConnection, fmd: FileMetaData) -> FileMetaDataAtDB:
     fmd_db = FileMetaDataAtDB.from_orm(fmd)
     result = await conn.execute(
@@ -64,17 +91,14 @@ async def get(conn: SAConnection, file_id: SimcoreS3FileID) -> FileMetaDataAtDB:
     raise FileMetaDataNotFoundError(file_id=file_id)
 
 
-async def list_filter_with_partial_file_id(
-    conn: SAConnection,
+def _list_filter_with_partial_file_id_where_clause(
     *,
     user_or_project_filter: UserOrProjectFilter,
     file_id_prefix: str | None,
     partial_file_id: str | None,
     sha256_checksum: SHA256Str | None,
     only_files: bool,
-    limit: int | None = None,
-    offset: int | None = None,
-) -> list[FileMetaDataAtDB]:
+):
     conditions = []
 
     # user_or_project_filter
@@ -94,7 +118,27 @@ async def list_filter_with_partial_file_id(
     if sha256_checksum:
         conditions.append(file_meta_data.c.sha256_checksum == sha256_checksum)
 
-    where_clause = sa.and_(*conditions)
+    return sa.and_(*conditions)
+
+
+async def list_filter_with_partial_file_id(
+    conn: SAConnection,
+    *,
+    user_or_project_filter: UserOrProjectFilter,
+    file_id_prefix: str | None,
+    partial_file_id: str | None,
+    sha256_checksum: SHA256Str | None,
+    only_files: bool,
+    limit: int | None = None,
+    offset: int | None = None,
+) -> list[FileMetaDataAtDB]:
+    where_clause = _list_filter_with_partial_file_id_where_clause(
+        user_or_project_filter=user_or_project_filter,
+        file_id_prefix=file_id_prefix,
+        partial_file_id=partial_file_id,
+        sha256_checksum=sha256_checksum,
+        only_files=only_files,
+    )
 
     stmt = (
         sa.select(file_meta_data).where(where_clause)
@@ -111,6 +155,68 @@ async def list_filter_with_partial_file_id(
     return [FileMetaDataAtDB.from_orm(row) async for row in await conn.execute(stmt)]
 
 
+async def count_filter_with_partial_file_id(
+    conn: SAConnection,
+    *,
+    user_or_project_filter: UserOrProjectFilter,
+    file_id_prefix: str | None,
+    partial_file_id: str | None,
+    sha256_checksum: SHA256Str | None,
+    only_files: bool,
+) -> int:
+    where_clause = _list_filter_with_partial_file_id_where_clause(
+        user_or_project_filter=user_or_project_filter,
+        file_id_prefix=file_id_prefix,
+        partial_file_id=partial_file_id,
+        sha256_checksum=sha256_checksum,
+        only_files=only_files,
+    )
+    count: int = await conn.scalar(
+        sa.select(sa.func.count()).select_from(file_meta_data).where(where_clause)
+    )
+    return count
+
+
+async def list_filter_with_partial_file_id_after(
+    conn: SAConnection,
+    *,
+    user_or_project_filter: UserOrProjectFilter,
+    partial_file_id: str | None,
+    after_file_id: SimcoreS3FileID | None,
+    include_after_file_id: bool = False,
+    limit: int,
+) -> list[FileMetaDataAtDB]:
+    """keyset pagination: lists up to `limit` entries sorted by file_id, starting after `after_file_id`
+    (or with it if `include_after_file_id`)
+
+    NOTE: unlike limit/offset, the pages remain consistent while entries are added/removed
+    """
+    where_clause = _list_filter_with_partial_file_id_where_clause(
+        user_or_project_filter=user_or_project_filter,
+        file_id_prefix=None,
+        partial_file_id=partial_file_id,
+        sha256_checksum=None,
+        only_files=False,
+    )
+    if after_file_id is not None:
+        where_clause = sa.and_(
+            where_clause,
+            (
+                (file_meta_data.c.file_id >= after_file_id)
+                if include_after_file_id
+                else (file_meta_data.c.file_id > after_file_id)
+            ),
+        )
+
+    stmt = (
+        sa.select(file_meta_data)
+        .where(where_clause)
+        .order_by(file_meta_data.c.file_id.asc())
+        .limit(limit)
+    )
+    return [FileMetaDataAtDB.from_orm(row) async for row in await conn.execute(stmt)]
+
+
 async def list_fmds(
     conn: SAConnection,
     *,
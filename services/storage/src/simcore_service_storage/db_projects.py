@@ -1,9 +1,10 @@
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable
 from contextlib import suppress
 
 import sqlalchemy as sa
 from aiopg.sa.connection import SAConnection
 from models_library.projects import ProjectAtDB, ProjectID
+from models_library.projects_nodes_io import NodeID
 from pydantic import ValidationError
 from simcore_postgres_database.storage_models import projects
 
@@ -37,3 +38,34 @@ async def project_exists(
         )
         == 1
     )
+
+
+async def get_project_and_nodes_names(
+    conn: SAConnection,
+    project_uuids: Iterable[ProjectID],
+) -> dict[ProjectID | NodeID, str]:
+    """returns the names of the projects in 'project_uuids' and the labels of their nodes
+
+    NOTE: only the names are selected from the workbench, i.e. the projects are neither loaded nor validated
+    """
+    workbench_nodes = (
+        sa.func.json_each(projects.c.workbench)
+        .table_valued("key", "value")
+        .lateral("workbench_nodes")
+    )
+    names: dict[ProjectID | NodeID, str] = {}
+    async for row in conn.execute(
+        sa.select(
+            projects.c.uuid,
+            projects.c.name,
+            workbench_nodes.c.key.label("node_id"),
+            workbench_nodes.c.value.op("->>")("label").label("node_name"),
+        )
+        .select_from(projects.outerjoin(workbench_nodes, sa.true()))
+        .where(projects.c.uuid.in_([f"{pid}" for pid in project_uuids]))
+    ):
+        names[ProjectID(row.uuid)] = row.name
+        if row.node_id and row.node_name:
+            with suppress(ValueError):
+                names[NodeID(row.node_id)] = row.node_name
+    return names
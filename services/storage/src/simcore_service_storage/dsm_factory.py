@@ -84,8 +84,13 @@ class BaseDataManager(ABC):
         file_id: StorageFileID,
         user_id: UserID,
         uploaded_parts: list[UploadedPart],
+        *,
+        sha256_checksum: SHA256Str | None = None,
     ) -> FileMetaData:
-        """completes an upload if the user has the rights to"""
+        """completes an upload if the user has the rights to
+
+        sha256_checksum: of the uploaded content, if unknown when the upload was created
+        """
 
     @abstractmethod
     async def abort_file_upload(self, user_id: UserID, file_id: StorageFileID) -> None:
@@ -65,14 +65,35 @@ async def get_files_metadata(request: web.Request) -> web.Response:
         f"{path_params=}, {query_params=}",
     )
     dsm = get_dsm_provider(request.app).get(path_params.location_id)
-    data: list[FileMetaData] = await dsm.list_files(
+    if query_params.limit is None:
+        data: list[FileMetaData] = await dsm.list_files(
+            user_id=query_params.user_id,
+            expand_dirs=query_params.expand_dirs,
+            uuid_filter=query_params.uuid_filter,
+            project_id=query_params.project_id,
+        )
+        return web.json_response(
+            {"data": [jsonable_encoder(FileMetaDataGet.from_orm(d)) for d in data]},
+            dumps=json_dumps,
+        )
+
+    if not isinstance(dsm, SimcoreS3DataManager):
+        raise web.HTTPNotImplemented(
+            reason=f"Paginated listing is not available in location {path_params.location_id}"
+        )
+    data, next_cursor = await dsm.list_files_page(
         user_id=query_params.user_id,
         expand_dirs=query_params.expand_dirs,
         uuid_filter=query_params.uuid_filter,
         project_id=query_params.project_id,
+        limit=query_params.limit,
+        cursor=query_params.cursor,
     )
     return web.json_response(
-        {"data": [jsonable_encoder(FileMetaDataGet.from_orm(d)) for d in data]},
+        {
+            "data": [jsonable_encoder(FileMetaDataGet.from_orm(d)) for d in data],
+            "next_cursor": next_cursor.encode() if next_cursor else None,
+        },
         dumps=json_dumps,
     )
 
@@ -284,7 +305,12 @@ async def complete_upload_file(request: web.Request) -> web.Response:
     # if it returns slow we return a 202 - Accepted, the client will have to check later
     # for completeness
     task = asyncio.create_task(
-        dsm.complete_file_upload(path_params.file_id, query_params.user_id, body.parts),
+        dsm.complete_file_upload(
+            path_params.file_id,
+            query_params.user_id,
+            body.parts,
+            sha256_checksum=body.sha256_checksum,
+        ),
         name=create_upload_completion_task_name(
             query_params.user_id, path_params.file_id
         ),
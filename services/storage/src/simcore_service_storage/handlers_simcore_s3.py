@@ -152,6 +152,11 @@ async def search_files(request: web.Request) -> web.Response:
         limit=query_params.limit,
         offset=query_params.offset,
     )
+    total = await dsm.count_owned_files(
+        user_id=query_params.user_id,
+        file_id_prefix=query_params.startswith,
+        sha256_checksum=query_params.sha256_checksum,
+    )
     _logger.debug(
         "Found %d files starting with '%s'",
         len(data),
@@ -159,6 +164,9 @@ async def search_files(request: web.Request) -> web.Response:
     )
 
     return web.json_response(
-        {"data": [jsonable_encoder(FileMetaDataGet.from_orm(d)) for d in data]},
+        {
+            "data": [jsonable_encoder(FileMetaDataGet.from_orm(d)) for d in data],
+            "total": total,
+        },
         dumps=json_dumps,
     )
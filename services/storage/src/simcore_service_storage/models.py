@@ -1,10 +1,11 @@
+import base64
 import datetime
 import urllib.parse
 from dataclasses import dataclass
 from typing import Final, Literal, NamedTuple
 from uuid import UUID
 
-from aws_library.s3 import UploadID
+from aws_library.s3 import S3ObjectKey, UploadID
 from models_library.api_schemas_storage import (
     DatasetMetaDataGet,
     ETag,
@@ -40,6 +41,7 @@ from pydantic import (
 )
 
 UNDEFINED_SIZE: Final[ByteSize] = parse_obj_as(ByteSize, -1)
+MAX_FILES_LISTING_PAGE_SIZE: Final[int] = 1000
 
 
 class DatasetMetaData(DatasetMetaDataGet):
@@ -149,10 +151,58 @@ class FilesMetadataDatasetQueryParams(StorageQueryParamsBase):
     expand_dirs: bool = True
 
 
+class FilesListingCursor(BaseModel):
+    """Position of the last listed entry, i.e. the listing resumes right after it"""
+
+    file_id: SimcoreS3FileID = Field(
+        ..., description="last listed entry of the file_meta_data table"
+    )
+    object_key: S3ObjectKey | None = Field(
+        default=None,
+        description="last listed object of the (expanded) directory 'file_id'",
+    )
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(self.json(exclude_none=True).encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "FilesListingCursor":
+        return cls.parse_raw(base64.urlsafe_b64decode(cursor.encode()))
+
+
 class FilesMetadataQueryParams(StorageQueryParamsBase):
     project_id: ProjectID | None = None
     uuid_filter: str = ""
     expand_dirs: bool = True
+    limit: int | None = Field(
+        default=None,
+        ge=1,
+        le=MAX_FILES_LISTING_PAGE_SIZE,
+        description="Page size limit. If passed, the listing is paginated",
+    )
+    cursor: FilesListingCursor | None = Field(
+        default=None,
+        description="Opaque cursor returned with the previous page (requires limit)",
+    )
+
+    @validator("cursor", pre=True)
+    @classmethod
+    def decode_cursor(cls, v):
+        if isinstance(v, str):
+            try:
+                return FilesListingCursor.decode(v)
+            except ValueError as err:
+                msg = f"Invalid cursor {v!r}"
+                raise ValueError(msg) from err
+        return v
+
+    @root_validator(skip_on_failure=True)
+    @classmethod
+    def check_cursor_requires_limit(cls, values):
+        if values.get("cursor") is not None and values.get("limit") is None:
+            msg = "cursor can only be used together with limit"
+            raise ValueError(msg)
+        return values
 
 
 class SyncMetadataQueryParams(BaseModel):
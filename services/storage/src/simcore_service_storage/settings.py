@@ -58,6 +58,11 @@ class Settings(BaseCustomSettings, MixinLoggingSettings):
         description="Interval in seconds when task cleaning pending uploads runs. setting to NULL disables the cleaner.",
     )
 
+    STORAGE_CLEANER_MAX_CONCURRENT_S3_CALLS: PositiveInt = Field(
+        2,
+        description="Maximal amount of concurrent calls to the S3 backend (listings, aborts of multipart uploads, restores) of the task cleaning pending uploads",
+    )
+
     STORAGE_S3_CLIENT_MAX_TRANSFER_CONCURRENCY: int = Field(
         4,
         description="Maximal amount of threads used by underlying S3 client to transfer data to S3 backend",
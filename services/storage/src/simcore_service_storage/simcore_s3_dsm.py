@@ -1,11 +1,14 @@
+import asyncio
 import contextlib
 import datetime
+import itertools
 import logging
 import tempfile
 import urllib.parse
-from collections.abc import Callable, Coroutine
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable
 from contextlib import suppress
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Final, cast
 
@@ -13,7 +16,12 @@ import arrow
 from aiohttp import web
 from aiopg.sa import Engine
 from aiopg.sa.connection import SAConnection
-from aws_library.s3 import S3DirectoryMetaData, S3KeyNotFoundError, S3MetaData
+from aws_library.s3 import (
+    S3DirectoryMetaData,
+    S3KeyNotFoundError,
+    S3MetaData,
+    S3ObjectKey,
+)
 from models_library.api_schemas_storage import LinkType, S3BucketName, UploadedPart
 from models_library.basic_types import SHA256Str
 from models_library.projects import ProjectID
@@ -24,10 +32,10 @@ from models_library.projects_nodes_io import (
     StorageFileID,
 )
 from models_library.users import UserID
-from pydantic import AnyUrl, ByteSize, NonNegativeInt, parse_obj_as
+from pydantic import AnyUrl, ByteSize, NonNegativeInt, PositiveInt, parse_obj_as
 from servicelib.aiohttp.client_session import get_client_session
 from servicelib.aiohttp.long_running_tasks.server import TaskProgress
-from servicelib.logging_utils import log_context
+from servicelib.logging_utils import log_catch, log_context
 from servicelib.utils import ensure_ends_with, limited_gather
 
 from . import db_file_meta_data, db_projects, db_tokens
@@ -36,6 +44,7 @@ from .constants import (
     APP_DB_ENGINE_KEY,
     DATCORE_ID,
     EXPAND_DIR_MAX_ITEM_COUNT,
+    MAX_CONCURRENT_S3_COPY_TASKS,
     MAX_CONCURRENT_S3_TASKS,
     MAX_LINK_CHUNK_BYTE_SIZE,
     S3_UNDEFINED_OR_EXTERNAL_MULTIPART_ID,
@@ -61,6 +70,7 @@ from .models import (
     DatasetMetaData,
     FileMetaData,
     FileMetaDataAtDB,
+    FilesListingCursor,
     UploadID,
     UploadLinks,
     UserOrProjectFilter,
@@ -68,7 +78,14 @@ from .models import (
 from .s3 import get_s3_client
 from .s3_utils import S3TransferDataCB, update_task_progress
 from .settings import Settings
-from .simcore_s3_dsm_utils import expand_directory, get_directory_file_id
+from .simcore_s3_dsm_utils import (
+    FileCopyPlan,
+    expand_directory,
+    find_copy_plans,
+    get_directory_file_id,
+    get_listing_prefixes,
+    reconcile_expired_uploads,
+)
 from .utils import (
     convert_db_to_model,
     download_to_file_or_raise,
@@ -76,12 +93,51 @@ from .utils import (
     is_valid_managed_multipart_upload,
 )
 
-_NO_CONCURRENCY: Final[int] = 1
 _MAX_PARALLEL_S3_CALLS: Final[NonNegativeInt] = 10
+_MAX_SCHEDULED_UPDATES_FROM_STORAGE: Final[NonNegativeInt] = 1000
 
 _logger = logging.getLogger(__name__)
 
 
+def _list_accessible_project_ids(
+    fmds: Iterable[FileMetaDataAtDB], user_or_project_filter: UserOrProjectFilter
+) -> set[ProjectID]:
+    accessible_project_ids = set(user_or_project_filter.project_ids)
+    return {
+        fmd.project_id for fmd in fmds if fmd.project_id in accessible_project_ids
+    }
+
+
+def _fill_project_and_node_names(
+    data: FileMetaData, names_mapping: dict[ProjectID | NodeID, str]
+) -> bool:
+    """returns False if the entry shall not be listed (i.e. no project or node name)"""
+    if data.project_id not in names_mapping:
+        return False
+    data.project_name = names_mapping[data.project_id]
+    if data.node_id in names_mapping:
+        data.node_name = names_mapping[data.node_id]
+    return bool(data.node_name and data.project_name)
+
+
+def _update_fmd_from_copied_objects(
+    fmd: FileMetaData,
+    plan: FileCopyPlan,
+    copied_objects: dict[S3ObjectKey, S3MetaData],
+) -> None:
+    if plan.src_fmd.is_directory:
+        # NOTE: same as the source directory
+        fmd.file_size = plan.src_fmd.file_size
+    else:
+        (object_copy,) = plan.objects
+        s3_metadata = copied_objects[object_copy.dst_object_key]
+        fmd.file_size = parse_obj_as(ByteSize, s3_metadata.size)
+        fmd.last_modified = s3_metadata.last_modified
+        fmd.entity_tag = s3_metadata.e_tag
+    fmd.upload_expires_at = None
+    fmd.upload_id = None
+
+
 @dataclass
 class SimcoreS3DataManager(BaseDataManager):
     engine: Engine
@@ -89,6 +145,16 @@ class SimcoreS3DataManager(BaseDataManager):
     app: web.Application
     settings: Settings
 
+    _scheduled_updates_from_storage: set[SimcoreS3FileID] = field(
+        default_factory=set, init=False
+    )
+    _update_from_storage_tasks: set[asyncio.Task] = field(
+        default_factory=set, init=False
+    )
+    _update_from_storage_semaphore: asyncio.Semaphore = field(
+        default_factory=lambda: asyncio.Semaphore(_MAX_PARALLEL_S3_CALLS), init=False
+    )
+
     @classmethod
     def get_location_id(cls) -> LocationID:
         return SIMCORE_S3_ID
@@ -125,7 +191,24 @@ class SimcoreS3DataManager(BaseDataManager):
         )
         return data
 
-    async def list_files(  # noqa C901
+    async def _get_user_or_project_filter(
+        self, conn: SAConnection, user_id: UserID, project_id: ProjectID | None
+    ) -> UserOrProjectFilter:
+        if project_id is not None:
+            project_access_rights = await get_project_access_rights(
+                conn=conn, user_id=user_id, project_id=project_id
+            )
+            if not project_access_rights.read:
+                raise ProjectAccessRightError(
+                    access_right="read", project_id=project_id
+                )
+            return UserOrProjectFilter(user_id=None, project_ids=[project_id])
+        return UserOrProjectFilter(
+            user_id=user_id,
+            project_ids=await get_readable_project_ids(conn, user_id),
+        )
+
+    async def list_files(
         self,
         user_id: UserID,
         *,
@@ -139,40 +222,33 @@ class SimcoreS3DataManager(BaseDataManager):
         project_id: If passed, only list files associated with that project_id
         uuid_filter: If passed, only list files whose 'object_name' match (ilike) the passed string
 
-        NOTE: expand_dirs will be replaced by pagination in the future
-        currently only {EXPAND_DIR_MAX_ITEM_COUNT} items will be returned
+        NOTE: currently only {EXPAND_DIR_MAX_ITEM_COUNT} items will be returned
         The endpoint produces similar results to what it did previously
+        SEE list_files_page for the paginated version
         """
 
         data: list[FileMetaData] = []
-        accessible_projects_ids = []
-        uid: UserID | None = None
         async with self.engine.acquire() as conn:
-            if project_id is not None:
-                project_access_rights = await get_project_access_rights(
-                    conn=conn, user_id=user_id, project_id=project_id
-                )
-                if not project_access_rights.read:
-                    raise ProjectAccessRightError(
-                        access_right="read", project_id=project_id
-                    )
-                accessible_projects_ids = [project_id]
-                uid = None
-            else:
-                accessible_projects_ids = await get_readable_project_ids(conn, user_id)
-                uid = user_id
+            user_or_project_filter = await self._get_user_or_project_filter(
+                conn, user_id, project_id
+            )
             file_and_directory_meta_data: list[
                 FileMetaDataAtDB
             ] = await db_file_meta_data.list_filter_with_partial_file_id(
                 conn,
-                user_or_project_filter=UserOrProjectFilter(
-                    user_id=uid, project_ids=accessible_projects_ids
-                ),
+                user_or_project_filter=user_or_project_filter,
                 file_id_prefix=None,
                 partial_file_id=uuid_filter,
                 only_files=False,
                 sha256_checksum=None,
             )
+            # now search for the names of the listed projects and their nodes
+            names_mapping = await db_projects.get_project_and_nodes_names(
+                conn,
+                _list_accessible_project_ids(
+                    file_and_directory_meta_data, user_or_project_filter
+                ),
+            )
 
         # add all the entries from file_meta_data without
         for metadata in file_and_directory_meta_data:
@@ -181,23 +257,8 @@ class SimcoreS3DataManager(BaseDataManager):
                 # avoids directory files and does not add any directory entry to the result
                 continue
 
-            if is_file_entry_valid(metadata):
+            if self._is_listable(metadata):
                 data.append(convert_db_to_model(metadata))
-                continue
-            with suppress(S3KeyNotFoundError):
-                updated_fmd = await self._update_database_from_storage(metadata)
-                data.append(convert_db_to_model(updated_fmd))
-
-        # now parse the project to search for node/project names
-        async with self.engine.acquire() as conn:
-            prj_names_mapping: dict[ProjectID | NodeID, str] = {}
-            async for proj_data in db_projects.list_valid_projects_in(
-                conn, accessible_projects_ids
-            ):
-                prj_names_mapping |= {proj_data.uuid: proj_data.name} | {
-                    NodeID(node_id): node_data.label
-                    for node_id, node_data in proj_data.workbench.items()
-                }
 
         # expand directories until the max number of files to return is reached
         directory_expands: list[Coroutine] = []
@@ -224,18 +285,160 @@ class SimcoreS3DataManager(BaseDataManager):
         # artifically fills ['project_name', 'node_name', 'file_id', 'raw_file_path', 'display_file_path']
         #   with information from the projects table!
         # NOTE: This part with the projects, should be done in the client code not here!
-        clean_data: list[FileMetaData] = []
-        for d in data:
-            if d.project_id not in prj_names_mapping:
-                continue
-            d.project_name = prj_names_mapping[d.project_id]
-            if d.node_id in prj_names_mapping:
-                d.node_name = prj_names_mapping[d.node_id]
-            if d.node_name and d.project_name:
-                clean_data.append(d)
+        return [d for d in data if _fill_project_and_node_names(d, names_mapping)]
 
-            data = clean_data
-        return data
+    async def list_files_page(
+        self,
+        user_id: UserID,
+        *,
+        expand_dirs: bool,
+        uuid_filter: str,
+        project_id: ProjectID | None,
+        limit: PositiveInt,
+        cursor: FilesListingCursor | None,
+    ) -> tuple[list[FileMetaData], FilesListingCursor | None]:
+        """Paginated version of list_files
+
+        Entries are listed by file_id and directories are expanded in place (if expand_dirs), i.e.
+        both the file_meta_data table and the S3 directories are read one page at a time.
+
+        Returns the entries and the cursor of the next page (None if there are no more entries)
+        """
+        async with self.engine.acquire() as conn:
+            user_or_project_filter = await self._get_user_or_project_filter(
+                conn, user_id, project_id
+            )
+
+        items: list[FileMetaData] = []
+        async with contextlib.aclosing(
+            self._iter_files(
+                user_or_project_filter,
+                expand_dirs=expand_dirs,
+                uuid_filter=uuid_filter,
+                cursor=cursor,
+                batch_size=limit,
+            )
+        ) as listed_files:
+            async for item, item_cursor in listed_files:
+                items.append(item)
+                if len(items) == limit:
+                    return items, item_cursor
+        return items, None
+
+    async def _iter_files(
+        self,
+        user_or_project_filter: UserOrProjectFilter,
+        *,
+        expand_dirs: bool,
+        uuid_filter: str,
+        cursor: FilesListingCursor | None,
+        batch_size: PositiveInt,
+    ) -> AsyncIterator[tuple[FileMetaData, FilesListingCursor]]:
+        names_mapping: dict[ProjectID | NodeID, str] = {}
+        after_file_id = cursor.file_id if cursor else None
+        # NOTE: if the previous page stopped inside a directory, its listing is resumed
+        start_after = cursor.object_key if cursor else None
+
+        while True:
+            async with self.engine.acquire() as conn:
+                fmds = await db_file_meta_data.list_filter_with_partial_file_id_after(
+                    conn,
+                    user_or_project_filter=user_or_project_filter,
+                    partial_file_id=uuid_filter,
+                    after_file_id=after_file_id,
+                    include_after_file_id=start_after is not None,
+                    limit=batch_size,
+                )
+                names_mapping |= await db_projects.get_project_and_nodes_names(
+                    conn,
+                    _list_accessible_project_ids(fmds, user_or_project_filter)
+                    - names_mapping.keys(),
+                )
+
+            for fmd in fmds:
+                is_resumed = start_after is not None and fmd.file_id == after_file_id
+                if fmd.is_directory and expand_dirs:
+                    if not _fill_project_and_node_names(
+                        convert_db_to_model(fmd), names_mapping
+                    ):
+                        continue
+                    async for file_in_directory in self._iter_directory_files(
+                        fmd,
+                        start_after=start_after if is_resumed else None,
+                        batch_size=batch_size,
+                    ):
+                        _fill_project_and_node_names(file_in_directory, names_mapping)
+                        yield file_in_directory, FilesListingCursor(
+                            file_id=fmd.file_id, object_key=file_in_directory.file_id
+                        )
+                elif is_resumed:
+                    # NOTE: not a directory anymore, it was already listed
+                    continue
+                elif self._is_listable(fmd):
+                    item = convert_db_to_model(fmd)
+                    if _fill_project_and_node_names(item, names_mapping):
+                        yield item, FilesListingCursor(file_id=fmd.file_id)
+
+            if len(fmds) < batch_size:
+                return
+            after_file_id = fmds[-1].file_id
+            start_after = None
+
+    async def _iter_directory_files(
+        self,
+        fmd: FileMetaDataAtDB,
+        *,
+        start_after: S3ObjectKey | None,
+        batch_size: PositiveInt,
+    ) -> AsyncIterator[FileMetaData]:
+        while True:
+            files_in_directory = await expand_directory(
+                get_s3_client(self.app),
+                self.simcore_bucket_name,
+                fmd,
+                batch_size,
+                start_after=start_after,
+            )
+            for file_in_directory in files_in_directory:
+                yield file_in_directory
+            if len(files_in_directory) < batch_size:
+                return
+            start_after = files_in_directory[-1].file_id
+
+    def _is_listable(self, fmd: FileMetaDataAtDB) -> bool:
+        """stale entries are not updated from S3 while listing, this is deferred to the background.
+        In the meantime only the directories are listed (e.g. pending uploads are not)
+        """
+        if is_file_entry_valid(fmd):
+            return True
+        self._schedule_update_database_from_storage(fmd)
+        return fmd.is_directory
+
+    def _schedule_update_database_from_storage(self, fmd: FileMetaDataAtDB) -> None:
+        if (
+            fmd.file_id in self._scheduled_updates_from_storage
+            or len(self._scheduled_updates_from_storage)
+            >= _MAX_SCHEDULED_UPDATES_FROM_STORAGE
+        ):
+            return
+        self._scheduled_updates_from_storage.add(fmd.file_id)
+        task = asyncio.create_task(
+            self._deferred_update_database_from_storage(fmd),
+            name=f"update_database_from_storage_{fmd.file_id}",
+        )
+        # NOTE: keeps a reference to the task so that it is not garbage collected
+        self._update_from_storage_tasks.add(task)
+        task.add_done_callback(self._update_from_storage_tasks.discard)
+
+    async def _deferred_update_database_from_storage(
+        self, fmd: FileMetaDataAtDB
+    ) -> None:
+        try:
+            async with self._update_from_storage_semaphore:
+                with log_catch(_logger, reraise=False), suppress(S3KeyNotFoundError):
+                    await self._update_database_from_storage(fmd)
+        finally:
+            self._scheduled_updates_from_storage.discard(fmd.file_id)
 
     async def get_file(self, user_id: UserID, file_id: StorageFileID) -> FileMetaData:
         async with self.engine.acquire() as conn:
@@ -393,6 +596,8 @@ class SimcoreS3DataManager(BaseDataManager):
         file_id: StorageFileID,
         user_id: UserID,
         uploaded_parts: list[UploadedPart],
+        *,
+        sha256_checksum: SHA256Str | None = None,
     ) -> FileMetaData:
         async with self.engine.acquire() as conn:
             can: AccessRights = await get_file_access_rights(
@@ -421,6 +626,8 @@ class SimcoreS3DataManager(BaseDataManager):
                 upload_id=fmd.upload_id,
                 uploaded_parts=uploaded_parts,
             )
+        if sha256_checksum:
+            fmd.sha256_checksum = sha256_checksum
         fmd = await self._update_database_from_storage(fmd)
         assert fmd  # nosec
         return convert_db_to_model(fmd)
@@ -563,6 +770,12 @@ class SimcoreS3DataManager(BaseDataManager):
         node_mapping: dict[NodeID, NodeID],
         task_progress: TaskProgress | None = None,
     ) -> None:
+        """copies the files of src_project to dst_project
+
+        NOTE: an interrupted copy is resumed by copying again to the SAME dst_project (i.e. same uuid),
+        the objects already in the destination with the same size are then not copied again.
+        A copy to a new destination project (e.g. another clone) always starts from scratch.
+        """
         src_project_uuid: ProjectID = ProjectID(src_project["uuid"])
         dst_project_uuid: ProjectID = ProjectID(dst_project["uuid"])
         with log_context(
@@ -607,20 +820,51 @@ class SimcoreS3DataManager(BaseDataManager):
                     conn, project_ids=[src_project_uuid]
                 )
 
+            # NOTE: plans are indexed by source object name (several soft-links may point to the same)
+            copy_plans: dict[str, list[FileCopyPlan]] = defaultdict(list)
+            for src_fmd in src_project_files:
+                if not src_fmd.node_id or (src_fmd.location_id != self.location_id):
+                    msg = (
+                        "This is not foreseen, stem from old decisions, and needs to "
+                        f"be implemented if needed. Faulty metadata: {src_fmd=}"
+                    )
+                    raise NotImplementedError(msg)
+
+                if new_node_id := node_mapping.get(src_fmd.node_id):
+                    copy_plans[src_fmd.object_name].append(
+                        FileCopyPlan(
+                            src_fmd=src_fmd,
+                            dst_file_id=SimcoreS3FileID(
+                                f"{dst_project_uuid}/{new_node_id}/{src_fmd.object_name.split('/', maxsplit=2)[-1]}"
+                            ),
+                        )
+                    )
+
             with log_context(
                 _logger,
                 logging.INFO,
-                f"{src_project_uuid} -> {dst_project_uuid}: get total file size for "
+                f"{src_project_uuid} -> {dst_project_uuid}: list the objects of "
                 f"{len(src_project_files)} files",
                 log_duration=True,
             ):
-                sizes_and_num_files: list[tuple[ByteSize, int]] = await limited_gather(
-                    *[self._get_size_and_num_files(fmd) for fmd in src_project_files],
-                    limit=_MAX_PARALLEL_S3_CALLS,
+                await self._fill_copy_plans(
+                    copy_plans, src_project_uuid=src_project_uuid
                 )
-            total_num_of_files = sum(n for _, n in sizes_and_num_files)
+                # NOTE: objects already copied by a previous (interrupted) attempt are not copied again
+                already_copied_objects = {
+                    s3_object.object_key: s3_object
+                    async for s3_objects in get_s3_client(
+                        self.app
+                    ).list_objects_paginated(
+                        self.simcore_bucket_name, f"{dst_project_uuid}/"
+                    )
+                    for s3_object in s3_objects
+                }
+
+            all_copy_plans = list(itertools.chain.from_iterable(copy_plans.values()))
+            total_num_of_files = sum(len(plan.objects) for plan in all_copy_plans)
             src_project_total_data_size: ByteSize = parse_obj_as(
-                ByteSize, sum(n for n, _ in sizes_and_num_files)
+                ByteSize, sum(plan.size for plan in all_copy_plans)
             )
         with log_context(
             _logger,
@@ -634,33 +878,49 @@ class SimcoreS3DataManager(BaseDataManager):
                 src_project_total_data_size,
                 task_progress_message_prefix=f"Copying {total_num_of_files} files to '{dst_project['name']}'",
             )
-            for src_fmd in src_project_files:
-                if not src_fmd.node_id or (src_fmd.location_id != self.location_id):
-                    msg = (
-                        "This is not foreseen, stem from old decisions, and needs to "
-                        f"be implemented if needed. Faulty metadata: {src_fmd=}"
+            # NOTE: the copies are registered as uploads until they are completed
+            dst_fmds = [
+                self._new_fmd_for_upload(
+                    user_id,
+                    plan.dst_file_id,
+                    upload_id=S3_UNDEFINED_OR_EXTERNAL_MULTIPART_ID,
+                    is_directory=plan.src_fmd.is_directory,
+                    sha256_checksum=plan.src_fmd.sha256_checksum,
+                )
+                for plan in all_copy_plans
+            ]
+            async with self.engine.acquire() as conn:
+                await db_file_meta_data.upsert_many(conn, dst_fmds)
+            copied_objects: dict[S3ObjectKey, S3MetaData] = {}
+            for plan in all_copy_plans:
+                for object_copy in plan.objects:
+                    already_copied = already_copied_objects.get(
+                        object_copy.dst_object_key
                     )
-                    raise NotImplementedError(msg)
-
-                if new_node_id := node_mapping.get(src_fmd.node_id):
-                    copy_tasks.append(
-                        self._copy_path_s3_s3(
-                            user_id,
-                            src_fmd=src_fmd,
-                            dst_file_id=SimcoreS3FileID(
-                                f"{dst_project_uuid}/{new_node_id}/{src_fmd.object_name.split('/', maxsplit=2)[-1]}"
-                            ),
-                            bytes_transfered_cb=s3_transfered_data_cb.copy_transfer_cb,
+                    if (
+                        already_copied
+                        and already_copied.size == object_copy.src_object.size
+                    ):
+                        copied_objects[object_copy.dst_object_key] = already_copied
+                        s3_transfered_data_cb.copy_transfer_cb(already_copied.size)
+                    else:
+                        copy_tasks.append(
+                            get_s3_client(self.app).copy_listed_object(
+                                bucket=self.simcore_bucket_name,
+                                src_object=object_copy.src_object,
+                                dst_object_key=object_copy.dst_object_key,
+                                bytes_transfered_cb=s3_transfered_data_cb.copy_transfer_cb,
+                            )
                         )
-                    )
         with log_context(
             _logger,
             logging.INFO,
             msg=f"{src_project_uuid} -> {dst_project_uuid}:"
             " Step 3.1: prepare copy tasks for files referenced from DAT-CORE",
         ):
+            datcore_copy_tasks = []
             for node_id, node in dst_project.get("workbench", {}).items():
-                copy_tasks.extend(
+                datcore_copy_tasks.extend(
                     [
                         self._copy_file_datcore_s3(
                             user_id=user_id,
@@ -678,34 +938,63 @@ class SimcoreS3DataManager(BaseDataManager):
         with log_context(
             _logger,
             logging.INFO,
-            msg=f"{src_project_uuid} -> {dst_project_uuid}: Step 3.3: effective copying {len(copy_tasks)} files",
+            msg=f"{src_project_uuid} -> {dst_project_uuid}: Step 3.3: effective copying {len(copy_tasks)} S3 objects and {len(datcore_copy_tasks)} files",
         ):
-            await limited_gather(*copy_tasks, limit=MAX_CONCURRENT_S3_TASKS)
+            for s3_object in await limited_gather(
+                *copy_tasks, limit=MAX_CONCURRENT_S3_COPY_TASKS
+            ):
+                copied_objects[s3_object.object_key] = s3_object
+            await limited_gather(*datcore_copy_tasks, limit=MAX_CONCURRENT_S3_TASKS)
+
+            # we are done, let's update the copies with their sources
+            for dst_fmd, plan in zip(dst_fmds, all_copy_plans, strict=True):
+                _update_fmd_from_copied_objects(dst_fmd, plan, copied_objects)
+            async with self.engine.acquire() as conn:
+                await db_file_meta_data.upsert_many(conn, dst_fmds)
 
         # ensure the full size is reported
         s3_transfered_data_cb.finalize_transfer()
 
-    async def _get_size_and_num_files(
-        self, fmd: FileMetaDataAtDB
-    ) -> tuple[ByteSize, int]:
-        if not fmd.is_directory:
-            return fmd.file_size, 1
-
-        # in case of directory list files and return size
-        total_size: int = 0
-        total_num_s3_objects = 0
-        async for s3_objects in get_s3_client(self.app).list_objects_paginated(
-            bucket=self.simcore_bucket_name,
-            prefix=(
-                ensure_ends_with(f"{fmd.object_name}", "/")
-                if fmd.is_directory
-                else fmd.object_name
-            ),
-        ):
-            total_size += sum(x.size for x in s3_objects)
-            total_num_s3_objects += len(s3_objects)
+    async def _fill_copy_plans(
+        self,
+        copy_plans: dict[str, list[FileCopyPlan]],
+        *,
+        src_project_uuid: ProjectID,
+    ) -> None:
+        """lists every prefix once and adds the objects to the plans they belong to
 
-        return parse_obj_as(ByteSize, total_size), total_num_s3_objects
+        Raises:
+            S3KeyNotFoundError -- if a file has no object in S3
+        """
+        project_prefix = f"{src_project_uuid}/"
+        # NOTE: soft-links might point to objects outside of the project
+        prefixes_to_list = {project_prefix} | {
+            (
+                ensure_ends_with(object_name, "/")
+                if any(plan.src_fmd.is_directory for plan in plans)
+                else object_name
+            )
+            for object_name, plans in copy_plans.items()
+            if not object_name.startswith(project_prefix)
+        }
+        listed_object_keys: set[S3ObjectKey] = set()
+        for prefix in sorted(prefixes_to_list):
+            async for s3_objects in get_s3_client(self.app).list_objects_paginated(
+                self.simcore_bucket_name, prefix
+            ):
+                for s3_object in s3_objects:
+                    if s3_object.object_key in listed_object_keys:
+                        continue
+                    listed_object_keys.add(s3_object.object_key)
+                    for plan in find_copy_plans(s3_object.object_key, copy_plans):
+                        plan.add_object(s3_object)
+
+        for plans in copy_plans.values():
+            for plan in plans:
+                if not plan.src_fmd.is_directory and not plan.objects:
+                    raise S3KeyNotFoundError(
+                        key=plan.src_fmd.object_name, bucket=self.simcore_bucket_name
+                    )
 
     async def search_owned_files(
         self,
@@ -741,6 +1030,25 @@ class SimcoreS3DataManager(BaseDataManager):
                 resolved_fmds.append(convert_db_to_model(updated_fmd))
         return resolved_fmds
 
+    async def count_owned_files(
+        self,
+        *,
+        user_id: UserID,
+        file_id_prefix: str | None,
+        sha256_checksum: SHA256Str | None = None,
+    ) -> int:
+        async with self.engine.acquire() as conn:
+            return await db_file_meta_data.count_filter_with_partial_file_id(
+                conn,
+                user_or_project_filter=UserOrProjectFilter(
+                    user_id=user_id, project_ids=[]
+                ),
+                file_id_prefix=file_id_prefix,
+                partial_file_id=None,
+                only_files=True,
+                sha256_checksum=sha256_checksum,
+            )
+
     async def create_soft_link(
         self, user_id: int, target_file_id: StorageFileID, link_file_id: StorageFileID
     ) -> FileMetaData:
@@ -805,7 +1113,11 @@ class SimcoreS3DataManager(BaseDataManager):
         """this method will check for all incomplete updates by checking
         the upload_expires_at entry in file_meta_data table.
         1. will try to update the entry from S3 backend if exists
-        2. will delete the entry if nothing exists in S3 backend.
+        2. will try to revert the entry to the last version in S3 backend if any
+        3. will delete the entry if nothing exists in S3 backend.
+
+        NOTE: S3 is listed in bulk (once per common prefix) and matched in memory with
+        the expired entries, which are then updated/deleted in batches
         """
         now = arrow.utcnow().datetime
         async with self.engine.acquire() as conn:
@@ -820,94 +1132,120 @@ class SimcoreS3DataManager(BaseDataManager):
             [fmd.file_id for fmd in list_of_expired_uploads],
         )
 
-        # try first to upload these from S3, they might have finished and the client forgot to tell us (conservative)
-        # NOTE: no concurrency here as we want to run low resources
-        updated_fmds = await limited_gather(
+        s3_client = get_s3_client(self.app)
+        # NOTE: limited concurrency here as we want to run low resources
+        max_concurrency = self.settings.STORAGE_CLEANER_MAX_CONCURRENT_S3_CALLS
+
+        # try first to update these from S3, they might have finished and the client forgot to tell us (conservative)
+        async def _list_objects(prefix: str) -> list[S3MetaData]:
+            return [
+                s3_object
+                async for s3_objects in s3_client.list_objects_paginated(
+                    self.simcore_bucket_name, prefix
+                )
+                for s3_object in s3_objects
+            ]
+
+        listed_objects = await limited_gather(
             *(
-                self._update_database_from_storage(fmd)
-                for fmd in list_of_expired_uploads
+                _list_objects(prefix)
+                for prefix in get_listing_prefixes(
+                    fmd.object_name for fmd in list_of_expired_uploads
+                )
             ),
-            reraise=False,
             log=_logger,
-            limit=_NO_CONCURRENCY,
+            limit=max_concurrency,
+        )
+        updated_fmds, list_of_fmds_to_delete = reconcile_expired_uploads(
+            list_of_expired_uploads,
+            {
+                s3_object.object_key: s3_object
+                for s3_objects in listed_objects
+                for s3_object in s3_objects
+            },
         )
-
-        list_of_fmds_to_delete = [
-            expired_fmd
-            for expired_fmd, updated_fmd in zip(
-                list_of_expired_uploads, updated_fmds, strict=True
-            )
-            if not isinstance(updated_fmd, FileMetaDataAtDB)
-        ]
 
         # try to revert the files if they exist
-        async def _revert_file(fmd: FileMetaDataAtDB) -> FileMetaDataAtDB:
-            if is_valid_managed_multipart_upload(fmd.upload_id):
-                assert fmd.upload_id  # nosec
-                await s3_client.abort_multipart_upload(
+        await limited_gather(
+            *(
+                s3_client.abort_multipart_upload(
                     bucket=fmd.bucket_name,
                     object_key=fmd.file_id,
                     upload_id=fmd.upload_id,
                 )
-            await s3_client.undelete_object(
-                bucket=fmd.bucket_name, object_key=fmd.file_id
-            )
-            return await self._update_database_from_storage(fmd)
-
-        s3_client = get_s3_client(self.app)
-        # NOTE: no concurrency here as we want to run low resources
-        reverted_fmds = await limited_gather(
-            *(_revert_file(fmd) for fmd in list_of_fmds_to_delete),
+                for fmd in list_of_fmds_to_delete
+                if fmd.upload_id and is_valid_managed_multipart_upload(fmd.upload_id)
+            ),
             reraise=False,
             log=_logger,
-            limit=_NO_CONCURRENCY,
+            limit=max_concurrency,
+        )
+        missing_object_keys = {fmd.object_name for fmd in list_of_fmds_to_delete}
+        restored_objects = await limited_gather(
+            *(
+                s3_client.undelete_objects(
+                    bucket=self.simcore_bucket_name,
+                    prefix=prefix,
+                    object_keys={
+                        key for key in missing_object_keys if key.startswith(prefix)
+                    },
+                )
+                for prefix in get_listing_prefixes(missing_object_keys)
+            ),
+            reraise=False,
+            log=_logger,
+            limit=max_concurrency,
+        )
+        # NOTE: the few restored files are read back with HEAD so that their
+        # metadata is exactly the one written when an upload completes
+        restored_metadata = await limited_gather(
+            *(
+                s3_client.get_object_metadata(
+                    bucket=self.simcore_bucket_name, object_key=s3_object.object_key
+                )
+                for s3_objects in restored_objects
+                if isinstance(s3_objects, list)
+                for s3_object in s3_objects
+            ),
+            reraise=False,
+            log=_logger,
+            limit=max_concurrency,
+        )
+        reverted_fmds, list_of_fmds_to_delete = reconcile_expired_uploads(
+            list_of_fmds_to_delete,
+            {
+                s3_metadata.object_key: s3_metadata
+                for s3_metadata in restored_metadata
+                if isinstance(s3_metadata, S3MetaData)
+            },
         )
-        list_of_fmds_to_delete = [
-            fmd
-            for fmd, reverted_fmd in zip(
-                list_of_fmds_to_delete, reverted_fmds, strict=True
-            )
-            if not isinstance(reverted_fmd, FileMetaDataAtDB)
-        ]
-
-        if list_of_fmds_to_delete:
-            # delete the remaining ones
-            _logger.debug(
-                "following unfinished/incomplete uploads will now be deleted : [%s]",
-                [fmd.file_id for fmd in list_of_fmds_to_delete],
-            )
-            for fmd in list_of_fmds_to_delete:
-                if fmd.user_id is not None:
-                    await self.delete_file(fmd.user_id, fmd.file_id)
 
-            _logger.warning(
-                "pending/incomplete uploads of [%s] removed",
-                [fmd.file_id for fmd in list_of_fmds_to_delete],
-            )
+        async with self.engine.acquire() as conn:
+            await db_file_meta_data.upsert_many(conn, [*updated_fmds, *reverted_fmds])
 
-    async def clean_expired_uploads(self) -> None:
-        await self._clean_expired_uploads()
+            if list_of_fmds_to_delete:
+                # delete the remaining ones
+                _logger.debug(
+                    "following unfinished/incomplete uploads will now be deleted : [%s]",
+                    [fmd.file_id for fmd in list_of_fmds_to_delete],
+                )
+                # NOTE: nothing is left in S3 for these files
+                await db_file_meta_data.delete(
+                    conn,
+                    [
+                        fmd.file_id
+                        for fmd in list_of_fmds_to_delete
+                        if fmd.user_id is not None
+                    ],
+                )
 
-    async def _update_fmd_from_other(
-        self, conn: SAConnection, *, fmd: FileMetaDataAtDB, copy_from: FileMetaDataAtDB
-    ) -> FileMetaDataAtDB:
-        if not fmd.is_directory:
-            s3_metadata = await get_s3_client(self.app).get_object_metadata(
-                bucket=fmd.bucket_name, object_key=fmd.object_name
-            )
-            fmd.file_size = parse_obj_as(ByteSize, s3_metadata.size)
-            fmd.last_modified = s3_metadata.last_modified
-            fmd.entity_tag = s3_metadata.e_tag
-        else:
-            # we spare calling get_directory_metadata as it is not needed now and is costly
-            fmd.file_size = copy_from.file_size
+                _logger.warning(
+                    "pending/incomplete uploads of [%s] removed",
+                    [fmd.file_id for fmd in list_of_fmds_to_delete],
+                )
 
-        fmd.upload_expires_at = None
-        fmd.upload_id = None
-        updated_fmd: FileMetaDataAtDB = await db_file_meta_data.upsert(
-            conn, convert_db_to_model(fmd)
-        )
-        return updated_fmd
+    async def clean_expired_uploads(self) -> None:
+        await self._clean_expired_uploads()
 
     async def _get_s3_metadata(
         self, fmd: FileMetaDataAtDB
@@ -998,69 +1336,39 @@ class SimcoreS3DataManager(BaseDataManager):
 
         return convert_db_to_model(updated_fmd)
 
-    async def _copy_path_s3_s3(
+    async def _create_fmd_for_upload(
         self,
+        conn: SAConnection,
         user_id: UserID,
+        file_id: StorageFileID,
+        upload_id: UploadID | None,
         *,
-        src_fmd: FileMetaDataAtDB,
-        dst_file_id: SimcoreS3FileID,
-        bytes_transfered_cb: Callable[[int], None],
-    ) -> FileMetaData:
-        with log_context(
-            _logger,
-            logging.INFO,
-            f"copying {src_fmd.file_id=} to {dst_file_id=}, {src_fmd.is_directory=}",
-        ):
-            # copying will happen using aioboto3, therefore multipart might happen
-            # NOTE: connection must be released to ensure database update
-            async with self.engine.acquire() as conn:
-                new_fmd = await self._create_fmd_for_upload(
-                    conn,
-                    user_id,
-                    dst_file_id,
-                    upload_id=S3_UNDEFINED_OR_EXTERNAL_MULTIPART_ID,
-                    is_directory=src_fmd.is_directory,
-                    sha256_checksum=src_fmd.sha256_checksum,
-                )
-
-            s3_client = get_s3_client(self.app)
-
-            if src_fmd.is_directory:
-                await s3_client.copy_objects_recursively(
-                    bucket=self.simcore_bucket_name,
-                    src_prefix=src_fmd.object_name,
-                    dst_prefix=new_fmd.object_name,
-                    bytes_transfered_cb=bytes_transfered_cb,
-                )
-            else:
-                await s3_client.copy_object(
-                    bucket=self.simcore_bucket_name,
-                    src_object_key=src_fmd.object_name,
-                    dst_object_key=new_fmd.object_name,
-                    bytes_transfered_cb=bytes_transfered_cb,
-                )
-            # we are done, let's update the copy with the src
-            async with self.engine.acquire() as conn:
-                updated_fmd = await self._update_fmd_from_other(
-                    conn, fmd=new_fmd, copy_from=src_fmd
-                )
-            return convert_db_to_model(updated_fmd)
+        is_directory: bool,
+        sha256_checksum: SHA256Str | None,
+    ) -> FileMetaDataAtDB:
+        fmd = self._new_fmd_for_upload(
+            user_id,
+            file_id,
+            upload_id,
+            is_directory=is_directory,
+            sha256_checksum=sha256_checksum,
+        )
+        return await db_file_meta_data.upsert(conn, fmd)
 
-    async def _create_fmd_for_upload(
+    def _new_fmd_for_upload(
         self,
-        conn: SAConnection,
         user_id: UserID,
         file_id: StorageFileID,
         upload_id: UploadID | None,
         *,
         is_directory: bool,
         sha256_checksum: SHA256Str | None,
-    ) -> FileMetaDataAtDB:
+    ) -> FileMetaData:
         now = arrow.utcnow().datetime
         upload_expiration_date = now + datetime.timedelta(
             seconds=self.settings.STORAGE_DEFAULT_PRESIGNED_LINK_EXPIRATION_SECONDS
         )
-        fmd = FileMetaData.from_simcore_node(
+        return FileMetaData.from_simcore_node(
             user_id=user_id,
             file_id=parse_obj_as(SimcoreS3FileID, file_id),
             bucket=self.simcore_bucket_name,
@@ -1071,7 +1379,6 @@ class SimcoreS3DataManager(BaseDataManager):
             is_directory=is_directory,
             sha256_checksum=sha256_checksum,
         )
-        return await db_file_meta_data.upsert(conn, fmd)
 
 
 def create_simcore_s3_data_manager(app: web.Application) -> SimcoreS3DataManager:
@@ -1,9 +1,12 @@
+import bisect
+from collections.abc import Iterable
 from contextlib import suppress
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import cast
 
 from aiopg.sa.connection import SAConnection
-from aws_library.s3 import S3MetaData, SimcoreS3API
+from aws_library.s3 import S3MetaData, S3ObjectKey, SimcoreS3API
 from models_library.api_schemas_storage import S3BucketName
 from models_library.projects_nodes_io import (
     SimcoreS3DirectoryID,
@@ -25,9 +28,10 @@ async def _list_all_files_in_folder(
     bucket: S3BucketName,
     prefix: str,
     max_files_to_list: int,
+    start_after: S3ObjectKey | None,
 ) -> list[S3MetaData]:
     async for s3_objects in s3_client.list_objects_paginated(
-        bucket, prefix, items_per_page=max_files_to_list
+        bucket, prefix, items_per_page=max_files_to_list, start_after=start_after
     ):
         # NOTE: stop immediately after listing after `max_files_to_list`
         return s3_objects
@@ -39,16 +43,22 @@ async def expand_directory(
     simcore_bucket_name: S3BucketName,
     fmd: FileMetaDataAtDB,
     max_items_to_include: NonNegativeInt,
+    *,
+    start_after: S3ObjectKey | None = None,
 ) -> list[FileMetaData]:
     """
     Scans S3 backend and returns a list S3MetaData entries which get mapped
     to FileMetaData entry.
+
+    start_after: if passed, the listing resumes after this object key (e.g. the last
+    entry of a previous call)
     """
     files_in_folder: list[S3MetaData] = await _list_all_files_in_folder(
         s3_client=s3_client,
         bucket=simcore_bucket_name,
         prefix=ensure_ends_with(fmd.file_id, "/"),
         max_files_to_list=max_items_to_include,
+        start_after=start_after,
     )
     result: list[FileMetaData] = [
         convert_db_to_model(
@@ -79,6 +89,116 @@ async def expand_directory(
     return result
 
 
+@dataclass(frozen=True, kw_only=True)
+class S3ObjectCopy:
+    src_object: S3MetaData
+    dst_object_key: S3ObjectKey
+
+
+@dataclass(kw_only=True)
+class FileCopyPlan:
+    """what to copy from S3 for one entry (file or directory) of file_meta_data"""
+
+    src_fmd: FileMetaDataAtDB
+    dst_file_id: SimcoreS3FileID
+    objects: list[S3ObjectCopy] = field(default_factory=list)
+
+    def add_object(self, src_object: S3MetaData) -> None:
+        self.objects.append(
+            S3ObjectCopy(
+                src_object=src_object,
+                dst_object_key=f"{self.dst_file_id}{src_object.object_key.removeprefix(self.src_fmd.object_name)}",
+            )
+        )
+
+    @property
+    def size(self) -> ByteSize:
+        return parse_obj_as(ByteSize, sum(o.src_object.size for o in self.objects))
+
+
+def find_copy_plans(
+    object_key: S3ObjectKey, copy_plans: dict[str, list[FileCopyPlan]]
+) -> list[FileCopyPlan]:
+    """returns the plans of the file (same key) or of the directory (one of its parents)
+    the object belongs to
+    """
+    if plans := [
+        plan
+        for plan in copy_plans.get(object_key, [])
+        if not plan.src_fmd.is_directory
+    ]:
+        return plans
+    parent = object_key
+    while "/" in parent:
+        parent = parent.rsplit("/", maxsplit=1)[0]
+        if plans := [
+            plan for plan in copy_plans.get(parent, []) if plan.src_fmd.is_directory
+        ]:
+            return plans
+    return []
+
+
+def get_listing_prefixes(object_names: Iterable[str]) -> list[str]:
+    """returns the fewest prefixes (i.e. the parent folders) whose listings
+    contain all the objects (or directories) `object_names`
+    """
+    parents = sorted(
+        {
+            ensure_ends_with(object_name.rsplit("/", maxsplit=1)[0], "/")
+            if "/" in object_name
+            else ""
+            for object_name in object_names
+        }
+    )
+    prefixes: list[str] = []
+    for parent in parents:
+        # NOTE: sorted, the subfolders of a prefix directly follow it
+        if prefixes and parent.startswith(prefixes[-1]):
+            continue
+        prefixes.append(parent)
+    return prefixes
+
+
+def _mark_upload_as_completed(fmd: FileMetaDataAtDB, *, file_size: int) -> None:
+    fmd.file_size = parse_obj_as(ByteSize, file_size)
+    fmd.upload_expires_at = None
+    fmd.upload_id = None
+
+
+def reconcile_expired_uploads(
+    expired_fmds: Iterable[FileMetaDataAtDB],
+    s3_objects: dict[S3ObjectKey, S3MetaData],
+) -> tuple[list[FileMetaDataAtDB], list[FileMetaDataAtDB]]:
+    """matches the expired uploads with the objects listed from S3 (in memory)
+
+    Returns the entries updated from S3 (to be saved) and the files not found in S3.
+    NOTE: directories are always updated, with the size of the objects they contain
+    """
+    sorted_object_keys = sorted(s3_objects)
+    updated_fmds: list[FileMetaDataAtDB] = []
+    missing_fmds: list[FileMetaDataAtDB] = []
+    for fmd in expired_fmds:
+        if fmd.is_directory:
+            directory_prefix = ensure_ends_with(fmd.object_name, "/")
+            directory_size = 0
+            index = bisect.bisect_left(sorted_object_keys, directory_prefix)
+            while index < len(sorted_object_keys) and sorted_object_keys[
+                index
+            ].startswith(directory_prefix):
+                directory_size += s3_objects[sorted_object_keys[index]].size
+                index += 1
+            _mark_upload_as_completed(fmd, file_size=directory_size)
+            updated_fmds.append(fmd)
+        elif s3_object := s3_objects.get(fmd.object_name):
+            _mark_upload_as_completed(fmd, file_size=s3_object.size)
+            fmd.last_modified = s3_object.last_modified
+            fmd.entity_tag = s3_object.e_tag
+            updated_fmds.append(fmd)
+        else:
+            missing_fmds.append(fmd)
+    return updated_fmds, missing_fmds
+
+
 def get_simcore_directory(file_id: SimcoreS3FileID) -> str:
     try:
         directory_id = SimcoreS3DirectoryID.from_simcore_s3_object(file_id)
@@ -130,6 +130,10 @@ async def test_create_soft_link(
     )
     assert len(files_list) == 1
     assert files_list[0] == link_file
+    assert (
+        await simcore_s3_dsm.count_owned_files(user_id=user_id, file_id_prefix="api/")
+        == 1
+    )
 
     # can get
     got_file = await simcore_s3_dsm.get_file(
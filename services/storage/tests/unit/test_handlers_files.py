@@ -1283,13 +1283,23 @@ async def test_is_directory_link_forces_link_type_and_size(
     # only gets 1 link regardless of size
     assert len(directory_file_upload.urls) == 1
 
-    files_and_directories: list[FileMetaDataGet] = await _list_files_and_directories(
-        client, user_id, location_id, directory_file_upload
-    )
-    assert len(files_and_directories) == 1
-    assert files_and_directories[0].is_directory is True
-    # file size is 0 since nothing is uploaded
-    assert files_and_directories[0].file_size == 0
+    # NOTE: the listing updates the stale entries from S3 in the background
+    async for attempt in AsyncRetrying(
+        reraise=True,
+        wait=wait_fixed(0.5),
+        stop=stop_after_delay(10),
+        retry=retry_if_exception_type(AssertionError),
+    ):
+        with attempt:
+            files_and_directories: list[
+                FileMetaDataGet
+            ] = await _list_files_and_directories(
+                client, user_id, location_id, directory_file_upload
+            )
+            assert len(files_and_directories) == 1
+            assert files_and_directories[0].is_directory is True
+            # file size is 0 since nothing is uploaded
+            assert files_and_directories[0].file_size == 0
 
 
 async def test_ensure_expand_dirs_defaults_true(
@@ -1406,6 +1416,56 @@ async def test_listing_more_than_1000_objects_in_bucket(
         assert len(list_of_files) == 1000
 
 
+@pytest.mark.parametrize("files_in_dir", [7])
+async def test_listing_directory_with_pagination(
+    create_directory_with_files: Callable[
+        ..., AbstractAsyncContextManager[FileUploadSchema]
+    ],
+    client: TestClient,
+    location_id: LocationID,
+    user_id: UserID,
+    files_in_dir: int,
+):
+    async with create_directory_with_files(
+        dir_name="some-random",
+        file_size_in_dir=parse_obj_as(ByteSize, "1"),
+        subdir_count=1,
+        file_count=files_in_dir,
+    ) as directory_file_upload:
+        list_of_files: list[FileMetaDataGet] = await _list_files_legacy(
+            client, user_id, location_id, directory_file_upload
+        )
+        assert len(list_of_files) == files_in_dir
+
+        # the directory is expanded one page at a time
+        assert directory_file_upload.urls[0].path
+        directory_file_id = directory_file_upload.urls[0].path.strip("/")
+        assert client.app
+        url = (
+            client.app.router["get_files_metadata"]
+            .url_for(location_id=f"{location_id}")
+            .with_query(user_id=user_id, uuid_filter=directory_file_id, limit=3)
+        )
+        paginated_files: list[FileMetaDataGet] = []
+        next_cursor = None
+        for _ in range(files_in_dir):
+            response = await client.get(
+                f"{url.update_query(cursor=next_cursor) if next_cursor else url}"
+            )
+            data, error = await assert_status(response, status.HTTP_200_OK)
+            assert not error
+            page = parse_obj_as(list[FileMetaDataGet], data)
+            assert len(page) <= 3
+            paginated_files.extend(page)
+            next_cursor = (await response.json())["next_cursor"]
+            if next_cursor is None:
+                break
+        assert next_cursor is None
+        assert [f.file_id for f in paginated_files] == [
+            f.file_id for f in sorted(list_of_files, key=lambda f: f.file_id)
+        ]
+
+
 @pytest.mark.parametrize("uuid_filter", [True, False])
 async def test_listing_with_project_id_filter(
     client: TestClient,
@@ -78,6 +78,40 @@ async def test_get_files_metadata(
     list_fmds = parse_obj_as(list[FileMetaDataGet], data)
     assert len(list_fmds) == (NUM_FILES)
 
+    # or list them page by page
+    paginated_fmds: list[FileMetaDataGet] = []
+    page_url = url.update_query(limit=7)
+    while True:
+        response = await client.get(f"{page_url}")
+        data, error = await assert_status(response, status.HTTP_200_OK)
+        assert not error
+        paginated_fmds.extend(parse_obj_as(list[FileMetaDataGet], data))
+        next_cursor = (await response.json())["next_cursor"]
+        if next_cursor is None:
+            break
+        page_url = page_url.update_query(cursor=next_cursor)
+    assert len(paginated_fmds) == (2 * NUM_FILES)
+    assert len({fmd.file_id for fmd in paginated_fmds}) == (2 * NUM_FILES)
+
+
+@pytest.mark.parametrize(
+    "query", [{"cursor": "invalid", "limit": 10}, {"limit": 0}], ids=str
+)
+async def test_get_files_metadata_with_invalid_pagination(
+    client: TestClient,
+    user_id: UserID,
+    location_id: int,
+    query: dict[str, str | int],
+):
+    assert client.app
+    url = (
+        client.app.router["get_files_metadata"]
+        .url_for(location_id=f"{location_id}")
+        .with_query(user_id=f"{user_id}", **query)
+    )
+    response = await client.get(f"{url}")
+    await assert_status(response, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
 
 @pytest.mark.xfail(
     reason="storage get_file_metadata must return a 200 with no payload as long as legacy services are around!!"
@@ -8,7 +8,9 @@
 import asyncio
 import logging
 import sys
+import time
 from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, AsyncExitStack
 from copy import deepcopy
 from pathlib import Path
 from typing import Any, Literal
@@ -20,13 +22,19 @@ from aiohttp.test_utils import TestClient
 from aiopg.sa.engine import Engine
 from aws_library.s3 import SimcoreS3API
 from faker import Faker
-from models_library.api_schemas_storage import FileMetaDataGet, FoldersBody
+from models_library.api_schemas_storage import (
+    FileMetaDataGet,
+    FileUploadSchema,
+    FoldersBody,
+    S3BucketName,
+)
 from models_library.basic_types import SHA256Str
 from models_library.projects import ProjectID
 from models_library.projects_nodes_io import NodeID, NodeIDStr, SimcoreS3FileID
 from models_library.users import UserID
 from models_library.utils.fastapi_encoders import jsonable_encoder
 from pydantic import ByteSize, parse_obj_as
+from pytest_mock import MockerFixture
 from pytest_simcore.helpers.assert_checks import assert_status
 from pytest_simcore.helpers.logging_tools import log_context
 from pytest_simcore.helpers.typing_env import EnvVarsDict
@@ -315,6 +323,161 @@ async def test_copy_folders_from_valid_project(
             )
 
 
+async def test_copy_folders_from_valid_project_resumes_interrupted_copy(
+    short_dsm_cleaner_interval: int,
+    client: TestClient,
+    user_id: UserID,
+    create_project: Callable[[], Awaitable[dict[str, Any]]],
+    random_project_with_files: Callable[
+        ...,
+        Awaitable[
+            tuple[
+                dict[str, Any],
+                dict[NodeID, dict[SimcoreS3FileID, dict[str, Path | SHA256Str]]],
+            ]
+        ],
+    ],
+    storage_s3_client: SimcoreS3API,
+    storage_s3_bucket: S3BucketName,
+    create_file_of_size: Callable[[ByteSize, str | None], Path],
+    mocker: MockerFixture,
+):
+    src_project, src_projects_list = await random_project_with_files(num_nodes=2)
+    dst_project, nodes_map = clone_project_data(src_project)
+    dst_project = await create_project(**dst_project)
+
+    def _dst_object_key(
+        src_node_id: NodeID, src_file_id: SimcoreS3FileID
+    ) -> SimcoreS3FileID:
+        return SimcoreS3FileID(
+            f"{src_file_id}".replace(src_project["uuid"], dst_project["uuid"]).replace(
+                f"{src_node_id}", nodes_map[NodeIDStr(f"{src_node_id}")]
+            )
+        )
+
+    src_files = [
+        (src_node_id, src_file_id)
+        for src_node_id, src_node_files in src_projects_list.items()
+        for src_file_id in src_node_files
+    ]
+    # NOTE: an interrupted copy to the SAME destination project left one object
+    # completely copied and one incompletely copied (i.e. with another size)
+    (copied_node_id, copied_file_id), (incomplete_node_id, incomplete_file_id), *_ = (
+        src_files
+    )
+    await storage_s3_client.copy_object(
+        bucket=storage_s3_bucket,
+        src_object_key=copied_file_id,
+        dst_object_key=_dst_object_key(copied_node_id, copied_file_id),
+        bytes_transfered_cb=None,
+    )
+    await storage_s3_client.upload_file(
+        bucket=storage_s3_bucket,
+        file=create_file_of_size(parse_obj_as(ByteSize, "1"), None),
+        object_key=_dst_object_key(incomplete_node_id, incomplete_file_id),
+        bytes_transfered_cb=None,
+    )
+
+    spy_copy_listed_object = mocker.spy(SimcoreS3API, "copy_listed_object")
+    await _request_copy_folders(
+        client,
+        user_id,
+        src_project,
+        dst_project,
+        nodes_map={NodeID(i): NodeID(j) for i, j in nodes_map.items()},
+    )
+
+    # only the missing (or incomplete) objects were copied
+    copied_object_keys = [
+        call.kwargs["dst_object_key"] for call in spy_copy_listed_object.call_args_list
+    ]
+    assert sorted(copied_object_keys) == sorted(
+        _dst_object_key(src_node_id, src_file_id)
+        for src_node_id, src_file_id in src_files[1:]
+    )
+    for src_node_id, src_file_id in src_files:
+        s3_metadata = await storage_s3_client.get_object_metadata(
+            bucket=storage_s3_bucket,
+            object_key=_dst_object_key(src_node_id, src_file_id),
+        )
+        src_path: Any = src_projects_list[src_node_id][src_file_id]["path"]
+        assert isinstance(src_path, Path)
+        assert s3_metadata.size == src_path.stat().st_size
+
+
+@pytest.mark.heavy_load
+@pytest.mark.parametrize(
+    "file_size, subdir_count, file_count",
+    [
+        pytest.param(parse_obj_as(ByteSize, "1Kib"), 100, 1000, id="100k small files"),
+        pytest.param(parse_obj_as(ByteSize, "50Gib"), None, None, id="one 50Gib file"),
+    ],
+)
+async def test_copy_folders_from_valid_project_performance(
+    client: TestClient,
+    user_id: UserID,
+    project_id: ProjectID,
+    node_id: NodeID,
+    create_project: Callable[[], Awaitable[dict[str, Any]]],
+    aiopg_engine: Engine,
+    create_directory_with_files: Callable[
+        ..., AbstractAsyncContextManager[FileUploadSchema]
+    ],
+    upload_file: Callable[[ByteSize, str], Awaitable[tuple[Path, SimcoreS3FileID]]],
+    storage_s3_client: SimcoreS3API,
+    storage_s3_bucket: S3BucketName,
+    file_size: ByteSize,
+    subdir_count: int | None,
+    file_count: int | None,
+):
+    async with AsyncExitStack() as stack:
+        if subdir_count and file_count:
+            await stack.enter_async_context(
+                create_directory_with_files(
+                    dir_name="some-random",
+                    file_size_in_dir=file_size,
+                    subdir_count=subdir_count,
+                    file_count=file_count,
+                )
+            )
+            expected_num_objects = subdir_count * file_count
+        else:
+            await upload_file(file_size, "a_big_file")
+            expected_num_objects = 1
+
+        src_project = await get_updated_project(aiopg_engine, f"{project_id}")
+        dst_project, nodes_map = clone_project_data(src_project)
+        dst_project = await create_project(**dst_project)
+
+        with log_context(
+            logging.INFO,
+            f"Copying {expected_num_objects} objects of {file_size.human_readable()}",
+        ) as ctx:
+            start = time.monotonic()
+            await _request_copy_folders(
+                client,
+                user_id,
+                src_project,
+                dst_project,
+                nodes_map={NodeID(i): NodeID(j) for i, j in nodes_map.items()},
+            )
+            elapsed = time.monotonic() - start
+            throughput = ByteSize(int(expected_num_objects * file_size / elapsed))
+            ctx.logger.info(
+                "%s",
+                f"copied {expected_num_objects} objects in {elapsed:.2f}s "
+                f"[{expected_num_objects / elapsed:.2f} objects/s, "
+                f"{throughput.human_readable()}/s]",
+            )
+
+        num_copied_objects = 0
+        async for s3_objects in storage_s3_client.list_objects_paginated(
+            storage_s3_bucket, f"{dst_project['uuid']}/"
+        ):
+            num_copied_objects += len(s3_objects)
+        assert num_copied_objects == expected_num_objects
+
+
 async def _create_and_delete_folders_from_project(
     user_id: UserID,
     project: dict[str, Any],
@@ -532,6 +695,8 @@ async def test_search_files_request(
         + search_files_query_params.limit
     ]
     assert [_.file_uuid for _ in found] == expected
+    # the total does not depend on the page
+    assert (await response.json())["total"] == len(uploaded_file_ids)
 
 
 @pytest.mark.parametrize("search_startswith", [True, False])
@@ -1,22 +1,31 @@
 # pylint:disable=protected-access
 # pylint:disable=redefined-outer-name
 
+import datetime
+from collections import defaultdict
 from collections.abc import Awaitable, Callable
 from contextlib import AbstractAsyncContextManager
 from pathlib import Path
 
 import pytest
 from aiopg.sa.engine import Engine
+from aws_library.s3 import S3KeyNotFoundError, S3MetaData, S3ObjectKey
 from faker import Faker
 from models_library.api_schemas_storage import FileUploadSchema
 from models_library.basic_types import SHA256Str
+from models_library.projects import ProjectID
 from models_library.projects_nodes_io import SimcoreS3FileID
 from models_library.users import UserID
 from pydantic import ByteSize, parse_obj_as
 from simcore_service_storage import db_file_meta_data
-from simcore_service_storage.models import FileMetaData
+from simcore_service_storage.models import FileMetaData, FileMetaDataAtDB
 from simcore_service_storage.s3 import get_s3_client
 from simcore_service_storage.simcore_s3_dsm import SimcoreS3DataManager
+from simcore_service_storage.simcore_s3_dsm_utils import (
+    FileCopyPlan,
+    find_copy_plans,
+    get_listing_prefixes,
+)
 
 pytest_simcore_core_services_selection = ["postgres"]
 pytest_simcore_ops_services_selection = ["adminer"]
@@ -27,53 +36,37 @@ def file_size() -> ByteSize:
     return parse_obj_as(ByteSize, "1")
 
 
-@pytest.fixture
-def mock_copy_transfer_cb() -> Callable[[int], None]:
-    def copy_transfer_cb(copied_bytes: int) -> None:
-        ...
-
-    return copy_transfer_cb
+def _create_copy_plans(
+    fmds: list[FileMetaDataAtDB], dst_project_uuid: ProjectID
+) -> dict[str, list[FileCopyPlan]]:
+    copy_plans: dict[str, list[FileCopyPlan]] = defaultdict(list)
+    for fmd in fmds:
+        copy_plans[fmd.object_name].append(
+            FileCopyPlan(
+                src_fmd=fmd,
+                dst_file_id=parse_obj_as(
+                    SimcoreS3FileID,
+                    f"{dst_project_uuid}/{fmd.file_id.split('/', maxsplit=1)[-1]}",
+                ),
+            )
+        )
+    return copy_plans
 
 
-async def test__copy_path_s3_s3(
+async def test__fill_copy_plans(
     simcore_s3_dsm: SimcoreS3DataManager,
     create_directory_with_files: Callable[
         ..., AbstractAsyncContextManager[FileUploadSchema]
     ],
     upload_file: Callable[[ByteSize, str], Awaitable[tuple[Path, SimcoreS3FileID]]],
     file_size: ByteSize,
-    user_id: UserID,
-    mock_copy_transfer_cb: Callable[[int], None],
+    project_id: ProjectID,
     aiopg_engine: Engine,
+    faker: Faker,
 ):
-    def _get_dest_file_id(src: SimcoreS3FileID) -> SimcoreS3FileID:
-        return parse_obj_as(SimcoreS3FileID, f"{Path(src).parent}/the-copy")
-
-    async def _copy_s3_path(s3_file_id_to_copy: SimcoreS3FileID) -> None:
-        async with aiopg_engine.acquire() as conn:
-            exiting_fmd = await db_file_meta_data.get(conn, s3_file_id_to_copy)
-
-        await simcore_s3_dsm._copy_path_s3_s3(  # noqa: SLF001
-            user_id=user_id,
-            src_fmd=exiting_fmd,
-            dst_file_id=_get_dest_file_id(s3_file_id_to_copy),
-            bytes_transfered_cb=mock_copy_transfer_cb,
-        )
-
-    async def _count_files(s3_file_id: SimcoreS3FileID, expected_count: int) -> None:
-        s3_client = get_s3_client(simcore_s3_dsm.app)
-        counted_files = 0
-        async for s3_objects in s3_client.list_objects_paginated(
-            bucket=simcore_s3_dsm.simcore_bucket_name, prefix=s3_file_id
-        ):
-            counted_files += len(s3_objects)
-
-        assert counted_files == expected_count
-
-    # using directory
-
     FILE_COUNT = 4
     SUBDIR_COUNT = 5
+    _, simcore_file_id = await upload_file(file_size, "a_file_name")
     async with create_directory_with_files(
         dir_name="some-random",
         file_size_in_dir=file_size,
@@ -82,19 +75,89 @@ async def test__copy_path_s3_s3(
     ) as directory_file_upload:
         assert len(directory_file_upload.urls) == 1
         assert directory_file_upload.urls[0].path
-        s3_object = directory_file_upload.urls[0].path.lstrip("/")
+        s3_file_id_dir = parse_obj_as(
+            SimcoreS3FileID, directory_file_upload.urls[0].path.lstrip("/")
+        )
+        async with aiopg_engine.acquire() as conn:
+            fmds = [
+                await db_file_meta_data.get(conn, file_id)
+                for file_id in (simcore_file_id, s3_file_id_dir)
+            ]
+        dst_project_uuid = ProjectID(faker.uuid4())
+        copy_plans = _create_copy_plans(fmds, dst_project_uuid)
+
+        await simcore_s3_dsm._fill_copy_plans(  # noqa: SLF001
+            copy_plans, src_project_uuid=project_id
+        )
+
+        (file_plan,) = copy_plans[simcore_file_id]
+        assert [o.src_object.object_key for o in file_plan.objects] == [
+            simcore_file_id
+        ]
+        assert file_plan.size == file_size
+        (dir_plan,) = copy_plans[s3_file_id_dir]
+        assert len(dir_plan.objects) == FILE_COUNT * SUBDIR_COUNT
+        assert dir_plan.size == FILE_COUNT * SUBDIR_COUNT * file_size
+        for plan in (file_plan, dir_plan):
+            for object_copy in plan.objects:
+                assert object_copy.dst_object_key.startswith(f"{plan.dst_file_id}")
+                assert object_copy.dst_object_key.startswith(f"{dst_project_uuid}/")
+
+
+async def test__fill_copy_plans_with_soft_links_outside_of_project(
+    simcore_s3_dsm: SimcoreS3DataManager,
+    upload_file: Callable[[ByteSize, str], Awaitable[tuple[Path, SimcoreS3FileID]]],
+    file_size: ByteSize,
+    aiopg_engine: Engine,
+    faker: Faker,
+):
+    _, simcore_file_id = await upload_file(file_size, "a_file_name")
+    async with aiopg_engine.acquire() as conn:
+        target_fmd = await db_file_meta_data.get(conn, simcore_file_id)
+    # NOTE: a soft-link of another project points to the object of this one
+    src_project_uuid = ProjectID(faker.uuid4())
+    soft_links = [
+        target_fmd.copy(
+            update={
+                "file_id": f"{src_project_uuid}/{faker.uuid4()}/link_{n}",
+                "is_soft_link": True,
+            }
+        )
+        for n in range(2)
+    ]
+    copy_plans = _create_copy_plans(soft_links, ProjectID(faker.uuid4()))
+    assert list(copy_plans) == [simcore_file_id]
 
-        s3_file_id_dir_src = parse_obj_as(SimcoreS3FileID, s3_object)
-        s3_file_id_dir_dst = _get_dest_file_id(s3_file_id_dir_src)
+    await simcore_s3_dsm._fill_copy_plans(  # noqa: SLF001
+        copy_plans, src_project_uuid=src_project_uuid
+    )
 
-        await _count_files(s3_file_id_dir_dst, expected_count=0)
-        await _copy_s3_path(s3_file_id_dir_src)
-        await _count_files(s3_file_id_dir_dst, expected_count=FILE_COUNT * SUBDIR_COUNT)
+    for soft_link, plan in zip(soft_links, copy_plans[simcore_file_id], strict=True):
+        assert plan.src_fmd == soft_link
+        assert [o.src_object.object_key for o in plan.objects] == [simcore_file_id]
+        assert plan.objects[0].dst_object_key == plan.dst_file_id
 
-    # using a single file
 
+async def test__fill_copy_plans_raises_if_file_object_is_missing(
+    simcore_s3_dsm: SimcoreS3DataManager,
+    upload_file: Callable[[ByteSize, str], Awaitable[tuple[Path, SimcoreS3FileID]]],
+    file_size: ByteSize,
+    project_id: ProjectID,
+    aiopg_engine: Engine,
+    faker: Faker,
+):
     _, simcore_file_id = await upload_file(file_size, "a_file_name")
-    await _copy_s3_path(simcore_file_id)
+    async with aiopg_engine.acquire() as conn:
+        fmd = await db_file_meta_data.get(conn, simcore_file_id)
+    await get_s3_client(simcore_s3_dsm.app).delete_object(
+        bucket=simcore_s3_dsm.simcore_bucket_name, object_key=simcore_file_id
+    )
+
+    with pytest.raises(S3KeyNotFoundError):
+        await simcore_s3_dsm._fill_copy_plans(  # noqa: SLF001
+            _create_copy_plans([fmd], ProjectID(faker.uuid4())),
+            src_project_uuid=project_id,
+        )
 
 
 async def test_upload_and_search(
@@ -115,3 +178,64 @@ async def test_upload_and_search(
     for file in files:
         assert file.sha256_checksum == checksum
         assert file.file_name in {"file1", "file2"}
+
+
+@pytest.mark.parametrize(
+    "object_names, expected_prefixes",
+    [
+        ([], []),
+        (["file"], [""]),
+        (["p/n/file", "file"], [""]),
+        (["p/n/file", "p/n/other_file", "p/n/dir"], ["p/n/"]),
+        (["p/n/file", "p/n/sub/file", "p/n2/file"], ["p/n/", "p/n2/"]),
+        (["p/n/sub/file", "p/n/file"], ["p/n/"]),
+        (["p-1/n/file", "p/n/file", "p/n1/file"], ["p-1/n/", "p/n/", "p/n1/"]),
+    ],
+)
+def test_get_listing_prefixes(object_names: list[str], expected_prefixes: list[str]):
+    assert get_listing_prefixes(object_names) == expected_prefixes
+
+
+def _plan(object_name: str, *, is_directory: bool) -> FileCopyPlan:
+    return FileCopyPlan(
+        src_fmd=FileMetaDataAtDB.construct(
+            object_name=object_name, is_directory=is_directory
+        ),
+        dst_file_id=SimcoreS3FileID(f"dst/{object_name}"),
+    )
+
+
+@pytest.mark.parametrize(
+    "object_key, expected_plans",
+    [
+        ("p/n/file", ["p/n/file", "p/n/file"]),
+        ("p/n/dir/file", ["p/n/dir"]),
+        ("p/n/dir/sub/file", ["p/n/dir"]),
+        ("p/n/dir", []),
+        ("p/n/directory/file", []),
+        ("p/n/other_file", []),
+        ("p/n/file/file", []),
+    ],
+)
+def test_find_copy_plans(object_key: S3ObjectKey, expected_plans: list[str]):
+    copy_plans = {
+        # NOTE: 2 soft-links of the same file
+        "p/n/file": [
+            _plan("p/n/file", is_directory=False),
+            _plan("p/n/file", is_directory=False),
+        ],
+        "p/n/dir": [_plan("p/n/dir", is_directory=True)],
+    }
+    found_plans = find_copy_plans(object_key, copy_plans)
+    assert [plan.src_fmd.object_name for plan in found_plans] == expected_plans
+    for plan in found_plans:
+        plan.add_object(
+            S3MetaData(
+                object_key=object_key,
+                last_modified=datetime.datetime.now(tz=datetime.UTC),
+                e_tag="etag",
+                sha256_checksum=None,
+                size=1,
+            )
+        )
+        assert plan.objects[-1].dst_object_key == f"dst/{object_key}"
@@ -5,28 +5,32 @@ of a record in comp_task table is changed.
 import asyncio
 import json
 import logging
-from collections.abc import AsyncIterator
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
 from contextlib import suppress
-from dataclasses import dataclass
-from typing import Final, NoReturn
+from dataclasses import dataclass, field
+from typing import Any, Final, NoReturn
 
 from aiohttp import web
 from aiopg.sa import Engine
 from aiopg.sa.connection import SAConnection
 from models_library.errors import ErrorDict
 from models_library.projects import ProjectID
-from models_library.projects_nodes_io import NodeID
-from models_library.projects_state import RunningState
+from models_library.projects_nodes_io import NodeID, NodeIDStr
 from pydantic.types import PositiveInt
 from servicelib.aiohttp.application_keys import APP_DB_ENGINE_KEY
+from servicelib.utils import logged_gather
 from simcore_postgres_database.webserver_models import DB_CHANNEL_NAME, projects
 from sqlalchemy.sql import select
 
 from ..projects import exceptions, projects_api
-from ..projects.nodes_utils import update_node_outputs
+from ..projects.nodes_utils import project_get_depending_nodes
 from ._utils import convert_state_from_db
 
-_LISTENING_TASK_BASE_SLEEPING_TIME_S: Final[int] = 1
+_CONNECTION_CHECK_INTERVAL_S: Final[int] = 1
+_NOTIFICATIONS_COALESCING_WINDOW_S: Final[float] = 0.1
+_MAX_CONCURRENT_PROJECTS_UPDATES: Final[int] = 10
+_MAX_CONCURRENT_NOTIFICATIONS: Final[int] = 10
 _logger = logging.getLogger(__name__)
 
 
@@ -39,22 +43,6 @@ async def _get_project_owner(conn: SAConnection, project_uuid: str) -> PositiveI
     return the_project_owner
 
 
-async def _update_project_state(
-    app: web.Application,
-    user_id: PositiveInt,
-    project_uuid: ProjectID,
-    node_uuid: NodeID,
-    new_state: RunningState,
-    node_errors: list[ErrorDict] | None,
-) -> None:
-    project = await projects_api.update_project_node_state(
-        app, user_id, project_uuid, node_uuid, new_state
-    )
-
-    await projects_api.notify_project_node_update(app, project, node_uuid, node_errors)
-    await projects_api.notify_project_state_update(app, project)
-
-
 @dataclass(frozen=True)
 class _CompTaskNotificationPayload:
     action: str
@@ -63,53 +51,151 @@ class _CompTaskNotificationPayload:
     table: str
 
 
-async def _handle_db_notification(
-    app: web.Application, payload: _CompTaskNotificationPayload, conn: SAConnection
-) -> None:
-    task_data = payload.data
-    task_changes = payload.changes
+@dataclass
+class _NodeChanges:
+    # latest comp_tasks row of the node and all the columns that changed since last handled
+    task_data: dict
+    changed_columns: set[str] = field(default_factory=set)
 
-    project_uuid = task_data.get("project_id", None)
-    node_uuid = task_data.get("node_id", None)
-    if any(x is None for x in [project_uuid, node_uuid]):
-        _logger.warning(
-            "comp_tasks row is corrupted. TIP: please check DB entry containing '%s'",
-            f"{task_data=}",
+    @property
+    def outputs_changed(self) -> bool:
+        return any(f in self.changed_columns for f in ["outputs", "run_hash"])
+
+    @property
+    def state_changed(self) -> bool:
+        return "state" in self.changed_columns
+
+    def to_node_data(self) -> dict[str, Any]:
+        node_data: dict[str, Any] = {}
+        if self.outputs_changed:
+            node_data["outputs"] = self.task_data.get("outputs") or {}
+            node_data["runHash"] = self.task_data.get("run_hash", None)
+        if self.state_changed:
+            node_data["state"] = {
+                "currentStatus": convert_state_from_db(self.task_data["state"])
+            }
+        return node_data
+
+
+def _coalesce_notifications(
+    payloads: Iterable[_CompTaskNotificationPayload],
+) -> dict[ProjectID, dict[NodeID, _NodeChanges]]:
+    """groups the notifications per project and per node, the latest row of a node wins
+    and the changes are accumulated"""
+    changes_per_project: dict[ProjectID, dict[NodeID, _NodeChanges]] = defaultdict(
+        dict
+    )
+    for payload in payloads:
+        task_data = payload.data
+        project_uuid = task_data.get("project_id", None)
+        node_uuid = task_data.get("node_id", None)
+        if any(x is None for x in [project_uuid, node_uuid]):
+            _logger.warning(
+                "comp_tasks row is corrupted. TIP: please check DB entry containing '%s'",
+                f"{task_data=}",
+            )
+            continue
+
+        nodes_changes = changes_per_project[ProjectID(project_uuid)]
+        node_changes = nodes_changes.setdefault(
+            NodeID(node_uuid), _NodeChanges(task_data=task_data)
         )
-        return
+        node_changes.task_data = task_data
+        node_changes.changed_columns.update(payload.changes)
+    return changes_per_project
+
+
+async def _update_project_nodes(
+    app: web.Application,
+    user_id: PositiveInt,
+    project_uuid: ProjectID,
+    nodes_changes: dict[NodeID, _NodeChanges],
+) -> tuple[dict, dict[NodeIDStr, Any]] | None:
+    partial_workbench_data = {
+        NodeIDStr(f"{node_uuid}"): node_data
+        for node_uuid, changes in nodes_changes.items()
+        if (node_data := changes.to_node_data())
+    }
+    while partial_workbench_data:
+        try:
+            return await projects_api.update_project_nodes_data(
+                app, user_id, project_uuid, partial_workbench_data
+            )
+        except exceptions.NodeNotFoundError as exc:  # noqa: PERF203
+            _logger.warning(
+                "Node %s of project %s not found and cannot be updated. Maybe was it deleted?",
+                exc.node_uuid,
+                exc.project_uuid,
+            )
+            # the other nodes shall still be updated
+            partial_workbench_data.pop(NodeIDStr(f"{exc.node_uuid}"), None)
+            nodes_changes.pop(NodeID(f"{exc.node_uuid}"), None)
+    return None
 
-    assert project_uuid  # nosec
-    assert node_uuid  # nosec
 
+async def _notify_project_nodes_changes(
+    app: web.Application,
+    project: dict,
+    nodes_changes: dict[NodeID, _NodeChanges],
+    changed_entries: dict[NodeIDStr, Any],
+) -> None:
+    # NOTE: the nodes depending on changed outputs are notified as well (without errors)
+    nodes_errors: dict[NodeID, list[ErrorDict] | None] = {}
+    for node_uuid, changes in nodes_changes.items():
+        if changes.outputs_changed:
+            nodes_errors |= dict.fromkeys(
+                await project_get_depending_nodes(project, node_uuid)
+            )
+    for node_uuid, changes in nodes_changes.items():
+        nodes_errors[node_uuid] = changes.task_data.get("errors", None)
+
+    await logged_gather(
+        *(
+            projects_api.notify_project_node_update(app, project, node_uuid, errors)
+            for node_uuid, errors in nodes_errors.items()
+            if f"{node_uuid}" in project["workbench"]
+        ),
+        log=_logger,
+        max_concurrency=_MAX_CONCURRENT_NOTIFICATIONS,
+    )
+    if any(changes.state_changed for changes in nodes_changes.values()):
+        await projects_api.notify_project_state_update(app, project)
+
+    for node_uuid, changes in nodes_changes.items():
+        if changes.outputs_changed:
+            # fire&forget to notify connected nodes to retrieve its inputs **if necessary**
+            changed_keys = list(
+                changed_entries.get(f"{node_uuid}", {}).get("outputs", {}).keys()
+            )
+            await projects_api.post_trigger_connected_service_retrieve(
+                app=app,
+                project=project,
+                updated_node_uuid=f"{node_uuid}",
+                changed_keys=changed_keys,
+            )
+
+
+async def _handle_project_notifications(
+    app: web.Application,
+    db_engine: Engine,
+    project_uuid: ProjectID,
+    nodes_changes: dict[NodeID, _NodeChanges],
+) -> None:
+    if not any(changes.to_node_data() for changes in nodes_changes.values()):
+        return
     try:
         # NOTE: we need someone with the rights to modify that project. the owner is one.
         # find the user(s) linked to that project
-        the_project_owner = await _get_project_owner(conn, project_uuid)
-
-        if any(f in task_changes for f in ["outputs", "run_hash"]):
-            new_outputs = task_data.get("outputs", {})
-            new_run_hash = task_data.get("run_hash", None)
-
-            await update_node_outputs(
-                app,
-                the_project_owner,
-                ProjectID(project_uuid),
-                NodeID(node_uuid),
-                new_outputs,
-                new_run_hash,
-                node_errors=task_data.get("errors", None),
-                ui_changed_keys=None,
-            )
+        async with db_engine.acquire() as conn:
+            the_project_owner = await _get_project_owner(conn, f"{project_uuid}")
 
-        if "state" in task_changes:
-            new_state = convert_state_from_db(task_data["state"])
-            await _update_project_state(
-                app,
-                the_project_owner,
-                ProjectID(project_uuid),
-                NodeID(node_uuid),
-                new_state,
-                node_errors=task_data.get("errors", None),
+        # all the changes of the project are written in one go and notified once
+        if updated := await _update_project_nodes(
+            app, the_project_owner, project_uuid, nodes_changes
+        ):
+            project, changed_entries = updated
+            await _notify_project_nodes_changes(
+                app, project, nodes_changes, changed_entries
             )
 
     except exceptions.ProjectNotFoundError as exc:
@@ -122,12 +208,23 @@ async def _handle_db_notification(
             "Project owner of project %s could not be found, is the project valid?",
             exc.project_uuid,
         )
-    except exceptions.NodeNotFoundError as exc:
-        _logger.warning(
-            "Node %s of project %s not found and cannot be updated. Maybe was it deleted?",
-            exc.node_uuid,
-            exc.project_uuid,
-        )
+
+
+async def _handle_db_notifications(
+    app: web.Application,
+    db_engine: Engine,
+    payloads: list[_CompTaskNotificationPayload],
+) -> None:
+    # NOTE: different projects are handled concurrently, the nodes of a project together
+    await logged_gather(
+        *(
+            _handle_project_notifications(app, db_engine, project_uuid, nodes_changes)
+            for project_uuid, nodes_changes in _coalesce_notifications(payloads).items()
+        ),
+        reraise=False,
+        log=_logger,
+        max_concurrency=_MAX_CONCURRENT_PROJECTS_UPDATES,
+    )
 
 
 async def _listen(app: web.Application, db_engine: Engine) -> NoReturn:
@@ -136,22 +233,35 @@ async def _listen(app: web.Application, db_engine: Engine) -> NoReturn:
     async with db_engine.acquire() as conn:
         assert conn.connection  # nosec
         await conn.execute(listen_query)
+        notifies = conn.connection.notifies
 
         while True:
-            # NOTE: instead of using await get() we check first if the connection was closed
-            # since aiopg does not reset the await in such a case (if DB was restarted or so)
+            # NOTE: aiopg does not reset the await on get() if the connection was closed
+            # (if DB was restarted or so), therefore the connection is checked regularly
             # see aiopg issue: https://github.com/aio-libs/aiopg/pull/559#issuecomment-826813082
             if conn.closed:
                 msg = "connection with database is closed!"
                 raise ConnectionError(msg)
-            if conn.connection.notifies.empty():
-                await asyncio.sleep(_LISTENING_TASK_BASE_SLEEPING_TIME_S)
+            try:
+                notification = await asyncio.wait_for(
+                    notifies.get(), timeout=_CONNECTION_CHECK_INTERVAL_S
+                )
+            except asyncio.TimeoutError:
                 continue
-            notification = conn.connection.notifies.get_nowait()
+
+            # a pipeline changes many tasks in a row, these are handled together
+            await asyncio.sleep(_NOTIFICATIONS_COALESCING_WINDOW_S)
+            notifications = [notification]
+            while not notifies.empty():
+                notifications.append(notifies.get_nowait())
+
             # get the data and the info on what changed
-            payload = _CompTaskNotificationPayload(**json.loads(notification.payload))
-            _logger.debug("received update from database: %s", f"{payload=}")
-            await _handle_db_notification(app, payload, conn)
+            payloads = [
+                _CompTaskNotificationPayload(**json.loads(n.payload))
+                for n in notifications
+            ]
+            _logger.debug("received %s updates from database", len(payloads))
+            await _handle_db_notifications(app, db_engine, payloads)
 
 
 async def _comp_tasks_listening_task(app: web.Application) -> None:
@@ -18,11 +18,12 @@ from ..dynamic_scheduler import api as dynamic_scheduler_api
 from ..projects.db import ProjectDBAPI
 from ..projects.projects_api import (
     is_node_id_present_in_any_project_workbench,
-    list_node_ids_in_project,
+    list_node_ids_in_projects,
 )
 from ..resource_manager.registry import RedisResourceRegistry
 from ..users.api import get_user_role
 from ..users.exceptions import UserNotFoundError
+from ._monitoring import observe_phase_duration
 
 _logger = logging.getLogger(__name__)
 
@@ -64,14 +65,13 @@ async def _remove_service(
         )
 
 
-async def _list_opened_project_ids(registry: RedisResourceRegistry) -> list[ProjectID]:
-    opened_projects: list[ProjectID] = []
+async def _list_opened_project_ids(registry: RedisResourceRegistry) -> set[ProjectID]:
     all_session_alive, _ = await registry.get_all_resource_keys()
-    for alive_session in all_session_alive:
-        resources = await registry.get_resources(alive_session)
-        if "project_id" in resources:
-            opened_projects.append(ProjectID(resources["project_id"]))
-    return opened_projects
+    return {
+        ProjectID(resources["project_id"])
+        for resources in await registry.get_many_resources(all_session_alive)
+        if "project_id" in resources
+    }
 
 
 async def remove_orphaned_services(
@@ -87,7 +87,8 @@ async def remove_orphaned_services(
     # in between and the GC would remove services that actually should be running.
 
     with log_catch(_logger, reraise=False):
-        running_services = await director_v2_api.list_dynamic_services(app)
+        with observe_phase_duration(app, "list_running_services"):
+            running_services = await director_v2_api.list_dynamic_services(app)
         if not running_services:
             # nothing to do
             return
@@ -99,18 +100,16 @@ async def remove_orphaned_services(
             service.node_uuid: service for service in running_services
         }
 
-        known_opened_project_ids = await _list_opened_project_ids(registry)
-        potentially_running_service_ids: list[
-            set[NodeID] | BaseException
-        ] = await logged_gather(
-            *(list_node_ids_in_project(app, _) for _ in known_opened_project_ids),
-            log=_logger,
-            max_concurrency=_MAX_CONCURRENT_CALLS,
-            reraise=False,
-        )
-        potentially_running_service_ids_set: set[NodeID] = set().union(
-            *(_ for _ in potentially_running_service_ids if isinstance(_, set))
-        )
+        # NOTE: a snapshot of all the opened projects and their nodes is taken in bulk
+        # (a pipelined redis read and a single db query). If it fails, nothing is removed
+        with observe_phase_duration(app, "list_opened_projects"):
+            known_opened_project_ids = await _list_opened_project_ids(registry)
+        with observe_phase_duration(app, "list_opened_projects_nodes"):
+            potentially_running_service_ids_set: set[NodeID] = (
+                await list_node_ids_in_projects(app, known_opened_project_ids)
+                if known_opened_project_ids
+                else set()
+            )
         _logger.debug(
             "Allowed service UUIDs from known opened projects: %s",
             potentially_running_service_ids_set,
@@ -123,11 +122,12 @@ async def remove_orphaned_services(
         _logger.debug("Found orphaned services: %s", orphaned_running_service_ids)
         # NOTE: no need to not reraise here, since we catch everything above
         # and logged_gather first runs everything
-        await logged_gather(
-            *(
-                _remove_service(app, node_id, running_services_by_id[node_id])
-                for node_id in orphaned_running_service_ids
-            ),
-            log=_logger,
-            max_concurrency=_MAX_CONCURRENT_CALLS,
-        )
+        with observe_phase_duration(app, "remove_orphaned_services"):
+            await logged_gather(
+                *(
+                    _remove_service(app, node_id, running_services_by_id[node_id])
+                    for node_id in orphaned_running_service_ids
+                ),
+                log=_logger,
+                max_concurrency=_MAX_CONCURRENT_CALLS,
+            )
@@ -0,0 +1,58 @@
+""" Metrics of the garbage collector
+
+NOTE: only available if the diagnostics plugin (i.e. the /metrics entrypoint) is enabled
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Final
+
+from aiohttp import web
+from prometheus_client import Histogram
+from servicelib.aiohttp.monitoring import kCOLLECTOR_REGISTRY
+
+from .._meta import APP_NAME
+
+_GC_PHASE_DURATION: Final[str] = f"{__name__}.phase_duration"
+
+_PHASE_DURATION_BUCKETS: Final[tuple[float, ...]] = (
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1,
+    5,
+    10,
+    30,
+    60,
+    float("inf"),
+)
+
+
+def add_instrumentation(app: web.Application) -> None:
+    if kCOLLECTOR_REGISTRY not in app:
+        return
+
+    # NOTE: keep the phases few, every label value is a new time series
+    app[_GC_PHASE_DURATION] = Histogram(
+        name="garbage_collector_phase_duration_seconds",
+        documentation="Duration of the phases of the garbage collector",
+        labelnames=["phase"],
+        buckets=_PHASE_DURATION_BUCKETS,
+        namespace="simcore",
+        subsystem=APP_NAME,
+        registry=app[kCOLLECTOR_REGISTRY],
+    )
+
+
+@contextmanager
+def observe_phase_duration(app: web.Application, phase: str) -> Iterator[None]:
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        if _GC_PHASE_DURATION in app:
+            app[_GC_PHASE_DURATION].labels(phase=phase).observe(
+                time.monotonic() - start
+            )
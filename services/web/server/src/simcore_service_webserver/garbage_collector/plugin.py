@@ -6,6 +6,7 @@ from servicelib.aiohttp.application_setup import ModuleCategory, app_module_setu
 from ..login.plugin import setup_login_storage
 from ..projects.db import setup_projects_db
 from ..socketio.plugin import setup_socketio
+from ._monitoring import add_instrumentation
 from ._tasks_api_keys import create_background_task_to_prune_api_keys
 from ._tasks_core import run_background_task
 from ._tasks_users import create_background_task_for_trial_accounts
@@ -30,6 +31,9 @@ def setup_garbage_collector(app: web.Application) -> None:
 
     settings = get_plugin_settings(app)
 
+    # NOTE: needs the diagnostics plugin to be setup before to export the metrics
+    add_instrumentation(app)
+
     app.cleanup_ctx.append(run_background_task)
 
     # NOTE: scaling web-servers will lead to having multiple tasks upgrading the db
@@ -1,8 +1,13 @@
+import asyncio
+import contextlib
 import logging
 from collections.abc import AsyncIterator, Generator
+from datetime import timedelta
 from typing import Final
 
 from aiohttp import web
+from models_library.projects import ProjectID
+from models_library.projects_nodes_io import NodeID
 from models_library.rabbitmq_messages import (
     EventRabbitMessage,
     LoggerRabbitMessage,
@@ -12,7 +17,7 @@ from models_library.rabbitmq_messages import (
     WalletCreditsMessage,
 )
 from models_library.socketio import SocketMessageDict
-from models_library.users import GroupID
+from models_library.users import GroupID, UserID
 from pydantic import parse_raw_as
 from servicelib.logging_utils import log_catch, log_context
 from servicelib.rabbitmq import RabbitMQClient
@@ -36,26 +41,29 @@ from ._rabbitmq_consumers_common import SubcribeArgumentsTuple, subscribe_to_rab
 _logger = logging.getLogger(__name__)
 
 _APP_RABBITMQ_CONSUMERS_KEY: Final[str] = f"{__name__}.rabbit_consumers"
+_APP_NODES_PROGRESS_COALESCER_KEY: Final[str] = f"{__name__}.nodes_progress_coalescer"
+
+_NODES_PROGRESS_COALESCING_WINDOW: Final[timedelta] = timedelta(milliseconds=300)
+_MAX_CONCURRENT_NODES_PROGRESS_SENDS: Final[int] = 20
 
 
 async def _convert_to_node_update_event(
     app: web.Application, message: ProgressRabbitMessageNode
 ) -> SocketMessageDict | None:
     try:
-        project = await projects_api.get_project_for_user(
+        # NOTE: progress messages come at high rate, the project is read from the cache
+        project = await projects_api.get_cached_project_for_user(
             app, f"{message.project_id}", message.user_id
         )
-        if f"{message.node_id}" in project["workbench"]:
-            # update the project node progress with the latest value
-            project["workbench"][f"{message.node_id}"].update(
-                {"progress": round(message.report.percent_value * 100.0)}
-            )
+        if (node_data := project["workbench"].get(f"{message.node_id}")) is not None:
             return SocketMessageDict(
                 event_type=SOCKET_IO_NODE_UPDATED_EVENT,
                 data={
                     "project_id": message.project_id,
                     "node_id": message.node_id,
-                    "data": project["workbench"][f"{message.node_id}"],
+                    # the project node with the latest progress value
+                    "data": node_data
+                    | {"progress": round(message.report.percent_value * 100.0)},
                 },
             )
         _logger.warning("node not found: '%s'", message.dict())
@@ -64,6 +72,68 @@ async def _convert_to_node_update_event(
     return None
 
 
+_NodeProgressKey = tuple[UserID, ProjectID, NodeID]
+
+
+class _NodesProgressCoalescer:
+    """Keeps only the latest running progress of each node and sends them every window
+
+    A running node reports its progress several times per second, the front-end
+    only needs the latest value.
+    """
+
+    def __init__(self, app: web.Application, *, window: timedelta) -> None:
+        self._app = app
+        self._window_s = window.total_seconds()
+        self._pending: dict[_NodeProgressKey, ProgressRabbitMessageNode] = {}
+        self._has_pending = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def push(self, message: ProgressRabbitMessageNode) -> None:
+        self._pending[(message.user_id, message.project_id, message.node_id)] = message
+        self._has_pending.set()
+
+    async def _send(self, message: ProgressRabbitMessageNode) -> None:
+        if socket_message := await _convert_to_node_update_event(self._app, message):
+            await send_message_to_user(
+                self._app,
+                message.user_id,
+                message=socket_message,
+                ignore_queue=True,
+            )
+
+    async def flush(self) -> None:
+        self._has_pending.clear()
+        pending, self._pending = self._pending, {}
+        await logged_gather(
+            *(self._send(message) for message in pending.values()),
+            reraise=False,
+            log=_logger,
+            max_concurrency=_MAX_CONCURRENT_NODES_PROGRESS_SENDS,
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            await asyncio.sleep(self._window_s)
+            with log_catch(_logger, reraise=False):
+                await self.flush()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(
+            self._run(), name=f"{__name__}.nodes_progress_coalescer"
+        )
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        with log_catch(_logger, reraise=False):
+            await self.flush()
+
+
 async def _progress_message_parser(app: web.Application, data: bytes) -> bool:
     rabbit_message: ProgressRabbitMessageNode | ProgressRabbitMessageProject = (
         parse_raw_as(ProgressRabbitMessageNode | ProgressRabbitMessageProject, data)
@@ -75,7 +145,10 @@ async def _progress_message_parser(app: web.Application, data: bytes) -> bool:
         ).to_socket_dict()
 
     elif rabbit_message.progress_type is ProgressType.COMPUTATION_RUNNING:
-        message = await _convert_to_node_update_event(app, rabbit_message)
+        nodes_progress_coalescer: _NodesProgressCoalescer = app[
+            _APP_NODES_PROGRESS_COALESCER_KEY
+        ]
+        nodes_progress_coalescer.push(rabbit_message)
 
     else:
         message = WebSocketNodeProgress.from_rabbit_message(
@@ -187,6 +260,11 @@ async def _unsubscribe_from_rabbitmq(app) -> None:
 async def on_cleanup_ctx_rabbitmq_consumers(
     app: web.Application,
 ) -> AsyncIterator[None]:
+    nodes_progress_coalescer = _NodesProgressCoalescer(
+        app, window=_NODES_PROGRESS_COALESCING_WINDOW
+    )
+    nodes_progress_coalescer.start()
+    app[_APP_NODES_PROGRESS_COALESCER_KEY] = nodes_progress_coalescer
     app[_APP_RABBITMQ_CONSUMERS_KEY] = await subscribe_to_rabbitmq(
         app, _EXCHANGE_TO_PARSER_CONFIG
     )
@@ -194,3 +272,4 @@ async def on_cleanup_ctx_rabbitmq_consumers(
 
     # cleanup
     await _unsubscribe_from_rabbitmq(app)
+    await nodes_progress_coalescer.stop()
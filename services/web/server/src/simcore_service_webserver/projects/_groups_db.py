@@ -16,6 +16,7 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.sql import select
 
 from ..db.plugin import get_database_engine
+from ._projects_cache import invalidate_cached_project
 from .exceptions import ProjectGroupNotFoundError
 
 _logger = logging.getLogger(__name__)
@@ -144,6 +145,7 @@ async def replace_project_group(
             raise ProjectGroupNotFoundError(
                 reason=f"Project {project_id} group {group_id} not found"
             )
+        invalidate_cached_project(app, f"{project_id}")
         return parse_obj_as(ProjectGroupGetDB, row)
 
 
@@ -176,6 +178,7 @@ async def update_or_insert_project_group(
             },
         )
         await conn.execute(on_update_stmt)
+    invalidate_cached_project(app, f"{project_id}")
 
 
 async def delete_project_group(
@@ -190,3 +193,4 @@ async def delete_project_group(
                 & (project_to_groups.c.gid == group_id)
             )
         )
+    invalidate_cached_project(app, f"{project_id}")
@@ -0,0 +1,129 @@
+""" Per-replica read cache of projects
+
+    Used on hot read-only paths (e.g. fan-out of the nodes progress to the front-end) where
+    loading the project from the database on every event is too expensive.
+    Entries are invalidated when the project is written (see ProjectDBAPI) and expire after a TTL,
+    which bounds the staleness w.r.t. changes done by other replicas.
+"""
+
+import collections
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Final
+
+from aiohttp import web
+from models_library.users import UserID
+
+from .models import ProjectDict
+from .settings import get_plugin_settings
+
+_logger = logging.getLogger(__name__)
+
+APP_PROJECTS_CACHE_KEY: Final[str] = f"{__name__}.ProjectsCache"
+
+_MAX_CACHED_PROJECTS: Final[int] = 1000
+
+
+@dataclass(slots=True)
+class _CachedProject:
+    project: ProjectDict
+    expires_at: float
+    # users for which the read access was already checked
+    readers: set[UserID] = field(default_factory=set)
+
+
+class ProjectsCache:
+    def __init__(
+        self, *, ttl: timedelta, max_size: int = _MAX_CACHED_PROJECTS
+    ) -> None:
+        self._ttl_s = ttl.total_seconds()
+        self._max_size = max_size
+        self._entries: collections.OrderedDict[
+            str, _CachedProject
+        ] = collections.OrderedDict()
+        # loads in progress and the ones that were invalidated in the meantime
+        self._loads_in_flight: collections.Counter[str] = collections.Counter()
+        self._invalidated_loads: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, project_uuid: str, user_id: UserID) -> ProjectDict | None:
+        entry = self._entries.get(project_uuid)
+        if entry is None:
+            return None
+        if entry.expires_at < time.monotonic():
+            del self._entries[project_uuid]
+            return None
+        if user_id not in entry.readers:
+            return None
+        self._entries.move_to_end(project_uuid)
+        return entry.project
+
+    def invalidate(self, project_uuid: str) -> None:
+        self._entries.pop(project_uuid, None)
+        if project_uuid in self._loads_in_flight:
+            self._invalidated_loads.add(project_uuid)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._invalidated_loads.update(self._loads_in_flight)
+
+    async def get_or_load(
+        self,
+        project_uuid: str,
+        user_id: UserID,
+        load: Callable[[], Awaitable[ProjectDict]],
+    ) -> ProjectDict:
+        """returns the cached project or loads it (load shall check the access rights of user_id)
+
+        NOTE: the returned project is shared, it must not be modified!
+        """
+        if (project := self.get(project_uuid, user_id)) is not None:
+            return project
+
+        self._loads_in_flight[project_uuid] += 1
+        try:
+            project = await load()
+        finally:
+            invalidated = project_uuid in self._invalidated_loads
+            self._loads_in_flight[project_uuid] -= 1
+            if not self._loads_in_flight[project_uuid]:
+                del self._loads_in_flight[project_uuid]
+                self._invalidated_loads.discard(project_uuid)
+
+        if invalidated:
+            # the project changed while loading, the loaded version might be outdated already
+            return project
+
+        entry = self._entries.get(project_uuid)
+        readers = entry.readers if entry else set()
+        readers.add(user_id)
+        self._entries[project_uuid] = _CachedProject(
+            project=project,
+            expires_at=time.monotonic() + self._ttl_s,
+            readers=readers,
+        )
+        self._entries.move_to_end(project_uuid)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        return project
+
+
+def invalidate_cached_project(app: web.Application, project_uuid: str) -> None:
+    if cache := app.get(APP_PROJECTS_CACHE_KEY):
+        cache.invalidate(project_uuid)
+
+
+def get_projects_cache(app: web.Application) -> ProjectsCache:
+    cache: ProjectsCache = app[APP_PROJECTS_CACHE_KEY]
+    return cache
+
+
+def setup_projects_cache(app: web.Application) -> None:
+    settings = get_plugin_settings(app)
+    app[APP_PROJECTS_CACHE_KEY] = ProjectsCache(ttl=settings.PROJECTS_CACHE_TTL)
+    _logger.debug("projects cache set up with %s", f"{settings.PROJECTS_CACHE_TTL=}")
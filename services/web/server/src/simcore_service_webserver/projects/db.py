@@ -6,6 +6,7 @@
 """
 
 import logging
+from collections.abc import Iterable
 from contextlib import AsyncExitStack
 from typing import Any
 from uuid import uuid1
@@ -48,14 +49,14 @@ from simcore_postgres_database.utils_projects_nodes import (
 )
 from simcore_postgres_database.webserver_models import ProjectType, projects, users
 from sqlalchemy import func, literal_column
-from sqlalchemy.dialects.postgresql import BOOLEAN, INTEGER
+from sqlalchemy.dialects.postgresql import ARRAY, BOOLEAN, INTEGER, JSONB, array
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.sql import and_
 from tenacity import TryAgain
 from tenacity.asyncio import AsyncRetrying
 from tenacity.retry import retry_if_exception_type
 
-from ..db.models import projects_to_wallet, study_tags
+from ..db.models import GroupType, groups, projects_to_wallet, study_tags
 from ..utils import now_str
 from ._comments_db import (
     create_project_comment,
@@ -78,16 +79,35 @@ from ._db_utils import (
     patch_workbench,
     update_workbench,
 )
+from ._projects_cache import invalidate_cached_project
 from .exceptions import (
+    NodeNotFoundError,
     ProjectDeleteError,
     ProjectInvalidRightsError,
+    ProjectInvalidUsageError,
     ProjectNodeResourcesInsufficientRightsError,
     ProjectNotFoundError,
 )
 from .models import ProjectDB, ProjectDict, UserProjectAccessRights
+from .utils import find_changed_node_keys
 
 _logger = logging.getLogger(__name__)
 
+
+def _user_can_write_project(user_id: UserID, project_uuid: str):
+    """SQL clause equivalent to check_project_permissions(..., "write")"""
+    user_gids = (
+        sa.select(groups.c.gid).where(groups.c.type == GroupType.EVERYONE)
+        if user_id == ANY_USER_ID_SENTINEL
+        else sa.select(user_to_groups.c.gid).where(user_to_groups.c.uid == user_id)
+    )
+    return sa.exists().where(
+        (project_to_groups.c.project_uuid == project_uuid)
+        & (project_to_groups.c.write.is_(True))
+        & (project_to_groups.c.gid.in_(user_gids))
+    )
+
+
 APP_PROJECT_DBAPI = __name__ + ".ProjectDBAPI"
 ANY_USER = ANY_USER_ID_SENTINEL
 
@@ -127,6 +147,10 @@ class ProjectDBAPI(BaseProjectDB):
         assert self._engine  # nosec
         return self._engine
 
+    def _invalidate_cached_project(self, project_uuid: ProjectID | str) -> None:
+        # NOTE: call it on every change of the project, the workbench or its access rights
+        invalidate_cached_project(self._app, f"{project_uuid}")
+
     async def _insert_project_in_db(
         self,
         insert_values: ProjectDict,
@@ -578,6 +602,8 @@ class ProjectDBAPI(BaseProjectDB):
                     extra=get_log_record_extra(user_id=user_id),
                 )
             )
+            # NOTE: invalidates once the transaction is over
+            stack.callback(self._invalidate_cached_project, project_uuid)
             db_connection = await stack.enter_async_context(self.engine.acquire())
             await stack.enter_async_context(db_connection.begin())
 
@@ -646,6 +672,7 @@ class ProjectDBAPI(BaseProjectDB):
             row = await result.fetchone()
             if row is None:
                 raise ProjectNotFoundError(project_uuid=project_uuid)
+            self._invalidate_cached_project(project_uuid)
             return ProjectDB.from_orm(row)
 
     async def update_project_owner_without_checking_permissions(
@@ -670,6 +697,7 @@ class ProjectDBAPI(BaseProjectDB):
             )
             result_row_count: int = result.rowcount
             assert result_row_count == 1  # nosec
+            self._invalidate_cached_project(project_uuid)
 
     async def update_project_last_change_timestamp(self, project_uuid: ProjectIDStr):
         async with self.engine.acquire() as conn:
@@ -700,6 +728,7 @@ class ProjectDBAPI(BaseProjectDB):
                 # pylint: disable=no-value-for-parameter
                 projects.delete().where(projects.c.uuid == project_uuid)
             )
+        self._invalidate_cached_project(project_uuid)
 
     #
     # Project WORKBENCH / NODES
@@ -723,12 +752,11 @@ class ProjectDBAPI(BaseProjectDB):
             partial_workbench_data: dict[NodeIDStr, Any] = {
                 NodeIDStr(f"{node_id}"): new_node_data,
             }
-            return await self._update_project_workbench(
+            return await self._patch_project_nodes(
                 partial_workbench_data,
                 user_id=user_id,
                 project_uuid=f"{project_uuid}",
                 product_name=product_name,
-                allow_workbench_changes=False,
             )
 
     async def update_project_multiple_node_data(
@@ -742,6 +770,7 @@ class ProjectDBAPI(BaseProjectDB):
         """
         Raises:
             ProjectInvalidUsageError if client tries to remove nodes using this method (use remove_project_node)
+            NodeNotFoundError if client tries to add nodes using this method (use add_project_node)
         """
         with log_context(
             _logger,
@@ -749,14 +778,138 @@ class ProjectDBAPI(BaseProjectDB):
             msg=f"update multiple nodes on {project_uuid=} for {user_id=}",
             extra=get_log_record_extra(user_id=user_id),
         ):
-            return await self._update_project_workbench(
+            return await self._patch_project_nodes(
                 partial_workbench_data,
                 user_id=user_id,
                 project_uuid=f"{project_uuid}",
                 product_name=product_name,
-                allow_workbench_changes=False,
             )
 
+    async def _patch_project_nodes(
+        self,
+        partial_workbench_data: dict[NodeIDStr, Any],
+        *,
+        user_id: UserID,
+        project_uuid: str,
+        product_name: str | None,
+    ) -> tuple[ProjectDict, dict[NodeIDStr, Any]]:
+        """patches EXISTING nodes of a project workbench in a single statement
+        each node entry is merged in the database (i.e. `workbench[node_id] || new_node_data`)
+        so that the workbench is neither read nor re-written as a whole here
+
+        - Example: to modify a node ```{node_id: {"outputs": {"output_1": 2}}}```
+
+        raises ProjectNotFoundError, ProjectInvalidRightsError, NodeNotFoundError, ProjectInvalidUsageError if nodes are removed
+        """
+        if any(node_data is None for node_data in partial_workbench_data.values()):
+            raise ProjectInvalidUsageError
+
+        node_keys = [f"{node_key}" for node_key in partial_workbench_data]
+        current_workbench = sa.cast(projects.c.workbench, JSONB)
+
+        # NOTE: the row is locked and the current values of the patched nodes are
+        # retrieved (to compute the changes) within the update statement
+        locked_project = (
+            sa.select(
+                projects.c.id,
+                *(
+                    current_workbench[node_key].label(f"node_{index}")
+                    for index, node_key in enumerate(node_keys)
+                ),
+            )
+            .where(
+                (projects.c.uuid == project_uuid)
+                & current_workbench.has_all(sa.cast(array(node_keys), ARRAY(sa.Text)))
+                & _user_can_write_project(user_id, project_uuid)
+            )
+            .with_for_update()
+            .cte("locked_project")
+        )
+
+        patched_workbench = current_workbench
+        for node_key, node_data in zip(
+            node_keys, partial_workbench_data.values(), strict=True
+        ):
+            patched_workbench = sa.func.jsonb_set(
+                patched_workbench,
+                sa.cast(array([node_key]), ARRAY(sa.Text)),
+                current_workbench[node_key].op("||")(sa.literal(node_data, JSONB)),
+                type_=JSONB,
+            )
+
+        update_stmt = (
+            projects.update()
+            .values(
+                workbench=sa.cast(patched_workbench, sa.JSON),
+                last_change_date=sa.func.now(),
+            )
+            .where(projects.c.id == locked_project.c.id)
+            .returning(
+                *projects.columns,
+                *(
+                    locked_project.c[f"node_{index}"]
+                    for index in range(len(node_keys))
+                ),
+                sa.select(users.c.email)
+                .where(users.c.id == projects.c.prj_owner)
+                .scalar_subquery()
+                .label("prj_owner_email"),
+                sa.select(sa.func.array_agg(study_tags.c.tag_id))
+                .where(study_tags.c.study_id == projects.c.id)
+                .scalar_subquery()
+                .label("project_tags"),
+            )
+        )
+
+        async with self.engine.acquire() as conn, conn.begin():
+            result = await conn.execute(update_stmt)
+            row = await result.first()
+            if row is None:
+                # nothing was patched, find out why (raises ProjectNotFoundError, ProjectInvalidRightsError)
+                current_project = await self._get_project(
+                    conn,
+                    user_id,
+                    project_uuid,
+                    exclude_foreign=["tags"],
+                    check_permissions="write",
+                )
+                if missing_node_key := next(
+                    (k for k in node_keys if k not in current_project["workbench"]),
+                    None,
+                ):
+                    raise NodeNotFoundError(
+                        project_uuid=project_uuid, node_uuid=missing_node_key
+                    )
+                raise ProjectInvalidRightsError(
+                    user_id=user_id, project_uuid=project_uuid
+                )
+
+            if product_name:
+                await self.upsert_project_linked_product(
+                    ProjectID(project_uuid), product_name, conn=conn
+                )
+        self._invalidate_cached_project(project_uuid)
+
+        changed_entries: dict[NodeIDStr, Any] = {
+            NodeIDStr(node_key): find_changed_node_keys(
+                row[f"node_{index}"],
+                node_data,
+                look_for_removed_keys=False,
+            )
+            for index, (node_key, node_data) in enumerate(
+                zip(node_keys, partial_workbench_data.values(), strict=True)
+            )
+        }
+        project = {column.name: row[column.name] for column in projects.columns}
+        return (
+            convert_to_schema_names(
+                project,
+                row.prj_owner_email or "Unknown",
+                tags=row.project_tags or [],
+            ),
+            changed_entries,
+        )
+
     async def _update_project_workbench(
         self,
         partial_workbench_data: dict[NodeIDStr, Any],
@@ -785,6 +938,8 @@ class ProjectDBAPI(BaseProjectDB):
                     extra=get_log_record_extra(user_id=user_id),
                 )
             )
+            # NOTE: invalidates once the transaction is over
+            stack.callback(self._invalidate_cached_project, project_uuid)
             db_connection = await stack.enter_async_context(self.engine.acquire())
             await stack.enter_async_context(db_connection.begin())
 
@@ -933,6 +1088,22 @@ class ProjectDBAPI(BaseProjectDB):
             list_of_nodes = await repo.list(conn)
         return {node.node_id for node in list_of_nodes}
 
+    async def list_node_ids_in_projects(
+        self, project_uuids: Iterable[ProjectID]
+    ) -> set[NodeID]:
+        """Returns a set containing all the node_ids from all the projects (single query)"""
+        async with self.engine.acquire() as conn:
+            return {
+                NodeID(row[projects_nodes.c.node_id])
+                async for row in conn.execute(
+                    sa.select(projects_nodes.c.node_id).where(
+                        projects_nodes.c.project_uuid.in_(
+                            [f"{project_uuid}" for project_uuid in project_uuids]
+                        )
+                    )
+                )
+            }
+
     #
     # Project NODES to Pricing Units
     #
@@ -23,6 +23,7 @@ from . import (
 )
 from ._observer import setup_project_observer_events
 from ._projects_access import setup_projects_access
+from ._projects_cache import setup_projects_cache
 from .db import setup_projects_db
 
 logger = logging.getLogger(__name__)
@@ -43,6 +44,7 @@ def setup_projects(app: web.Application) -> bool:
 
     # database API
     setup_projects_db(app)
+    setup_projects_cache(app)
 
     # registers event handlers (e.g. on_user_disconnect)
     setup_project_observer_events(app)
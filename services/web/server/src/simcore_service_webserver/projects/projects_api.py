@@ -11,10 +11,11 @@ import asyncio
 import collections
 import contextlib
 import datetime
+import functools
 import json
 import logging
 from collections import defaultdict
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from contextlib import suppress
 from decimal import Decimal
 from pprint import pformat
@@ -118,6 +119,7 @@ from ..wallets import api as wallets_api
 from ..wallets.errors import WalletNotEnoughCreditsError
 from . import _crud_api_delete, _nodes_api
 from ._nodes_utils import set_reservation_same_as_limit, validate_new_service_resources
+from ._projects_cache import get_projects_cache
 from ._wallets_api import connect_wallet_to_project, get_project_wallet
 from .db import APP_PROJECT_DBAPI, ProjectDBAPI
 from .exceptions import (
@@ -187,6 +189,23 @@ async def get_project_for_user(
     return project
 
 
+async def get_cached_project_for_user(
+    app: web.Application,
+    project_uuid: str,
+    user_id: UserID,
+) -> ProjectDict:
+    """Same as get_project_for_user (without state) but served from the projects cache of this replica
+
+    NOTE: the returned project is shared, it must not be modified!
+    :raises ProjectNotFoundError: if no match found
+    """
+    return await get_projects_cache(app).get_or_load(
+        project_uuid,
+        user_id,
+        functools.partial(get_project_for_user, app, project_uuid, user_id),
+    )
+
+
 async def get_project_type(
     app: web.Application, project_uuid: ProjectID
 ) -> ProjectType:
@@ -1017,13 +1036,38 @@ async def update_project_node_outputs(
     return updated_project, changed_keys
 
 
-async def list_node_ids_in_project(
+async def update_project_nodes_data(
     app: web.Application,
-    project_uuid: ProjectID,
+    user_id: UserID,
+    project_id: ProjectID,
+    partial_workbench_data: dict[NodeIDStr, dict[str, Any]],
+) -> tuple[dict, dict[NodeIDStr, Any]]:
+    """
+    Patches several nodes of a project at once (single read/write of the workbench)
+    e.g. ```{node_id: {"outputs": {...}, "runHash": ..., "state": {"currentStatus": ...}}}```
+
+    raises NodeNotFoundError if any of the nodes is not in the project (then none is patched)
+    """
+    db: ProjectDBAPI = app[APP_PROJECT_DBAPI]
+    updated_project, changed_entries = await db.update_project_multiple_node_data(
+        user_id=user_id,
+        project_uuid=project_id,
+        product_name=None,
+        partial_workbench_data=partial_workbench_data,
+    )
+    updated_project = await add_project_states_for_user(
+        user_id=user_id, project=updated_project, is_template=False, app=app
+    )
+    return updated_project, changed_entries
+
+
+async def list_node_ids_in_projects(
+    app: web.Application,
+    project_uuids: Iterable[ProjectID],
 ) -> set[NodeID]:
-    """Returns a set with all the node_ids from a project's workbench"""
+    """Returns a set with all the node_ids from the workbench of all the projects"""
     db: ProjectDBAPI = app[APP_PROJECT_DBAPI]
-    return await db.list_node_ids_in_project(project_uuid)
+    return await db.list_node_ids_in_projects(project_uuids)
 
 
 async def is_node_id_present_in_any_project_workbench(
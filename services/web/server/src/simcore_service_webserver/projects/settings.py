@@ -23,6 +23,12 @@ class ProjectsSettings(BaseCustomSettings):
         description="interval after which services need to be idle in order to be considered inactive",
     )
 
+    PROJECTS_CACHE_TTL: timedelta = Field(
+        timedelta(seconds=10),
+        description="time after which a project in the read cache of this replica expires"
+        " (bounds how long changes done by other replicas are not seen by e.g. the nodes progress notifications)",
+    )
+
 
 def get_plugin_settings(app: web.Application) -> ProjectsSettings:
     settings = app[APP_SETTINGS_KEY].WEBSERVER_PROJECTS
@@ -13,11 +13,15 @@ from servicelib.aiohttp.application_setup import ModuleCategory, app_module_setu
 
 from ..redis import setup_redis
 from ._constants import APP_CLIENT_SOCKET_REGISTRY_KEY, APP_RESOURCE_MANAGER_TASKS_KEY
-from .registry import RedisResourceRegistry
+from .registry import RedisResourceRegistry, get_registry
 
 _logger = logging.getLogger(__name__)
 
 
+async def _backfill_registry_indexes(app: web.Application) -> None:
+    await get_registry(app).backfill_indexes()
+
+
 @app_module_setup(
     "simcore_service_webserver.resource_manager",
     ModuleCategory.SYSTEM,
@@ -31,5 +35,7 @@ def setup_resource_manager(app: web.Application) -> bool:
 
     setup_redis(app)
     app[APP_CLIENT_SOCKET_REGISTRY_KEY] = RedisResourceRegistry(app)
+    # NOTE: redis clients are created in the cleanup contexts which run before on_startup
+    app.on_startup.append(_backfill_registry_indexes)
 
     return True
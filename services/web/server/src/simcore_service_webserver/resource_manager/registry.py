@@ -10,15 +10,20 @@
     A key can be set as "alive". This creates a secondary key (e.g. "user_id=a_user_id:some_other_id=123:alive").
     This key can have a timeout value. When the key times out then the key disappears from Redis automatically.
 
+    Lookups go through secondary indexes (sets and a sorted set for the alive keys) updated in the
+    same transactions as the keys, the keyspace is only scanned once to backfill them.
 
 """
 
+import fnmatch
 import logging
-from typing import TypedDict
+import time
+from typing import Final, TypedDict
 
 import redis.asyncio as aioredis
 from aiohttp import web
 from models_library.basic_types import UUIDStr
+from redis.asyncio.client import Pipeline
 
 from ..redis import get_redis_resources_client
 from ._constants import APP_CLIENT_SOCKET_REGISTRY_KEY
@@ -33,6 +38,28 @@ _logger = logging.getLogger(__name__)
 _ALIVE_SUFFIX = "alive"  # points to a string type
 _RESOURCE_SUFFIX = "resources"  # points to a hash (like a dict) type
 
+# secondary indexes, maintained together with the keys above, so that lookups do not
+# need to scan the whole keyspace. Their members are the session keys (e.g. 'user_id=1:client_session_id=...')
+#    Example:
+#        Key: resources_index:sessions = {sessions having resources}  (set)
+#        Key: resources_index:alive = {session: alive key expiration timestamp}  (sorted set)
+#        Key: resources_index:resource:project_id=... = {sessions having that resource}  (set)
+#        Key: resources_index:key:user_id=1 = {sessions of that user}  (set)
+#
+_INDEX_PREFIX: Final[str] = "resources_index"
+_SESSIONS_INDEX_KEY: Final[str] = f"{_INDEX_PREFIX}:sessions"
+_ALIVE_INDEX_KEY: Final[str] = f"{_INDEX_PREFIX}:alive"
+_INDEXES_VERSION_KEY: Final[str] = f"{_INDEX_PREFIX}:version"
+_INDEXES_VERSION: Final[int] = 1
+
+
+def _resource_index_key(field: str, value: str) -> str:
+    return f"{_INDEX_PREFIX}:resource:{field}={value}"
+
+
+def _component_index_key(key_name: str, key_value: str | int) -> str:
+    return f"{_INDEX_PREFIX}:key:{key_name}={key_value}"
+
 
 class _UserRequired(TypedDict, total=True):
     user_id: str | int
@@ -89,78 +116,187 @@ class RedisResourceRegistry:
         client: aioredis.Redis = get_redis_resources_client(self.app)
         return client
 
+    @classmethod
+    def _decode_session_key(cls, session_key: str) -> UserSessionDict:
+        return cls._decode_hash_key(f"{session_key}:{_RESOURCE_SUFFIX}")
+
+    @staticmethod
+    def _key_component_indexes(key: UserSessionDict) -> list[str]:
+        return [_component_index_key(k, v) for k, v in key.items()]
+
     async def set_resource(
         self, key: UserSessionDict, resource: tuple[str, str]
     ) -> None:
-        hash_key = f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}"
+        session_key = self._hash_key(key)
+        hash_key = f"{session_key}:{_RESOURCE_SUFFIX}"
         field, value = resource
-        await self.client.hset(hash_key, mapping={field: value})
+
+        async def _set_and_index(pipe: Pipeline) -> None:
+            old_value = await pipe.hget(hash_key, field)
+            pipe.multi()
+            pipe.hset(hash_key, mapping={field: value})
+            if old_value is not None and old_value != value:
+                pipe.srem(_resource_index_key(field, old_value), session_key)
+            pipe.sadd(_resource_index_key(field, value), session_key)
+            pipe.sadd(_SESSIONS_INDEX_KEY, session_key)
+            for index_key in self._key_component_indexes(key):
+                pipe.sadd(index_key, session_key)
+
+        await self.client.transaction(_set_and_index, hash_key)
 
     async def get_resources(self, key: UserSessionDict) -> ResourcesDict:
         hash_key = f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}"
         fields = await self.client.hgetall(hash_key)
         return ResourcesDict(**fields)
 
+    async def get_many_resources(
+        self, keys: list[UserSessionDict]
+    ) -> list[ResourcesDict]:
+        """same as `get_resources` for many keys at once (a single round trip)"""
+        if not keys:
+            return []
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hgetall(f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}")
+            all_fields = await pipe.execute()
+        return [ResourcesDict(**fields) for fields in all_fields]
+
     async def remove_resource(self, key: UserSessionDict, resource_name: str) -> None:
-        hash_key = f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}"
-        await self.client.hdel(hash_key, resource_name)
+        session_key = self._hash_key(key)
+        hash_key = f"{session_key}:{_RESOURCE_SUFFIX}"
+
+        async def _remove_and_unindex(pipe: Pipeline) -> None:
+            old_value = await pipe.hget(hash_key, resource_name)
+            num_fields = await pipe.hlen(hash_key)
+            pipe.multi()
+            pipe.hdel(hash_key, resource_name)
+            if old_value is None:
+                return
+            pipe.srem(_resource_index_key(resource_name, old_value), session_key)
+            if num_fields <= 1:
+                # the hash is gone with its last field
+                pipe.srem(_SESSIONS_INDEX_KEY, session_key)
+                for index_key in self._key_component_indexes(key):
+                    pipe.srem(index_key, session_key)
+
+        await self.client.transaction(_remove_and_unindex, hash_key)
+
+    async def _find_session_keys(self, key: UserSessionDict) -> list[str]:
+        """returns the sessions matching the (possibly partial, i.e. with '*') key"""
+        session_key_pattern = self._hash_key(key)
+        exact_indexes = [
+            _component_index_key(k, v) for k, v in key.items() if "*" not in f"{v}"
+        ]
+        if len(exact_indexes) == len(key):
+            is_member = await self.client.sismember(
+                _SESSIONS_INDEX_KEY, session_key_pattern
+            )
+            return [session_key_pattern] if is_member else []
+
+        candidates: set[str] = (
+            await self.client.sinter(exact_indexes)
+            if exact_indexes
+            else await self.client.smembers(_SESSIONS_INDEX_KEY)
+        )
+        return [
+            session_key
+            for session_key in candidates
+            if fnmatch.fnmatchcase(session_key, session_key_pattern)
+        ]
 
     async def find_resources(
         self, key: UserSessionDict, resource_name: str
     ) -> list[str]:
-        resources: list[str] = []
         # the key might only be partialy complete
-        partial_hash_key = f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}"
-        async for scanned_key in self.client.scan_iter(match=partial_hash_key):
-            if await self.client.hexists(scanned_key, resource_name):
-                key_value = await self.client.hget(scanned_key, resource_name)
-                if key_value is not None:
-                    resources.append(key_value)
-        return resources
+        session_keys = await self._find_session_keys(key)
+        if not session_keys:
+            return []
+        async with self.client.pipeline(transaction=False) as pipe:
+            for session_key in session_keys:
+                pipe.hget(f"{session_key}:{_RESOURCE_SUFFIX}", resource_name)
+            values = await pipe.execute()
+        return [value for value in values if value is not None]
 
     async def find_keys(self, resource: tuple[str, str]) -> list[UserSessionDict]:
-        keys: list[UserSessionDict] = []
         if not resource:
-            return keys
+            return []
 
         field, value = resource
-
-        async for hash_key in self.client.scan_iter(match=f"*:{_RESOURCE_SUFFIX}"):
-            if value == await self.client.hget(hash_key, field):
-                keys.append(self._decode_hash_key(hash_key))
-        return keys
+        session_keys = await self.client.smembers(_resource_index_key(field, value))
+        return [self._decode_session_key(session_key) for session_key in session_keys]
 
     async def set_key_alive(self, key: UserSessionDict, timeout: int) -> None:
         # setting the timeout to always expire, timeout > 0
         timeout = int(max(1, timeout))
-        hash_key = f"{self._hash_key(key)}:{_ALIVE_SUFFIX}"
-        await self.client.set(hash_key, 1, ex=timeout)
+        session_key = self._hash_key(key)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(f"{session_key}:{_ALIVE_SUFFIX}", 1, ex=timeout)
+            pipe.zadd(_ALIVE_INDEX_KEY, {session_key: time.time() + timeout})
+            await pipe.execute()
 
     async def is_key_alive(self, key: UserSessionDict) -> bool:
         hash_key = f"{self._hash_key(key)}:{_ALIVE_SUFFIX}"
         return await self.client.exists(hash_key) > 0
 
     async def remove_key(self, key: UserSessionDict) -> None:
-        await self.client.delete(
-            f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}",
-            f"{self._hash_key(key)}:{_ALIVE_SUFFIX}",
-        )
+        session_key = self._hash_key(key)
+        hash_key = f"{session_key}:{_RESOURCE_SUFFIX}"
+
+        async def _remove_and_unindex(pipe: Pipeline) -> None:
+            resources = await pipe.hgetall(hash_key)
+            pipe.multi()
+            pipe.delete(hash_key, f"{session_key}:{_ALIVE_SUFFIX}")
+            for field, value in resources.items():
+                pipe.srem(_resource_index_key(field, value), session_key)
+            pipe.srem(_SESSIONS_INDEX_KEY, session_key)
+            for index_key in self._key_component_indexes(key):
+                pipe.srem(index_key, session_key)
+            pipe.zrem(_ALIVE_INDEX_KEY, session_key)
+
+        await self.client.transaction(_remove_and_unindex, hash_key)
 
     async def get_all_resource_keys(
         self,
     ) -> tuple[list[UserSessionDict], list[UserSessionDict]]:
-        alive_keys = [
-            self._decode_hash_key(hash_key)
-            async for hash_key in self.client.scan_iter(match=f"*:{_ALIVE_SUFFIX}")
-        ]
+        now = time.time()
+        async with self.client.pipeline(transaction=True) as pipe:
+            # NOTE: expired alive keys are dropped from the index here
+            pipe.zremrangebyscore(_ALIVE_INDEX_KEY, "-inf", now)
+            pipe.zrange(_ALIVE_INDEX_KEY, 0, -1)
+            pipe.smembers(_SESSIONS_INDEX_KEY)
+            _, alive_session_keys, session_keys = await pipe.execute()
+
+        alive_keys = [self._decode_session_key(k) for k in alive_session_keys]
         dead_keys = [
-            self._decode_hash_key(hash_key)
-            async for hash_key in self.client.scan_iter(match=f"*:{_RESOURCE_SUFFIX}")
-            if self._decode_hash_key(hash_key) not in alive_keys
+            self._decode_session_key(k)
+            for k in set(session_keys).difference(alive_session_keys)
         ]
-
         return (alive_keys, dead_keys)
 
+    async def backfill_indexes(self) -> None:
+        """builds the indexes of the keys created before they existed (runs once)"""
+        if await self.client.exists(_INDEXES_VERSION_KEY):
+            return
+
+        _logger.info("backfilling resources registry indexes...")
+        num_sessions = 0
+        async for hash_key in self.client.scan_iter(match=f"*:{_RESOURCE_SUFFIX}"):
+            key = self._decode_hash_key(hash_key)
+            for field, value in (await self.client.hgetall(hash_key)).items():
+                await self.set_resource(key, (field, value))
+            num_sessions += 1
+
+        now = time.time()
+        async for alive_key in self.client.scan_iter(match=f"*:{_ALIVE_SUFFIX}"):
+            if (ttl_ms := await self.client.pttl(alive_key)) > 0:
+                session_key = alive_key[: -len(f":{_ALIVE_SUFFIX}")]
+                await self.client.zadd(
+                    _ALIVE_INDEX_KEY, {session_key: now + ttl_ms / 1000}
+                )
+
+        await self.client.set(_INDEXES_VERSION_KEY, _INDEXES_VERSION)
+        _logger.info("backfilled resources registry indexes of %s sessions", num_sessions)
+
 
 def get_registry(app: web.Application) -> RedisResourceRegistry:
     client: RedisResourceRegistry = app[APP_CLIENT_SOCKET_REGISTRY_KEY]
@@ -4,8 +4,9 @@
 # pylint: disable=unused-argument
 # pylint: disable=unused-variable
 
+from datetime import timedelta
 from unittest.mock import AsyncMock
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
 from models_library.progress_bar import ProgressReport
@@ -17,6 +18,8 @@ from models_library.rabbitmq_messages import (
 from models_library.socketio import SocketMessageDict
 from pytest_mock import MockerFixture
 from simcore_service_webserver.notifications._rabbitmq_exclusive_queue_consumers import (
+    _APP_NODES_PROGRESS_COALESCER_KEY,
+    _NodesProgressCoalescer,
     _progress_message_parser,
 )
 from simcore_service_webserver.socketio.models import WebSocketNodeProgress
@@ -92,3 +95,53 @@ async def test_regression_progress_message_parser(
 
     # check that all fields are sent as expected
     assert message["data"] == expected_socket_message["data"]
+
+
+async def test_running_nodes_progress_are_coalesced(mocker: MockerFixture):
+    send_messages_to_user_mock = mocker.patch(
+        "simcore_service_webserver.notifications._rabbitmq_exclusive_queue_consumers.send_message_to_user",
+        autospec=True,
+    )
+    convert_mock = mocker.patch(
+        "simcore_service_webserver.notifications._rabbitmq_exclusive_queue_consumers._convert_to_node_update_event",
+        autospec=True,
+        side_effect=lambda app, message: SocketMessageDict(
+            event_type="nodeUpdated",
+            data={"node_id": message.node_id, "progress": message.report.actual_value},
+        ),
+    )
+    app: dict = {}
+    coalescer = _NodesProgressCoalescer(app, window=timedelta(seconds=0))  # type: ignore[arg-type]
+    app[_APP_NODES_PROGRESS_COALESCER_KEY] = coalescer
+
+    node_ids = [uuid4() for _ in range(3)]
+    for value in range(10):
+        for node_id in node_ids:
+            assert await _progress_message_parser(
+                app,  # type: ignore[arg-type]
+                ProgressRabbitMessageNode(
+                    project_id=UUID("ee825037-599b-4df1-ba44-731dd48287fa"),
+                    user_id=123,
+                    node_id=node_id,
+                    progress_type=ProgressType.COMPUTATION_RUNNING,
+                    report=ProgressReport(actual_value=value, total=10),
+                ).json(),
+            )
+    send_messages_to_user_mock.assert_not_called()
+
+    await coalescer.flush()
+    # only the latest progress of each node is sent
+    assert convert_mock.call_count == len(node_ids)
+    assert send_messages_to_user_mock.call_count == len(node_ids)
+    assert {
+        c.kwargs["message"]["data"]["node_id"]
+        for c in send_messages_to_user_mock.call_args_list
+    } == set(node_ids)
+    assert all(
+        c.kwargs["message"]["data"]["progress"] == 9
+        for c in send_messages_to_user_mock.call_args_list
+    )
+
+    # nothing left to send
+    await coalescer.stop()
+    assert send_messages_to_user_mock.call_count == len(node_ids)
@@ -51,8 +51,8 @@ def mock_registry(
     registry.get_all_resource_keys = mock.AsyncMock(
         side_effect=_fake_get_all_resource_keys
     )
-    registry.get_resources = mock.AsyncMock(
-        return_value={"project_id": f"{project_id}"}
+    registry.get_many_resources = mock.AsyncMock(
+        return_value=[{"project_id": f"{project_id}"}]
     )
     return registry
 
@@ -63,9 +63,9 @@ def mock_app() -> mock.AsyncMock:
 
 
 @pytest.fixture
-def mock_list_node_ids_in_project(mocker: MockerFixture) -> mock.AsyncMock:
+def mock_list_node_ids_in_projects(mocker: MockerFixture) -> mock.AsyncMock:
     return mocker.patch(
-        f"{MODULE_GC_CORE_ORPHANS}.list_node_ids_in_project",
+        f"{MODULE_GC_CORE_ORPHANS}.list_node_ids_in_projects",
         autospec=True,
         return_value=set(),
     )
@@ -105,7 +105,7 @@ async def mock_stop_dynamic_service(mocker: MockerFixture) -> mock.AsyncMock:
 
 
 async def test_remove_orphaned_services_with_no_running_services_does_nothing(
-    mock_list_node_ids_in_project: mock.AsyncMock,
+    mock_list_node_ids_in_projects: mock.AsyncMock,
     mock_list_dynamic_services: mock.AsyncMock,
     mock_is_node_id_present_in_any_project_workbench: mock.AsyncMock,
     mock_stop_dynamic_service: mock.AsyncMock,
@@ -114,7 +114,7 @@ async def test_remove_orphaned_services_with_no_running_services_does_nothing(
 ):
     await remove_orphaned_services(mock_registry, mock_app)
     mock_list_dynamic_services.assert_called_once()
-    mock_list_node_ids_in_project.assert_not_called()
+    mock_list_node_ids_in_projects.assert_not_called()
     mock_is_node_id_present_in_any_project_workbench.assert_not_called()
     mock_stop_dynamic_service.assert_not_called()
 
@@ -169,7 +169,7 @@ async def mock_get_user_role(
 async def test_remove_orphaned_services(
     mock_app: mock.AsyncMock,
     mock_registry: mock.AsyncMock,
-    mock_list_node_ids_in_project: mock.AsyncMock,
+    mock_list_node_ids_in_projects: mock.AsyncMock,
     mock_is_node_id_present_in_any_project_workbench: mock.AsyncMock,
     mock_list_dynamic_services: mock.AsyncMock,
     mock_stop_dynamic_service: mock.AsyncMock,
@@ -188,7 +188,7 @@ async def test_remove_orphaned_services(
     mock_is_node_id_present_in_any_project_workbench.assert_called_once_with(
         mock.ANY, fake_running_service.node_uuid
     )
-    mock_list_node_ids_in_project.assert_called_once_with(mock.ANY, project_id)
+    mock_list_node_ids_in_projects.assert_called_once_with(mock.ANY, {project_id})
 
     expected_save_state = bool(
         node_exists and user_role > UserRole.GUEST and has_write_permission
@@ -224,7 +224,7 @@ async def test_remove_orphaned_services(
 async def test_remove_orphaned_services_inexisting_user_does_not_save_state(
     mock_app: mock.AsyncMock,
     mock_registry: mock.AsyncMock,
-    mock_list_node_ids_in_project: mock.AsyncMock,
+    mock_list_node_ids_in_projects: mock.AsyncMock,
     mock_is_node_id_present_in_any_project_workbench: mock.AsyncMock,
     mock_list_dynamic_services: mock.AsyncMock,
     mock_stop_dynamic_service: mock.AsyncMock,
@@ -242,7 +242,7 @@ async def test_remove_orphaned_services_inexisting_user_does_not_save_state(
     mock_is_node_id_present_in_any_project_workbench.assert_called_once_with(
         mock.ANY, fake_running_service.node_uuid
     )
-    mock_list_node_ids_in_project.assert_called_once_with(mock.ANY, project_id)
+    mock_list_node_ids_in_projects.assert_called_once_with(mock.ANY, {project_id})
     mock_get_user_role.assert_called_once_with(mock_app, fake_running_service.user_id)
     mock_has_write_permission.assert_not_called()
     mock_stop_dynamic_service.assert_called_once_with(
@@ -261,7 +261,7 @@ async def test_remove_orphaned_services_inexisting_user_does_not_save_state(
 async def test_remove_orphaned_services_raises_exception_does_not_reraise(
     mock_app: mock.AsyncMock,
     mock_registry: mock.AsyncMock,
-    mock_list_node_ids_in_project: mock.AsyncMock,
+    mock_list_node_ids_in_projects: mock.AsyncMock,
     mock_is_node_id_present_in_any_project_workbench: mock.AsyncMock,
     mock_list_dynamic_services: mock.AsyncMock,
     mock_stop_dynamic_service: mock.AsyncMock,
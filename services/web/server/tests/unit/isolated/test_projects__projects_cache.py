@@ -0,0 +1,92 @@
+# pylint: disable=protected-access
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from faker import Faker
+from simcore_service_webserver.projects._projects_cache import ProjectsCache
+from simcore_service_webserver.projects.exceptions import ProjectNotFoundError
+
+
+@pytest.fixture
+def project_uuid(faker: Faker) -> str:
+    return faker.uuid4()
+
+
+async def test_projects_cache_loads_once_per_reader(project_uuid: str):
+    cache = ProjectsCache(ttl=timedelta(minutes=1))
+    load = AsyncMock(return_value={"uuid": project_uuid, "workbench": {}})
+
+    for _ in range(10):
+        project = await cache.get_or_load(project_uuid, 1, load)
+        assert project == load.return_value
+    assert load.await_count == 1
+
+    # another user needs its access rights checked once
+    await cache.get_or_load(project_uuid, 2, load)
+    await cache.get_or_load(project_uuid, 2, load)
+    assert load.await_count == 2
+    assert cache.get(project_uuid, 1) is not None
+
+    # a change of the project invalidates it for everyone
+    cache.invalidate(project_uuid)
+    assert cache.get(project_uuid, 1) is None
+    assert cache.get(project_uuid, 2) is None
+    await cache.get_or_load(project_uuid, 1, load)
+    assert load.await_count == 3
+
+
+async def test_projects_cache_entries_expire(project_uuid: str):
+    cache = ProjectsCache(ttl=timedelta(seconds=0))
+    load = AsyncMock(return_value={"uuid": project_uuid, "workbench": {}})
+    await cache.get_or_load(project_uuid, 1, load)
+    await asyncio.sleep(0.01)
+    await cache.get_or_load(project_uuid, 1, load)
+    assert load.await_count == 2
+
+
+async def test_projects_cache_does_not_keep_project_invalidated_while_loading(
+    project_uuid: str,
+):
+    cache = ProjectsCache(ttl=timedelta(minutes=1))
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _slow_load():
+        loading.set()
+        await release.wait()
+        return {"uuid": project_uuid, "workbench": {}}
+
+    task = asyncio.create_task(cache.get_or_load(project_uuid, 1, _slow_load))
+    await loading.wait()
+    cache.invalidate(project_uuid)
+    release.set()
+    assert await task
+    assert cache.get(project_uuid, 1) is None
+    assert not cache._loads_in_flight  # noqa: SLF001
+    assert not cache._invalidated_loads  # noqa: SLF001
+
+
+async def test_projects_cache_is_bounded_and_does_not_cache_errors(faker: Faker):
+    cache = ProjectsCache(ttl=timedelta(minutes=1), max_size=3)
+    for _ in range(5):
+        project_uuid = faker.uuid4()
+        await cache.get_or_load(
+            project_uuid, 1, AsyncMock(return_value={"uuid": project_uuid})
+        )
+    assert len(cache) == 3
+
+    project_uuid = faker.uuid4()
+    with pytest.raises(ProjectNotFoundError):
+        await cache.get_or_load(
+            project_uuid,
+            1,
+            AsyncMock(side_effect=ProjectNotFoundError(project_uuid=project_uuid)),
+        )
+    assert cache.get(project_uuid, 1) is None
+    assert not cache._loads_in_flight  # noqa: SLF001
@@ -15,6 +15,7 @@ import sqlalchemy as sa
 from aiohttp.test_utils import TestClient
 from faker import Faker
 from models_library.projects import ProjectAtDB, ProjectID
+from models_library.projects_state import RunningState
 from pytest_mock.plugin import MockerFixture
 from pytest_simcore.helpers.webserver_login import UserInfoDict
 from servicelib.aiohttp.application_keys import APP_DB_ENGINE_KEY
@@ -24,6 +25,7 @@ from simcore_postgres_database.models.users import UserRole
 from simcore_service_webserver.db_listener._db_comp_tasks_listening_task import (
     create_comp_tasks_listening_task,
 )
+from simcore_service_webserver.projects.exceptions import NodeNotFoundError
 from tenacity.asyncio import AsyncRetrying
 from tenacity.before_sleep import before_sleep_log
 from tenacity.retry import retry_if_exception_type
@@ -39,18 +41,17 @@ async def mock_project_subsystem(
 ) -> AsyncIterator[dict[str, mock.MagicMock]]:
     mocked_project_calls = {}
 
-    mocked_project_calls["update_node_outputs"] = mocker.patch(
-        "simcore_service_webserver.db_listener._db_comp_tasks_listening_task.update_node_outputs",
-        return_value="",
-    )
-
     mocked_project_calls["_get_project_owner"] = mocker.patch(
         "simcore_service_webserver.db_listener._db_comp_tasks_listening_task._get_project_owner",
         return_value="",
     )
-    mocked_project_calls["_update_project_state"] = mocker.patch(
-        "simcore_service_webserver.db_listener._db_comp_tasks_listening_task._update_project_state",
-        return_value="",
+    mocked_project_calls["update_project_nodes_data"] = mocker.patch(
+        "simcore_service_webserver.db_listener._db_comp_tasks_listening_task.projects_api.update_project_nodes_data",
+        return_value=({"workbench": {}}, {}),
+    )
+    mocked_project_calls["_notify_project_nodes_changes"] = mocker.patch(
+        "simcore_service_webserver.db_listener._db_comp_tasks_listening_task._notify_project_nodes_changes",
+        return_value=None,
     )
 
     yield mocked_project_calls
@@ -95,32 +96,43 @@ def comp_task(
         )
 
 
+_ALL_CALLS: list[str] = [
+    "_get_project_owner",
+    "update_project_nodes_data",
+    "_notify_project_nodes_changes",
+]
+
+
 @pytest.mark.parametrize(
     "task_class", [NodeClass.COMPUTATIONAL, NodeClass.INTERACTIVE, NodeClass.FRONTEND]
 )
 @pytest.mark.parametrize(
-    "update_values, expected_calls",
+    "update_values, expected_calls, expected_node_data_keys",
     [
         pytest.param(
             {
                 "outputs": {"some new stuff": "it is new"},
             },
-            ["_get_project_owner", "update_node_outputs"],
+            _ALL_CALLS,
+            {"outputs", "runHash"},
             id="new output shall trigger",
         ),
         pytest.param(
             {"state": StateType.ABORTED},
-            ["_get_project_owner", "_update_project_state"],
+            _ALL_CALLS,
+            {"state"},
             id="new state shall trigger",
         ),
         pytest.param(
             {"outputs": {"some new stuff": "it is new"}, "state": StateType.ABORTED},
-            ["_get_project_owner", "update_node_outputs", "_update_project_state"],
-            id="new output and state shall double trigger",
+            _ALL_CALLS,
+            {"outputs", "runHash", "state"},
+            id="new output and state shall trigger one update",
         ),
         pytest.param(
             {"inputs": {"should not trigger": "right?"}},
             [],
+            set(),
             id="no new output or state shall not trigger",
         ),
     ],
@@ -136,6 +148,7 @@ async def test_listen_comp_tasks_task(
     client,
     update_values: dict[str, Any],
     expected_calls: list[str],
+    expected_node_data_keys: set[str],
     task_class: NodeClass,
     faker: Faker,
 ):
@@ -171,3 +184,132 @@ async def test_listen_comp_tasks_task(
 
             else:
                 mocked_call.assert_not_called()
+
+    if expected_node_data_keys:
+        mock_project_subsystem["update_project_nodes_data"].assert_awaited_once()
+        partial_workbench_data = mock_project_subsystem[
+            "update_project_nodes_data"
+        ].call_args.args[-1]
+        assert set(partial_workbench_data[task["node_id"]]) == expected_node_data_keys
+
+
+@pytest.mark.parametrize("user_role", [UserRole.USER])
+async def test_listen_comp_tasks_task_coalesces_project_updates(
+    mock_project_subsystem: dict,
+    logged_user: UserInfoDict,
+    project: Callable[..., Awaitable[ProjectAtDB]],
+    pipeline: Callable[..., dict[str, Any]],
+    comp_task: Callable[..., dict[str, Any]],
+    comp_task_listening_task: None,
+    client,
+    faker: Faker,
+):
+    db_engine: aiopg.sa.Engine = client.app[APP_DB_ENGINE_KEY]
+    projects = [await project(logged_user) for _ in range(2)]
+    tasks = []
+    for some_project in projects:
+        pipeline(project_id=f"{some_project.uuid}")
+        tasks.extend(
+            comp_task(
+                project_id=f"{some_project.uuid}",
+                node_id=faker.uuid4(),
+                outputs=json.dumps({}),
+                node_class=NodeClass.COMPUTATIONAL,
+            )
+            for _ in range(3)
+        )
+    async with db_engine.acquire() as conn, conn.begin():
+        # a burst of changes, several times on the same tasks
+        for state in [StateType.PENDING, StateType.RUNNING, StateType.SUCCESS]:
+            await conn.execute(
+                comp_tasks.update()
+                .values(state=state)
+                .where(comp_tasks.c.task_id.in_([t["task_id"] for t in tasks]))
+            )
+
+    async for attempt in AsyncRetrying(
+        wait=wait_fixed(1),
+        stop=stop_after_delay(10),
+        retry=retry_if_exception_type(AssertionError),
+        before_sleep=before_sleep_log(logger, logging.INFO),
+        reraise=True,
+    ):
+        with attempt:
+            # one workbench update per project, with the latest state of all its nodes
+            assert mock_project_subsystem["update_project_nodes_data"].await_count == 2
+
+    for call in mock_project_subsystem["update_project_nodes_data"].call_args_list:
+        partial_workbench_data = call.args[-1]
+        assert len(partial_workbench_data) == 3
+        assert all(
+            node_data["state"]["currentStatus"] == RunningState.SUCCESS
+            for node_data in partial_workbench_data.values()
+        )
+    assert mock_project_subsystem["_notify_project_nodes_changes"].await_count == 2
+
+
+@pytest.mark.parametrize("user_role", [UserRole.USER])
+async def test_listen_comp_tasks_task_still_updates_nodes_when_one_was_deleted(
+    mock_project_subsystem: dict,
+    logged_user: UserInfoDict,
+    project: Callable[..., Awaitable[ProjectAtDB]],
+    pipeline: Callable[..., dict[str, Any]],
+    comp_task: Callable[..., dict[str, Any]],
+    comp_task_listening_task: None,
+    client,
+    faker: Faker,
+):
+    db_engine: aiopg.sa.Engine = client.app[APP_DB_ENGINE_KEY]
+    some_project = await project(logged_user)
+    pipeline(project_id=f"{some_project.uuid}")
+    deleted_task, *other_tasks = (
+        comp_task(
+            project_id=f"{some_project.uuid}",
+            node_id=faker.uuid4(),
+            outputs=json.dumps({}),
+            node_class=NodeClass.COMPUTATIONAL,
+        )
+        for _ in range(3)
+    )
+    mock_project_subsystem["update_project_nodes_data"].side_effect = [
+        NodeNotFoundError(
+            project_uuid=f"{some_project.uuid}", node_uuid=deleted_task["node_id"]
+        ),
+        ({"workbench": {}}, {}),
+    ]
+
+    async with db_engine.acquire() as conn, conn.begin():
+        await conn.execute(
+            comp_tasks.update()
+            .values(state=StateType.SUCCESS)
+            .where(
+                comp_tasks.c.task_id.in_(
+                    [t["task_id"] for t in [deleted_task, *other_tasks]]
+                )
+            )
+        )
+
+    async for attempt in AsyncRetrying(
+        wait=wait_fixed(1),
+        stop=stop_after_delay(10),
+        retry=retry_if_exception_type(AssertionError),
+        before_sleep=before_sleep_log(logger, logging.INFO),
+        reraise=True,
+    ):
+        with attempt:
+            mock_project_subsystem[
+                "_notify_project_nodes_changes"
+            ].assert_awaited_once()
+
+    # the batch is retried without the deleted node
+    first_call, second_call = mock_project_subsystem[
+        "update_project_nodes_data"
+    ].call_args_list
+    assert len(first_call.args[-1]) == 3
+    assert set(second_call.args[-1]) == {t["node_id"] for t in other_tasks}
+    notified_nodes_changes = mock_project_subsystem[
+        "_notify_project_nodes_changes"
+    ].call_args.args[2]
+    assert {f"{node_id}" for node_id in notified_nodes_changes} == {
+        t["node_id"] for t in other_tasks
+    }
@@ -139,6 +139,13 @@ async def test_redis_registry(redis_registry: RedisResourceRegistry):
         assert all(x in found_keys for x in [key, second_key])
         assert all(x in [key, second_key] for x in found_keys)
         assert not await redis_registry.find_keys(invalid_resource)
+    # get them all at once
+    assert await redis_registry.get_many_resources([key, invalid_key, second_key]) == [
+        await redis_registry.get_resources(key),
+        {},
+        await redis_registry.get_resources(second_key),
+    ]
+    assert await redis_registry.get_many_resources([]) == []
 
     DEAD_KEY_TIMEOUT = 1
     STILL_ALIVE_KEY_TIMEOUT = DEAD_KEY_TIMEOUT + 1
@@ -171,6 +178,35 @@ async def test_redis_registry(redis_registry: RedisResourceRegistry):
         )
 
 
+async def test_redis_registry_backfills_indexes_of_existing_keys(
+    redis_client: aioredis.Redis, redis_registry: RedisResourceRegistry
+):
+    key = {"user_id": "1", "client_session_id": f"{uuid4()}"}
+    other_user_key = {"user_id": "2", "client_session_id": f"{uuid4()}"}
+    resource = ("project_id", f"{uuid4()}")
+    # keys written without indexes (e.g. by a previous version)
+    for k in (key, other_user_key):
+        hash_key = RedisResourceRegistry._hash_key(k)
+        await redis_client.hset(
+            f"{hash_key}:{_RESOURCE_SUFFIX}", mapping=dict([resource])
+        )
+    await redis_client.set(
+        f"{RedisResourceRegistry._hash_key(key)}:{_ALIVE_SUFFIX}", 1, ex=10
+    )
+    assert await redis_registry.find_keys(resource) == []
+
+    await redis_registry.backfill_indexes()
+
+    found_keys = await redis_registry.find_keys(resource)
+    assert sorted(found_keys, key=lambda k: k["user_id"]) == [key, other_user_key]
+    assert await redis_registry.find_resources(
+        {"user_id": "1", "client_session_id": "*"}, resource[0]
+    ) == [resource[1]]
+    alive_keys, dead_keys = await redis_registry.get_all_resource_keys()
+    assert alive_keys == [key]
+    assert dead_keys == [other_user_key]
+
+
 async def test_redis_registry_key_will_always_expire(
     redis_registry: RedisResourceRegistry,
 ):
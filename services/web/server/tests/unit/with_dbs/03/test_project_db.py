@@ -5,6 +5,7 @@
 # pylint: disable=unused-variable
 
 import asyncio
+import itertools
 from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
 from copy import deepcopy
 from random import randint
@@ -34,6 +35,7 @@ from simcore_service_webserver.projects._groups_db import update_or_insert_proje
 from simcore_service_webserver.projects.db import ProjectAccessRights, ProjectDBAPI
 from simcore_service_webserver.projects.exceptions import (
     NodeNotFoundError,
+    ProjectInvalidUsageError,
     ProjectNodeRequiredInputsNotSetError,
     ProjectNotFoundError,
 )
@@ -607,6 +609,112 @@ async def test_patch_user_project_workbench_concurrently(
     )
 
 
+@pytest.mark.parametrize(
+    "user_role",
+    [(UserRole.USER)],
+)
+async def test_patch_project_nodes_concurrently(
+    fake_project: dict[str, Any],
+    postgres_db: sa.engine.Engine,
+    logged_user: dict[str, Any],
+    db_api: ProjectDBAPI,
+    faker: Faker,
+    insert_project_in_db: Callable[..., Awaitable[dict[str, Any]]],
+):
+    _NUMBER_OF_NODES = 100
+    BASE_UUID = UUID("ccc0839f-93b8-4387-ab16-197281060927")
+    node_uuids = [str(uuid5(BASE_UUID, f"{n}")) for n in range(_NUMBER_OF_NODES)]
+    fake_project["workbench"] = {
+        node_uuids[n]: {
+            "key": "simcore/services/comp/sleepers",
+            "version": "1.43.5",
+            "label": f"I am node {n}",
+            "outputs": {"out_1": 1},
+        }
+        for n in range(_NUMBER_OF_NODES)
+    }
+    expected_project = deepcopy(fake_project)
+    new_project = await insert_project_in_db(fake_project, user_id=logged_user["id"])
+
+    # each node is patched on its own, the other entries of the nodes are kept
+    nodes_data = [
+        {
+            "outputs": {"out_1": n, "out_2": f"{n}"},
+            "runHash": faker.sha256(),
+            "state": {"currentStatus": "SUCCESS"},
+        }
+        for n in range(_NUMBER_OF_NODES)
+    ]
+    for node_uuid, node_data in zip(node_uuids, nodes_data, strict=True):
+        expected_project["workbench"][node_uuid].update(node_data)
+
+    patched_projects = await asyncio.gather(
+        *(
+            db_api.update_project_multiple_node_data(
+                user_id=logged_user["id"],
+                project_uuid=new_project["uuid"],
+                product_name=None,
+                partial_workbench_data={NodeIDStr(node_uuid): node_data},
+            )
+            for node_uuid, node_data in zip(node_uuids, nodes_data, strict=True)
+        )
+    )
+    for (prj, changed_entries), node_uuid, node_data in zip(
+        patched_projects, node_uuids, nodes_data, strict=True
+    ):
+        assert prj["workbench"][node_uuid] == expected_project["workbench"][node_uuid]
+        assert prj["prjOwner"] == logged_user["email"]
+        assert set(changed_entries) == {node_uuid}
+        assert set(changed_entries[node_uuid]) == {"outputs", "runHash", "state"}
+
+    latest_change_date = max(
+        to_datetime(prj["lastChangeDate"]) for prj, _ in patched_projects
+    )
+    _assert_project_db_row(
+        postgres_db,
+        expected_project,
+        prj_owner=logged_user["id"],
+        creation_date=to_datetime(new_project["creationDate"]),
+        last_change_date=latest_change_date,
+    )
+
+    # patching the same values again changes nothing
+    _, changed_entries = await db_api.update_project_node_data(
+        user_id=logged_user["id"],
+        project_uuid=new_project["uuid"],
+        node_id=NodeID(node_uuids[0]),
+        product_name=None,
+        new_node_data=nodes_data[0],
+    )
+    assert changed_entries == {node_uuids[0]: {}}
+
+    # nodes cannot be added or removed this way
+    with pytest.raises(NodeNotFoundError):
+        await db_api.update_project_multiple_node_data(
+            user_id=logged_user["id"],
+            project_uuid=new_project["uuid"],
+            product_name=None,
+            partial_workbench_data={
+                NodeIDStr(node_uuids[0]): {"outputs": {}},
+                NodeIDStr(faker.uuid4()): {"outputs": {}},
+            },
+        )
+    with pytest.raises(ProjectInvalidUsageError):
+        await db_api.update_project_multiple_node_data(
+            user_id=logged_user["id"],
+            project_uuid=new_project["uuid"],
+            product_name=None,
+            partial_workbench_data={NodeIDStr(node_uuids[0]): None},  # type: ignore[dict-item]
+        )
+    with pytest.raises(ProjectNotFoundError):
+        await db_api.update_project_multiple_node_data(
+            user_id=logged_user["id"],
+            project_uuid=faker.uuid4(),
+            product_name=None,
+            partial_workbench_data={NodeIDStr(node_uuids[0]): {"outputs": {}}},
+        )
+
+
 @pytest.fixture()
 async def some_projects_and_nodes(
     logged_user: dict[str, Any],
@@ -691,6 +799,12 @@ async def test_get_node_ids_from_project(
     ):
         assert node_ids_inside_project == set(some_projects_and_nodes[project_id])
 
+    # all at once
+    assert await db_api.list_node_ids_in_projects(some_projects_and_nodes) == set(
+        itertools.chain.from_iterable(some_projects_and_nodes.values())
+    )
+    assert await db_api.list_node_ids_in_projects([]) == set()
+
 
 @pytest.mark.parametrize(
     "user_role",